@@ -0,0 +1,40 @@
+"""create refresh_token table
+
+Revision ID: 0b6f1c2d9e4a
+Revises: 646514cc5c93
+Create Date: 2026-10-17 09:12:41.208311
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b6f1c2d9e4a'
+down_revision: Union[str, None] = '646514cc5c93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'refresh_tokens',
+        sa.Column('id', sa.String(36), primary_key=True),
+        sa.Column('user_id', sa.String(36), nullable=False),
+        sa.Column('family_id', sa.String(36), nullable=False),
+        sa.Column('token_hash', sa.String(64), unique=True, nullable=False),
+        sa.Column('replaced_by', sa.String(36), nullable=True),
+        sa.Column('expired_at', sa.DateTime, nullable=False),
+        sa.Column('revoked_at', sa.DateTime, nullable=True),
+        sa.Column('created_at', sa.DateTime, server_default=sa.func.NOW(), nullable=False),
+        sa.Column('updated_at', sa.DateTime, server_default=sa.func.NOW(), onupdate=sa.func.NOW(), nullable=False),
+    )
+    op.create_index("ix_refresh_token_user_id", 'refresh_tokens', ["user_id"])
+    op.create_index("ix_refresh_token_family_id", 'refresh_tokens', ["family_id"])
+    op.create_foreign_key("fk_refresh_token_user_id", 'refresh_tokens', 'users',
+                        ["user_id"], ["id"], ondelete='CASCADE', onupdate='CASCADE')
+
+def downgrade() -> None:
+    op.drop_table('refresh_tokens')
@@ -0,0 +1,35 @@
+"""create file_deletion table
+
+Revision ID: 2d8e6b4f0a17
+Revises: 9c3d5f7a1b2e
+Create Date: 2026-10-17 18:44:05.917320
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2d8e6b4f0a17'
+down_revision: Union[str, None] = '9c3d5f7a1b2e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'file_deletions',
+        sa.Column('id', sa.String(36), primary_key=True),
+        sa.Column('folder', sa.String(256), nullable=True),
+        sa.Column('filename', sa.String(256), nullable=False),
+        sa.Column('attempts', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('last_error', sa.Text, nullable=True),
+        sa.Column('next_attempt_at', sa.DateTime, server_default=sa.func.NOW(), nullable=False),
+        sa.Column('created_at', sa.DateTime, server_default=sa.func.NOW(), nullable=False),
+    )
+    op.create_index("ix_file_deletion_next_attempt_at", 'file_deletions', ["next_attempt_at"])
+
+def downgrade() -> None:
+    op.drop_table('file_deletions')
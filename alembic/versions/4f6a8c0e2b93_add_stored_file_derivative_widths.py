@@ -0,0 +1,25 @@
+"""add derivative_widths to stored_file table
+
+Revision ID: 4f6a8c0e2b93
+Revises: 2d8e6b4f0a17
+Create Date: 2026-10-17 21:12:40.284611
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f6a8c0e2b93'
+down_revision: Union[str, None] = '2d8e6b4f0a17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('stored_files', sa.Column('derivative_widths', sa.JSON, nullable=True))
+
+def downgrade() -> None:
+    op.drop_column('stored_files', 'derivative_widths')
@@ -0,0 +1,35 @@
+"""create revoked_token table
+
+Revision ID: 5e2a7c4b8d31
+Revises: 0b6f1c2d9e4a
+Create Date: 2026-10-17 11:40:18.562093
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e2a7c4b8d31'
+down_revision: Union[str, None] = '0b6f1c2d9e4a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'revoked_tokens',
+        sa.Column('id', sa.String(36), primary_key=True),
+        sa.Column('user_id', sa.String(36), nullable=True),
+        sa.Column('expired_at', sa.DateTime, nullable=False),
+        sa.Column('created_at', sa.DateTime, server_default=sa.func.NOW(), nullable=False),
+    )
+    op.create_index("ix_revoked_token_expired_at", 'revoked_tokens', ["expired_at"])
+    op.create_index("ix_revoked_token_created_at", 'revoked_tokens', ["created_at"])
+    op.create_foreign_key("fk_revoked_token_user_id", 'revoked_tokens', 'users',
+                        ["user_id"], ["id"], ondelete='CASCADE', onupdate='CASCADE')
+
+def downgrade() -> None:
+    op.drop_table('revoked_tokens')
@@ -0,0 +1,34 @@
+"""create stored_file table
+
+Revision ID: 9c3d5f7a1b2e
+Revises: 5e2a7c4b8d31
+Create Date: 2026-10-17 15:02:17.530146
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c3d5f7a1b2e'
+down_revision: Union[str, None] = '5e2a7c4b8d31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'stored_files',
+        sa.Column('id', sa.String(128), primary_key=True),
+        sa.Column('content_type', sa.String(64), nullable=True),
+        sa.Column('size', sa.BigInteger, nullable=False, server_default='0'),
+        sa.Column('ref_count', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime, server_default=sa.func.NOW(), nullable=False),
+        sa.Column('updated_at', sa.DateTime, server_default=sa.func.NOW(), onupdate=sa.func.NOW(), nullable=False),
+    )
+    op.create_index("ix_stored_file_updated_at", 'stored_files', ["updated_at"])
+
+def downgrade() -> None:
+    op.drop_table('stored_files')
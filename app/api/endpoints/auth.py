@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends, Form, UploadFile, status, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 from app.database import get_db
-from app.dtos.auth import AuthLogin, AuthProfilePassword
-from app.models.response import AuthResponse, GeneralDataResponse
+from app.dtos.auth import AuthLogin, AuthProfilePassword, AuthRefreshToken
+from app.models.response import AuthResponse, GeneralDataResponse, json_response
 from app.models.role.role_authority import RoleAuthorityName
 from app.models.user import User, UserGender
 from app.services.auth_service import AuthService
@@ -11,11 +12,12 @@ from app.services.role.role_authority_service import RoleAuthorityService
 from app.services.user_service import UserService
 from app.utils.authentication import Authentication
 from app.utils.handling_file import validation_file
+from app.utils.storage import get_file_url
 
 router = APIRouter()
 
 @router.post("/login", response_model=AuthResponse, status_code=status.HTTP_200_OK)
-def auth_login(auth_login: AuthLogin, db: Session = Depends(get_db)):
+async def auth_login(auth_login: AuthLogin, db: Session = Depends(get_db)):
     """
         Login user
         - check username exist
@@ -24,7 +26,7 @@ def auth_login(auth_login: AuthLogin, db: Session = Depends(get_db)):
     auth_service = AuthService(db)
 
     try:
-        user = auth_service.auth_login(auth_login)
+        user = await auth_service.auth_login(auth_login)
     except ValueError as error:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
 
@@ -44,7 +46,7 @@ def auth_login(auth_login: AuthLogin, db: Session = Depends(get_db)):
             'expired_at': expired_at
         },
     )
-    response = JSONResponse(content=auth_response.model_dump(), status_code=status_code)
+    response = json_response(auth_response, status_code)
     response.set_cookie("access_token", access_token, max_age=expired_at * 60)
     return response
 
@@ -83,7 +85,7 @@ def auth_profile(db: Session = Depends(get_db),  payload = Depends(Authenticatio
         'gender': user.gender,
         'name': user.name,
         'role': role_data,
-        'image_url': f"{user_service.static_folder_image}/{user.image_url}" if user.image_url else None,
+        'image_url': get_file_url(user_service.static_folder_image, user.image_url),
         'view_mode': role_authority_list
     }
 
@@ -92,11 +94,11 @@ def auth_profile(db: Session = Depends(get_db),  payload = Depends(Authenticatio
         status="OK",
         data=data,
     )
-    response = JSONResponse(content=auth_response.model_dump(), status_code=status_code)
+    response = json_response(auth_response, status_code)
     return response
 
 @router.patch("/profile", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
-async def auth_update_profile(
+def auth_update_profile(
     username: str = Form(None, min_length=0, max_length=36),
     email: str = Form(None, min_length=0, max_length=36),
     name: str = Form(None, min_length=0, max_length=36),
@@ -116,7 +118,7 @@ async def auth_update_profile(
     
     try:
         if (image):
-            await validation_file(file=image)
+            validation_file(file=image)
 
         content_type = image.content_type if image else ""
         file_extension = content_type.split('/')[1] if image else ""
@@ -154,7 +156,7 @@ async def auth_update_profile(
         status="OK",
         data=data,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.put("/profile/password", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
@@ -167,25 +169,26 @@ async def auth_update_profile(
     user_id = payload.get("uid", None)
     user_service = UserService(db)
     
-    exist_user = user_service.user_repository.read_user(user_id)
+    exist_user = await run_in_threadpool(user_service.user_repository.read_user, user_id)
     if not exist_user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     
-    is_password_valid = user_service.verify_password(auth_profile_password.old_password, exist_user.password)
+    is_password_valid = await user_service.verify_password_async(auth_profile_password.old_password, exist_user.password)
     if not is_password_valid:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Old password is not valid")
     
     if auth_profile_password.confirm_new_password != auth_profile_password.new_password:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="New password and confirm new password are not the same")
     
-    new_password = user_service.get_password_hash(auth_profile_password.new_password),
+    new_password = await user_service.get_password_hash_async(auth_profile_password.new_password)
     
     user_model = User(
         id=user_id,
         password=new_password,
     )
     try:
-        data = user_service.update_user_password(
+        data = await run_in_threadpool(
+            user_service.update_user_password,
             exist_user,
             user_model,
         )
@@ -202,26 +205,72 @@ async def auth_update_profile(
         status="OK",
         data=data,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
-# @router.post("/refresh-token", response_model=AuthResponse, status_code=status.HTTP_200_OK)
-# def auth_refresh_token(db: Session = Depends(get_db)):
-#     """
-#         Refresh token user
+@router.post("/refresh-token", response_model=AuthResponse, status_code=status.HTTP_200_OK)
+async def auth_refresh_token(auth_refresh_token: AuthRefreshToken, db: Session = Depends(get_db)):
+    """
+        Refresh token user
 
-#         COMING SOON
-#     """
-#     pass
+        - refresh token only usable once, response has the new one
+        - reuse of old refresh token end the login
+    """
+    auth_service = AuthService(db)
 
-# @router.post("/logout", response_model=AuthResponse, status_code=status.HTTP_200_OK)
-# def auth_logout(db: Session = Depends(get_db)):
-#     """
-#         Logout user
+    try:
+        user = await run_in_threadpool(auth_service.auth_refresh_token, auth_refresh_token.refresh_token)
+    except ValueError as error:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(error))
 
-#         COMING SOON
-#         - refer with saving refresh token
-#     """
-#     pass
+    user_id = user.get('user_id', None)
+    access_token = user.get('access_token', None)
+    refresh_token = user.get('refresh_token', None)
+    expired_at = user.get('access_token_expired_at', None)
+    status_code = status.HTTP_200_OK
 
+    auth_response = AuthResponse(
+        code=status_code,
+        status="OK",
+        data={
+            'id': user_id,
+            'access_token': access_token,
+            'refresh_token': refresh_token,
+            'expired_at': expired_at
+        },
+    )
+    response = json_response(auth_response, status_code)
+    response.set_cookie("access_token", access_token, max_age=expired_at * 60)
+    return response
+
+@router.post("/logout", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
+def auth_logout(
+    auth_refresh_token: AuthRefreshToken,
+    db: Session = Depends(get_db),
+    authorization: HTTPAuthorizationCredentials = Depends(HTTPBearer(auto_error=False)),
+):
+    """
+        Logout user
+
+        - revoke refresh token and every token rotated from the same login
+        - revoke access token when sent as bearer
+    """
+    auth_service = AuthService(db)
+    access_token = authorization.credentials if authorization else None
+
+    try:
+        user = auth_service.auth_logout(auth_refresh_token.refresh_token, access_token)
+    except ValueError as error:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(error))
 
+    status_code = status.HTTP_200_OK
+    data_response = GeneralDataResponse(
+        code=status_code,
+        status="OK",
+        data={
+            'id': user.id,
+        },
+    )
+    response = json_response(data_response, status_code)
+    response.delete_cookie("access_token")
+    return response
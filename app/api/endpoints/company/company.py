@@ -1,8 +1,7 @@
 from fastapi import APIRouter, Depends, Form, Query, UploadFile, status, HTTPException
-from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from app.database import get_db
-from app.models.response import GeneralDataPaginateResponse, GeneralDataResponse
+from app.models.response import GeneralDataPaginateResponse, GeneralDataResponse, json_response
 from app.models.role.role_authority import RoleAuthorityFeature, RoleAuthorityName
 from app.models.company.company import Company
 from app.services.role.role_authority_service import RoleAuthorityService
@@ -12,18 +11,21 @@ from app.services.user_service import UserService
 from app.utils.authentication import Authentication
 from app.utils.handling_file import validation_file
 from app.utils.manual import get_total_pages
+from app.utils.pagination import get_next_cursor
+from app.utils.permission import require
+from app.utils.storage import get_file_url
 
 router = APIRouter()
 
 @router.post("", response_model=GeneralDataResponse, status_code=status.HTTP_201_CREATED)
-async def create_company(
+def create_company(
     code: str = Form(..., min_length=1, max_length=36),
     name: str = Form(..., min_length=1, max_length=36),
     website_url: str = Form(None, min_length=0, max_length=512),
     image: UploadFile = None,
     logo: UploadFile = None,
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.company, RoleAuthorityName.create))
 ):
     """
         Create Company
@@ -31,17 +33,10 @@ async def create_company(
         - should login
         - allow to create with role that has authority
     """
-    user_id_active = payload.get("uid", None)
 
     # service
     company_service = CompanyService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
     
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.company.value, name=RoleAuthorityName.create.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to create")
 
     # validation
     exist_code = company_service.company_repository.get_company_by_code(code)
@@ -54,10 +49,10 @@ async def create_company(
     
     try:
         if (image):
-            await validation_file(file=image)
+            validation_file(file=image)
         
         if (logo):
-            await validation_file(file=logo)
+            validation_file(file=logo)
 
         content_type_image = image.content_type if image else ""
         file_extension_image = content_type_image.split('/')[1] if image else ""
@@ -92,7 +87,7 @@ async def create_company(
         status="OK",
         data=result,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.get("", response_model=GeneralDataPaginateResponse, status_code=status.HTTP_200_OK)
@@ -104,6 +99,8 @@ def read_companies(
     is_active: bool = Query(None),
     offset: int = Query(None, ge=1), 
     size: int = Query(None, ge=1),
+    cursor: str = Query(None),
+    with_total: bool = Query(True),
     db: Session = Depends(get_db), 
     payload = Depends(Authentication())
 ):
@@ -116,23 +113,26 @@ def read_companies(
 
     custom_filters = {filter_by_column: filter_value} if filter_by_column and filter_value else None
 
-    companies = company_service.company_repository.read_companies(
-        offset=offset, 
-        size=size, 
-        sort_by=sort_by, 
-        sort_order=sort_order, 
-        custom_filters=custom_filters,
-        is_active=is_active
-    )
+    try:
+        companies = company_service.company_repository.read_companies(
+            offset=offset, 
+            size=size, 
+            cursor=cursor,
+            with_total=with_total,
+            sort_by=sort_by, 
+            sort_order=sort_order, 
+            custom_filters=custom_filters,
+            is_active=is_active
+        )
+    except ValueError as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
 
     if not companies:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Data not found")
     
-    count = company_service.company_repository.count_companies(
-        custom_filters=custom_filters,
-        is_active=is_active
-    )
+    count = companies.total
     total_pages = get_total_pages(size, count)
+    next_cursor = get_next_cursor(companies, size, sort_by, Company) if cursor is not None else None
     
 
     datas = []
@@ -142,10 +142,10 @@ def read_companies(
             'name': company.name,
             'code': company.code,
             'is_active': company.is_active,
-            'created_at': str(company.created_at),
-            'updated_at': str(company.updated_at),
-            'image_url': f"{company_service.static_folder_image}/{company.image_url}" if company.image_url else None,
-            'logo_url': f"{company_service.static_folder_logo}/{company.logo_url}" if company.logo_url else None,
+            'created_at': company.created_at,
+            'updated_at': company.updated_at,
+            'image_url': get_file_url(company_service.static_folder_image, company.image_url),
+            'logo_url': get_file_url(company_service.static_folder_logo, company.logo_url),
             'website_url': str(company.website_url) if company.website_url else None,
         })
 
@@ -158,10 +158,11 @@ def read_companies(
             "size": size,
             "total": count,
             "total_pages": total_pages,
-            "offset": offset
+            "offset": offset,
+            "next_cursor": next_cursor
         },
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.get("/{company_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
@@ -190,18 +191,18 @@ def read_company(
             'name': company.name,
             'code': company.code,
             'is_active': company.is_active,
-            'created_at': str(company.created_at),
-            'updated_at': str(company.updated_at),
-            'image_url': f"{company_service.static_folder_image}/{company.image_url}" if company.image_url else None,
-            'logo_url': f"{company_service.static_folder_logo}/{company.logo_url}" if company.logo_url else None,
+            'created_at': company.created_at,
+            'updated_at': company.updated_at,
+            'image_url': get_file_url(company_service.static_folder_image, company.image_url),
+            'logo_url': get_file_url(company_service.static_folder_logo, company.logo_url),
             'website_url': str(company.website_url) if company.website_url else None,
         },
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.patch("/{company_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
-async def update_company(
+def update_company(
     company_id: str,
     code: str = Form(None, min_length=0, max_length=36),
     name: str = Form(None, min_length=0, max_length=36),
@@ -210,7 +211,7 @@ async def update_company(
     image: UploadFile = None,
     logo: UploadFile = None,
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.company, RoleAuthorityName.edit))
 ):
     """
         Update Company
@@ -218,17 +219,9 @@ async def update_company(
         - should login
         - allow to update with role that has authority
     """
-    user_id_active = payload.get("uid", None)
 
     # service
     company_service = CompanyService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
-    
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.company.value, name=RoleAuthorityName.edit.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to edit")
     
     # validation
     exist_company = company_service.company_repository.read_company(company_id)
@@ -237,10 +230,10 @@ async def update_company(
     
     try:
         if (image):
-            await validation_file(file=image)
+            validation_file(file=image)
         
         if (logo):
-            await validation_file(file=logo)
+            validation_file(file=logo)
 
         content_type_image = image.content_type if image else ""
         file_extension_image = content_type_image.split('/')[1] if image else ""
@@ -277,15 +270,15 @@ async def update_company(
         status="OK",
         data=data,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 
 @router.delete("/{company_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
-async def delete_company(
+def delete_company(
     company_id: str,
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.company, RoleAuthorityName.delete))
 ):
     """
         Delete Company
@@ -293,17 +286,10 @@ async def delete_company(
         - should login
         - allow to delete with role that has authority
     """
-    user_id_active = payload.get("uid", None)
 
     # service
     company_service = CompanyService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
     
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.company.value, name=RoleAuthorityName.delete.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to delete")
 
     try:
         company_service.delete_company(company_id)
@@ -320,11 +306,11 @@ async def delete_company(
         status="OK",
         data=data,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.get("-resource", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
-async def read_company_resource(
+def read_company_resource(
     db: Session = Depends(get_db), 
     payload = Depends(Authentication())
 ):
@@ -351,5 +337,5 @@ async def read_company_resource(
         status="OK",
         data=role_authority_list,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
\ No newline at end of file
@@ -1,28 +1,26 @@
 from fastapi import APIRouter, Depends, Form, status, HTTPException
-from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models import LanguageOption
-from app.models.response import GeneralDataResponse
+from app.models.response import GeneralDataResponse, json_response
 from app.models.role.role_authority import RoleAuthorityFeature, RoleAuthorityName
 from app.models.company.company_translation import CompanyTranslation
 from app.services.company.company_service import CompanyService
-from app.services.role.role_authority_service import RoleAuthorityService
 from app.services.company.company_translation_service import CompanyTranslationService
-from app.services.user_service import UserService
 from app.utils.authentication import Authentication
+from app.utils.permission import require
 
 router = APIRouter()
 
 @router.post("", response_model=GeneralDataResponse, status_code=status.HTTP_201_CREATED)
-async def create_company_translation(
+def create_company_translation(
     company_id: str = Form(..., min_length=1, max_length=36),
     language_id: LanguageOption = Form(...),
     name: str = Form(..., min_length=1, max_length=128),
     description: str = Form(None, min_length=0, max_length=512),
     address: str = Form(None, min_length=0, max_length=512),
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.company, RoleAuthorityName.create))
 ):
     """
         Create Company Translation
@@ -30,19 +28,11 @@ async def create_company_translation(
         - should login
         - allow to create with role that has authority
     """
-    user_id_active = payload.get("uid", None)
 
     # service
     company_translation_service = CompanyTranslationService(db)
     company_service = CompanyService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
     
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.company.value, name=RoleAuthorityName.create.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to create")
-
     language_id = language_id.value
 
     # validation
@@ -78,7 +68,7 @@ async def create_company_translation(
         status="OK",
         data=result,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.get("/{company_id}/{language_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
@@ -109,22 +99,22 @@ def read_company_translation(
             'description': company_translation.description,
             'address': company_translation.address,
             'language_id': company_translation.language_id,
-            'created_at': str(company_translation.created_at),
-            'updated_at': str(company_translation.updated_at),
+            'created_at': company_translation.created_at,
+            'updated_at': company_translation.updated_at,
         },
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.patch("/{company_id}/{language_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
-async def update_company_translation(
+def update_company_translation(
     company_id: str,
     language_id: LanguageOption,
     name: str = Form(..., min_length=1, max_length=128),
     description: str = Form(None, min_length=0, max_length=512),
     address: str = Form(None, min_length=0, max_length=512),
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.company, RoleAuthorityName.edit))
 ):
     """
         Update Company Translation
@@ -132,17 +122,9 @@ async def update_company_translation(
         - should login
         - allow to update with role that has authority
     """
-    user_id_active = payload.get("uid", None)
 
     # service
     company_translation_service = CompanyTranslationService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
-    
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.company.value, name=RoleAuthorityName.edit.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to edit")
     
     # validation
     exist_company_translation = company_translation_service.company_translation_repository.get_company_translation_by_company_id_and_language_id(company_id=company_id, language_id=language_id.value)
@@ -176,16 +158,16 @@ async def update_company_translation(
         status="OK",
         data=data,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 
 @router.delete("/{company_id}/{language_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
-async def delete_company_translation(
+def delete_company_translation(
     company_id: str,
     language_id: LanguageOption,
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.company, RoleAuthorityName.delete))
 ):
     """
         Delete CompanyTranslation
@@ -193,18 +175,10 @@ async def delete_company_translation(
         - should login
         - allow to delete with role that has authority
     """
-    user_id_active = payload.get("uid", None)
 
     # service
     company_translation_service = CompanyTranslationService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
     
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.company.value, name=RoleAuthorityName.delete.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to delete")
-
     try:
         company_translation_service.delete_company_translation(company_id=company_id, language_id=language_id)
     except ValueError as error:
@@ -221,5 +195,5 @@ async def delete_company_translation(
         status="OK",
         data=data,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
\ No newline at end of file
@@ -0,0 +1,164 @@
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.orm import Session
+from app.config import config
+from app.database import async_engine, engine, get_db, get_pool_status
+from app.models.response import GeneralDataResponse, json_response
+from app.models.role.role_authority import RoleAuthorityFeature, RoleAuthorityName
+from app.utils.compression import compressed_body_cache
+from app.utils.file_deletion import file_deletion_queue
+from app.utils.image_derivative import image_derivative_pool
+from app.utils.password import password_hasher
+from app.utils.permission import require
+from app.utils.revocation import revocation_list
+from app.utils.threadpool import get_threadpool_status
+from app.utils.token_cache import token_cache
+
+router = APIRouter()
+
+@router.get("/pool", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
+def read_pool_status(payload = Depends(require(RoleAuthorityFeature.diagnostic, RoleAuthorityName.view))):
+    """
+        Live statistic of database connection pool
+
+        - should login
+        - allow to view with role that has authority
+        - checked out, overflow and waiting time to get connection
+        - sync pool used by handler on thread, async pool used by public profile
+    """
+    status_code = status.HTTP_200_OK
+    data_response = GeneralDataResponse(
+        code=status_code,
+        status="OK",
+        data={
+            'sync': get_pool_status(engine, config.DB_POOL_MAX_OVERFLOW),
+            'async': get_pool_status(async_engine.sync_engine, config.DB_ASYNC_POOL_MAX_OVERFLOW),
+        },
+    )
+    response = json_response(data_response, status_code)
+    return response
+
+@router.get("/threadpool", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
+async def read_threadpool_status(payload = Depends(require(RoleAuthorityFeature.diagnostic, RoleAuthorityName.view))):
+    """
+        Live statistic of worker thread pool running sync handler
+
+        - should login
+        - allow to view with role that has authority
+        - async because limiter only readable inside event loop
+    """
+    status_code = status.HTTP_200_OK
+    data_response = GeneralDataResponse(
+        code=status_code,
+        status="OK",
+        data=get_threadpool_status(),
+    )
+    response = json_response(data_response, status_code)
+    return response
+
+@router.get("/password-hasher", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
+def read_password_hasher_status(payload = Depends(require(RoleAuthorityFeature.diagnostic, RoleAuthorityName.view))):
+    """
+        Live statistic of bcrypt pool
+
+        - should login
+        - allow to view with role that has authority
+        - in flight, queue depth and duration of hash and verify
+    """
+    status_code = status.HTTP_200_OK
+    data_response = GeneralDataResponse(
+        code=status_code,
+        status="OK",
+        data=password_hasher.get_status(),
+    )
+    response = json_response(data_response, status_code)
+    return response
+
+@router.get("/revocation", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
+def read_revocation_status(payload = Depends(require(RoleAuthorityFeature.diagnostic, RoleAuthorityName.view))):
+    """
+        Live statistic of revoked token list
+
+        - should login
+        - allow to view with role that has authority
+        - revoked jti in memory, bloom filter size and watermark
+    """
+    status_code = status.HTTP_200_OK
+    data_response = GeneralDataResponse(
+        code=status_code,
+        status="OK",
+        data=revocation_list.get_status(),
+    )
+    response = json_response(data_response, status_code)
+    return response
+
+@router.get("/token-cache", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
+def read_token_cache_status(payload = Depends(require(RoleAuthorityFeature.diagnostic, RoleAuthorityName.view))):
+    """
+        Live statistic of verified token cache
+
+        - should login
+        - allow to view with role that has authority
+        - hit ratio and verification time saved by hit
+    """
+    status_code = status.HTTP_200_OK
+    data_response = GeneralDataResponse(
+        code=status_code,
+        status="OK",
+        data=token_cache.get_status(),
+    )
+    response = json_response(data_response, status_code)
+    return response
+
+@router.get("/image-derivative", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
+def read_image_derivative_status(payload = Depends(require(RoleAuthorityFeature.diagnostic, RoleAuthorityName.view))):
+    """
+        Live statistic of image derivative pool
+
+        - should login
+        - allow to view with role that has authority
+        - in flight, completed and failed resize job
+    """
+    status_code = status.HTTP_200_OK
+    data_response = GeneralDataResponse(
+        code=status_code,
+        status="OK",
+        data=image_derivative_pool.get_status(),
+    )
+    response = json_response(data_response, status_code)
+    return response
+
+@router.get("/file-deletion", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
+def read_file_deletion_status(db: Session = Depends(get_db), payload = Depends(require(RoleAuthorityFeature.diagnostic, RoleAuthorityName.view))):
+    """
+        Live statistic of file deletion queue
+
+        - should login
+        - allow to view with role that has authority
+        - pending journal, deleted and failed file
+    """
+    status_code = status.HTTP_200_OK
+    data_response = GeneralDataResponse(
+        code=status_code,
+        status="OK",
+        data=file_deletion_queue.get_status(db),
+    )
+    response = json_response(data_response, status_code)
+    return response
+
+@router.get("/compression", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
+def read_compression_status(payload = Depends(require(RoleAuthorityFeature.diagnostic, RoleAuthorityName.view))):
+    """
+        Live statistic of compressed body cache
+
+        - should login
+        - allow to view with role that has authority
+        - entries, size and hit of cache
+    """
+    status_code = status.HTTP_200_OK
+    data_response = GeneralDataResponse(
+        code=status_code,
+        status="OK",
+        data=compressed_body_cache.get_status(),
+    )
+    response = json_response(data_response, status_code)
+    return response
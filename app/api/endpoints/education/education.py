@@ -1,9 +1,8 @@
 from datetime import date
 from fastapi import APIRouter, Depends, Form, Query, status, HTTPException
-from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from app.database import get_db
-from app.models.response import GeneralDataPaginateResponse, GeneralDataResponse
+from app.models.response import GeneralDataPaginateResponse, GeneralDataResponse, json_response
 from app.models.role.role_authority import RoleAuthorityFeature, RoleAuthorityName
 from app.models.education.education import Education
 from app.services.role.role_authority_service import RoleAuthorityService
@@ -12,17 +11,19 @@ from app.services.school.school_service import SchoolService
 from app.services.user_service import UserService
 from app.utils.authentication import Authentication
 from app.utils.manual import get_total_pages
+from app.utils.pagination import get_next_cursor
+from app.utils.permission import has_permission, require
 
 router = APIRouter()
 
 @router.post("", response_model=GeneralDataResponse, status_code=status.HTTP_201_CREATED)
-async def create_education(
+def create_education(
     school_id: str = Form(..., min_length=1, max_length=36),
     title: str = Form(..., min_length=1, max_length=128),
     started_at: date = Form(...),
     finished_at: date = Form(None),
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.education, RoleAuthorityName.create))
 ):
     """
         Create Education
@@ -35,13 +36,7 @@ async def create_education(
     # service
     school_service = SchoolService(db)
     education_service = EducationService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
     
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.education.value, name=RoleAuthorityName.create.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to create")
 
     # validation
     exist_school = school_service.school_repository.read_school(school_id)
@@ -74,7 +69,7 @@ async def create_education(
         status="OK",
         data=result,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.get("", response_model=GeneralDataPaginateResponse, status_code=status.HTTP_200_OK)
@@ -86,6 +81,8 @@ def read_educations(
     is_active: bool = Query(None),
     offset: int = Query(None, ge=1), 
     size: int = Query(None, ge=1),
+    cursor: str = Query(None),
+    with_total: bool = Query(True),
     db: Session = Depends(get_db), 
     payload = Depends(Authentication())
 ):
@@ -99,37 +96,35 @@ def read_educations(
     """
     user_id_active = payload.get("uid", None)
     education_service = EducationService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
 
     user_id_filter = user_id_active
     
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.education_other.value, name=RoleAuthorityName.create.value)
-    if role_authority:
+    if has_permission(db, payload, RoleAuthorityFeature.education_other, RoleAuthorityName.create):
         user_id_filter = None
 
     custom_filters = {filter_by_column: filter_value} if filter_by_column and filter_value else None
 
-    educations = education_service.education_repository.read_educations(
-        offset=offset, 
-        size=size, 
-        sort_by=sort_by, 
-        sort_order=sort_order, 
-        custom_filters=custom_filters,
-        is_active=is_active,
-        user_id=user_id_filter,
-    )
+    try:
+        educations = education_service.education_repository.read_educations(
+            offset=offset, 
+            size=size, 
+            cursor=cursor,
+            with_total=with_total,
+            sort_by=sort_by, 
+            sort_order=sort_order, 
+            custom_filters=custom_filters,
+            is_active=is_active,
+            user_id=user_id_filter,
+        )
+    except ValueError as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
 
     if not educations:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Data not found")
     
-    count = education_service.education_repository.count_educations(
-        custom_filters=custom_filters,
-        is_active=is_active,
-        user_id=user_id_filter,
-    )
+    count = educations.total
     total_pages = get_total_pages(size, count)
+    next_cursor = get_next_cursor(educations, size, sort_by, Education) if cursor is not None else None
     
 
     datas = []
@@ -143,10 +138,10 @@ def read_educations(
             'school': school,
             'title': education.title,
             'is_active': education.is_active,
-            'started_at': str(education.started_at),
-            'finished_at': str(education.finished_at) if education.finished_at else None,
-            'created_at': str(education.created_at),
-            'updated_at': str(education.updated_at),
+            'started_at': education.started_at,
+            'finished_at': education.finished_at,
+            'created_at': education.created_at,
+            'updated_at': education.updated_at,
         })
 
     status_code = status.HTTP_200_OK
@@ -158,10 +153,11 @@ def read_educations(
             "size": size,
             "total": count,
             "total_pages": total_pages,
-            "offset": offset
+            "offset": offset,
+            "next_cursor": next_cursor
         },
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.get("/{education_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
@@ -180,14 +176,10 @@ def read_education(
     """
     user_id_active = payload.get("uid", None)
     education_service = EducationService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
 
     user_id_filter = user_id_active
     
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.education_other.value, name=RoleAuthorityName.view.value)
-    if role_authority:
+    if has_permission(db, payload, RoleAuthorityFeature.education_other, RoleAuthorityName.view):
         user_id_filter = None
 
     education = education_service.education_repository.read_education(education_id)
@@ -212,17 +204,17 @@ def read_education(
             'school': school,
             'title': education.title,
             'is_active': education.is_active,
-            'started_at': str(education.started_at),
-            'finished_at': str(education.finished_at) if education.finished_at else None,
-            'created_at': str(education.created_at),
-            'updated_at': str(education.updated_at),
+            'started_at': education.started_at,
+            'finished_at': education.finished_at,
+            'created_at': education.created_at,
+            'updated_at': education.updated_at,
         },
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.patch("/{education_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
-async def update_education(
+def update_education(
     education_id: str,
     school_id: str = Form(..., min_length=1, max_length=36),
     title: str = Form(None, min_length=0, max_length=128),
@@ -230,7 +222,7 @@ async def update_education(
     finished_at: date = Form(None),
     is_active: bool = Form(default=True),
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.education, RoleAuthorityName.edit))
 ):
     """
         Update Education
@@ -246,17 +238,9 @@ async def update_education(
     # service
     school_service = SchoolService(db)
     education_service = EducationService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
-    
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.education.value, name=RoleAuthorityName.edit.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to edit")
     
     user_id_filter = user_id_active
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.education_other.value, name=RoleAuthorityName.edit.value)
-    if role_authority:
+    if has_permission(db, payload, RoleAuthorityFeature.education_other, RoleAuthorityName.edit):
         user_id_filter = None
     
     # validation
@@ -298,15 +282,15 @@ async def update_education(
         status="OK",
         data=data,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 
 @router.delete("/{education_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
-async def delete_education(
+def delete_education(
     education_id: str,
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.education, RoleAuthorityName.delete))
 ):
     """
         Delete Education
@@ -321,21 +305,13 @@ async def delete_education(
 
     # service
     education_service = EducationService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
-    
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.education.value, name=RoleAuthorityName.delete.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to delete")
     
     exist_education = education_service.education_repository.read_education(education_id)
     if not exist_education:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Education not found")
     
     user_id_filter = user_id_active
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.education_other.value, name=RoleAuthorityName.delete.value)
-    if role_authority:
+    if has_permission(db, payload, RoleAuthorityFeature.education_other, RoleAuthorityName.delete):
         user_id_filter = None
     
     if user_id_filter is not None and exist_education.user_id != user_id_filter:
@@ -356,11 +332,11 @@ async def delete_education(
         status="OK",
         data=data,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.get("-resource", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
-async def read_education_resource(
+def read_education_resource(
     db: Session = Depends(get_db), 
     payload = Depends(Authentication())
 ):
@@ -387,5 +363,5 @@ async def read_education_resource(
         status="OK",
         data=role_authority_list,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
\ No newline at end of file
@@ -1,21 +1,19 @@
 from fastapi import APIRouter, Depends, Form, status, HTTPException
-from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models import LanguageOption
-from app.models.response import GeneralDataResponse
+from app.models.response import GeneralDataResponse, json_response
 from app.models.role.role_authority import RoleAuthorityFeature, RoleAuthorityName
 from app.models.education.education_translation import EducationTranslation
 from app.services.education.education_service import EducationService
-from app.services.role.role_authority_service import RoleAuthorityService
 from app.services.education.education_translation_service import EducationTranslationService
-from app.services.user_service import UserService
 from app.utils.authentication import Authentication
+from app.utils.permission import has_permission, require
 
 router = APIRouter()
 
 @router.post("", response_model=GeneralDataResponse, status_code=status.HTTP_201_CREATED)
-async def create_education_translation(
+def create_education_translation(
     education_id: str = Form(..., min_length=1, max_length=36),
     language_id: LanguageOption = Form(...),
     title: str = Form(..., min_length=1, max_length=128),
@@ -23,7 +21,7 @@ async def create_education_translation(
     field_of_study: str = Form(..., min_length=1, max_length=128),
     description: str = Form(None, min_length=0, max_length=512),
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.education, RoleAuthorityName.create))
 ):
     """
         Create Education Translation
@@ -36,17 +34,9 @@ async def create_education_translation(
     # service
     education_translation_service = EducationTranslationService(db)
     education_service = EducationService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
     
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.education.value, name=RoleAuthorityName.create.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to create")
-
     user_id_filter = user_id_active
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.education_other.value, name=RoleAuthorityName.create.value)
-    if role_authority:
+    if has_permission(db, payload, RoleAuthorityFeature.education_other, RoleAuthorityName.create):
         user_id_filter = None
 
     language_id = language_id.value
@@ -88,7 +78,7 @@ async def create_education_translation(
         status="OK",
         data=result,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.get("/{education_id}/{language_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
@@ -105,14 +95,10 @@ def read_education_translation(
     """
     user_id_active = payload.get("uid", None)
     education_translation_service = EducationTranslationService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
 
     user_id_filter = user_id_active
     
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.education_other.value, name=RoleAuthorityName.view.value)
-    if role_authority:
+    if has_permission(db, payload, RoleAuthorityFeature.education_other, RoleAuthorityName.view):
         user_id_filter = None
 
     education_translation = education_translation_service.education_translation_repository.get_education_translation_by_education_id_and_language_id(education_id=education_id, language_id=language_id.value)
@@ -134,15 +120,15 @@ def read_education_translation(
             'field_of_study': education_translation.field_of_study,
             'description': education_translation.description,
             'language_id': education_translation.language_id,
-            'created_at': str(education_translation.created_at),
-            'updated_at': str(education_translation.updated_at),
+            'created_at': education_translation.created_at,
+            'updated_at': education_translation.updated_at,
         },
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.patch("/{education_id}/{language_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
-async def update_education_translation(
+def update_education_translation(
     education_id: str,
     language_id: LanguageOption,
     title: str = Form(None, min_length=1, max_length=128),
@@ -150,7 +136,7 @@ async def update_education_translation(
     field_of_study: str = Form(None, min_length=1, max_length=128),
     description: str = Form(None, min_length=0, max_length=512),
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.education, RoleAuthorityName.edit))
 ):
     """
         Update Education Translation
@@ -162,17 +148,9 @@ async def update_education_translation(
 
     # service
     education_translation_service = EducationTranslationService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
-    
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.education.value, name=RoleAuthorityName.edit.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to edit")
     
     user_id_filter = user_id_active
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.education_other.value, name=RoleAuthorityName.edit.value)
-    if role_authority:
+    if has_permission(db, payload, RoleAuthorityFeature.education_other, RoleAuthorityName.edit):
         user_id_filter = None
 
     # validation
@@ -212,16 +190,16 @@ async def update_education_translation(
         status="OK",
         data=data,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 
 @router.delete("/{education_id}/{language_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
-async def delete_education_translation(
+def delete_education_translation(
     education_id: str,
     language_id: LanguageOption,
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.education, RoleAuthorityName.delete))
 ):
     """
         Delete EducationTranslation
@@ -233,21 +211,13 @@ async def delete_education_translation(
 
     # service
     education_translation_service = EducationTranslationService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
     
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.education.value, name=RoleAuthorityName.delete.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to delete")
-
     exist_education_translation = education_translation_service.education_translation_repository.get_education_translation_by_education_id_and_language_id(education_id, language_id)
     if not exist_education_translation:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Education not found")
 
     user_id_filter = user_id_active
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.education_other.value, name=RoleAuthorityName.delete.value)
-    if role_authority:
+    if has_permission(db, payload, RoleAuthorityFeature.education_other, RoleAuthorityName.delete):
         user_id_filter = None
 
     if user_id_filter is not None and exist_education_translation.education.user_id != user_id_filter:
@@ -269,5 +239,5 @@ async def delete_education_translation(
         status="OK",
         data=data,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
\ No newline at end of file
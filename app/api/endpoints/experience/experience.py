@@ -1,9 +1,8 @@
 from datetime import date
 from fastapi import APIRouter, Depends, Form, Query, status, HTTPException
-from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from app.database import get_db
-from app.models.response import GeneralDataPaginateResponse, GeneralDataResponse
+from app.models.response import GeneralDataPaginateResponse, GeneralDataResponse, json_response
 from app.models.role.role_authority import RoleAuthorityFeature, RoleAuthorityName
 from app.models.experience.experience import Experience
 from app.services.role.role_authority_service import RoleAuthorityService
@@ -12,17 +11,19 @@ from app.services.company.company_service import CompanyService
 from app.services.user_service import UserService
 from app.utils.authentication import Authentication
 from app.utils.manual import get_total_pages
+from app.utils.pagination import get_next_cursor
+from app.utils.permission import has_permission, require
 
 router = APIRouter()
 
 @router.post("", response_model=GeneralDataResponse, status_code=status.HTTP_201_CREATED)
-async def create_experience(
+def create_experience(
     company_id: str = Form(..., min_length=1, max_length=36),
     title: str = Form(..., min_length=1, max_length=128),
     started_at: date = Form(...),
     finished_at: date = Form(None),
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.experience, RoleAuthorityName.create))
 ):
     """
         Create Experience
@@ -35,13 +36,7 @@ async def create_experience(
     # service
     company_service = CompanyService(db)
     experience_service = ExperienceService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
     
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.experience.value, name=RoleAuthorityName.create.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to create")
 
     # validation
     exist_company = company_service.company_repository.read_company(company_id)
@@ -74,7 +69,7 @@ async def create_experience(
         status="OK",
         data=result,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.get("", response_model=GeneralDataPaginateResponse, status_code=status.HTTP_200_OK)
@@ -86,6 +81,8 @@ def read_experiences(
     is_active: bool = Query(None),
     offset: int = Query(None, ge=1), 
     size: int = Query(None, ge=1),
+    cursor: str = Query(None),
+    with_total: bool = Query(True),
     db: Session = Depends(get_db), 
     payload = Depends(Authentication())
 ):
@@ -100,37 +97,35 @@ def read_experiences(
     user_id_active = payload.get("uid", None)
     experience_service = ExperienceService(db)
 
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
 
     user_id_filter = user_id_active
     
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.experience_other.value, name=RoleAuthorityName.create.value)
-    if role_authority:
+    if has_permission(db, payload, RoleAuthorityFeature.experience_other, RoleAuthorityName.create):
         user_id_filter = None
 
     custom_filters = {filter_by_column: filter_value} if filter_by_column and filter_value else None
 
-    experiences = experience_service.experience_repository.read_experiences(
-        offset=offset, 
-        size=size, 
-        sort_by=sort_by, 
-        sort_order=sort_order, 
-        custom_filters=custom_filters,
-        is_active=is_active,
-        user_id=user_id_filter,
-    )
+    try:
+        experiences = experience_service.experience_repository.read_experiences(
+            offset=offset, 
+            size=size, 
+            cursor=cursor,
+            with_total=with_total,
+            sort_by=sort_by, 
+            sort_order=sort_order, 
+            custom_filters=custom_filters,
+            is_active=is_active,
+            user_id=user_id_filter,
+        )
+    except ValueError as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
 
     if not experiences:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Data not found")
     
-    count = experience_service.experience_repository.count_experiences(
-        custom_filters=custom_filters,
-        is_active=is_active,
-        user_id=user_id_filter,
-    )
+    count = experiences.total
     total_pages = get_total_pages(size, count)
+    next_cursor = get_next_cursor(experiences, size, sort_by, Experience) if cursor is not None else None
     
 
     datas = []
@@ -144,10 +139,10 @@ def read_experiences(
             'company': company,
             'title': experience.title,
             'is_active': experience.is_active,
-            'started_at': str(experience.started_at),
-            'finished_at': str(experience.finished_at) if experience.finished_at else None,
-            'created_at': str(experience.created_at),
-            'updated_at': str(experience.updated_at),
+            'started_at': experience.started_at,
+            'finished_at': experience.finished_at,
+            'created_at': experience.created_at,
+            'updated_at': experience.updated_at,
         })
 
     status_code = status.HTTP_200_OK
@@ -159,10 +154,11 @@ def read_experiences(
             "size": size,
             "total": count,
             "total_pages": total_pages,
-            "offset": offset
+            "offset": offset,
+            "next_cursor": next_cursor
         },
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.get("/{experience_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
@@ -181,14 +177,10 @@ def read_experience(
     """
     user_id_active = payload.get("uid", None)
     experience_service = ExperienceService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
 
     user_id_filter = user_id_active
     
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.experience_other.value, name=RoleAuthorityName.view.value)
-    if role_authority:
+    if has_permission(db, payload, RoleAuthorityFeature.experience_other, RoleAuthorityName.view):
         user_id_filter = None
 
     experience = experience_service.experience_repository.read_experience(experience_id)
@@ -213,17 +205,17 @@ def read_experience(
             'company': company,
             'title': experience.title,
             'is_active': experience.is_active,
-            'started_at': str(experience.started_at),
-            'finished_at': str(experience.finished_at) if experience.finished_at else None,
-            'created_at': str(experience.created_at),
-            'updated_at': str(experience.updated_at),
+            'started_at': experience.started_at,
+            'finished_at': experience.finished_at,
+            'created_at': experience.created_at,
+            'updated_at': experience.updated_at,
         },
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.patch("/{experience_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
-async def update_experience(
+def update_experience(
     experience_id: str,
     company_id: str = Form(..., min_length=1, max_length=36),
     title: str = Form(None, min_length=0, max_length=128),
@@ -231,7 +223,7 @@ async def update_experience(
     finished_at: date = Form(None),
     is_active: bool = Form(default=True),
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.experience, RoleAuthorityName.edit))
 ):
     """
         Update Experience
@@ -247,17 +239,9 @@ async def update_experience(
     # service
     company_service = CompanyService(db)
     experience_service = ExperienceService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
-    
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.experience.value, name=RoleAuthorityName.edit.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to edit")
     
     user_id_filter = user_id_active
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.experience_other.value, name=RoleAuthorityName.edit.value)
-    if role_authority:
+    if has_permission(db, payload, RoleAuthorityFeature.experience_other, RoleAuthorityName.edit):
         user_id_filter = None
 
     # validation
@@ -299,15 +283,15 @@ async def update_experience(
         status="OK",
         data=data,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 
 @router.delete("/{experience_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
-async def delete_experience(
+def delete_experience(
     experience_id: str,
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.experience, RoleAuthorityName.delete))
 ):
     """
         Delete Experience
@@ -322,21 +306,13 @@ async def delete_experience(
 
     # service
     experience_service = ExperienceService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
-    
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.experience.value, name=RoleAuthorityName.delete.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to delete")
     
     exist_experience = experience_service.experience_repository.read_experience(experience_id)
     if not exist_experience:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Experience not found")
 
     user_id_filter = user_id_active
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.experience_other.value, name=RoleAuthorityName.delete.value)
-    if role_authority:
+    if has_permission(db, payload, RoleAuthorityFeature.experience_other, RoleAuthorityName.delete):
         user_id_filter = None
     
     if user_id_filter is not None and exist_experience.user_id != user_id_filter:
@@ -357,11 +333,11 @@ async def delete_experience(
         status="OK",
         data=data,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.get("-resource", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
-async def read_experience_resource(
+def read_experience_resource(
     db: Session = Depends(get_db), 
     payload = Depends(Authentication())
 ):
@@ -388,5 +364,5 @@ async def read_experience_resource(
         status="OK",
         data=role_authority_list,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
\ No newline at end of file
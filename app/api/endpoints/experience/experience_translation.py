@@ -1,21 +1,19 @@
 from fastapi import APIRouter, Depends, Form, status, HTTPException
-from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models import LanguageOption
-from app.models.response import GeneralDataResponse
+from app.models.response import GeneralDataResponse, json_response
 from app.models.role.role_authority import RoleAuthorityFeature, RoleAuthorityName
 from app.models.experience.experience_translation import ExperienceTranslation
 from app.services.experience.experience_service import ExperienceService
-from app.services.role.role_authority_service import RoleAuthorityService
 from app.services.experience.experience_translation_service import ExperienceTranslationService
-from app.services.user_service import UserService
 from app.utils.authentication import Authentication
+from app.utils.permission import has_permission, require
 
 router = APIRouter()
 
 @router.post("", response_model=GeneralDataResponse, status_code=status.HTTP_201_CREATED)
-async def create_experience_translation(
+def create_experience_translation(
     experience_id: str = Form(..., min_length=1, max_length=36),
     language_id: LanguageOption = Form(...),
     title: str = Form(..., min_length=1, max_length=128),
@@ -24,7 +22,7 @@ async def create_experience_translation(
     location_type: str = Form(..., min_length=1, max_length=128),
     description: str = Form(None, min_length=0, max_length=512),
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.experience, RoleAuthorityName.create))
 ):
     """
         Create Experience Translation
@@ -37,17 +35,9 @@ async def create_experience_translation(
     # service
     experience_translation_service = ExperienceTranslationService(db)
     experience_service = ExperienceService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
-    
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.experience.value, name=RoleAuthorityName.create.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to create")
     
     user_id_filter = user_id_active
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.experience_other.value, name=RoleAuthorityName.create.value)
-    if role_authority:
+    if has_permission(db, payload, RoleAuthorityFeature.experience_other, RoleAuthorityName.create):
         user_id_filter = None
 
     language_id = language_id.value
@@ -90,7 +80,7 @@ async def create_experience_translation(
         status="OK",
         data=result,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.get("/{experience_id}/{language_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
@@ -107,14 +97,10 @@ def read_experience_translation(
     """
     user_id_active = payload.get("uid", None)
     experience_translation_service = ExperienceTranslationService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
 
     user_id_filter = user_id_active
 
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.experience_other.value, name=RoleAuthorityName.view.value)
-    if role_authority:
+    if has_permission(db, payload, RoleAuthorityFeature.experience_other, RoleAuthorityName.view):
         user_id_filter = None
 
     experience_translation = experience_translation_service.experience_translation_repository.get_experience_translation_by_experience_id_and_language_id(experience_id=experience_id, language_id=language_id.value)
@@ -137,15 +123,15 @@ def read_experience_translation(
             'location_type': experience_translation.location_type,
             'description': experience_translation.description,
             'language_id': experience_translation.language_id,
-            'created_at': str(experience_translation.created_at),
-            'updated_at': str(experience_translation.updated_at),
+            'created_at': experience_translation.created_at,
+            'updated_at': experience_translation.updated_at,
         },
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.patch("/{experience_id}/{language_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
-async def update_experience_translation(
+def update_experience_translation(
     experience_id: str,
     language_id: LanguageOption,
     title: str = Form(None, min_length=1, max_length=128),
@@ -154,7 +140,7 @@ async def update_experience_translation(
     location_type: str = Form(None, min_length=1, max_length=128),
     description: str = Form(None, min_length=0, max_length=512),
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.experience, RoleAuthorityName.edit))
 ):
     """
         Update Experience Translation
@@ -166,17 +152,9 @@ async def update_experience_translation(
 
     # service
     experience_translation_service = ExperienceTranslationService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
-    
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.experience.value, name=RoleAuthorityName.edit.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to edit")
     
     user_id_filter = user_id_active
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.experience_other.value, name=RoleAuthorityName.edit.value)
-    if role_authority:
+    if has_permission(db, payload, RoleAuthorityFeature.experience_other, RoleAuthorityName.edit):
         user_id_filter = None
 
     # validation
@@ -216,16 +194,16 @@ async def update_experience_translation(
         status="OK",
         data=data,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 
 @router.delete("/{experience_id}/{language_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
-async def delete_experience_translation(
+def delete_experience_translation(
     experience_id: str,
     language_id: LanguageOption,
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.experience, RoleAuthorityName.delete))
 ):
     """
         Delete ExperienceTranslation
@@ -237,21 +215,13 @@ async def delete_experience_translation(
 
     # service
     experience_translation_service = ExperienceTranslationService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
     
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.experience.value, name=RoleAuthorityName.delete.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to delete")
-
     exist_experience_translation = experience_translation_service.experience_translation_repository.get_experience_translation_by_experience_id_and_language_id(experience_id, language_id)
     if not exist_experience_translation:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Experience not found")
 
     user_id_filter = user_id_active
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.experience_other.value, name=RoleAuthorityName.delete.value)
-    if role_authority:
+    if has_permission(db, payload, RoleAuthorityFeature.experience_other, RoleAuthorityName.delete):
         user_id_filter = None
 
     if user_id_filter is not None and exist_experience_translation.experience.user_id != user_id_filter:
@@ -273,5 +243,5 @@ async def delete_experience_translation(
         status="OK",
         data=data,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
\ No newline at end of file
@@ -1,9 +1,8 @@
 from datetime import date
 from fastapi import APIRouter, Depends, Form, Query, UploadFile, status, HTTPException
-from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from app.database import get_db
-from app.models.response import GeneralDataPaginateResponse, GeneralDataResponse
+from app.models.response import GeneralDataPaginateResponse, GeneralDataResponse, json_response
 from app.models.role.role_authority import RoleAuthorityFeature, RoleAuthorityName
 from app.models.project.project import Project
 from app.services.role.role_authority_service import RoleAuthorityService
@@ -12,17 +11,20 @@ from app.services.user_service import UserService
 from app.utils.authentication import Authentication
 from app.utils.handling_file import validation_file
 from app.utils.manual import get_total_pages
+from app.utils.pagination import get_next_cursor
+from app.utils.permission import has_permission, require
+from app.utils.storage import get_file_url
 
 router = APIRouter()
 
 @router.post("", response_model=GeneralDataResponse, status_code=status.HTTP_201_CREATED)
-async def create_project(
+def create_project(
     title: str = Form(..., min_length=1, max_length=128),
     slug: str = Form(..., min_length=1, max_length=256),
     image: UploadFile = None,
     logo: UploadFile = None,
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.project, RoleAuthorityName.create))
 ):
     """
         Create Project
@@ -34,24 +36,17 @@ async def create_project(
 
     # service
     project_service = ProjectService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
-    
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.project.value, name=RoleAuthorityName.create.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to create")
-    
+
     exist_slug = project_service.project_repository.get_project_by_slug(slug)
     if exist_slug and exist_slug.user_id == user_id_active:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Slug already exist")
 
     try:
         if (image):
-            await validation_file(file=image)
+            validation_file(file=image)
         
         if (logo):
-            await validation_file(file=logo)
+            validation_file(file=logo)
 
         content_type_image = image.content_type if image else ""
         file_extension_image = content_type_image.split('/')[1] if image else ""
@@ -65,15 +60,12 @@ async def create_project(
             slug=slug,
         )
 
-        file_name = f"{user_active.username}-{title}"
-
         data = project_service.create_project(
             project=project_model,
             image=image,
             logo=logo,
             file_extension_image=file_extension_image,
             file_extension_logo=file_extension_logo,
-            file_name=file_name
         )
     except ValueError as error:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
@@ -89,7 +81,7 @@ async def create_project(
         status="OK",
         data=result,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.get("", response_model=GeneralDataPaginateResponse, status_code=status.HTTP_200_OK)
@@ -101,6 +93,8 @@ def read_projects(
     is_active: bool = Query(None),
     offset: int = Query(None, ge=1), 
     size: int = Query(None, ge=1),
+    cursor: str = Query(None),
+    with_total: bool = Query(True),
     db: Session = Depends(get_db), 
     payload = Depends(Authentication())
 ):
@@ -115,38 +109,36 @@ def read_projects(
     user_id_active = payload.get("uid", None)
     project_service = ProjectService(db)
 
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
 
     user_id_filter = user_id_active
     
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.project_other.value, name=RoleAuthorityName.create.value)
-    if role_authority:
+    if has_permission(db, payload, RoleAuthorityFeature.project_other, RoleAuthorityName.create):
         user_id_filter = None
 
     
     custom_filters = {filter_by_column: filter_value} if filter_by_column and filter_value else None
 
-    projects = project_service.project_repository.read_projects(
-        offset=offset, 
-        size=size, 
-        sort_by=sort_by, 
-        sort_order=sort_order, 
-        custom_filters=custom_filters,
-        is_active=is_active,
-        user_id=user_id_filter,
-    )
+    try:
+        projects = project_service.project_repository.read_projects(
+            offset=offset, 
+            size=size, 
+            cursor=cursor,
+            with_total=with_total,
+            sort_by=sort_by, 
+            sort_order=sort_order, 
+            custom_filters=custom_filters,
+            is_active=is_active,
+            user_id=user_id_filter,
+        )
+    except ValueError as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
 
     if not projects:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Data not found")
     
-    count = project_service.project_repository.count_projects(
-        custom_filters=custom_filters,
-        is_active=is_active,
-        user_id=user_id_filter,
-    )
+    count = projects.total
     total_pages = get_total_pages(size, count)
+    next_cursor = get_next_cursor(projects, size, sort_by, Project) if cursor is not None else None
     
 
     datas = []
@@ -156,10 +148,10 @@ def read_projects(
             'title': project.title,
             'is_active': project.is_active,
             'slug': project.slug,
-            'created_at': str(project.created_at),
-            'updated_at': str(project.updated_at),
-            'image_url': f"{project_service.static_folder_image}/{project.image_url}" if project.image_url else None,
-            'logo_url': f"{project_service.static_folder_logo}/{project.logo_url}" if project.logo_url else None,
+            'created_at': project.created_at,
+            'updated_at': project.updated_at,
+            'image_url': get_file_url(project_service.static_folder_image, project.image_url),
+            'logo_url': get_file_url(project_service.static_folder_logo, project.logo_url),
         })
 
     status_code = status.HTTP_200_OK
@@ -171,10 +163,11 @@ def read_projects(
             "size": size,
             "total": count,
             "total_pages": total_pages,
-            "offset": offset
+            "offset": offset,
+            "next_cursor": next_cursor
         },
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.get("/{project_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
@@ -194,14 +187,10 @@ def read_project(
     user_id_active = payload.get("uid", None)
     project_service = ProjectService(db)
 
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
 
     user_id_filter = user_id_active
     
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.project_other.value, name=RoleAuthorityName.view.value)
-    if role_authority:
+    if has_permission(db, payload, RoleAuthorityFeature.project_other, RoleAuthorityName.view):
         user_id_filter = None
 
     
@@ -222,17 +211,17 @@ def read_project(
             'title': project.title,
             'slug': project.slug,
             'is_active': project.is_active,
-            'created_at': str(project.created_at),
-            'updated_at': str(project.updated_at),
-            'image_url': f"{project_service.static_folder_image}/{project.image_url}" if project.image_url else None,
-            'logo_url': f"{project_service.static_folder_logo}/{project.logo_url}" if project.logo_url else None,
+            'created_at': project.created_at,
+            'updated_at': project.updated_at,
+            'image_url': get_file_url(project_service.static_folder_image, project.image_url),
+            'logo_url': get_file_url(project_service.static_folder_logo, project.logo_url),
         },
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.patch("/{project_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
-async def update_project(
+def update_project(
     project_id: str,
     title: str = Form(None, min_length=0, max_length=128),
     slug: str = Form(None, min_length=0, max_length=256),
@@ -240,7 +229,7 @@ async def update_project(
     logo: UploadFile = None,
     is_active: bool = Form(default=True),
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.project, RoleAuthorityName.edit))
 ):
     """
         Update Project
@@ -255,17 +244,9 @@ async def update_project(
 
     # service
     project_service = ProjectService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
-    
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.project.value, name=RoleAuthorityName.edit.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to edit")
-    
+
     user_id_filter = user_id_active
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.project_other.value, name=RoleAuthorityName.edit.value)
-    if role_authority:
+    if has_permission(db, payload, RoleAuthorityFeature.project_other, RoleAuthorityName.edit):
         user_id_filter = None
 
     # validation
@@ -278,10 +259,10 @@ async def update_project(
 
     try:
         if (image):
-            await validation_file(file=image)
+            validation_file(file=image)
         
         if (logo):
-            await validation_file(file=logo)
+            validation_file(file=logo)
 
         content_type_image = image.content_type if image else ""
         file_extension_image = content_type_image.split('/')[1] if image else ""
@@ -296,8 +277,6 @@ async def update_project(
             slug=slug,
         )
 
-        file_name = f"{user_active.username}-{title}"
-
         data = project_service.update_project(
             exist_project=exist_project,
             project=project_model,
@@ -305,7 +284,6 @@ async def update_project(
             logo=logo,
             file_extension_image=file_extension_image,
             file_extension_logo=file_extension_logo,
-            file_name=file_name
         )
     except ValueError as error:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
@@ -320,15 +298,15 @@ async def update_project(
         status="OK",
         data=data,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 
 @router.delete("/{project_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
-async def delete_project(
+def delete_project(
     project_id: str,
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.project, RoleAuthorityName.delete))
 ):
     """
         Delete Project
@@ -343,21 +321,13 @@ async def delete_project(
 
     # service
     project_service = ProjectService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
-    
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.project.value, name=RoleAuthorityName.delete.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to delete")
     
     exist_project = project_service.project_repository.read_project(project_id)
     if not exist_project:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
 
     user_id_filter = user_id_active
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.project_other.value, name=RoleAuthorityName.delete.value)
-    if role_authority:
+    if has_permission(db, payload, RoleAuthorityFeature.project_other, RoleAuthorityName.delete):
         user_id_filter = None
     
     if user_id_filter is not None and exist_project.user_id != user_id_filter:
@@ -378,11 +348,11 @@ async def delete_project(
         status="OK",
         data=data,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.get("-resource", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
-async def read_project_resource(
+def read_project_resource(
     db: Session = Depends(get_db), 
     payload = Depends(Authentication())
 ):
@@ -409,5 +379,5 @@ async def read_project_resource(
         status="OK",
         data=role_authority_list,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
\ No newline at end of file
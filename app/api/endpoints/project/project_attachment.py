@@ -1,23 +1,23 @@
 from datetime import date
 from fastapi import APIRouter, Depends, Form, Query, UploadFile, status, HTTPException
-from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from app.database import get_db
-from app.models.response import GeneralDataPaginateResponse, GeneralDataResponse
+from app.models.response import GeneralDataPaginateResponse, GeneralDataResponse, json_response
 from app.models.role.role_authority import RoleAuthorityFeature, RoleAuthorityName
 from app.models.project.project_attachment import ProjectAttachment
-from app.services.role.role_authority_service import RoleAuthorityService
 from app.services.project.project_attachment_service import ProjectAttachmentService
 from app.services.project.project_service import ProjectService
-from app.services.user_service import UserService
 from app.utils.authentication import Authentication
 from app.utils.handling_file import validation_file
 from app.utils.manual import get_total_pages
+from app.utils.pagination import get_next_cursor
+from app.utils.permission import has_permission, require
+from app.utils.storage import get_file_url
 
 router = APIRouter()
 
 @router.post("", response_model=GeneralDataResponse, status_code=status.HTTP_201_CREATED)
-async def create_project_attachment(
+def create_project_attachment(
     project_id: str = Form(..., min_length=1, max_length=36),
     title: str = Form(..., min_length=1, max_length=128),
     description: str = Form(None, min_length=0, max_length=512),
@@ -25,7 +25,7 @@ async def create_project_attachment(
     category: str = Form(..., min_length=1, max_length=512),
     image: UploadFile = None,
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.project, RoleAuthorityName.create))
 ):
     """
         Create ProjectAttachment
@@ -38,17 +38,10 @@ async def create_project_attachment(
     # service
     project_service = ProjectService(db)
     project_attachment_service = ProjectAttachmentService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
     
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.project.value, name=RoleAuthorityName.create.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to create")
 
     user_id_filter = user_id_active
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.project_other.value, name=RoleAuthorityName.create.value)
-    if role_authority:
+    if has_permission(db, payload, RoleAuthorityFeature.project_other, RoleAuthorityName.create):
         user_id_filter = None
 
     # validation
@@ -61,7 +54,7 @@ async def create_project_attachment(
 
     try:
         if (image):
-            await validation_file(file=image)
+            validation_file(file=image)
 
         content_type_image = image.content_type if image else ""
         file_extension_image = content_type_image.split('/')[1] if image else ""
@@ -94,7 +87,7 @@ async def create_project_attachment(
         status="OK",
         data=result,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.get("", response_model=GeneralDataPaginateResponse, status_code=status.HTTP_200_OK)
@@ -107,6 +100,8 @@ def read_project_attachments(
     is_active: bool = Query(None),
     offset: int = Query(None, ge=1), 
     size: int = Query(None, ge=1),
+    cursor: str = Query(None),
+    with_total: bool = Query(True),
     db: Session = Depends(get_db), 
     payload = Depends(Authentication())
 ):
@@ -120,25 +115,27 @@ def read_project_attachments(
     
     custom_filters = {filter_by_column: filter_value} if filter_by_column and filter_value else None
 
-    project_attachments = project_attachment_service.project_attachment_repository.read_project_attachments(
-        offset=offset, 
-        size=size, 
-        sort_by=sort_by, 
-        sort_order=sort_order, 
-        custom_filters=custom_filters,
-        is_active=is_active,
-        project_id=project_id
-    )
+    try:
+        project_attachments = project_attachment_service.project_attachment_repository.read_project_attachments(
+            offset=offset, 
+            size=size, 
+            cursor=cursor,
+            with_total=with_total,
+            sort_by=sort_by, 
+            sort_order=sort_order, 
+            custom_filters=custom_filters,
+            is_active=is_active,
+            project_id=project_id
+        )
+    except ValueError as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
 
     if not project_attachments:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Data not found")
     
-    count = project_attachment_service.project_attachment_repository.count_project_attachments(
-        custom_filters=custom_filters,
-        is_active=is_active,
-        project_id=project_id
-    )
+    count = project_attachments.total
     total_pages = get_total_pages(size, count)
+    next_cursor = get_next_cursor(project_attachments, size, sort_by, ProjectAttachment) if cursor is not None else None
     
 
     datas = []
@@ -150,9 +147,9 @@ def read_project_attachments(
             'description': project_attachment.description if project_attachment.description else None,
             'website_url': project_attachment.website_url if project_attachment.website_url else None,
             'category': project_attachment.category,
-            'created_at': str(project_attachment.created_at),
-            'updated_at': str(project_attachment.updated_at),
-            'image_url': f"{project_attachment_service.static_folder_image}/{project_attachment.image_url}" if project_attachment.image_url else None,
+            'created_at': project_attachment.created_at,
+            'updated_at': project_attachment.updated_at,
+            'image_url': get_file_url(project_attachment_service.static_folder_image, project_attachment.image_url),
         })
 
     status_code = status.HTTP_200_OK
@@ -164,10 +161,11 @@ def read_project_attachments(
             "size": size,
             "total": count,
             "total_pages": total_pages,
-            "offset": offset
+            "offset": offset,
+            "next_cursor": next_cursor
         },
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.get("/{project_attachment_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
@@ -187,14 +185,10 @@ def read_project_attachment(
     user_id_active = payload.get("uid", None)
     project_attachment_service = ProjectAttachmentService(db)
 
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
 
     user_id_filter = user_id_active
     
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.project.value, name=RoleAuthorityName.view.value)
-    if role_authority:
+    if has_permission(db, payload, RoleAuthorityFeature.project, RoleAuthorityName.view):
         user_id_filter = None
 
     
@@ -217,16 +211,16 @@ def read_project_attachment(
             'description': project_attachment.description if project_attachment.description else None,
             'website_url': project_attachment.website_url if project_attachment.website_url else None,
             'category': project_attachment.category,
-            'created_at': str(project_attachment.created_at),
-            'updated_at': str(project_attachment.updated_at),
-            'image_url': f"{project_attachment_service.static_folder_image}/{project_attachment.image_url}" if project_attachment.image_url else None,
+            'created_at': project_attachment.created_at,
+            'updated_at': project_attachment.updated_at,
+            'image_url': get_file_url(project_attachment_service.static_folder_image, project_attachment.image_url),
         },
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.patch("/{project_attachment_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
-async def update_project_attachment(
+def update_project_attachment(
     project_attachment_id: str,
     project_id: str = Form(..., min_length=1, max_length=36),
     title: str = Form(None, min_length=0, max_length=128),
@@ -236,7 +230,7 @@ async def update_project_attachment(
     image: UploadFile = None,
     is_active: bool = Form(default=True),
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.project, RoleAuthorityName.edit))
 ):
     """
         Update ProjectAttachment
@@ -252,17 +246,9 @@ async def update_project_attachment(
     # service
     project_service = ProjectService(db)
     project_attachment_service = ProjectAttachmentService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
-    
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.project.value, name=RoleAuthorityName.edit.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to edit")
     
     user_id_filter = user_id_active
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.project.value, name=RoleAuthorityName.edit.value)
-    if role_authority:
+    if has_permission(db, payload, RoleAuthorityFeature.project, RoleAuthorityName.edit):
         user_id_filter = None
 
     # validation
@@ -279,7 +265,7 @@ async def update_project_attachment(
 
     try:
         if (image):
-            await validation_file(file=image)
+            validation_file(file=image)
 
         content_type_image = image.content_type if image else ""
         file_extension_image = content_type_image.split('/')[1] if image else ""
@@ -314,15 +300,15 @@ async def update_project_attachment(
         status="OK",
         data=data,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 
 @router.delete("/{project_attachment_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
-async def delete_project_attachment(
+def delete_project_attachment(
     project_attachment_id: str,
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.project, RoleAuthorityName.delete))
 ):
     """
         Delete ProjectAttachment
@@ -337,21 +323,13 @@ async def delete_project_attachment(
 
     # service
     project_attachment_service = ProjectAttachmentService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
-    
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.project.value, name=RoleAuthorityName.delete.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to delete")
     
     exist_project_attachment = project_attachment_service.project_attachment_repository.read_project_attachment(project_attachment_id)
     if not exist_project_attachment:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="ProjectAttachment not found")
 
     user_id_filter = user_id_active
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.project.value, name=RoleAuthorityName.delete.value)
-    if role_authority:
+    if has_permission(db, payload, RoleAuthorityFeature.project, RoleAuthorityName.delete):
         user_id_filter = None
     
     if user_id_filter is not None and exist_project_attachment.project.user_id != user_id_filter:
@@ -372,5 +350,5 @@ async def delete_project_attachment(
         status="OK",
         data=data,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
\ No newline at end of file
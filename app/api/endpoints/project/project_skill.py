@@ -1,27 +1,27 @@
 from fastapi import APIRouter, Depends, Form, Query,status, HTTPException
-from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from app.database import get_db
-from app.models.response import GeneralDataPaginateResponse, GeneralDataResponse
+from app.models.response import GeneralDataPaginateResponse, GeneralDataResponse, json_response
 from app.models.role.role_authority import RoleAuthorityFeature, RoleAuthorityName
 from app.models.project.project_skill import ProjectSkill
 from app.services.project.project_service import ProjectService
-from app.services.role.role_authority_service import RoleAuthorityService
 from app.services.project.project_skill_service import ProjectSkillService
 from app.services.skill.skill_service import SkillService
-from app.services.user_service import UserService
 from app.utils.authentication import Authentication
 from app.utils.manual import get_total_pages
+from app.utils.pagination import get_next_cursor
+from app.utils.permission import has_permission, require
+from app.utils.storage import get_file_url
 
 router = APIRouter()
 
 @router.post("", response_model=GeneralDataResponse, status_code=status.HTTP_201_CREATED)
-async def create_project_skill(
+def create_project_skill(
     project_id: str = Form(..., min_length=1, max_length=36),
     skill_id: str = Form(..., min_length=1, max_length=36),
     is_active: bool = Form(default=True),
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.project, RoleAuthorityName.create))
 ):
     """
         Create Project Skill
@@ -35,17 +35,10 @@ async def create_project_skill(
     project_skill_service = ProjectSkillService(db)
     project_service = ProjectService(db)
     skill_service = SkillService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
     
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.project.value, name=RoleAuthorityName.create.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to create")
 
     user_id_filter = user_id_active
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.project_other.value, name=RoleAuthorityName.create.value)
-    if role_authority:
+    if has_permission(db, payload, RoleAuthorityFeature.project_other, RoleAuthorityName.create):
         user_id_filter = None
 
     # validation
@@ -86,7 +79,7 @@ async def create_project_skill(
         status="OK",
         data=result,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.get("", response_model=GeneralDataPaginateResponse, status_code=status.HTTP_200_OK)
@@ -99,6 +92,8 @@ def read_project_skills(
     is_active: bool = Query(None),
     offset: int = Query(None, ge=1), 
     size: int = Query(None, ge=1),
+    cursor: str = Query(None),
+    with_total: bool = Query(True),
     db: Session = Depends(get_db), 
     payload = Depends(Authentication())
 ):
@@ -113,31 +108,33 @@ def read_project_skills(
     
     custom_filters = {filter_by_column: filter_value} if filter_by_column and filter_value else None
 
-    project_skills = project_skill_service.project_skill_repository.read_project_skills(
-        offset=offset, 
-        size=size, 
-        sort_by=sort_by, 
-        sort_order=sort_order, 
-        custom_filters=custom_filters,
-        is_active=is_active,
-        project_id=project_id
-    )
+    try:
+        project_skills = project_skill_service.project_skill_repository.read_project_skills(
+            offset=offset, 
+            size=size, 
+            cursor=cursor,
+            with_total=with_total,
+            sort_by=sort_by, 
+            sort_order=sort_order, 
+            custom_filters=custom_filters,
+            is_active=is_active,
+            project_id=project_id
+        )
+    except ValueError as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
 
     if not project_skills:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Data not found")
     
-    count = project_skill_service.project_skill_repository.count_project_skills(
-        custom_filters=custom_filters,
-        is_active=is_active,
-        project_id=project_id
-    )
+    count = project_skills.total
     total_pages = get_total_pages(size, count)
+    next_cursor = get_next_cursor(project_skills, size, sort_by, ProjectSkill) if cursor is not None else None
     
 
     datas = []
     for project_skill in project_skills:
-        image_url = f"{skill_service.static_folder_image}/{project_skill.skill.image_url}" if project_skill.skill.image_url else None
-        logo_url = f"{skill_service.static_folder_logo}/{project_skill.skill.logo_url}" if project_skill.skill.logo_url else None
+        image_url = get_file_url(skill_service.static_folder_image, project_skill.skill.image_url)
+        logo_url = get_file_url(skill_service.static_folder_logo, project_skill.skill.logo_url)
         skill = {
             'id': project_skill.skill.id,
             'name': project_skill.skill.name,
@@ -154,8 +151,8 @@ def read_project_skills(
             'skill': skill,
             'project': project,
             'is_active': project_skill.is_active,
-            'created_at': str(project_skill.created_at),
-            'updated_at': str(project_skill.updated_at),
+            'created_at': project_skill.created_at,
+            'updated_at': project_skill.updated_at,
         })
 
     status_code = status.HTTP_200_OK
@@ -167,19 +164,20 @@ def read_project_skills(
             "size": size,
             "total": count,
             "total_pages": total_pages,
-            "offset": offset
+            "offset": offset,
+            "next_cursor": next_cursor
         },
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.patch("/{project_id}/{skill_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
-async def update_project_skill(
+def update_project_skill(
     project_id: str,
     skill_id: str,
     is_active: bool = Form(default=True),
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.project, RoleAuthorityName.edit))
 ):
     """
         Update Project Skill
@@ -192,17 +190,9 @@ async def update_project_skill(
     # service
     project_skill_service = ProjectSkillService(db)
     skill_service = SkillService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
-    
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.project.value, name=RoleAuthorityName.edit.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to edit")
     
     user_id_filter = user_id_active
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.project_other.value, name=RoleAuthorityName.edit.value)
-    if role_authority:
+    if has_permission(db, payload, RoleAuthorityFeature.project_other, RoleAuthorityName.edit):
         user_id_filter = None
 
     # validation    
@@ -241,16 +231,16 @@ async def update_project_skill(
         status="OK",
         data=data,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 
 @router.delete("/{project_id}/{skill_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
-async def delete_project_skill(
+def delete_project_skill(
     project_id: str,
     skill_id: str,
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.project, RoleAuthorityName.delete))
 ):
     """
         Delete ProjectSkill
@@ -262,21 +252,14 @@ async def delete_project_skill(
 
     # service
     project_skill_service = ProjectSkillService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
     
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.project.value, name=RoleAuthorityName.delete.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to delete")
 
     exist_project_skill = project_skill_service.project_skill_repository.get_project_skill_by_project_id_and_skill_id(project_id, skill_id)
     if not exist_project_skill:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
 
     user_id_filter = user_id_active
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.project_other.value, name=RoleAuthorityName.delete.value)
-    if role_authority:
+    if has_permission(db, payload, RoleAuthorityFeature.project_other, RoleAuthorityName.delete):
         user_id_filter = None
 
     if user_id_filter is not None and exist_project_skill.project.user_id != user_id_filter:
@@ -298,5 +281,5 @@ async def delete_project_skill(
         status="OK",
         data=data,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
\ No newline at end of file
@@ -1,27 +1,25 @@
 from fastapi import APIRouter, Depends, Form, status, HTTPException
-from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models import LanguageOption
-from app.models.response import GeneralDataResponse
+from app.models.response import GeneralDataResponse, json_response
 from app.models.role.role_authority import RoleAuthorityFeature, RoleAuthorityName
 from app.models.project.project_translation import ProjectTranslation
 from app.services.project.project_service import ProjectService
-from app.services.role.role_authority_service import RoleAuthorityService
 from app.services.project.project_translation_service import ProjectTranslationService
-from app.services.user_service import UserService
 from app.utils.authentication import Authentication
+from app.utils.permission import has_permission, require
 
 router = APIRouter()
 
 @router.post("", response_model=GeneralDataResponse, status_code=status.HTTP_201_CREATED)
-async def create_project_translation(
+def create_project_translation(
     project_id: str = Form(..., min_length=1, max_length=36),
     language_id: LanguageOption = Form(...),
     title: str = Form(..., min_length=1, max_length=128),
     description: str = Form(None, min_length=0, max_length=512),
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.project, RoleAuthorityName.create))
 ):
     """
         Create Project Translation
@@ -34,17 +32,9 @@ async def create_project_translation(
     # service
     project_translation_service = ProjectTranslationService(db)
     project_service = ProjectService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
-    
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.project.value, name=RoleAuthorityName.create.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to create")
     
     user_id_filter = user_id_active
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.project_other.value, name=RoleAuthorityName.create.value)
-    if role_authority:
+    if has_permission(db, payload, RoleAuthorityFeature.project_other, RoleAuthorityName.create):
         user_id_filter = None
 
     language_id = language_id.value
@@ -84,7 +74,7 @@ async def create_project_translation(
         status="OK",
         data=result,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.get("/{project_id}/{language_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
@@ -101,14 +91,10 @@ def read_project_translation(
     """
     user_id_active = payload.get("uid", None)
     project_translation_service = ProjectTranslationService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
 
     user_id_filter = user_id_active
 
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.project_other.value, name=RoleAuthorityName.view.value)
-    if role_authority:
+    if has_permission(db, payload, RoleAuthorityFeature.project_other, RoleAuthorityName.view):
         user_id_filter = None
 
     project_translation = project_translation_service.project_translation_repository.get_project_translation_by_project_id_and_language_id(project_id=project_id, language_id=language_id.value)
@@ -128,21 +114,21 @@ def read_project_translation(
             'title': project_translation.title,
             'description': project_translation.description,
             'language_id': project_translation.language_id,
-            'created_at': str(project_translation.created_at),
-            'updated_at': str(project_translation.updated_at),
+            'created_at': project_translation.created_at,
+            'updated_at': project_translation.updated_at,
         },
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.patch("/{project_id}/{language_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
-async def update_project_translation(
+def update_project_translation(
     project_id: str,
     language_id: LanguageOption,
     title: str = Form(None, min_length=1, max_length=128),
     description: str = Form(None, min_length=0, max_length=512),
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.project, RoleAuthorityName.edit))
 ):
     """
         Update Project Translation
@@ -154,17 +140,9 @@ async def update_project_translation(
 
     # service
     project_translation_service = ProjectTranslationService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
-    
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.project.value, name=RoleAuthorityName.edit.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to edit")
     
     user_id_filter = user_id_active
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.project_other.value, name=RoleAuthorityName.edit.value)
-    if role_authority:
+    if has_permission(db, payload, RoleAuthorityFeature.project_other, RoleAuthorityName.edit):
         user_id_filter = None
 
     # validation
@@ -201,16 +179,16 @@ async def update_project_translation(
         status="OK",
         data=data,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 
 @router.delete("/{project_id}/{language_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
-async def delete_project_translation(
+def delete_project_translation(
     project_id: str,
     language_id: LanguageOption,
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.project, RoleAuthorityName.delete))
 ):
     """
         Delete ProjectTranslation
@@ -222,21 +200,13 @@ async def delete_project_translation(
 
     # service
     project_translation_service = ProjectTranslationService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
     
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.project.value, name=RoleAuthorityName.delete.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to delete")
-
     exist_project_translation = project_translation_service.project_translation_repository.get_project_translation_by_project_id_and_language_id(project_id, language_id)
     if not exist_project_translation:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
 
     user_id_filter = user_id_active
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.project_other.value, name=RoleAuthorityName.delete.value)
-    if role_authority:
+    if has_permission(db, payload, RoleAuthorityFeature.project_other, RoleAuthorityName.delete):
         user_id_filter = None
 
     if user_id_filter is not None and exist_project_translation.project.user_id != user_id_filter:
@@ -258,5 +228,5 @@ async def delete_project_translation(
         status="OK",
         data=data,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
\ No newline at end of file
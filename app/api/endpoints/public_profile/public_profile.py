@@ -1,21 +1,43 @@
-from fastapi import APIRouter, Depends, status, HTTPException
-from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
-from app.database import get_db
-from app.models.response import GeneralDataResponse
+from fastapi import APIRouter, Depends, Query, Request, status, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
+from app.models import LanguageOption
+from app.models.response import GeneralDataResponse, json_response
+from app.repositories.education.education_translation_repository import AsyncEducationTranslationRepository
+from app.repositories.experience.experience_translation_repository import AsyncExperienceTranslationRepository
+from app.repositories.project.project_translation_repository import AsyncProjectTranslationRepository
+from app.repositories.skill.skill_translation_repository import AsyncSkillTranslationRepository
+from app.repositories.solution.solution_translation_repository import AsyncSolutionTranslationRepository
+from app.repositories.stored_file_repository import AsyncStoredFileRepository
+from app.repositories.user_repository import AsyncUserRepository
+from app.services.company.company_service import CompanyService
+from app.services.project.project_service import ProjectService
+from app.services.school.school_service import SchoolService
+from app.services.skill.skill_service import SkillService
+from app.services.solution.solution_service import SolutionService
 from app.services.user_service import UserService
+from app.utils.conditional_request import conditional_response, get_last_modified, set_validators
+from app.utils.image_derivative import get_srcset
+from app.utils.response_cache import public_profile_cache
+from app.utils.storage import get_file_url
 
 router = APIRouter()
 
 @router.get("/{username}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
-def public_profile(username: str, db: Session = Depends(get_db)):
+async def public_profile(request: Request, username: str, db: AsyncSession = Depends(get_async_db)):
     """
         Profile user public
     """
-    user_service = UserService(db)
+    cache_key = public_profile_cache.make_key(request, 'profile', username, None)
+    cached_response = await public_profile_cache.get(cache_key)
+    if cached_response is not None:
+        return conditional_response(request, cached_response)
+
+    user_repository = AsyncUserRepository(db)
+    stored_file_repository = AsyncStoredFileRepository(db)
 
     try:
-        user = user_service.user_repository.get_user_by_username(username)
+        user = await user_repository.get_user_by_username(username)
     except ValueError as error:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
     
@@ -25,6 +47,220 @@ def public_profile(username: str, db: Session = Depends(get_db)):
     if not user.is_active:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail='this user is not active')
 
+    derivative_widths = await stored_file_repository.read_derivative_widths([user.image_url])
+    last_modified = user.updated_at
+    status_code = status.HTTP_200_OK
+
+    data = {
+        'id': user.id,
+        'username': user.username,
+        'gender': user.gender,
+        'name': user.name,
+        'image_url': get_file_url(UserService.static_folder_image, user.image_url),
+        'image_srcset': get_srcset(UserService.static_folder_image, user.image_url, derivative_widths),
+    }
+
+    data_response = GeneralDataResponse(
+        code=status_code,
+        status="OK",
+        data=data,
+    )
+    response = json_response(data_response, status_code)
+    set_validators(response, last_modified=last_modified)
+    await public_profile_cache.set(cache_key, user.id, response)
+    return conditional_response(request, response)
+
+@router.get("/{username}/{language_id}/full", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
+async def public_profile_full(
+    request: Request,
+    username: str,
+    language_id: LanguageOption,
+    education_size: int = Query(10, ge=0, lt=100),
+    experience_size: int = Query(10, ge=0, lt=100),
+    skill_size: int = Query(10, ge=0, lt=100),
+    solution_size: int = Query(10, ge=0, lt=100),
+    project_size: int = Query(10, ge=0, lt=100),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+        Profile user public with education, experience, skill, solution and project
+
+        - one query for each section, section with size 0 is skipped
+        - srcset of every image read by one query
+    """
+    cache_key = public_profile_cache.make_key(request, 'full', username, language_id.value)
+    cached_response = await public_profile_cache.get(cache_key)
+    if cached_response is not None:
+        return conditional_response(request, cached_response)
+
+    user_repository = AsyncUserRepository(db)
+    education_translation_repository = AsyncEducationTranslationRepository(db)
+    experience_translation_repository = AsyncExperienceTranslationRepository(db)
+    skill_translation_repository = AsyncSkillTranslationRepository(db)
+    solution_translation_repository = AsyncSolutionTranslationRepository(db)
+    project_translation_repository = AsyncProjectTranslationRepository(db)
+    stored_file_repository = AsyncStoredFileRepository(db)
+
+    try:
+        user = await user_repository.get_user_by_username(username)
+    except ValueError as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
+    
+    if not user:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='user not found')
+
+    if not user.is_active:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail='this user is not active')
+
+    language_id = language_id.value
+
+    education_rows = await education_translation_repository.get_education_translation_rows_by_user_id_and_language_id(
+        user_id=user.id,
+        language_id=language_id,
+        sort_by='started_at',
+        sort_order='desc',
+        offset=1,
+        size=education_size,
+    ) if education_size else []
+    experience_rows = await experience_translation_repository.get_experience_translation_rows_by_user_id_and_language_id(
+        user_id=user.id,
+        language_id=language_id,
+        sort_by='started_at',
+        sort_order='desc',
+        offset=1,
+        size=experience_size,
+    ) if experience_size else []
+    skill_rows = await skill_translation_repository.get_skill_translation_rows_by_user_id_and_language_id(
+        user_id=user.id,
+        language_id=language_id,
+        offset=1,
+        size=skill_size,
+    ) if skill_size else []
+    solution_rows = await solution_translation_repository.get_solution_translation_rows_by_user_id_and_language_id(
+        user_id=user.id,
+        language_id=language_id,
+        sort_by='created_at',
+        sort_order='desc',
+        offset=1,
+        size=solution_size,
+    ) if solution_size else []
+    project_rows = await project_translation_repository.get_project_translation_rows_by_user_id_and_language_id(
+        user_id=user.id,
+        language_id=language_id,
+        sort_by='created_at',
+        sort_order='desc',
+        offset=1,
+        size=project_size,
+    ) if project_size else []
+    derivative_widths = await stored_file_repository.read_derivative_widths([
+        user.image_url,
+        *(key for _, _, school, _ in education_rows for key in (school.image_url, school.logo_url)),
+        *(key for _, _, company, _ in experience_rows for key in (company.image_url, company.logo_url)),
+        *(key for _, skill in skill_rows for key in (skill.image_url, skill.logo_url)),
+        *(key for _, solution in solution_rows for key in (solution.image_url, solution.logo_url)),
+        *(key for _, project in project_rows for key in (project.image_url, project.logo_url)),
+    ])
+
+    last_modified = user.updated_at
+
+    educations = []
+    for education_translation, education, school, school_translation in education_rows:
+        last_modified = get_last_modified(last_modified, education_translation.updated_at, education.updated_at, school.updated_at, school_translation.updated_at)
+        educations.append({
+            'id': education_translation.id,
+            'title': education_translation.title,
+            'degree': education_translation.degree,
+            'description': education_translation.description,
+            'field_of_study': education_translation.field_of_study,
+            'started_at': education.started_at,
+            'finished_at': education.finished_at,
+            'created_at': education_translation.created_at,
+            'updated_at': education_translation.updated_at,
+            'school': {
+                'name': school_translation.name,
+                'description': school_translation.description,
+                'address': school_translation.address,
+                'image_url': get_file_url(SchoolService.static_folder_image, school.image_url),
+                'image_srcset': get_srcset(SchoolService.static_folder_image, school.image_url, derivative_widths),
+                'logo_url': get_file_url(SchoolService.static_folder_logo, school.logo_url),
+                'logo_srcset': get_srcset(SchoolService.static_folder_logo, school.logo_url, derivative_widths),
+                'website_url': str(school.website_url) if school.website_url else None,
+            },
+        })
+
+    experiences = []
+    for experience_translation, experience, company, company_translation in experience_rows:
+        last_modified = get_last_modified(last_modified, experience_translation.updated_at, experience.updated_at, company.updated_at, company_translation.updated_at)
+        experiences.append({
+            'id': experience_translation.id,
+            'title': experience_translation.title,
+            'description': experience_translation.description,
+            'employee_type': experience_translation.employee_type,
+            'location': experience_translation.location,
+            'location_type': experience_translation.location_type,
+            'started_at': experience.started_at,
+            'finished_at': experience.finished_at,
+            'created_at': experience_translation.created_at,
+            'updated_at': experience_translation.updated_at,
+            'company': {
+                'name': company_translation.name,
+                'description': company_translation.description,
+                'address': company_translation.address,
+                'image_url': get_file_url(CompanyService.static_folder_image, company.image_url),
+                'image_srcset': get_srcset(CompanyService.static_folder_image, company.image_url, derivative_widths),
+                'logo_url': get_file_url(CompanyService.static_folder_logo, company.logo_url),
+                'logo_srcset': get_srcset(CompanyService.static_folder_logo, company.logo_url, derivative_widths),
+                'website_url': str(company.website_url) if company.website_url else None,
+            },
+        })
+
+    skills = []
+    for skill_translation, skill in skill_rows:
+        last_modified = get_last_modified(last_modified, skill_translation.updated_at, skill.updated_at)
+        skills.append({
+            'id': skill_translation.id,
+            'name': skill_translation.name,
+            'description': skill_translation.description,
+            'created_at': skill_translation.created_at,
+            'updated_at': skill_translation.updated_at,
+            'image_url': get_file_url(SkillService.static_folder_image, skill.image_url),
+            'image_srcset': get_srcset(SkillService.static_folder_image, skill.image_url, derivative_widths),
+            'logo_url': get_file_url(SkillService.static_folder_logo, skill.logo_url),
+            'logo_srcset': get_srcset(SkillService.static_folder_logo, skill.logo_url, derivative_widths),
+            'website_url': str(skill.website_url) if skill.website_url else None,
+        })
+
+    solutions = []
+    for solution_translation, solution in solution_rows:
+        last_modified = get_last_modified(last_modified, solution_translation.updated_at, solution.updated_at)
+        solutions.append({
+            'id': solution_translation.id,
+            'title': solution_translation.title,
+            'description': solution_translation.description,
+            'created_at': solution_translation.created_at,
+            'updated_at': solution_translation.updated_at,
+            'image_url': get_file_url(SolutionService.static_folder_image, solution.image_url),
+            'image_srcset': get_srcset(SolutionService.static_folder_image, solution.image_url, derivative_widths),
+            'logo_url': get_file_url(SolutionService.static_folder_logo, solution.logo_url),
+            'logo_srcset': get_srcset(SolutionService.static_folder_logo, solution.logo_url, derivative_widths),
+        })
+
+    projects = []
+    for project_translation, project in project_rows:
+        last_modified = get_last_modified(last_modified, project_translation.updated_at, project.updated_at)
+        projects.append({
+            'id': project_translation.id,
+            'title': project_translation.title,
+            'description': project_translation.description,
+            'slug': project.slug,
+            'created_at': project_translation.created_at,
+            'updated_at': project_translation.updated_at,
+            'image_url': get_file_url(ProjectService.static_folder_image, project.image_url),
+            'image_srcset': get_srcset(ProjectService.static_folder_image, project.image_url, derivative_widths),
+            'logo_url': get_file_url(ProjectService.static_folder_logo, project.logo_url),
+            'logo_srcset': get_srcset(ProjectService.static_folder_logo, project.logo_url, derivative_widths),
+        })
+
     status_code = status.HTTP_200_OK
 
     data = {
@@ -32,7 +268,13 @@ def public_profile(username: str, db: Session = Depends(get_db)):
         'username': user.username,
         'gender': user.gender,
         'name': user.name,
-        'image_url': f"{user_service.static_folder_image}/{user.image_url}" if user.image_url else None,
+        'image_url': get_file_url(UserService.static_folder_image, user.image_url),
+        'image_srcset': get_srcset(UserService.static_folder_image, user.image_url, derivative_widths),
+        'educations': educations,
+        'experiences': experiences,
+        'skills': skills,
+        'solutions': solutions,
+        'projects': projects,
     }
 
     data_response = GeneralDataResponse(
@@ -40,5 +282,7 @@ def public_profile(username: str, db: Session = Depends(get_db)):
         status="OK",
         data=data,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
-    return response
+    response = json_response(data_response, status_code)
+    set_validators(response, last_modified=last_modified)
+    await public_profile_cache.set(cache_key, user.id, response)
+    return conditional_response(request, response)
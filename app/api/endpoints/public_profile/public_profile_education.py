@@ -1,40 +1,53 @@
-from fastapi import APIRouter, Depends, Query, status, HTTPException
-from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
-from app.database import get_db
+from fastapi import APIRouter, Depends, Query, Request, status, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
 from app.models import LanguageOption
-from app.models.response import GeneralDataPaginateResponse
+from app.models.response import GeneralDataPaginateResponse, json_response
+from app.models.education.education import Education
+from app.models.education.education_translation import EducationTranslation
+from app.repositories.education.education_translation_repository import AsyncEducationTranslationRepository
+from app.repositories.stored_file_repository import AsyncStoredFileRepository
+from app.repositories.user_repository import AsyncUserRepository
 from app.services.school.school_service import SchoolService
-from app.services.school.school_translation_service import SchoolTranslationService
-from app.services.education.education_translation_service import EducationTranslationService
-from app.services.user_service import UserService
 from app.utils.manual import get_total_pages
+from app.utils.pagination import get_next_cursor
+from app.utils.conditional_request import conditional_response, get_last_modified, set_validators
+from app.utils.image_derivative import get_srcset
+from app.utils.response_cache import public_profile_cache
+from app.utils.storage import get_file_url
 
 router = APIRouter()
 
 @router.get("/{username}/{language_id}/education", response_model=GeneralDataPaginateResponse, status_code=status.HTTP_200_OK)
-def public_profile_education(
+async def public_profile_education(
+    request: Request,
     username: str, 
     language_id: LanguageOption,
     offset: int = Query(1, ge=1), 
     size: int = Query(10, ge=1, lt=100),
+    cursor: str = Query(None),
+    with_total: bool = Query(True),
     sort_by: str = Query(None),
     sort_order: str = Query(None),
     filter_by_column: str = Query(None),
     filter_value: str = Query(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
         Profile user public education
     """
-    user_service = UserService(db)
-    school_service = SchoolService(db)
-    school_translation_service = SchoolTranslationService(db)
-    education_translation_service = EducationTranslationService(db)
+    cache_key = public_profile_cache.make_key(request, 'education', username, language_id.value)
+    cached_response = await public_profile_cache.get(cache_key)
+    if cached_response is not None:
+        return conditional_response(request, cached_response)
+
+    user_repository = AsyncUserRepository(db)
+    education_translation_repository = AsyncEducationTranslationRepository(db)
+    stored_file_repository = AsyncStoredFileRepository(db)
     custom_filters = {filter_by_column: filter_value} if filter_by_column and filter_value else None
 
     try:
-        user = user_service.user_repository.get_user_by_username(username)
+        user = await user_repository.get_user_by_username(username)
     except ValueError as error:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
     
@@ -46,57 +59,54 @@ def public_profile_education(
     
     language_id = language_id.value
 
-    education_translations = education_translation_service.education_translation_repository.get_education_translation_by_user_id_and_language_id(
-        user_id=user.id,
-        language_id=language_id,
-        offset=offset, 
-        size=size, 
-        sort_by=sort_by, 
-        sort_order=sort_order, 
-        custom_filters=custom_filters,
-    )
+    try:
+        education_rows = await education_translation_repository.get_education_translation_rows_by_user_id_and_language_id(
+            user_id=user.id,
+            language_id=language_id,
+            offset=offset, 
+            size=size, 
+            cursor=cursor,
+            with_total=with_total,
+            sort_by=sort_by, 
+            sort_order=sort_order, 
+            custom_filters=custom_filters,
+        )
+    except ValueError as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
     
-    if not education_translations:
+    if not education_rows:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Data not found")
     
-    count = education_translation_service.education_translation_repository.count_education_translation_by_user_id_and_language_id(
-        user_id=user.id,
-        language_id=language_id,
-        custom_filters=custom_filters,
-    )
+    count = education_rows.total
     total_pages = get_total_pages(size, count)
+    next_cursor = get_next_cursor(education_rows, size, sort_by, EducationTranslation, Education) if cursor is not None else None
 
-    datas = []
-    for education_translation in education_translations:
-        school = {}
-        if education_translation.education.school:
-            exist_school_translation = school_translation_service.school_translation_repository.get_school_translation_by_school_id_and_language_id(
-                school_id=education_translation.education.school_id,
-                language_id=language_id
-            )
-            image_url = f"{school_service.static_folder_image}/{exist_school_translation.school.image_url}" if exist_school_translation.school.image_url else None
-            logo_url = f"{school_service.static_folder_logo}/{exist_school_translation.school.logo_url}" if exist_school_translation.school.logo_url else None
-            website_url = str(exist_school_translation.school.website_url) if exist_school_translation.school.website_url else None
-            school = {
-                'name': exist_school_translation.name,
-                'description': exist_school_translation.description,
-                'address': exist_school_translation.address,
-                'image_url': image_url,
-                'logo_url': logo_url,
-                'website_url': website_url,
-            } if exist_school_translation else {}
+    derivative_widths = await stored_file_repository.read_derivative_widths([key for _, _, school, _ in education_rows for key in (school.image_url, school.logo_url)])
 
+    last_modified = None
+    datas = []
+    for education_translation, education, school, school_translation in education_rows:
+        last_modified = get_last_modified(last_modified, education_translation.updated_at, education.updated_at, school.updated_at, school_translation.updated_at)
         datas.append({
             'id': education_translation.id,
             'title': education_translation.title,
             'degree': education_translation.degree,
             'description': education_translation.description,
             'field_of_study': education_translation.field_of_study,
-            'started_at': str(education_translation.education.started_at),
-            'finished_at': str(education_translation.education.finished_at) if education_translation.education.finished_at else None,
-            'created_at': str(education_translation.created_at),
-            'updated_at': str(education_translation.updated_at),
-            'school': school
+            'started_at': education.started_at,
+            'finished_at': education.finished_at,
+            'created_at': education_translation.created_at,
+            'updated_at': education_translation.updated_at,
+            'school': {
+                'name': school_translation.name,
+                'description': school_translation.description,
+                'address': school_translation.address,
+                'image_url': get_file_url(SchoolService.static_folder_image, school.image_url),
+                'image_srcset': get_srcset(SchoolService.static_folder_image, school.image_url, derivative_widths),
+                'logo_url': get_file_url(SchoolService.static_folder_logo, school.logo_url),
+                'logo_srcset': get_srcset(SchoolService.static_folder_logo, school.logo_url, derivative_widths),
+                'website_url': str(school.website_url) if school.website_url else None,
+            },
         })
 
     status_code = status.HTTP_200_OK
@@ -108,9 +118,12 @@ def public_profile_education(
             "size": size,
             "total": count,
             "total_pages": total_pages,
-            "offset": offset
+            "offset": offset,
+            "next_cursor": next_cursor
         },
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
-    return response
+    response = json_response(data_response, status_code)
+    set_validators(response, last_modified=last_modified)
+    await public_profile_cache.set(cache_key, user.id, response)
+    return conditional_response(request, response)
 
@@ -1,40 +1,53 @@
-from fastapi import APIRouter, Depends, Query, status, HTTPException
-from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
-from app.database import get_db
+from fastapi import APIRouter, Depends, Query, Request, status, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
 from app.models import LanguageOption
-from app.models.response import GeneralDataPaginateResponse
+from app.models.response import GeneralDataPaginateResponse, json_response
+from app.models.experience.experience import Experience
+from app.models.experience.experience_translation import ExperienceTranslation
+from app.repositories.experience.experience_translation_repository import AsyncExperienceTranslationRepository
+from app.repositories.stored_file_repository import AsyncStoredFileRepository
+from app.repositories.user_repository import AsyncUserRepository
 from app.services.company.company_service import CompanyService
-from app.services.company.company_translation_service import CompanyTranslationService
-from app.services.experience.experience_translation_service import ExperienceTranslationService
-from app.services.user_service import UserService
 from app.utils.manual import get_total_pages
+from app.utils.pagination import get_next_cursor
+from app.utils.conditional_request import conditional_response, get_last_modified, set_validators
+from app.utils.image_derivative import get_srcset
+from app.utils.response_cache import public_profile_cache
+from app.utils.storage import get_file_url
 
 router = APIRouter()
 
 @router.get("/{username}/{language_id}/experience", response_model=GeneralDataPaginateResponse, status_code=status.HTTP_200_OK)
-def public_profile_experience(
+async def public_profile_experience(
+    request: Request,
     username: str, 
     language_id: LanguageOption,
     offset: int = Query(1, ge=1), 
     size: int = Query(10, ge=1, lt=100),
+    cursor: str = Query(None),
+    with_total: bool = Query(True),
     sort_by: str = Query(None),
     sort_order: str = Query(None),
     filter_by_column: str = Query(None),
     filter_value: str = Query(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
         Profile user public experience
     """
-    user_service = UserService(db)
-    company_service = CompanyService(db)
-    company_translation_service = CompanyTranslationService(db)
-    experience_translation_service = ExperienceTranslationService(db)
+    cache_key = public_profile_cache.make_key(request, 'experience', username, language_id.value)
+    cached_response = await public_profile_cache.get(cache_key)
+    if cached_response is not None:
+        return conditional_response(request, cached_response)
+
+    user_repository = AsyncUserRepository(db)
+    experience_translation_repository = AsyncExperienceTranslationRepository(db)
+    stored_file_repository = AsyncStoredFileRepository(db)
     custom_filters = {filter_by_column: filter_value} if filter_by_column and filter_value else None
 
     try:
-        user = user_service.user_repository.get_user_by_username(username)
+        user = await user_repository.get_user_by_username(username)
     except ValueError as error:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
     
@@ -46,46 +59,34 @@ def public_profile_experience(
     
     language_id = language_id.value
 
-    experience_translations = experience_translation_service.experience_translation_repository.get_experience_translation_by_user_id_and_language_id(
-        user_id=user.id,
-        language_id=language_id,
-        offset=offset, 
-        size=size, 
-        sort_by=sort_by, 
-        sort_order=sort_order, 
-        custom_filters=custom_filters,
-    )
+    try:
+        experience_rows = await experience_translation_repository.get_experience_translation_rows_by_user_id_and_language_id(
+            user_id=user.id,
+            language_id=language_id,
+            offset=offset, 
+            size=size, 
+            cursor=cursor,
+            with_total=with_total,
+            sort_by=sort_by, 
+            sort_order=sort_order, 
+            custom_filters=custom_filters,
+        )
+    except ValueError as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
     
-    if not experience_translations:
+    if not experience_rows:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Data not found")
     
-    count = experience_translation_service.experience_translation_repository.count_experience_translation_by_user_id_and_language_id(
-        user_id=user.id,
-        language_id=language_id,
-        custom_filters=custom_filters,
-    )
+    count = experience_rows.total
     total_pages = get_total_pages(size, count)
+    next_cursor = get_next_cursor(experience_rows, size, sort_by, ExperienceTranslation, Experience) if cursor is not None else None
 
-    datas = []
-    for experience_translation in experience_translations:
-        company = {}
-        if experience_translation.experience.company:
-            exist_company_translation = company_translation_service.company_translation_repository.get_company_translation_by_company_id_and_language_id(
-                company_id=experience_translation.experience.company_id,
-                language_id=language_id
-            )
-            image_url = f"{company_service.static_folder_image}/{exist_company_translation.company.image_url}" if exist_company_translation.company.image_url else None
-            logo_url = f"{company_service.static_folder_logo}/{exist_company_translation.company.logo_url}" if exist_company_translation.company.logo_url else None
-            website_url = str(exist_company_translation.company.website_url) if exist_company_translation.company.website_url else None
-            company = {
-                'name': exist_company_translation.name,
-                'description': exist_company_translation.description,
-                'address': exist_company_translation.address,
-                'image_url': image_url,
-                'logo_url': logo_url,
-                'website_url': website_url,
-            } if exist_company_translation else {}
+    derivative_widths = await stored_file_repository.read_derivative_widths([key for _, _, company, _ in experience_rows for key in (company.image_url, company.logo_url)])
 
+    last_modified = None
+    datas = []
+    for experience_translation, experience, company, company_translation in experience_rows:
+        last_modified = get_last_modified(last_modified, experience_translation.updated_at, experience.updated_at, company.updated_at, company_translation.updated_at)
         datas.append({
             'id': experience_translation.id,
             'title': experience_translation.title,
@@ -93,11 +94,20 @@ def public_profile_experience(
             'employee_type': experience_translation.employee_type,
             'location': experience_translation.location,
             'location_type': experience_translation.location_type,
-            'started_at': str(experience_translation.experience.started_at),
-            'finished_at': str(experience_translation.experience.finished_at) if experience_translation.experience.finished_at else None,
-            'created_at': str(experience_translation.created_at),
-            'updated_at': str(experience_translation.updated_at),
-            'company': company
+            'started_at': experience.started_at,
+            'finished_at': experience.finished_at,
+            'created_at': experience_translation.created_at,
+            'updated_at': experience_translation.updated_at,
+            'company': {
+                'name': company_translation.name,
+                'description': company_translation.description,
+                'address': company_translation.address,
+                'image_url': get_file_url(CompanyService.static_folder_image, company.image_url),
+                'image_srcset': get_srcset(CompanyService.static_folder_image, company.image_url, derivative_widths),
+                'logo_url': get_file_url(CompanyService.static_folder_logo, company.logo_url),
+                'logo_srcset': get_srcset(CompanyService.static_folder_logo, company.logo_url, derivative_widths),
+                'website_url': str(company.website_url) if company.website_url else None,
+            },
         })
 
     status_code = status.HTTP_200_OK
@@ -109,9 +119,12 @@ def public_profile_experience(
             "size": size,
             "total": count,
             "total_pages": total_pages,
-            "offset": offset
+            "offset": offset,
+            "next_cursor": next_cursor
         },
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
-    return response
+    response = json_response(data_response, status_code)
+    set_validators(response, last_modified=last_modified)
+    await public_profile_cache.set(cache_key, user.id, response)
+    return conditional_response(request, response)
 
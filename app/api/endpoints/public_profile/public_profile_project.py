@@ -1,41 +1,57 @@
-from fastapi import APIRouter, Depends, Query, status, HTTPException
-from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
-from app.database import get_db
+from fastapi import APIRouter, Depends, Query, Request, status, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
 from app.models import LanguageOption
-from app.models.response import GeneralDataPaginateResponse, GeneralDataResponse
+from app.models.response import GeneralDataPaginateResponse, GeneralDataResponse, json_response
+from app.models.project.project_translation import ProjectTranslation
+from app.repositories.project.project_repository import AsyncProjectRepository
+from app.repositories.project.project_attachment_repository import AsyncProjectAttachmentRepository
+from app.repositories.project.project_skill_repository import AsyncProjectSkillRepository
+from app.repositories.project.project_translation_repository import AsyncProjectTranslationRepository
+from app.repositories.stored_file_repository import AsyncStoredFileRepository
+from app.repositories.user_repository import AsyncUserRepository
 from app.services.project.project_attachment_service import ProjectAttachmentService
 from app.services.project.project_service import ProjectService
-from app.services.project.project_skill_service import ProjectSkillService
-from app.services.project.project_translation_service import ProjectTranslationService
 from app.services.skill.skill_service import SkillService
-from app.services.user_service import UserService
 from app.utils.manual import get_total_pages
+from app.utils.pagination import get_next_cursor
+from app.utils.conditional_request import check_not_modified, conditional_response, get_last_modified, make_etag, set_validators
+from app.utils.image_derivative import get_srcset
+from app.utils.response_cache import public_profile_cache
+from app.utils.storage import get_file_url
 
 router = APIRouter()
 
 @router.get("/{username}/{language_id}/project", response_model=GeneralDataPaginateResponse, status_code=status.HTTP_200_OK)
-def public_profile_project(
+async def public_profile_project(
+    request: Request,
     username: str, 
     language_id: LanguageOption,
     offset: int = Query(1, ge=1), 
     size: int = Query(10, ge=1, lt=100),
+    cursor: str = Query(None),
+    with_total: bool = Query(True),
     sort_by: str = Query(None),
     sort_order: str = Query(None),
     filter_by_column: str = Query(None),
     filter_value: str = Query(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
         Profile user public project
     """
-    user_service = UserService(db)
-    project_service = ProjectService(db)
-    project_translation_service = ProjectTranslationService(db)
+    cache_key = public_profile_cache.make_key(request, 'project', username, language_id.value)
+    cached_response = await public_profile_cache.get(cache_key)
+    if cached_response is not None:
+        return conditional_response(request, cached_response)
+
+    user_repository = AsyncUserRepository(db)
+    project_translation_repository = AsyncProjectTranslationRepository(db)
+    stored_file_repository = AsyncStoredFileRepository(db)
     custom_filters = {filter_by_column: filter_value} if filter_by_column and filter_value else None
 
     try:
-        user = user_service.user_repository.get_user_by_username(username)
+        user = await user_repository.get_user_by_username(username)
     except ValueError as error:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
     
@@ -47,40 +63,50 @@ def public_profile_project(
     
     language_id = language_id.value
 
-    project_translations = project_translation_service.project_translation_repository.get_project_translation_by_user_id_and_language_id(
-        user_id=user.id,
-        language_id=language_id,
-        offset=offset, 
-        size=size, 
-        sort_by=sort_by, 
-        sort_order=sort_order, 
-        custom_filters=custom_filters,
-    )
+    try:
+        project_translations = await project_translation_repository.get_project_translation_by_user_id_and_language_id(
+            user_id=user.id,
+            language_id=language_id,
+            offset=offset, 
+            size=size, 
+            cursor=cursor,
+            with_total=with_total,
+            sort_by=sort_by, 
+            sort_order=sort_order, 
+            custom_filters=custom_filters,
+        )
+    except ValueError as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
     
     if not project_translations:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Data not found")
     
-    count = project_translation_service.project_translation_repository.count_project_translation_by_user_id_and_language_id(
-        user_id=user.id,
-        language_id=language_id,
-        custom_filters=custom_filters,
-    )
+    count = project_translations.total
     total_pages = get_total_pages(size, count)
+    next_cursor = get_next_cursor(project_translations, size, sort_by, ProjectTranslation) if cursor is not None else None
+
+    derivative_widths = await stored_file_repository.read_derivative_widths([key for x in project_translations for key in (x.project.image_url, x.project.logo_url)])
 
+    last_modified = None
     datas = []
     for project_translation in project_translations:
-        image_url = f"{project_service.static_folder_image}/{project_translation.project.image_url}" if project_translation.project.image_url else None
-        logo_url = f"{project_service.static_folder_logo}/{project_translation.project.logo_url}" if project_translation.project.logo_url else None
+        last_modified = get_last_modified(last_modified, project_translation.updated_at, project_translation.project.updated_at)
+        image_url = get_file_url(ProjectService.static_folder_image, project_translation.project.image_url)
+        image_srcset = get_srcset(ProjectService.static_folder_image, project_translation.project.image_url, derivative_widths)
+        logo_url = get_file_url(ProjectService.static_folder_logo, project_translation.project.logo_url)
+        logo_srcset = get_srcset(ProjectService.static_folder_logo, project_translation.project.logo_url, derivative_widths)
         
         datas.append({
             'id': project_translation.id,
             'title': project_translation.title,
             'description': project_translation.description,
             'slug': project_translation.project.slug,
-            'created_at': str(project_translation.created_at),
-            'updated_at': str(project_translation.updated_at),
+            'created_at': project_translation.created_at,
+            'updated_at': project_translation.updated_at,
             'image_url': image_url,
-            'logo_url': logo_url    
+            'image_srcset': image_srcset,
+            'logo_url': logo_url,
+            'logo_srcset': logo_srcset,
         })
 
     status_code = status.HTTP_200_OK
@@ -92,32 +118,41 @@ def public_profile_project(
             "size": size,
             "total": count,
             "total_pages": total_pages,
-            "offset": offset
+            "offset": offset,
+            "next_cursor": next_cursor
         },
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
-    return response
+    response = json_response(data_response, status_code)
+    set_validators(response, last_modified=last_modified)
+    await public_profile_cache.set(cache_key, user.id, response)
+    return conditional_response(request, response)
 
 
 @router.get("/{username}/{language_id}/project/{project_slug}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
-def public_profile_project_detail(
+async def public_profile_project_detail(
+    request: Request,
     username: str, 
     language_id: LanguageOption, 
     project_slug: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
         Profile user public project detail
     """
-    user_service = UserService(db)
-    project_service = ProjectService(db)
-    project_translation_service = ProjectTranslationService(db)
-    project_skill_service = ProjectSkillService(db)
-    skill_service = SkillService(db)
-    project_attachment_service = ProjectAttachmentService(db)
+    cache_key = public_profile_cache.make_key(request, f"project/{project_slug}", username, language_id.value)
+    cached_response = await public_profile_cache.get(cache_key)
+    if cached_response is not None:
+        return conditional_response(request, cached_response)
+
+    user_repository = AsyncUserRepository(db)
+    project_repository = AsyncProjectRepository(db)
+    project_translation_repository = AsyncProjectTranslationRepository(db)
+    project_skill_repository = AsyncProjectSkillRepository(db)
+    project_attachment_repository = AsyncProjectAttachmentRepository(db)
+    stored_file_repository = AsyncStoredFileRepository(db)
 
     try:
-        user = user_service.user_repository.get_user_by_username(username)
+        user = await user_repository.get_user_by_username(username)
     except ValueError as error:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
     
@@ -127,24 +162,42 @@ def public_profile_project_detail(
     if not user.is_active:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail='this user is not active')
     
-    project = project_service.project_repository.get_project_by_user_id_and_slug(user.id, project_slug)
+    project = await project_repository.get_project_by_user_id_and_slug(user.id, project_slug)
     if not project:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Data not found")
 
     language_id = language_id.value
 
-    project_translation = project_translation_service.project_translation_repository.get_project_translation_by_project_id_and_language_id(
+    project_translation = await project_translation_repository.get_project_translation_by_project_id_and_language_id(
         project_id=project.id,
         language_id=language_id,
     )
     
     if not project_translation:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Data not found")
+
+    # validator from timestamp only, before skill and attachment loaded, id and language keep it unique per resource
+    version = await project_repository.get_project_detail_version(project.id, language_id)
+    etag = make_etag(f"{project.id}|{language_id}|{project.updated_at}|{project_translation.updated_at}|{'|'.join(str(value) for value in version)}")
+    last_modified = get_last_modified(project.updated_at, project_translation.updated_at, version[1], version[3], version[4], version[5], version[6])
+    not_modified = check_not_modified(request, etag, last_modified)
+    if not_modified is not None:
+        return not_modified
     
-    skill_translations = project_skill_service.project_skill_repository.get_project_skill_by_project_id_and_language_id(
+    skill_translations = await project_skill_repository.get_project_skill_by_project_id_and_language_id(
         project_id=project.id,
         language_id=language_id,
     )
+    project_attachments = await project_attachment_repository.read_project_attachments(
+        project_id=project.id,
+        is_active=True
+    )
+    derivative_widths = await stored_file_repository.read_derivative_widths([
+        project.image_url,
+        project.logo_url,
+        *(key for x in skill_translations or [] for key in (x.skill.image_url, x.skill.logo_url)),
+        *(x.image_url for x in project_attachments or []),
+    ])
 
     skills = []
     if skill_translations:
@@ -153,18 +206,15 @@ def public_profile_project_detail(
                 'id': skill_translation.id,
                 'name': skill_translation.name,
                 'description': skill_translation.description,
-                'created_at': str(skill_translation.created_at),
-                'updated_at': str(skill_translation.updated_at),
-                'image_url': f"{skill_service.static_folder_image}/{skill_translation.skill.image_url}" if skill_translation.skill.image_url else None,
-                'logo_url': f"{skill_service.static_folder_logo}/{skill_translation.skill.logo_url}" if skill_translation.skill.logo_url else None,
+                'created_at': skill_translation.created_at,
+                'updated_at': skill_translation.updated_at,
+                'image_url': get_file_url(SkillService.static_folder_image, skill_translation.skill.image_url),
+                'image_srcset': get_srcset(SkillService.static_folder_image, skill_translation.skill.image_url, derivative_widths),
+                'logo_url': get_file_url(SkillService.static_folder_logo, skill_translation.skill.logo_url),
+                'logo_srcset': get_srcset(SkillService.static_folder_logo, skill_translation.skill.logo_url, derivative_widths),
                 'website_url': str(skill_translation.skill.website_url) if skill_translation.skill.website_url else None,
             })
 
-    project_attachments = project_attachment_service.project_attachment_repository.read_project_attachments(
-        project_id=project.id,
-        is_active=True
-    )
-
     attachments = []
     if project_attachments:
         for project_attachment in project_attachments:
@@ -175,9 +225,10 @@ def public_profile_project_detail(
                 'description': project_attachment.description if project_attachment.description else None,
                 'website_url': project_attachment.website_url if project_attachment.website_url else None,
                 'category': project_attachment.category,
-                'created_at': str(project_attachment.created_at),
-                'updated_at': str(project_attachment.updated_at),
-                'image_url': f"{project_attachment_service.static_folder_image}/{project_attachment.image_url}" if project_attachment.image_url else None,
+                'created_at': project_attachment.created_at,
+                'updated_at': project_attachment.updated_at,
+                'image_url': get_file_url(ProjectAttachmentService.static_folder_image, project_attachment.image_url),
+                'image_srcset': get_srcset(ProjectAttachmentService.static_folder_image, project_attachment.image_url, derivative_widths),
             })
 
 
@@ -191,14 +242,18 @@ def public_profile_project_detail(
             'description': project_translation.description,
             'slug': project_translation.project.slug,
             'is_active': project_translation.project.is_active,
-            'created_at': str(project.created_at),
-            'updated_at': str(project.updated_at),
-            'image_url': f"{project_service.static_folder_image}/{project.image_url}" if project.image_url else None,
-            'logo_url': f"{project_service.static_folder_logo}/{project.logo_url}" if project.logo_url else None,
+            'created_at': project.created_at,
+            'updated_at': project.updated_at,
+            'image_url': get_file_url(ProjectService.static_folder_image, project.image_url),
+            'image_srcset': get_srcset(ProjectService.static_folder_image, project.image_url, derivative_widths),
+            'logo_url': get_file_url(ProjectService.static_folder_logo, project.logo_url),
+            'logo_srcset': get_srcset(ProjectService.static_folder_logo, project.logo_url, derivative_widths),
             'skills': skills,
             'attachments': attachments,
         },
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
-    return response
+    response = json_response(data_response, status_code)
+    set_validators(response, etag=etag, last_modified=last_modified)
+    await public_profile_cache.set(cache_key, user.id, response)
+    return conditional_response(request, response)
 
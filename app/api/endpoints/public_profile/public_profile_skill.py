@@ -1,38 +1,52 @@
-from fastapi import APIRouter, Depends, Query, status, HTTPException
-from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
-from app.database import get_db
+from fastapi import APIRouter, Depends, Query, Request, status, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
 from app.models import LanguageOption
-from app.models.response import GeneralDataPaginateResponse
+from app.models.response import GeneralDataPaginateResponse, json_response
+from app.models.skill.skill_translation import SkillTranslation
+from app.repositories.skill.skill_translation_repository import AsyncSkillTranslationRepository
+from app.repositories.stored_file_repository import AsyncStoredFileRepository
+from app.repositories.user_repository import AsyncUserRepository
 from app.services.skill.skill_service import SkillService
-from app.services.skill.skill_translation_service import SkillTranslationService
-from app.services.user_service import UserService
 from app.utils.manual import get_total_pages
+from app.utils.pagination import get_next_cursor
+from app.utils.conditional_request import conditional_response, get_last_modified, set_validators
+from app.utils.image_derivative import get_srcset
+from app.utils.response_cache import public_profile_cache
+from app.utils.storage import get_file_url
 
 router = APIRouter()
 
 @router.get("/{username}/{language_id}/skill", response_model=GeneralDataPaginateResponse, status_code=status.HTTP_200_OK)
-def public_profile_skill(
+async def public_profile_skill(
+    request: Request,
     username: str, 
     language_id: LanguageOption,
     offset: int = Query(1, ge=1), 
     size: int = Query(10, ge=1, lt=100),
+    cursor: str = Query(None),
+    with_total: bool = Query(True),
     sort_by: str = Query(None),
     sort_order: str = Query(None),
     filter_by_column: str = Query(None),
     filter_value: str = Query(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
         Profile user public skill
     """
-    user_service = UserService(db)
-    skill_service = SkillService(db)
-    skill_translation_service = SkillTranslationService(db)
+    cache_key = public_profile_cache.make_key(request, 'skill', username, language_id.value)
+    cached_response = await public_profile_cache.get(cache_key)
+    if cached_response is not None:
+        return conditional_response(request, cached_response)
+
+    user_repository = AsyncUserRepository(db)
+    skill_translation_repository = AsyncSkillTranslationRepository(db)
+    stored_file_repository = AsyncStoredFileRepository(db)
     custom_filters = {filter_by_column: filter_value} if filter_by_column and filter_value else None
 
     try:
-        user = user_service.user_repository.get_user_by_username(username)
+        user = await user_repository.get_user_by_username(username)
     except ValueError as error:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
     
@@ -44,36 +58,44 @@ def public_profile_skill(
     
     language_id = language_id.value
 
-    skill_translations = skill_translation_service.skill_translation_repository.get_skill_translation_by_user_id_and_language_id(
-        user_id=user.id,
-        language_id=language_id,
-        offset=offset, 
-        size=size, 
-        sort_by=sort_by, 
-        sort_order=sort_order, 
-        custom_filters=custom_filters,
-    )
+    try:
+        skill_translations = await skill_translation_repository.get_skill_translation_by_user_id_and_language_id(
+            user_id=user.id,
+            language_id=language_id,
+            offset=offset, 
+            size=size, 
+            cursor=cursor,
+            with_total=with_total,
+            sort_by=sort_by, 
+            sort_order=sort_order, 
+            custom_filters=custom_filters,
+        )
+    except ValueError as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
     
     if not skill_translations:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Data not found")
     
-    count = skill_translation_service.skill_translation_repository.count_skill_translation_by_user_id_and_language_id(
-        user_id=user.id,
-        language_id=language_id,
-        custom_filters=custom_filters,
-    )
+    count = skill_translations.total
     total_pages = get_total_pages(size, count)
+    next_cursor = get_next_cursor(skill_translations, size, sort_by, SkillTranslation) if cursor is not None else None
+
+    derivative_widths = await stored_file_repository.read_derivative_widths([key for x in skill_translations for key in (x.skill.image_url, x.skill.logo_url)])
 
+    last_modified = None
     datas = []
     for skill_translation in skill_translations:
+        last_modified = get_last_modified(last_modified, skill_translation.updated_at, skill_translation.skill.updated_at)
         datas.append({
             'id': skill_translation.id,
             'name': skill_translation.name,
             'description': skill_translation.description,
-            'created_at': str(skill_translation.created_at),
-            'updated_at': str(skill_translation.updated_at),
-            'image_url': f"{skill_service.static_folder_image}/{skill_translation.skill.image_url}" if skill_translation.skill.image_url else None,
-            'logo_url': f"{skill_service.static_folder_logo}/{skill_translation.skill.logo_url}" if skill_translation.skill.logo_url else None,
+            'created_at': skill_translation.created_at,
+            'updated_at': skill_translation.updated_at,
+            'image_url': get_file_url(SkillService.static_folder_image, skill_translation.skill.image_url),
+            'image_srcset': get_srcset(SkillService.static_folder_image, skill_translation.skill.image_url, derivative_widths),
+            'logo_url': get_file_url(SkillService.static_folder_logo, skill_translation.skill.logo_url),
+            'logo_srcset': get_srcset(SkillService.static_folder_logo, skill_translation.skill.logo_url, derivative_widths),
             'website_url': str(skill_translation.skill.website_url) if skill_translation.skill.website_url else None,
         })
 
@@ -86,8 +108,11 @@ def public_profile_skill(
             "size": size,
             "total": count,
             "total_pages": total_pages,
-            "offset": offset
+            "offset": offset,
+            "next_cursor": next_cursor
         },
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
-    return response
\ No newline at end of file
+    response = json_response(data_response, status_code)
+    set_validators(response, last_modified=last_modified)
+    await public_profile_cache.set(cache_key, user.id, response)
+    return conditional_response(request, response)
\ No newline at end of file
@@ -1,38 +1,52 @@
-from fastapi import APIRouter, Depends, Query, status, HTTPException
-from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
-from app.database import get_db
+from fastapi import APIRouter, Depends, Query, Request, status, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
 from app.models import LanguageOption
-from app.models.response import GeneralDataPaginateResponse
+from app.models.response import GeneralDataPaginateResponse, json_response
+from app.models.solution.solution_translation import SolutionTranslation
+from app.repositories.solution.solution_translation_repository import AsyncSolutionTranslationRepository
+from app.repositories.stored_file_repository import AsyncStoredFileRepository
+from app.repositories.user_repository import AsyncUserRepository
 from app.services.solution.solution_service import SolutionService
-from app.services.solution.solution_translation_service import SolutionTranslationService
-from app.services.user_service import UserService
 from app.utils.manual import get_total_pages
+from app.utils.pagination import get_next_cursor
+from app.utils.conditional_request import conditional_response, get_last_modified, set_validators
+from app.utils.image_derivative import get_srcset
+from app.utils.response_cache import public_profile_cache
+from app.utils.storage import get_file_url
 
 router = APIRouter()
 
 @router.get("/{username}/{language_id}/solution", response_model=GeneralDataPaginateResponse, status_code=status.HTTP_200_OK)
-def public_profile_solution(
+async def public_profile_solution(
+    request: Request,
     username: str, 
     language_id: LanguageOption,
     offset: int = Query(1, ge=1), 
     size: int = Query(10, ge=1, lt=100),
+    cursor: str = Query(None),
+    with_total: bool = Query(True),
     sort_by: str = Query(None),
     sort_order: str = Query(None),
     filter_by_column: str = Query(None),
     filter_value: str = Query(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
         Profile user public solution
     """
-    user_service = UserService(db)
-    solution_service = SolutionService(db)
-    solution_translation_service = SolutionTranslationService(db)
+    cache_key = public_profile_cache.make_key(request, 'solution', username, language_id.value)
+    cached_response = await public_profile_cache.get(cache_key)
+    if cached_response is not None:
+        return conditional_response(request, cached_response)
+
+    user_repository = AsyncUserRepository(db)
+    solution_translation_repository = AsyncSolutionTranslationRepository(db)
+    stored_file_repository = AsyncStoredFileRepository(db)
     custom_filters = {filter_by_column: filter_value} if filter_by_column and filter_value else None
 
     try:
-        user = user_service.user_repository.get_user_by_username(username)
+        user = await user_repository.get_user_by_username(username)
     except ValueError as error:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
     
@@ -44,39 +58,49 @@ def public_profile_solution(
     
     language_id = language_id.value
 
-    solution_translations = solution_translation_service.solution_translation_repository.get_solution_translation_by_user_id_and_language_id(
-        user_id=user.id,
-        language_id=language_id,
-        offset=offset, 
-        size=size, 
-        sort_by=sort_by, 
-        sort_order=sort_order, 
-        custom_filters=custom_filters,
-    )
+    try:
+        solution_translations = await solution_translation_repository.get_solution_translation_by_user_id_and_language_id(
+            user_id=user.id,
+            language_id=language_id,
+            offset=offset, 
+            size=size, 
+            cursor=cursor,
+            with_total=with_total,
+            sort_by=sort_by, 
+            sort_order=sort_order, 
+            custom_filters=custom_filters,
+        )
+    except ValueError as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
     
     if not solution_translations:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Data not found")
     
-    count = solution_translation_service.solution_translation_repository.count_solution_translation_by_user_id_and_language_id(
-        user_id=user.id,
-        language_id=language_id,
-        custom_filters=custom_filters,
-    )
+    count = solution_translations.total
     total_pages = get_total_pages(size, count)
+    next_cursor = get_next_cursor(solution_translations, size, sort_by, SolutionTranslation) if cursor is not None else None
+
+    derivative_widths = await stored_file_repository.read_derivative_widths([key for x in solution_translations for key in (x.solution.image_url, x.solution.logo_url)])
 
+    last_modified = None
     datas = []
     for solution_translation in solution_translations:
-        image_url = f"{solution_service.static_folder_image}/{solution_translation.solution.image_url}" if solution_translation.solution.image_url else None
-        logo_url = f"{solution_service.static_folder_logo}/{solution_translation.solution.logo_url}" if solution_translation.solution.logo_url else None
+        last_modified = get_last_modified(last_modified, solution_translation.updated_at, solution_translation.solution.updated_at)
+        image_url = get_file_url(SolutionService.static_folder_image, solution_translation.solution.image_url)
+        image_srcset = get_srcset(SolutionService.static_folder_image, solution_translation.solution.image_url, derivative_widths)
+        logo_url = get_file_url(SolutionService.static_folder_logo, solution_translation.solution.logo_url)
+        logo_srcset = get_srcset(SolutionService.static_folder_logo, solution_translation.solution.logo_url, derivative_widths)
         
         datas.append({
             'id': solution_translation.id,
             'title': solution_translation.title,
             'description': solution_translation.description,
-            'created_at': str(solution_translation.created_at),
-            'updated_at': str(solution_translation.updated_at),
+            'created_at': solution_translation.created_at,
+            'updated_at': solution_translation.updated_at,
             'image_url': image_url,
-            'logo_url': logo_url    
+            'image_srcset': image_srcset,
+            'logo_url': logo_url,
+            'logo_srcset': logo_srcset,
         })
 
     status_code = status.HTTP_200_OK
@@ -88,9 +112,12 @@ def public_profile_solution(
             "size": size,
             "total": count,
             "total_pages": total_pages,
-            "offset": offset
+            "offset": offset,
+            "next_cursor": next_cursor
         },
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
-    return response
+    response = json_response(data_response, status_code)
+    set_validators(response, last_modified=last_modified)
+    await public_profile_cache.set(cache_key, user.id, response)
+    return conditional_response(request, response)
 
@@ -1,9 +1,8 @@
 from fastapi import APIRouter, Depends, Form, Query,status, HTTPException
-from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.dtos.role import CreateRole, EditRole
-from app.models.response import GeneralDataPaginateResponse, GeneralDataResponse
+from app.models.response import GeneralDataPaginateResponse, GeneralDataResponse, json_response
 from app.models.role.role import Role
 from app.models.role.role_authority import RoleAuthorityFeature, RoleAuthorityName
 from app.services.role.role_authority_service import RoleAuthorityService
@@ -11,14 +10,16 @@ from app.services.role.role_service import RoleService
 from app.services.user_service import UserService
 from app.utils.authentication import Authentication
 from app.utils.manual import get_total_pages
+from app.utils.pagination import get_next_cursor
+from app.utils.permission import require
 
 router = APIRouter()
 
 @router.post("", response_model=GeneralDataResponse, status_code=status.HTTP_201_CREATED)
-async def create_role(
+def create_role(
     data: CreateRole,
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.role, RoleAuthorityName.create))
 ):
     """
         Create Role
@@ -26,17 +27,8 @@ async def create_role(
         - should login
         - allow to create with role that has authority
     """
-    user_id = payload.get("uid", None)
-
     # service
-    user_service = UserService(db)
-    role_authority_service = RoleAuthorityService(db)
     role_service = RoleService(db)
-    
-    user_active = user_service.user_repository.read_user(user_id)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.role.value, name=RoleAuthorityName.create.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to create")
 
     # validation
     exist_code = role_service.role_repository.get_role_by_code(data.code)
@@ -69,13 +61,15 @@ async def create_role(
         status="OK",
         data=data,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.get("", response_model=GeneralDataPaginateResponse, status_code=status.HTTP_200_OK)
 def read_roles(
     offset: int = Query(None, ge=1), 
     size: int = Query(None, ge=1),
+    cursor: str = Query(None),
+    with_total: bool = Query(True),
     is_active: bool = Query(None),
     sort_by: str = Query(None),
     sort_order: str = Query(None),
@@ -95,23 +89,26 @@ def read_roles(
     user = user_service.user_repository.read_user(user_id)
     level = user.role.level if user.role else None
     
-    roles = role_service.role_repository.read_roles(
-        offset=offset, 
-        size=size,
-        is_active=is_active,
-        level=level,
-        sort_by=sort_by,
-        sort_order=sort_order,
-    )
+    try:
+        roles = role_service.role_repository.read_roles(
+            offset=offset, 
+            size=size,
+            cursor=cursor,
+            with_total=with_total,
+            is_active=is_active,
+            level=level,
+            sort_by=sort_by,
+            sort_order=sort_order,
+        )
+    except ValueError as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
 
     if not roles:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Data not found")
     
-    count = role_service.role_repository.count_roles(
-        is_active=is_active, 
-        level=level,
-    )
+    count = roles.total
     total_pages = get_total_pages(size, count)
+    next_cursor = get_next_cursor(roles, size, sort_by, Role) if cursor is not None else None
     
 
     datas = []
@@ -134,10 +131,11 @@ def read_roles(
             "size": size,
             "total": count,
             "total_pages": total_pages,
-            "offset": offset
+            "offset": offset,
+            "next_cursor": next_cursor
         },
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.get("/{role_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
@@ -170,15 +168,15 @@ def read_role(
             'is_active': role.is_active,
         },
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.patch("/{role_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
-async def update_role(
+def update_role(
     role_id: str,
     data: EditRole,
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.role, RoleAuthorityName.edit))
 ):
     """
         Update Role
@@ -186,18 +184,9 @@ async def update_role(
         - should login
         - allow to update with role that has authority
     """
-    user_id = payload.get("uid", None)
-
     # service
-    user_service = UserService(db)
-    role_authority_service = RoleAuthorityService(db)
     role_service = RoleService(db)
     
-    user_active = user_service.user_repository.read_user(user_id)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.role.value, name=RoleAuthorityName.edit.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to edit")
-    
     # validation
     exist_role = role_service.role_repository.read_role(role_id)
     if not exist_role:
@@ -230,14 +219,14 @@ async def update_role(
         status="OK",
         data=data,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.delete("/{role_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
-async def delete_role(
+def delete_role(
     role_id: str,
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.role, RoleAuthorityName.delete))
 ):
     """
         Delete Role
@@ -246,17 +235,9 @@ async def delete_role(
         - should login
         - allow to delete with role that has authority
     """
-    user_id = payload.get("uid", None)
-
     # service
     user_service = UserService(db)
-    role_authority_service = RoleAuthorityService(db)
     role_service = RoleService(db)
-    
-    user_active = user_service.user_repository.read_user(user_id)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.role.value, name=RoleAuthorityName.delete.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to delete")
 
     try:
         count_user = user_service.user_repository.count_users(role_id=role_id)
@@ -276,11 +257,11 @@ async def delete_role(
         status="OK",
         data=data,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.get("-resource", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
-async def read_role_resource(
+def read_role_resource(
     db: Session = Depends(get_db), 
     payload = Depends(Authentication())
 ):
@@ -307,5 +288,5 @@ async def read_role_resource(
         status="OK",
         data=role_authority_list,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
\ No newline at end of file
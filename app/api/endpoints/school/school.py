@@ -1,8 +1,7 @@
 from fastapi import APIRouter, Depends, Form, Query, UploadFile, status, HTTPException
-from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from app.database import get_db
-from app.models.response import GeneralDataPaginateResponse, GeneralDataResponse
+from app.models.response import GeneralDataPaginateResponse, GeneralDataResponse, json_response
 from app.models.role.role_authority import RoleAuthorityFeature, RoleAuthorityName
 from app.models.school.school import School
 from app.services.role.role_authority_service import RoleAuthorityService
@@ -12,18 +11,21 @@ from app.services.user_service import UserService
 from app.utils.authentication import Authentication
 from app.utils.handling_file import validation_file
 from app.utils.manual import get_total_pages
+from app.utils.pagination import get_next_cursor
+from app.utils.permission import require
+from app.utils.storage import get_file_url
 
 router = APIRouter()
 
 @router.post("", response_model=GeneralDataResponse, status_code=status.HTTP_201_CREATED)
-async def create_school(
+def create_school(
     code: str = Form(..., min_length=1, max_length=36),
     name: str = Form(..., min_length=1, max_length=36),
     website_url: str = Form(None, min_length=0, max_length=512),
     image: UploadFile = None,
     logo: UploadFile = None,
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.school, RoleAuthorityName.create))
 ):
     """
         Create School
@@ -31,17 +33,10 @@ async def create_school(
         - should login
         - allow to create with role that has authority
     """
-    user_id_active = payload.get("uid", None)
 
     # service
     school_service = SchoolService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
     
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.school.value, name=RoleAuthorityName.create.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to create")
 
     # validation
     exist_code = school_service.school_repository.get_school_by_code(code)
@@ -54,10 +49,10 @@ async def create_school(
     
     try:
         if (image):
-            await validation_file(file=image)
+            validation_file(file=image)
         
         if (logo):
-            await validation_file(file=logo)
+            validation_file(file=logo)
 
         content_type_image = image.content_type if image else ""
         file_extension_image = content_type_image.split('/')[1] if image else ""
@@ -92,7 +87,7 @@ async def create_school(
         status="OK",
         data=result,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.get("", response_model=GeneralDataPaginateResponse, status_code=status.HTTP_200_OK)
@@ -104,6 +99,8 @@ def read_schools(
     is_active: bool = Query(None),
     offset: int = Query(None, ge=1), 
     size: int = Query(None, ge=1),
+    cursor: str = Query(None),
+    with_total: bool = Query(True),
     db: Session = Depends(get_db), 
     payload = Depends(Authentication())
 ):
@@ -117,23 +114,26 @@ def read_schools(
     
     custom_filters = {filter_by_column: filter_value} if filter_by_column and filter_value else None
 
-    schools = school_service.school_repository.read_schools(
-        offset=offset, 
-        size=size, 
-        sort_by=sort_by, 
-        sort_order=sort_order, 
-        custom_filters=custom_filters,
-        is_active=is_active
-    )
+    try:
+        schools = school_service.school_repository.read_schools(
+            offset=offset, 
+            size=size, 
+            cursor=cursor,
+            with_total=with_total,
+            sort_by=sort_by, 
+            sort_order=sort_order, 
+            custom_filters=custom_filters,
+            is_active=is_active
+        )
+    except ValueError as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
 
     if not schools:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Data not found")
     
-    count = school_service.school_repository.count_schools(
-        custom_filters=custom_filters,
-        is_active=is_active
-    )
+    count = schools.total
     total_pages = get_total_pages(size, count)
+    next_cursor = get_next_cursor(schools, size, sort_by, School) if cursor is not None else None
     
 
     datas = []
@@ -143,10 +143,10 @@ def read_schools(
             'name': school.name,
             'code': school.code,
             'is_active': school.is_active,
-            'created_at': str(school.created_at),
-            'updated_at': str(school.updated_at),
-            'image_url': f"{school_service.static_folder_image}/{school.image_url}" if school.image_url else None,
-            'logo_url': f"{school_service.static_folder_logo}/{school.logo_url}" if school.logo_url else None,
+            'created_at': school.created_at,
+            'updated_at': school.updated_at,
+            'image_url': get_file_url(school_service.static_folder_image, school.image_url),
+            'logo_url': get_file_url(school_service.static_folder_logo, school.logo_url),
             'website_url': str(school.website_url) if school.website_url else None,
         })
 
@@ -159,10 +159,11 @@ def read_schools(
             "size": size,
             "total": count,
             "total_pages": total_pages,
-            "offset": offset
+            "offset": offset,
+            "next_cursor": next_cursor
         },
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.get("/{school_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
@@ -192,18 +193,18 @@ def read_school(
             'name': school.name,
             'code': school.code,
             'is_active': school.is_active,
-            'created_at': str(school.created_at),
-            'updated_at': str(school.updated_at),
-            'image_url': f"{school_service.static_folder_image}/{school.image_url}" if school.image_url else None,
-            'logo_url': f"{school_service.static_folder_logo}/{school.logo_url}" if school.logo_url else None,
+            'created_at': school.created_at,
+            'updated_at': school.updated_at,
+            'image_url': get_file_url(school_service.static_folder_image, school.image_url),
+            'logo_url': get_file_url(school_service.static_folder_logo, school.logo_url),
             'website_url': str(school.website_url) if school.website_url else None,
         },
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.patch("/{school_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
-async def update_school(
+def update_school(
     school_id: str,
     code: str = Form(None, min_length=0, max_length=36),
     name: str = Form(None, min_length=0, max_length=36),
@@ -212,7 +213,7 @@ async def update_school(
     image: UploadFile = None,
     logo: UploadFile = None,
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.school, RoleAuthorityName.edit))
 ):
     """
         Update School
@@ -220,17 +221,9 @@ async def update_school(
         - should login
         - allow to update with role that has authority
     """
-    user_id_active = payload.get("uid", None)
 
     # service
     school_service = SchoolService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
-    
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.school.value, name=RoleAuthorityName.edit.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to edit")
     
     # validation
     exist_school = school_service.school_repository.read_school(school_id)
@@ -239,10 +232,10 @@ async def update_school(
     
     try:
         if (image):
-            await validation_file(file=image)
+            validation_file(file=image)
         
         if (logo):
-            await validation_file(file=logo)
+            validation_file(file=logo)
 
         content_type_image = image.content_type if image else ""
         file_extension_image = content_type_image.split('/')[1] if image else ""
@@ -279,15 +272,15 @@ async def update_school(
         status="OK",
         data=data,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 
 @router.delete("/{school_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
-async def delete_school(
+def delete_school(
     school_id: str,
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.school, RoleAuthorityName.delete))
 ):
     """
         Delete School
@@ -295,17 +288,10 @@ async def delete_school(
         - should login
         - allow to delete with role that has authority
     """
-    user_id_active = payload.get("uid", None)
 
     # service
     school_service = SchoolService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
     
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.school.value, name=RoleAuthorityName.delete.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to delete")
 
     try:
         school_service.delete_school(school_id)
@@ -322,11 +308,11 @@ async def delete_school(
         status="OK",
         data=data,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.get("-resource", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
-async def read_school_resource(
+def read_school_resource(
     db: Session = Depends(get_db), 
     payload = Depends(Authentication())
 ):
@@ -353,5 +339,5 @@ async def read_school_resource(
         status="OK",
         data=role_authority_list,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
\ No newline at end of file
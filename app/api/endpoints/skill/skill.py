@@ -1,8 +1,7 @@
 from fastapi import APIRouter, Depends, Form, Query, UploadFile, status, HTTPException
-from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from app.database import get_db
-from app.models.response import GeneralDataPaginateResponse, GeneralDataResponse
+from app.models.response import GeneralDataPaginateResponse, GeneralDataResponse, json_response
 from app.models.role.role_authority import RoleAuthorityFeature, RoleAuthorityName
 from app.models.skill.skill import Skill
 from app.services.role.role_authority_service import RoleAuthorityService
@@ -12,11 +11,14 @@ from app.services.user_service import UserService
 from app.utils.authentication import Authentication
 from app.utils.handling_file import validation_file
 from app.utils.manual import get_total_pages
+from app.utils.pagination import get_next_cursor
+from app.utils.permission import require
+from app.utils.storage import get_file_url
 
 router = APIRouter()
 
 @router.post("", response_model=GeneralDataResponse, status_code=status.HTTP_201_CREATED)
-async def create_skill(
+def create_skill(
     code: str = Form(..., min_length=1, max_length=36),
     name: str = Form(..., min_length=1, max_length=36),
     website_url: str = Form(None, min_length=0, max_length=512),
@@ -24,7 +26,7 @@ async def create_skill(
     image: UploadFile = None,
     logo: UploadFile = None,
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.skill_other, RoleAuthorityName.create))
 ):
     """
         Create Skill
@@ -32,17 +34,10 @@ async def create_skill(
         - should login
         - allow to create with role that has authority
     """
-    user_id_active = payload.get("uid", None)
 
     # service
     skill_service = SkillService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
     
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.skill_other.value, name=RoleAuthorityName.create.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to create")
 
     # validation
     exist_code = skill_service.skill_repository.get_skill_by_code(code)
@@ -55,10 +50,10 @@ async def create_skill(
     
     try:
         if (image):
-            await validation_file(file=image)
+            validation_file(file=image)
         
         if (logo):
-            await validation_file(file=logo)
+            validation_file(file=logo)
 
         content_type_image = image.content_type if image else ""
         file_extension_image = content_type_image.split('/')[1] if image else ""
@@ -94,7 +89,7 @@ async def create_skill(
         status="OK",
         data=result,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.get("", response_model=GeneralDataPaginateResponse, status_code=status.HTTP_200_OK)
@@ -106,6 +101,8 @@ def read_skills(
     is_active: bool = Query(None),
     offset: int = Query(None, ge=1), 
     size: int = Query(None, ge=1),
+    cursor: str = Query(None),
+    with_total: bool = Query(True),
     db: Session = Depends(get_db), 
     payload = Depends(Authentication())
 ):
@@ -119,23 +116,26 @@ def read_skills(
     
     custom_filters = {filter_by_column: filter_value} if filter_by_column and filter_value else None
 
-    skills = skill_service.skill_repository.read_skills(
-        offset=offset, 
-        size=size, 
-        sort_by=sort_by, 
-        sort_order=sort_order, 
-        custom_filters=custom_filters,
-        is_active=is_active
-    )
+    try:
+        skills = skill_service.skill_repository.read_skills(
+            offset=offset, 
+            size=size, 
+            cursor=cursor,
+            with_total=with_total,
+            sort_by=sort_by, 
+            sort_order=sort_order, 
+            custom_filters=custom_filters,
+            is_active=is_active
+        )
+    except ValueError as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
 
     if not skills:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Data not found")
     
-    count = skill_service.skill_repository.count_skills(
-        custom_filters=custom_filters,
-        is_active=is_active
-    )
+    count = skills.total
     total_pages = get_total_pages(size, count)
+    next_cursor = get_next_cursor(skills, size, sort_by, Skill) if cursor is not None else None
     
 
     datas = []
@@ -146,10 +146,10 @@ def read_skills(
             'code': skill.code,
             'is_active': skill.is_active,
             'category': skill.category,
-            'created_at': str(skill.created_at),
-            'updated_at': str(skill.updated_at),
-            'image_url': f"{skill_service.static_folder_image}/{skill.image_url}" if skill.image_url else None,
-            'logo_url': f"{skill_service.static_folder_logo}/{skill.logo_url}" if skill.logo_url else None,
+            'created_at': skill.created_at,
+            'updated_at': skill.updated_at,
+            'image_url': get_file_url(skill_service.static_folder_image, skill.image_url),
+            'logo_url': get_file_url(skill_service.static_folder_logo, skill.logo_url),
             'website_url': str(skill.website_url) if skill.website_url else None,
         })
 
@@ -162,10 +162,11 @@ def read_skills(
             "size": size,
             "total": count,
             "total_pages": total_pages,
-            "offset": offset
+            "offset": offset,
+            "next_cursor": next_cursor
         },
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.get("/{skill_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
@@ -196,18 +197,18 @@ def read_skill(
             'code': skill.code,
             'is_active': skill.is_active,
             'category': skill.category,
-            'created_at': str(skill.created_at),
-            'updated_at': str(skill.updated_at),
-            'image_url': f"{skill_service.static_folder_image}/{skill.image_url}" if skill.image_url else None,
-            'logo_url': f"{skill_service.static_folder_logo}/{skill.logo_url}" if skill.logo_url else None,
+            'created_at': skill.created_at,
+            'updated_at': skill.updated_at,
+            'image_url': get_file_url(skill_service.static_folder_image, skill.image_url),
+            'logo_url': get_file_url(skill_service.static_folder_logo, skill.logo_url),
             'website_url': str(skill.website_url) if skill.website_url else None,
         },
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.patch("/{skill_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
-async def update_skill(
+def update_skill(
     skill_id: str,
     code: str = Form(None, min_length=0, max_length=36),
     name: str = Form(None, min_length=0, max_length=36),
@@ -217,7 +218,7 @@ async def update_skill(
     image: UploadFile = None,
     logo: UploadFile = None,
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.skill_other, RoleAuthorityName.edit))
 ):
     """
         Update Skill
@@ -225,17 +226,9 @@ async def update_skill(
         - should login
         - allow to update with role that has authority
     """
-    user_id_active = payload.get("uid", None)
     
     # service
     skill_service = SkillService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
-    
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.skill_other.value, name=RoleAuthorityName.edit.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to edit")
     
     # validation
     exist_skill = skill_service.skill_repository.read_skill(skill_id)
@@ -244,10 +237,10 @@ async def update_skill(
     
     try:
         if (image):
-            await validation_file(file=image)
+            validation_file(file=image)
         
         if (logo):
-            await validation_file(file=logo)
+            validation_file(file=logo)
 
         content_type_image = image.content_type if image else ""
         file_extension_image = content_type_image.split('/')[1] if image else ""
@@ -285,15 +278,15 @@ async def update_skill(
         status="OK",
         data=data,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 
 @router.delete("/{skill_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
-async def delete_skill(
+def delete_skill(
     skill_id: str,
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.skill_other, RoleAuthorityName.delete))
 ):
     """
         Delete Skill
@@ -301,17 +294,10 @@ async def delete_skill(
         - should login
         - allow to delete with role that has authority
     """
-    user_id_active = payload.get("uid", None)
 
     # service
     skill_service = SkillService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
     
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.skill_other.value, name=RoleAuthorityName.delete.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to delete")
 
     try:
         skill_service.delete_skill(skill_id)
@@ -328,11 +314,11 @@ async def delete_skill(
         status="OK",
         data=data,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.get("-resource", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
-async def read_skill_resource(
+def read_skill_resource(
     db: Session = Depends(get_db), 
     payload = Depends(Authentication())
 ):
@@ -359,5 +345,5 @@ async def read_skill_resource(
         status="OK",
         data=role_authority_list,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
\ No newline at end of file
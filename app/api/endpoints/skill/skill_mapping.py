@@ -1,25 +1,24 @@
 from datetime import date
 from fastapi import APIRouter, Depends, Form, Query, status, HTTPException
-from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from app.database import get_db
-from app.models.response import GeneralDataPaginateResponse, GeneralDataResponse
+from app.models.response import GeneralDataPaginateResponse, GeneralDataResponse, json_response
 from app.models.role.role_authority import RoleAuthorityFeature, RoleAuthorityName
 from app.models.skill.skill_mapping import SkillMapping
-from app.services.role.role_authority_service import RoleAuthorityService
 from app.services.skill.skill_mapping_service import SkillMappingService
 from app.services.skill.skill_service import SkillService
-from app.services.user_service import UserService
 from app.utils.authentication import Authentication
 from app.utils.manual import get_total_pages
+from app.utils.pagination import get_next_cursor
+from app.utils.permission import has_permission, require
 
 router = APIRouter()
 
 @router.post("", response_model=GeneralDataResponse, status_code=status.HTTP_201_CREATED)
-async def create_skill_mapping(
+def create_skill_mapping(
     skill_id: str = Form(..., min_length=1, max_length=36),
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.skill_mapping, RoleAuthorityName.create))
 ):
     """
         Create Skill Mapping
@@ -32,13 +31,7 @@ async def create_skill_mapping(
     # service
     skill_service = SkillService(db)
     skill_mapping_service = SkillMappingService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
     
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.skill_mapping.value, name=RoleAuthorityName.create.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to create")
 
     # validation
     exist_skill = skill_service.skill_repository.read_skill(skill_id)
@@ -72,7 +65,7 @@ async def create_skill_mapping(
         status="OK",
         data=result,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.get("", response_model=GeneralDataPaginateResponse, status_code=status.HTTP_200_OK)
@@ -84,6 +77,8 @@ def read_skill_mappings(
     is_active: bool = Query(None),
     offset: int = Query(None, ge=1), 
     size: int = Query(None, ge=1),
+    cursor: str = Query(None),
+    with_total: bool = Query(True),
     db: Session = Depends(get_db), 
     payload = Depends(Authentication())
 ):
@@ -98,37 +93,35 @@ def read_skill_mappings(
     user_id_active = payload.get("uid", None)
     skill_mapping_service = SkillMappingService(db)
 
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
 
     user_id_filter = user_id_active
     
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.skill_other.value, name=RoleAuthorityName.create.value)
-    if role_authority:
+    if has_permission(db, payload, RoleAuthorityFeature.skill_other, RoleAuthorityName.create):
         user_id_filter = None
 
     custom_filters = {filter_by_column: filter_value} if filter_by_column and filter_value else None
 
-    skill_mappings = skill_mapping_service.skill_mapping_repository.read_skill_mappings(
-        offset=offset, 
-        size=size, 
-        sort_by=sort_by, 
-        sort_order=sort_order, 
-        custom_filters=custom_filters,
-        is_active=is_active,
-        user_id=user_id_filter,
-    )
+    try:
+        skill_mappings = skill_mapping_service.skill_mapping_repository.read_skill_mappings(
+            offset=offset, 
+            size=size, 
+            cursor=cursor,
+            with_total=with_total,
+            sort_by=sort_by, 
+            sort_order=sort_order, 
+            custom_filters=custom_filters,
+            is_active=is_active,
+            user_id=user_id_filter,
+        )
+    except ValueError as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
 
     if not skill_mappings:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Data not found")
     
-    count = skill_mapping_service.skill_mapping_repository.count_skill_mappings(
-        custom_filters=custom_filters,
-        is_active=is_active,
-        user_id=user_id_filter,
-    )
+    count = skill_mappings.total
     total_pages = get_total_pages(size, count)
+    next_cursor = get_next_cursor(skill_mappings, size, sort_by, SkillMapping) if cursor is not None else None
     
 
     datas = []
@@ -141,8 +134,8 @@ def read_skill_mappings(
             'id': skill_mapping.id,
             'skill': skill,
             'is_active': skill_mapping.is_active,
-            'created_at': str(skill_mapping.created_at),
-            'updated_at': str(skill_mapping.updated_at),
+            'created_at': skill_mapping.created_at,
+            'updated_at': skill_mapping.updated_at,
         })
 
     status_code = status.HTTP_200_OK
@@ -154,10 +147,11 @@ def read_skill_mappings(
             "size": size,
             "total": count,
             "total_pages": total_pages,
-            "offset": offset
+            "offset": offset,
+            "next_cursor": next_cursor
         },
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.get("/{skill_mapping_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
@@ -176,14 +170,10 @@ def read_skill_mapping(
     """
     user_id_active = payload.get("uid", None)
     skill_mapping_service = SkillMappingService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
 
     user_id_filter = user_id_active
     
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.skill_mapping.value, name=RoleAuthorityName.view.value)
-    if role_authority:
+    if has_permission(db, payload, RoleAuthorityFeature.skill_mapping, RoleAuthorityName.view):
         user_id_filter = None
 
     skill_mapping = skill_mapping_service.skill_mapping_repository.read_skill_mapping(skill_mapping_id)
@@ -207,19 +197,19 @@ def read_skill_mapping(
             'id': skill_mapping.id,
             'skill': skill,
             'is_active': skill_mapping.is_active,
-            'created_at': str(skill_mapping.created_at),
-            'updated_at': str(skill_mapping.updated_at),
+            'created_at': skill_mapping.created_at,
+            'updated_at': skill_mapping.updated_at,
         },
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.patch("/{skill_mapping_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
-async def update_skill_mapping(
+def update_skill_mapping(
     skill_mapping_id: str,
     is_active: bool = Form(default=True),
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.skill_mapping, RoleAuthorityName.edit))
 ):
     """
         Update Skill Mapping
@@ -234,13 +224,6 @@ async def update_skill_mapping(
 
     # service
     skill_mapping_service = SkillMappingService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
-    
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.skill_mapping.value, name=RoleAuthorityName.edit.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to edit")
     
     # validation
     exist_skill_mapping = skill_mapping_service.skill_mapping_repository.read_skill_mapping(skill_mapping_id)
@@ -248,8 +231,7 @@ async def update_skill_mapping(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Skill Mapping not found")
     
     user_id_filter = user_id_active
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.skill_other.value, name=RoleAuthorityName.edit.value)
-    if role_authority:
+    if has_permission(db, payload, RoleAuthorityFeature.skill_other, RoleAuthorityName.edit):
         user_id_filter = None
     
     if user_id_filter is not None and exist_skill_mapping.user_id != user_id_filter:
@@ -278,15 +260,15 @@ async def update_skill_mapping(
         status="OK",
         data=data,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 
 @router.delete("/{skill_mapping_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
-async def delete_skill_mapping(
+def delete_skill_mapping(
     skill_mapping_id: str,
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.skill_mapping, RoleAuthorityName.delete))
 ):
     """
         Delete Skill Mapping
@@ -298,21 +280,13 @@ async def delete_skill_mapping(
 
     # service
     skill_mapping_service = SkillMappingService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
-    
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.skill_mapping.value, name=RoleAuthorityName.delete.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to delete")
     
     exist_skill_mapping = skill_mapping_service.skill_mapping_repository.read_skill_mapping(skill_mapping_id)
     if not exist_skill_mapping:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Skill Mapping not found")
     
     user_id_filter = user_id_active
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.skill_other.value, name=RoleAuthorityName.delete.value)
-    if role_authority:
+    if has_permission(db, payload, RoleAuthorityFeature.skill_other, RoleAuthorityName.delete):
         user_id_filter = None
 
     if user_id_filter is not None and exist_skill_mapping.user_id != user_id_filter:
@@ -333,5 +307,5 @@ async def delete_skill_mapping(
         status="OK",
         data=data,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
\ No newline at end of file
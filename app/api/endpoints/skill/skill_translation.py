@@ -1,27 +1,25 @@
 from fastapi import APIRouter, Depends, Form, status, HTTPException
-from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models import LanguageOption
-from app.models.response import GeneralDataResponse
+from app.models.response import GeneralDataResponse, json_response
 from app.models.role.role_authority import RoleAuthorityFeature, RoleAuthorityName
 from app.models.skill.skill_translation import SkillTranslation
 from app.services.skill.skill_service import SkillService
-from app.services.role.role_authority_service import RoleAuthorityService
 from app.services.skill.skill_translation_service import SkillTranslationService
-from app.services.user_service import UserService
 from app.utils.authentication import Authentication
+from app.utils.permission import require
 
 router = APIRouter()
 
 @router.post("", response_model=GeneralDataResponse, status_code=status.HTTP_201_CREATED)
-async def create_skill_translation(
+def create_skill_translation(
     skill_id: str = Form(..., min_length=1, max_length=36),
     language_id: LanguageOption = Form(...),
     name: str = Form(..., min_length=1, max_length=128),
     description: str = Form(None, min_length=0, max_length=512),
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.skill, RoleAuthorityName.create))
 ):
     """
         Create Skill Translation
@@ -29,19 +27,11 @@ async def create_skill_translation(
         - should login
         - allow to create with role that has authority
     """
-    user_id_active = payload.get("uid", None)
 
     # service
     skill_translation_service = SkillTranslationService(db)
     skill_service = SkillService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
     
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.skill.value, name=RoleAuthorityName.create.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to create")
-
     language_id = language_id.value
 
     # validation
@@ -76,7 +66,7 @@ async def create_skill_translation(
         status="OK",
         data=result,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.get("/{skill_id}/{language_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
@@ -106,21 +96,21 @@ def read_skill_translation(
             'name': skill_translation.name,
             'description': skill_translation.description,
             'language_id': skill_translation.language_id,
-            'created_at': str(skill_translation.created_at),
-            'updated_at': str(skill_translation.updated_at),
+            'created_at': skill_translation.created_at,
+            'updated_at': skill_translation.updated_at,
         },
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.patch("/{skill_id}/{language_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
-async def update_skill_translation(
+def update_skill_translation(
     skill_id: str,
     language_id: LanguageOption,
     name: str = Form(..., min_length=1, max_length=128),
     description: str = Form(None, min_length=0, max_length=512),
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.skill, RoleAuthorityName.edit))
 ):
     """
         Update Skill Translation
@@ -128,17 +118,9 @@ async def update_skill_translation(
         - should login
         - allow to update with role that has authority
     """
-    user_id_active = payload.get("uid", None)
 
     # service
     skill_translation_service = SkillTranslationService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
-    
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.skill.value, name=RoleAuthorityName.edit.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to edit")
     
     # validation
     exist_skill_translation = skill_translation_service.skill_translation_repository.get_skill_translation_by_skill_id_and_language_id(skill_id=skill_id, language_id=language_id.value)
@@ -171,16 +153,16 @@ async def update_skill_translation(
         status="OK",
         data=data,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 
 @router.delete("/{skill_id}/{language_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
-async def delete_skill_translation(
+def delete_skill_translation(
     skill_id: str,
     language_id: LanguageOption,
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.skill, RoleAuthorityName.delete))
 ):
     """
         Delete SkillTranslation
@@ -188,18 +170,10 @@ async def delete_skill_translation(
         - should login
         - allow to delete with role that has authority
     """
-    user_id_active = payload.get("uid", None)
 
     # service
     skill_translation_service = SkillTranslationService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
     
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.skill.value, name=RoleAuthorityName.delete.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to delete")
-
     try:
         skill_translation_service.delete_skill_translation(skill_id=skill_id, language_id=language_id)
     except ValueError as error:
@@ -216,5 +190,5 @@ async def delete_skill_translation(
         status="OK",
         data=data,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
\ No newline at end of file
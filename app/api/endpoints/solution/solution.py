@@ -1,9 +1,8 @@
 from datetime import date
 from fastapi import APIRouter, Depends, Form, Query, UploadFile, status, HTTPException
-from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from app.database import get_db
-from app.models.response import GeneralDataPaginateResponse, GeneralDataResponse
+from app.models.response import GeneralDataPaginateResponse, GeneralDataResponse, json_response
 from app.models.role.role_authority import RoleAuthorityFeature, RoleAuthorityName
 from app.models.solution.solution import Solution
 from app.services.role.role_authority_service import RoleAuthorityService
@@ -12,16 +11,19 @@ from app.services.user_service import UserService
 from app.utils.authentication import Authentication
 from app.utils.handling_file import validation_file
 from app.utils.manual import get_total_pages
+from app.utils.pagination import get_next_cursor
+from app.utils.permission import has_permission, require
+from app.utils.storage import get_file_url
 
 router = APIRouter()
 
 @router.post("", response_model=GeneralDataResponse, status_code=status.HTTP_201_CREATED)
-async def create_solution(
+def create_solution(
     title: str = Form(..., min_length=1, max_length=128),
     image: UploadFile = None,
     logo: UploadFile = None,
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.solution, RoleAuthorityName.create))
 ):
     """
         Create Solution
@@ -33,20 +35,13 @@ async def create_solution(
 
     # service
     solution_service = SolutionService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
-    
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.solution.value, name=RoleAuthorityName.create.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to create")
 
     try:
         if (image):
-            await validation_file(file=image)
+            validation_file(file=image)
         
         if (logo):
-            await validation_file(file=logo)
+            validation_file(file=logo)
 
         content_type_image = image.content_type if image else ""
         file_extension_image = content_type_image.split('/')[1] if image else ""
@@ -59,15 +54,12 @@ async def create_solution(
             title=title,
         )
 
-        file_name = f"{user_active.username}-{title}"
-
         data = solution_service.create_solution(
             solution=solution_model,
             image=image,
             logo=logo,
             file_extension_image=file_extension_image,
             file_extension_logo=file_extension_logo,
-            file_name=file_name,
         )
     except ValueError as error:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
@@ -83,7 +75,7 @@ async def create_solution(
         status="OK",
         data=result,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.get("", response_model=GeneralDataPaginateResponse, status_code=status.HTTP_200_OK)
@@ -95,6 +87,8 @@ def read_solutions(
     is_active: bool = Query(None),
     offset: int = Query(None, ge=1), 
     size: int = Query(None, ge=1),
+    cursor: str = Query(None),
+    with_total: bool = Query(True),
     db: Session = Depends(get_db), 
     payload = Depends(Authentication())
 ):
@@ -109,38 +103,36 @@ def read_solutions(
     user_id_active = payload.get("uid", None)
     solution_service = SolutionService(db)
 
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
 
     user_id_filter = user_id_active
     
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.solution_other.value, name=RoleAuthorityName.create.value)
-    if role_authority:
+    if has_permission(db, payload, RoleAuthorityFeature.solution_other, RoleAuthorityName.create):
         user_id_filter = None
 
     
     custom_filters = {filter_by_column: filter_value} if filter_by_column and filter_value else None
 
-    solutions = solution_service.solution_repository.read_solutions(
-        offset=offset, 
-        size=size, 
-        sort_by=sort_by, 
-        sort_order=sort_order, 
-        custom_filters=custom_filters,
-        is_active=is_active,
-        user_id=user_id_filter,
-    )
+    try:
+        solutions = solution_service.solution_repository.read_solutions(
+            offset=offset, 
+            size=size, 
+            cursor=cursor,
+            with_total=with_total,
+            sort_by=sort_by, 
+            sort_order=sort_order, 
+            custom_filters=custom_filters,
+            is_active=is_active,
+            user_id=user_id_filter,
+        )
+    except ValueError as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
 
     if not solutions:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Data not found")
     
-    count = solution_service.solution_repository.count_solutions(
-        custom_filters=custom_filters,
-        is_active=is_active,
-        user_id=user_id_filter,
-    )
+    count = solutions.total
     total_pages = get_total_pages(size, count)
+    next_cursor = get_next_cursor(solutions, size, sort_by, Solution) if cursor is not None else None
     
 
     datas = []
@@ -149,10 +141,10 @@ def read_solutions(
             'id': solution.id,
             'title': solution.title,
             'is_active': solution.is_active,
-            'created_at': str(solution.created_at),
-            'updated_at': str(solution.updated_at),
-            'image_url': f"{solution_service.static_folder_image}/{solution.image_url}" if solution.image_url else None,
-            'logo_url': f"{solution_service.static_folder_logo}/{solution.logo_url}" if solution.logo_url else None,
+            'created_at': solution.created_at,
+            'updated_at': solution.updated_at,
+            'image_url': get_file_url(solution_service.static_folder_image, solution.image_url),
+            'logo_url': get_file_url(solution_service.static_folder_logo, solution.logo_url),
         })
 
     status_code = status.HTTP_200_OK
@@ -164,10 +156,11 @@ def read_solutions(
             "size": size,
             "total": count,
             "total_pages": total_pages,
-            "offset": offset
+            "offset": offset,
+            "next_cursor": next_cursor
         },
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.get("/{solution_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
@@ -187,14 +180,10 @@ def read_solution(
     user_id_active = payload.get("uid", None)
     solution_service = SolutionService(db)
 
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
 
     user_id_filter = user_id_active
     
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.solution_other.value, name=RoleAuthorityName.view.value)
-    if role_authority:
+    if has_permission(db, payload, RoleAuthorityFeature.solution_other, RoleAuthorityName.view):
         user_id_filter = None
 
     
@@ -214,24 +203,24 @@ def read_solution(
             'id': solution.id,
             'title': solution.title,
             'is_active': solution.is_active,
-            'created_at': str(solution.created_at),
-            'updated_at': str(solution.updated_at),
-            'image_url': f"{solution_service.static_folder_image}/{solution.image_url}" if solution.image_url else None,
-            'logo_url': f"{solution_service.static_folder_logo}/{solution.logo_url}" if solution.logo_url else None,
+            'created_at': solution.created_at,
+            'updated_at': solution.updated_at,
+            'image_url': get_file_url(solution_service.static_folder_image, solution.image_url),
+            'logo_url': get_file_url(solution_service.static_folder_logo, solution.logo_url),
         },
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.patch("/{solution_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
-async def update_solution(
+def update_solution(
     solution_id: str,
     title: str = Form(None, min_length=0, max_length=128),
     image: UploadFile = None,
     logo: UploadFile = None,
     is_active: bool = Form(default=True),
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.solution, RoleAuthorityName.edit))
 ):
     """
         Update Solution
@@ -246,17 +235,9 @@ async def update_solution(
 
     # service
     solution_service = SolutionService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
-    
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.solution.value, name=RoleAuthorityName.edit.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to edit")
-    
+
     user_id_filter = user_id_active
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.solution_other.value, name=RoleAuthorityName.edit.value)
-    if role_authority:
+    if has_permission(db, payload, RoleAuthorityFeature.solution_other, RoleAuthorityName.edit):
         user_id_filter = None
 
     # validation
@@ -269,10 +250,10 @@ async def update_solution(
 
     try:
         if (image):
-            await validation_file(file=image)
+            validation_file(file=image)
         
         if (logo):
-            await validation_file(file=logo)
+            validation_file(file=logo)
 
         content_type_image = image.content_type if image else ""
         file_extension_image = content_type_image.split('/')[1] if image else ""
@@ -286,8 +267,6 @@ async def update_solution(
             is_active=is_active,
         )
 
-        file_name = f"{user_active.username}-{title}"
-
         data = solution_service.update_solution(
             exist_solution=exist_solution,
             solution=solution_model,
@@ -295,7 +274,6 @@ async def update_solution(
             logo=logo,
             file_extension_image=file_extension_image,
             file_extension_logo=file_extension_logo,
-            file_name=file_name
         )
     except ValueError as error:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
@@ -310,15 +288,15 @@ async def update_solution(
         status="OK",
         data=data,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 
 @router.delete("/{solution_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
-async def delete_solution(
+def delete_solution(
     solution_id: str,
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.solution, RoleAuthorityName.delete))
 ):
     """
         Delete Solution
@@ -333,21 +311,13 @@ async def delete_solution(
 
     # service
     solution_service = SolutionService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
-    
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.solution.value, name=RoleAuthorityName.delete.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to delete")
     
     exist_solution = solution_service.solution_repository.read_solution(solution_id)
     if not exist_solution:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Solution not found")
 
     user_id_filter = user_id_active
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.solution_other.value, name=RoleAuthorityName.delete.value)
-    if role_authority:
+    if has_permission(db, payload, RoleAuthorityFeature.solution_other, RoleAuthorityName.delete):
         user_id_filter = None
     
     if user_id_filter is not None and exist_solution.user_id != user_id_filter:
@@ -368,11 +338,11 @@ async def delete_solution(
         status="OK",
         data=data,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.get("-resource", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
-async def read_solution_resource(
+def read_solution_resource(
     db: Session = Depends(get_db), 
     payload = Depends(Authentication())
 ):
@@ -399,5 +369,5 @@ async def read_solution_resource(
         status="OK",
         data=role_authority_list,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
\ No newline at end of file
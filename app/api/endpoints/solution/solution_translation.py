@@ -1,27 +1,25 @@
 from fastapi import APIRouter, Depends, Form, status, HTTPException
-from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models import LanguageOption
-from app.models.response import GeneralDataResponse
+from app.models.response import GeneralDataResponse, json_response
 from app.models.role.role_authority import RoleAuthorityFeature, RoleAuthorityName
 from app.models.solution.solution_translation import SolutionTranslation
 from app.services.solution.solution_service import SolutionService
-from app.services.role.role_authority_service import RoleAuthorityService
 from app.services.solution.solution_translation_service import SolutionTranslationService
-from app.services.user_service import UserService
 from app.utils.authentication import Authentication
+from app.utils.permission import has_permission, require
 
 router = APIRouter()
 
 @router.post("", response_model=GeneralDataResponse, status_code=status.HTTP_201_CREATED)
-async def create_solution_translation(
+def create_solution_translation(
     solution_id: str = Form(..., min_length=1, max_length=36),
     language_id: LanguageOption = Form(...),
     title: str = Form(..., min_length=1, max_length=128),
     description: str = Form(None, min_length=0, max_length=512),
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.solution, RoleAuthorityName.create))
 ):
     """
         Create Solution Translation
@@ -34,17 +32,9 @@ async def create_solution_translation(
     # service
     solution_translation_service = SolutionTranslationService(db)
     solution_service = SolutionService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
     
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.solution.value, name=RoleAuthorityName.create.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to create")
-
     user_id_filter = user_id_active
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.solution_other.value, name=RoleAuthorityName.create.value)
-    if role_authority:
+    if has_permission(db, payload, RoleAuthorityFeature.solution_other, RoleAuthorityName.create):
         user_id_filter = None
 
     language_id = language_id.value
@@ -84,7 +74,7 @@ async def create_solution_translation(
         status="OK",
         data=result,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.get("/{solution_id}/{language_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
@@ -101,14 +91,10 @@ def read_solution_translation(
     """
     user_id_active = payload.get("uid", None)
     solution_translation_service = SolutionTranslationService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
 
     user_id_filter = user_id_active
 
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.solution_other.value, name=RoleAuthorityName.view.value)
-    if role_authority:
+    if has_permission(db, payload, RoleAuthorityFeature.solution_other, RoleAuthorityName.view):
         user_id_filter = None
 
     solution_translation = solution_translation_service.solution_translation_repository.get_solution_translation_by_solution_id_and_language_id(solution_id=solution_id, language_id=language_id.value)
@@ -128,21 +114,21 @@ def read_solution_translation(
             'title': solution_translation.title,
             'description': solution_translation.description,
             'language_id': solution_translation.language_id,
-            'created_at': str(solution_translation.created_at),
-            'updated_at': str(solution_translation.updated_at),
+            'created_at': solution_translation.created_at,
+            'updated_at': solution_translation.updated_at,
         },
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.patch("/{solution_id}/{language_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
-async def update_solution_translation(
+def update_solution_translation(
     solution_id: str,
     language_id: LanguageOption,
     title: str = Form(None, min_length=1, max_length=128),
     description: str = Form(None, min_length=0, max_length=512),
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.solution, RoleAuthorityName.edit))
 ):
     """
         Update Solution Translation
@@ -154,17 +140,9 @@ async def update_solution_translation(
 
     # service
     solution_translation_service = SolutionTranslationService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
-    
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.solution.value, name=RoleAuthorityName.edit.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to edit")
     
     user_id_filter = user_id_active
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.solution_other.value, name=RoleAuthorityName.edit.value)
-    if role_authority:
+    if has_permission(db, payload, RoleAuthorityFeature.solution_other, RoleAuthorityName.edit):
         user_id_filter = None
 
     # validation
@@ -201,16 +179,16 @@ async def update_solution_translation(
         status="OK",
         data=data,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 
 @router.delete("/{solution_id}/{language_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
-async def delete_solution_translation(
+def delete_solution_translation(
     solution_id: str,
     language_id: LanguageOption,
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.solution, RoleAuthorityName.delete))
 ):
     """
         Delete SolutionTranslation
@@ -222,21 +200,13 @@ async def delete_solution_translation(
 
     # service
     solution_translation_service = SolutionTranslationService(db)
-    role_authority_service = RoleAuthorityService(db)
-    user_service = UserService(db)
     
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.solution.value, name=RoleAuthorityName.delete.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to delete")
-
     exist_solution_translation = solution_translation_service.solution_translation_repository.get_solution_translation_by_solution_id_and_language_id(solution_id, language_id)
     if not exist_solution_translation:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Solution not found")
 
     user_id_filter = user_id_active
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.solution_other.value, name=RoleAuthorityName.delete.value)
-    if role_authority:
+    if has_permission(db, payload, RoleAuthorityFeature.solution_other, RoleAuthorityName.delete):
         user_id_filter = None
 
     if user_id_filter is not None and exist_solution_translation.solution.user_id != user_id_filter:
@@ -258,5 +228,5 @@ async def delete_solution_translation(
         status="OK",
         data=data,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
\ No newline at end of file
@@ -1,8 +1,7 @@
 from fastapi import APIRouter, Depends, Form, Query, UploadFile, status, HTTPException
-from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from app.database import get_db
-from app.models.response import GeneralDataPaginateResponse, GeneralDataResponse
+from app.models.response import GeneralDataPaginateResponse, GeneralDataResponse, json_response
 from app.models.role.role_authority import RoleAuthorityFeature, RoleAuthorityName
 from app.models.user import User, UserGender
 from app.services.role.role_authority_service import RoleAuthorityService
@@ -11,11 +10,14 @@ from app.services.user_service import UserService
 from app.utils.authentication import Authentication
 from app.utils.handling_file import validation_file
 from app.utils.manual import get_total_pages
+from app.utils.pagination import get_next_cursor
+from app.utils.permission import has_permission, require
+from app.utils.storage import get_file_url
 
 router = APIRouter()
 
 @router.post("", response_model=GeneralDataResponse, status_code=status.HTTP_201_CREATED)
-async def create_user(
+def create_user(
     role_id: int = Form(...),
     username: str = Form(..., min_length=1, max_length=36),
     email: str = Form(..., min_length=1, max_length=36),
@@ -25,7 +27,7 @@ async def create_user(
     gender: UserGender = Form(...),
     image: UploadFile = None,
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.user, RoleAuthorityName.create))
 ):
     """
         Create User
@@ -33,17 +35,11 @@ async def create_user(
         - should login
         - allow to create with role that has authority
     """
-    user_id_active = payload.get("uid", None)
 
     # service
     user_service = UserService(db)
-    role_authority_service = RoleAuthorityService(db)
     role_service = RoleService(db)
     
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.user.value, name=RoleAuthorityName.create.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to create")
 
     # validation
     exist_role_id = role_service.role_repository.read_role(role_id)
@@ -60,7 +56,7 @@ async def create_user(
     
     try:
         if (image):
-            await validation_file(file=image)
+            validation_file(file=image)
 
         content_type = image.content_type if image else ""
         file_extension = content_type.split('/')[1] if image else ""
@@ -94,7 +90,7 @@ async def create_user(
         status="OK",
         data=result,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.get("", response_model=GeneralDataPaginateResponse, status_code=status.HTTP_200_OK)
@@ -108,6 +104,8 @@ def read_users(
     is_active: bool = Query(None),
     offset: int = Query(None, ge=1), 
     size: int = Query(None, ge=1),
+    cursor: str = Query(None),
+    with_total: bool = Query(True),
     db: Session = Depends(get_db), 
     payload = Depends(Authentication())
 ):
@@ -122,7 +120,6 @@ def read_users(
     """
     user_id_active = payload.get('uid', None)
     user_service = UserService(db)
-    role_authority_service = RoleAuthorityService(db)
 
     custom_filters = {filter_by_column: filter_value} if filter_by_column and filter_value else None
     
@@ -130,35 +127,33 @@ def read_users(
     role_level = user_active.role.level if user_active.role else None
 
     user_id = None
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.user.value, name=RoleAuthorityName.view.value)
-    if not role_authority:
+    if not has_permission(db, payload, RoleAuthorityFeature.user, RoleAuthorityName.view):
         user_id =  user_active.id
 
-    users = user_service.user_repository.read_users(
-        role_id=role_id, 
-        offset=offset, 
-        size=size, 
-        sort_by=sort_by, 
-        sort_order=sort_order, 
-        custom_filters=custom_filters,
-        role_level=role_level,
-        is_role_level=is_role_level,
-        user_id=user_id,
-        is_active=is_active
-    )
+    try:
+        users = user_service.user_repository.read_users(
+            role_id=role_id, 
+            offset=offset, 
+            size=size, 
+            cursor=cursor,
+            with_total=with_total,
+            sort_by=sort_by, 
+            sort_order=sort_order, 
+            custom_filters=custom_filters,
+            role_level=role_level,
+            is_role_level=is_role_level,
+            user_id=user_id,
+            is_active=is_active
+        )
+    except ValueError as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
 
     if not users:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Data not found")
     
-    count = user_service.user_repository.count_users(
-        role_id=role_id, 
-        custom_filters=custom_filters,
-        role_level=role_level,
-        is_role_level=is_role_level,
-        user_id=user_id,
-        is_active=is_active
-    )
+    count = users.total
     total_pages = get_total_pages(size, count)
+    next_cursor = get_next_cursor(users, size, sort_by, User) if cursor is not None else None
     
 
     datas = []
@@ -174,10 +169,10 @@ def read_users(
             'gender': user.gender,
             'role': role,
             'is_active': user.is_active,
-            'last_login_at': str(user.last_login_at),
-            'created_at': str(user.created_at),
-            'updated_at': str(user.updated_at),
-            'image_url': f"{user_service.static_folder_image}/{user.image_url}" if user.image_url else None,
+            'last_login_at': user.last_login_at,
+            'created_at': user.created_at,
+            'updated_at': user.updated_at,
+            'image_url': get_file_url(user_service.static_folder_image, user.image_url),
         })
 
     status_code = status.HTTP_200_OK
@@ -189,10 +184,11 @@ def read_users(
             "size": size,
             "total": count,
             "total_pages": total_pages,
-            "offset": offset
+            "offset": offset,
+            "next_cursor": next_cursor
         },
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.get("/{user_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
@@ -231,17 +227,17 @@ def read_user(
             'role': role,
             'no_handphone': user.no_handphone,
             'is_active': user.is_active,
-            'last_login_at': str(user.last_login_at),
-            'created_at': str(user.created_at),
-            'updated_at': str(user.updated_at),
-            'image_url': f"{user_service.static_folder_image}/{user.image_url}" if user.image_url else None,
+            'last_login_at': user.last_login_at,
+            'created_at': user.created_at,
+            'updated_at': user.updated_at,
+            'image_url': get_file_url(user_service.static_folder_image, user.image_url),
         },
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.patch("/{user_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
-async def update_user(
+def update_user(
     user_id: str,
     role_id: int = Form(...),
     username: str = Form(None, min_length=0, max_length=36),
@@ -252,7 +248,7 @@ async def update_user(
     gender: UserGender = Form(...),
     image: UploadFile = None,
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.user, RoleAuthorityName.edit))
 ):
     """
         Update User
@@ -260,18 +256,11 @@ async def update_user(
         - should login
         - allow to update with role that has authority
     """
-    user_id_active = payload.get("uid", None)
 
     # service
     user_service = UserService(db)
-    role_authority_service = RoleAuthorityService(db)
     role_service = RoleService(db)
     
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.user.value, name=RoleAuthorityName.edit.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to edit")
-    
     # validation
     exist_role_id = role_service.role_repository.read_role(role_id)
     if not exist_role_id:
@@ -283,7 +272,7 @@ async def update_user(
     
     try:
         if (image):
-            await validation_file(file=image)
+            validation_file(file=image)
 
         content_type = image.content_type if image else ""
         file_extension = content_type.split('/')[1] if image else ""
@@ -318,15 +307,15 @@ async def update_user(
         status="OK",
         data=data,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 
 @router.delete("/{user_id}", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
-async def delete_user(
+def delete_user(
     user_id: str,
     db: Session = Depends(get_db), 
-    payload = Depends(Authentication())
+    payload = Depends(require(RoleAuthorityFeature.user, RoleAuthorityName.delete))
 ):
     """
         Delete User
@@ -334,16 +323,10 @@ async def delete_user(
         - should login
         - allow to delete with role that has authority
     """
-    user_id_active = payload.get("uid", None)
 
     # service
     user_service = UserService(db)
-    role_authority_service = RoleAuthorityService(db)
     
-    user_active = user_service.user_repository.read_user(user_id_active)
-    role_authority = role_authority_service.role_authority_repository.get_role_authority_by_specific(role_id=user_active.role_id, feature=RoleAuthorityFeature.user.value, name=RoleAuthorityName.delete.value)
-    if not role_authority:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allow to delete")
 
     try:
         user_service.delete_user(user_id)
@@ -360,11 +343,11 @@ async def delete_user(
         status="OK",
         data=data,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
 
 @router.get("-resource", response_model=GeneralDataResponse, status_code=status.HTTP_200_OK)
-async def read_user_resource(
+def read_user_resource(
     db: Session = Depends(get_db), 
     payload = Depends(Authentication())
 ):
@@ -391,5 +374,5 @@ async def read_user_resource(
         status="OK",
         data=role_authority_list,
     )
-    response = JSONResponse(content=data_response.model_dump(), status_code=status_code)
+    response = json_response(data_response, status_code)
     return response
\ No newline at end of file
@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from .endpoints import auth, role, user
+from .endpoints import auth, diagnostic, role, user
 from .endpoints.company import company, company_translation
 from .endpoints.school import school, school_translation
 from .endpoints.skill import skill, skill_translation, skill_mapping
@@ -20,6 +20,8 @@ router.include_router(public_profile_project.router, prefix="/public-profile", t
 
 router.include_router(auth.router, prefix="/auth", tags=["Auth"])
 
+router.include_router(diagnostic.router, prefix="/diagnostic", tags=["Diagnostic"])
+
 router.include_router(role.router, prefix="/role", tags=["User"])
 router.include_router(user.router, prefix="/user", tags=["User"])
 
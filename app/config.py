@@ -13,12 +13,97 @@ class Config(BaseSettings):
     PRIVATE_KEY: str
     REFRESH_PRIVATE_KEY: str
     PUBLIC_KEY: str
+    KEY_ID: str = "default"
+    # kid -> public key of retired signing keys, still accepted while token not expired
+    PREVIOUS_PUBLIC_KEYS: dict[str, str] = {}
 
     DB: str
     DB_POOL_PRE_PING: bool = True
     DB_POOL_SIZE: int = 20
     DB_POOL_RECYCLE: int = 1800
+    DB_POOL_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_USE_LIFO: bool = True
     DB_ECHO: bool = False
+    # async driver url, derived from DB when empty (pymysql -> aiomysql, sqlite -> aiosqlite)
+    DB_ASYNC: str | None = None
+    # pool of async engine, separate from DB_POOL_*; one event loop serve many request with few connection
+    # connection to database can reach DB_POOL_SIZE + DB_POOL_MAX_OVERFLOW + DB_ASYNC_POOL_SIZE + DB_ASYNC_POOL_MAX_OVERFLOW
+    DB_ASYNC_POOL_SIZE: int = 10
+    DB_ASYNC_POOL_MAX_OVERFLOW: int = 5
+    DB_ASYNC_POOL_TIMEOUT: int = 30
+
+    # worker thread of sync handler, keep it near DB_POOL_SIZE + DB_POOL_MAX_OVERFLOW
+    THREADPOOL_SIZE: int = 30
+
+    # bcrypt pool, executor 'thread' or 'process'
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_EXECUTOR: str = 'thread'
+
+    PERMISSION_CACHE_TTL: int = 60
+
+    # whole multipart request and each file of it
+    UPLOAD_MAX_REQUEST_SIZE_MB: int = 12
+    UPLOAD_MAX_FILE_SIZE_MB: int = 5
+
+    # uploaded file: local | s3, s3 need package boto3
+    STORAGE_BACKEND: str = "local"
+    STORAGE_LOCAL_ROOT: str = "static/files"
+    # url path local file is served on, root can be any folder of the server
+    STORAGE_LOCAL_URL_PREFIX: str = "static/files"
+    STORAGE_S3_BUCKET: str = ""
+    STORAGE_S3_ENDPOINT_URL: str | None = None
+    STORAGE_S3_REGION: str | None = None
+    STORAGE_S3_ACCESS_KEY: str | None = None
+    STORAGE_S3_SECRET_KEY: str | None = None
+    STORAGE_S3_PUBLIC_URL: str | None = None
+
+    # /static cache policy by path prefix, content addressed file always immutable
+    STATIC_CACHE_CONTROL: dict[str, str] = {"images/": "public, max-age=86400"}
+    STATIC_CACHE_CONTROL_DEFAULT: str = "public, max-age=3600"
+    # internal location of front proxy (nginx), url path of the mount and file path inside its folder are appended
+    STATIC_ACCEL_REDIRECT_PREFIX: str | None = None
+
+    # response compression, br preferred over gzip; content type matched by prefix
+    COMPRESSION_MINIMUM_SIZE: int = 500
+    COMPRESSION_CONTENT_TYPES: list[str] = ["application/json", "text/", "application/javascript", "image/svg+xml"]
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_CACHE_MAX_SIZE_MB: int = 32
+
+    # orphan file collector, interval in second (0 run only by file_gc.py)
+    FILE_GC_INTERVAL: int = 0
+    FILE_GC_MIN_AGE: int = 3600
+    FILE_GC_BATCH_SIZE: int = 500
+    FILE_GC_QUARANTINE_FOLDER: str | None = None
+
+    # deletion of released file after commit, delay in second
+    FILE_DELETION_POLL_INTERVAL: int = 30
+    FILE_DELETION_BATCH_SIZE: int = 100
+    FILE_DELETION_RETRY_DELAY: int = 10
+    FILE_DELETION_RETRY_MAX_DELAY: int = 3600
+
+    # resized copy of uploaded image
+    IMAGE_DERIVATIVE_WIDTHS: list[int] = [64, 256, 1024]
+    IMAGE_DERIVATIVE_QUALITY: int = 80
+    IMAGE_DERIVATIVE_WORKERS: int = 2
+
+    # verified access token kept in process, 0 to disable
+    TOKEN_CACHE_MAX_SIZE: int = 4096
+
+    # revoked access token, bloom filter size in bit
+    REVOCATION_REFRESH_INTERVAL: int = 5
+    REVOCATION_REBUILD_INTERVAL: int = 3600
+    # second read again before watermark, row committed later than its created_at still loaded
+    REVOCATION_REFRESH_OVERLAP: int = 60
+    REVOCATION_BLOOM_SIZE: int = 1 << 20
+    REVOCATION_BLOOM_HASHES: int = 7
+
+    # memory | redis | none
+    RESPONSE_CACHE_BACKEND: str = "memory"
+    RESPONSE_CACHE_TTL: int = 300
+    RESPONSE_CACHE_MAX_SIZE: int = 1024
+    RESPONSE_CACHE_REDIS_URL: str = "redis://localhost:6379/0"
 
     PORT: int
 
@@ -1,16 +1,137 @@
+import threading
+import time
+
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from app.config import config
 
 DATABASE_URL = config.DB
 
+class TimedQueuePool(QueuePool):
+    """
+        QueuePool that keep track how long request wait for a connection
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._wait_lock = threading.Lock()
+        self.wait_count = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def _do_get(self):
+        started_at = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - started_at
+            with self._wait_lock:
+                self.wait_count += 1
+                self.wait_total += waited
+                self.wait_max = max(self.wait_max, waited)
+
+class TimedAsyncAdaptedQueuePool(TimedQueuePool, AsyncAdaptedQueuePool):
+    """
+        TimedQueuePool for async engine
+    """
+
+def create_database_engine(database_url: str = DATABASE_URL):
+    """
+        Create engine with connection pool based config DB_POOL_*
+    """
+    # sqlite in memory can not share connection through pool
+    if database_url.startswith('sqlite') and ':memory:' in database_url:
+        return create_engine(database_url, echo=config.DB_ECHO)
+
+    return create_engine(
+        database_url,
+        poolclass=TimedQueuePool,
+        pool_pre_ping=config.DB_POOL_PRE_PING,
+        pool_size=config.DB_POOL_SIZE,
+        max_overflow=config.DB_POOL_MAX_OVERFLOW,
+        pool_timeout=config.DB_POOL_TIMEOUT,
+        pool_recycle=config.DB_POOL_RECYCLE,
+        pool_use_lifo=config.DB_POOL_USE_LIFO,
+        echo=config.DB_ECHO,
+    )
+
+def get_async_database_url(database_url: str = DATABASE_URL) -> str:
+    """
+        Same database with async driver, DB_ASYNC has priority when set
+    """
+    if config.DB_ASYNC:
+        return config.DB_ASYNC
+    for sync_driver, async_driver in [('mysql+pymysql://', 'mysql+aiomysql://'), ('mysql://', 'mysql+aiomysql://'), ('sqlite://', 'sqlite+aiosqlite://')]:
+        if database_url.startswith(sync_driver):
+            return async_driver + database_url[len(sync_driver):]
+    return database_url
+
+def create_async_database_engine(database_url: str = None):
+    """
+        Async engine with its own pool based config DB_ASYNC_POOL_*
+    """
+    database_url = database_url or get_async_database_url()
+    if database_url.startswith('sqlite'):
+        return create_async_engine(database_url, echo=config.DB_ECHO)
+
+    return create_async_engine(
+        database_url,
+        poolclass=TimedAsyncAdaptedQueuePool,
+        pool_pre_ping=config.DB_POOL_PRE_PING,
+        pool_size=config.DB_ASYNC_POOL_SIZE,
+        max_overflow=config.DB_ASYNC_POOL_MAX_OVERFLOW,
+        pool_timeout=config.DB_ASYNC_POOL_TIMEOUT,
+        pool_recycle=config.DB_POOL_RECYCLE,
+        pool_use_lifo=config.DB_POOL_USE_LIFO,
+        echo=config.DB_ECHO,
+    )
+
+def get_pool_status(engine, max_overflow: int) -> dict:
+    """
+        Live statistic of connection pool
+
+        - max_overflow from config the pool was created with
+    """
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return {'pool_class': pool.__class__.__name__}
+
+    status = {
+        'pool_class': pool.__class__.__name__,
+        'size': pool.size(),
+        'max_overflow': max_overflow,
+        'timeout': pool.timeout(),
+        'checked_in': pool.checkedin(),
+        'checked_out': pool.checkedout(),
+        'overflow': pool.overflow(),
+    }
+
+    if isinstance(pool, TimedQueuePool):
+        with pool._wait_lock:
+            wait_count = pool.wait_count
+            wait_total = pool.wait_total
+            wait_max = pool.wait_max
+        status.update({
+            'wait_count': wait_count,
+            'wait_total_ms': round(wait_total * 1000, 3),
+            'wait_avg_ms': round(wait_total * 1000 / wait_count, 3) if wait_count else 0,
+            'wait_max_ms': round(wait_max * 1000, 3),
+        })
+
+    return status
+
 # Create the SQLAlchemy engine
-engine = create_engine(DATABASE_URL)
+engine = create_database_engine()
 
 # Create a SessionLocal class for handling database sessions
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine and session, used by route that only read
+async_engine = create_async_database_engine()
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 # Base class for declarative models
 Base = declarative_base()
 
@@ -21,3 +142,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# Dependency to get an async database session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
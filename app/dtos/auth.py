@@ -9,3 +9,6 @@ class AuthProfilePassword(BaseModel):
     old_password: str = Field(..., min_length=1, max_length=512)
     new_password: str = Field(..., min_length=1, max_length=512)
     confirm_new_password: str = Field(..., min_length=1, max_length=512)
+
+class AuthRefreshToken(BaseModel):
+    refresh_token: str = Field(..., min_length=1, max_length=2048)
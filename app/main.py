@@ -1,9 +1,19 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from app.config import config
 from app.api.router import router as api_router
 from app.database import Base, engine
+from app.utils.compression import CompressionMiddleware, compressed_body_cache
+from app.utils.file_deletion import file_deletion_queue
+from app.utils.file_gc import run_file_gc_periodically
+from app.utils.image_derivative import image_derivative_pool
+from app.utils.password import password_hasher
+from app.utils.request_limit import UploadSizeLimitMiddleware
+from app.utils.static_files import StaticFileServer
+from app.utils.storage import IMMUTABLE_CACHE_CONTROL
+from app.utils.threadpool import configure_threadpool
 
 # whitelist alloed routes
 origins = [
@@ -14,10 +24,32 @@ origins = [
     "http://localhost:3000",
 ]
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # handler are sync, they run on this bounded thread pool
+    configure_threadpool(config.THREADPOOL_SIZE)
+    # file released by committed row, journal left by last run deleted first
+    file_deletion_queue.start()
+    file_gc_task = asyncio.create_task(run_file_gc_periodically(config.FILE_GC_INTERVAL)) if config.FILE_GC_INTERVAL > 0 else None
+    yield
+    if file_gc_task is not None:
+        file_gc_task.cancel()
+    password_hasher.shutdown()
+    image_derivative_pool.shutdown()
+    file_deletion_queue.shutdown()
+
 # Create the FastAPI app instance
 app = FastAPI(
     title=config.APP_TITLE,
     description=config.APP_DESCRIPTION,
+    lifespan=lifespan,
+)
+
+# upload bigger than limit is aborted before whole body received, inside cors so 413 carry cors header
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    max_size=config.UPLOAD_MAX_REQUEST_SIZE_MB * 1024 * 1024,
+    max_file_size=config.UPLOAD_MAX_FILE_SIZE_MB * 1024 * 1024,
 )
 
 # cors middleware
@@ -29,8 +61,37 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# mounting static files directory
-app.mount("/static", StaticFiles(directory="static"), name="static")
+# gzip or brotli for text body, compressed body of cached response is reused
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=config.COMPRESSION_MINIMUM_SIZE,
+    content_types=config.COMPRESSION_CONTENT_TYPES,
+    gzip_level=config.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=config.COMPRESSION_BROTLI_QUALITY,
+    cache=compressed_body_cache,
+)
+
+def get_accel_redirect_prefix(mount_path: str) -> str | None:
+    # internal location of each mount, file path inside its folder appended by StaticFileServer
+    if not config.STATIC_ACCEL_REDIRECT_PREFIX:
+        return None
+    return f"{config.STATIC_ACCEL_REDIRECT_PREFIX.rstrip('/')}{mount_path}"
+
+# mounting static files directory, content addressed file before the rest of static
+if config.STORAGE_BACKEND == 'local':
+    files_mount_path = f"/{config.STORAGE_LOCAL_URL_PREFIX.strip('/')}"
+    app.mount(files_mount_path, StaticFileServer(
+        directory=config.STORAGE_LOCAL_ROOT,
+        check_dir=False,
+        default_cache_control=IMMUTABLE_CACHE_CONTROL,
+        accel_redirect_prefix=get_accel_redirect_prefix(files_mount_path),
+    ), name="files")
+app.mount("/static", StaticFileServer(
+    directory="static",
+    cache_control=config.STATIC_CACHE_CONTROL,
+    default_cache_control=config.STATIC_CACHE_CONTROL_DEFAULT,
+    accel_redirect_prefix=get_accel_redirect_prefix("/static"),
+), name="static")
 
 # Include the API router
 app.include_router(api_router, prefix="/api/v1")
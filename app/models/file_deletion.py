@@ -0,0 +1,16 @@
+from sqlalchemy import Column, DateTime, Integer, String, Text, func
+
+from app.database import Base
+
+class FileDeletion(Base):
+    __tablename__ = "file_deletions"
+
+    # journal of file to delete, saved in the same transaction as the row that released it
+    id = Column(String(36), primary_key=True, index=True)
+    # folder of file saved before content addressed storage, null for content key
+    folder = Column(String(256), nullable=True)
+    filename = Column(String(256), nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    next_attempt_at = Column(DateTime, server_default=func.NOW(), nullable=False, index=True)
+    created_at = Column(DateTime, server_default=func.NOW(), nullable=False)
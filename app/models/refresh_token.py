@@ -0,0 +1,17 @@
+from sqlalchemy import Column, DateTime, String, func, ForeignKey
+
+from app.database import Base
+
+class RefreshToken(Base):
+    __tablename__ = "refresh_tokens"
+
+    # jti of refresh token, only hash of token is saved
+    id = Column(String(36), primary_key=True, index=True)
+    user_id = Column(ForeignKey('users.id', ondelete='CASCADE', onupdate='CASCADE'), nullable=False, index=True)
+    family_id = Column(String(36), unique=False, nullable=False, index=True)
+    token_hash = Column(String(64), unique=True, nullable=False, index=True)
+    replaced_by = Column(String(36), unique=False, nullable=True)
+    expired_at = Column(DateTime, nullable=False)
+    revoked_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, server_default=func.NOW(), nullable=False)
+    updated_at = Column(DateTime, server_default=func.NOW(), onupdate=func.NOW(), nullable=False)
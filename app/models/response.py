@@ -1,7 +1,9 @@
-from typing import Union
+from decimal import Decimal
+from typing import Any, Union
 from typing import Optional
+import orjson
 from pydantic import BaseModel
-from fastapi.responses import StreamingResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 
 class BaseResponse(BaseModel):
     code: int = 200
@@ -23,6 +25,35 @@ class GeneralDataPaginateResponse(BaseResponse):
     data: Optional[Union[dict, list]]
     meta: Optional[Union[dict, list]]
 
+def _default(value: Any):
+    # type orjson does not know, datetime, date, uuid and enum are native
+    if isinstance(value, BaseModel):
+        return _envelope(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+def _envelope(model: BaseModel) -> dict:
+    # shallow, data is not copied like model_dump
+    return {name: getattr(model, name) for name in type(model).model_fields}
+
+class ORJSONResponse(JSONResponse):
+    """
+        JSON response encoded by orjson in one pass
+
+        - response model (GeneralDataResponse, ...) accepted as content without model_dump
+        - datetime written as ISO 8601
+    """
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            content = _envelope(content)
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+def json_response(data_response: BaseResponse, status_code: int = 200, headers: dict = None) -> ORJSONResponse:
+    return ORJSONResponse(content=data_response, status_code=status_code, headers=headers)
+
 def response_streaming(data, filename):
     return StreamingResponse(
         data,
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, DateTime, String, func, ForeignKey
+
+from app.database import Base
+
+class RevokedToken(Base):
+    __tablename__ = "revoked_tokens"
+
+    # jti of revoked access token
+    id = Column(String(36), primary_key=True, index=True)
+    user_id = Column(ForeignKey('users.id', ondelete='CASCADE', onupdate='CASCADE'), nullable=True)
+    # expiration of the token, row is useless after it
+    expired_at = Column(DateTime, nullable=False, index=True)
+    created_at = Column(DateTime, server_default=func.NOW(), nullable=False, index=True)
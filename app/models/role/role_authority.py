@@ -38,4 +38,5 @@ class RoleAuthorityFeature(EnumParam):
     solution = "solution"
     solution_other = "solution_other"
     project = "project"
-    project_other = "project_other"
\ No newline at end of file
+    project_other = "project_other"
+    diagnostic = "diagnostic"
\ No newline at end of file
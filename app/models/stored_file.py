@@ -0,0 +1,17 @@
+from sqlalchemy import JSON, BigInteger, Column, DateTime, Integer, String, func
+
+from app.database import Base
+
+class StoredFile(Base):
+    __tablename__ = "stored_files"
+
+    # storage key, sharded sha256 of content with extension
+    id = Column(String(128), primary_key=True, index=True)
+    content_type = Column(String(64), nullable=True)
+    size = Column(BigInteger, nullable=False, default=0)
+    # count of row (image_url, logo_url) pointing to this file
+    ref_count = Column(Integer, nullable=False, default=0)
+    # width of derivative ready in storage, saved when resize job is done
+    derivative_widths = Column(JSON, nullable=True)
+    created_at = Column(DateTime, server_default=func.NOW(), nullable=False)
+    updated_at = Column(DateTime, server_default=func.NOW(), onupdate=func.NOW(), nullable=False, index=True)
@@ -1,12 +1,35 @@
+import uuid
+from datetime import datetime, timezone
+
 import sqlalchemy as sa
 from sqlalchemy.orm import Session
+from app.models.refresh_token import RefreshToken
+from app.models.role.role import Role
 from app.models.user import User
+from app.repositories.refresh_token_repository import RefreshTokenRepository
 from app.utils.generate_access_token import generate_access_token
-from app.utils.generate_refresh_token import generate_refresh_token
+from app.utils.generate_refresh_token import generate_refresh_token, hash_refresh_token
 
 class AuthRepository:
     def __init__(self, db: Session):
         self.db = db
+        self.refresh_token_repository = RefreshTokenRepository(db)
+
+    def generate_refresh_token(self, payload: dict, user_id: str, family_id: str = None) -> tuple[str, RefreshToken]:
+        """
+            New refresh token and its row, family is kept over rotation of one login
+        """
+        refresh_token_id = str(uuid.uuid4())
+        family_id = family_id or refresh_token_id
+        refresh_token, expired_at = generate_refresh_token({**payload, 'jti': refresh_token_id, 'fam': family_id})
+        refresh_token_model = RefreshToken(
+            id=refresh_token_id,
+            user_id=user_id,
+            family_id=family_id,
+            token_hash=hash_refresh_token(refresh_token),
+            expired_at=datetime.fromtimestamp(expired_at, timezone.utc).replace(tzinfo=None),
+        )
+        return refresh_token, refresh_token_model
 
     def auth_login(self, user: User, is_password_valid: bool):
         if is_password_valid:
@@ -17,12 +40,12 @@ class AuthRepository:
                 'role_code': user.role.code if user.role else "",
             }
             # generate refresh_token
-            refresh_token = generate_refresh_token(payload)
+            refresh_token, refresh_token_model = self.generate_refresh_token(payload, user.id)
             # generate access token and access token expired
             access_token, access_token_expired_at = generate_access_token(payload)
 
-            # saving data of refresh token
-            ## COMING SOON
+            # saving hash of refresh token
+            self.refresh_token_repository.create_refresh_token(refresh_token_model, is_commit=False)
 
             # update last login
             user.last_login_at = sa.func.now()
@@ -37,3 +60,25 @@ class AuthRepository:
 
         else:
             raise ValueError("Password invalid")
+
+    def auth_refresh_token(self, exist_refresh_token: RefreshToken, user: User, role: Role = None):
+        """
+            Rotate refresh token and generate access token, without password check
+        """
+        payload = {
+            'uid': user.id,
+            'username': user.username,
+            'role_code': role.code if role else "",
+        }
+        refresh_token, refresh_token_model = self.generate_refresh_token(payload, user.id, exist_refresh_token.family_id)
+        access_token, access_token_expired_at = generate_access_token(payload)
+
+        if not self.refresh_token_repository.rotate_refresh_token(exist_refresh_token, refresh_token_model):
+            raise ValueError("Refresh token reused")
+
+        return {
+            'user_id': user.id,
+            'access_token': access_token,
+            'refresh_token': refresh_token,
+            'access_token_expired_at': access_token_expired_at,
+        }
@@ -2,6 +2,8 @@ import uuid
 from sqlalchemy import asc, desc, or_
 from sqlalchemy.orm import Session
 from app.models.company.company import Company
+from app.utils.response_cache import public_profile_cache
+from app.utils.pagination import apply_cursor, fetch_page, resolve_sort_column
 
 class CompanyRepository:
     def __init__(self, db: Session):
@@ -13,6 +15,7 @@ class CompanyRepository:
         self.db.add(company)
         self.db.commit()
         self.db.refresh(company)
+        public_profile_cache.invalidate_all()
         return company
 
     def get_company_by_name(self, name: str) -> Company:
@@ -28,6 +31,8 @@ class CompanyRepository:
         custom_filters: dict = None,
         offset: int = None, 
         size: int = None,
+        cursor: str = None,
+        with_total: bool = False,
         is_active: bool = None,
     ) -> list[Company]:
         query = self.db.query(Company)
@@ -44,6 +49,11 @@ class CompanyRepository:
                 else:
                     query = query.filter(getattr(Company, column) == value)
 
+        # Sorting and pagination by cursor
+        if cursor is not None:
+            sort_column = resolve_sort_column(sort_by, Company)
+            return fetch_page(apply_cursor(query, sort_column, Company.id, sort_order, cursor, size), with_total, total_query=query)
+
         # Sorting
         if sort_by is not None:
             if sort_order == 'asc' and hasattr(Company, sort_by):
@@ -55,31 +65,11 @@ class CompanyRepository:
         if offset is not None and size is not None:
             query = query.offset((offset - 1) * size).limit(size)
 
-        return query.all()
+        return fetch_page(query, with_total)
     
-    def count_companies(
-        self, 
-        custom_filters: dict = None,
-        is_active: bool = None,
-    ) -> int:
-        query = self.db.query(Company)
-
-        # Filtering
-        if is_active is not None:
-            query = query.filter(Company.is_active == is_active)
-
-        # Apply custom filters
-        if custom_filters is not None:
-            for column, value in custom_filters.items():
-                if isinstance(value, str):
-                    query = query.filter(getattr(Company, column).like(f'%{value}%'))
-                else:
-                    query = query.filter(getattr(Company, column) == value)
-
-        return query.count()
-
     def update_company(self, company: Company):
         self.db.commit()
+        public_profile_cache.invalidate_all()
         return company
 
     def read_company(self, id: str) -> Company:
@@ -90,4 +80,5 @@ class CompanyRepository:
         company_id = company.id
         self.db.delete(company)
         self.db.commit()
+        public_profile_cache.invalidate_all()
         return company_id
@@ -2,6 +2,7 @@ import uuid
 from sqlalchemy import asc, desc, or_
 from sqlalchemy.orm import Session
 from app.models.company.company_translation import CompanyTranslation
+from app.utils.response_cache import public_profile_cache
 
 class CompanyTranslationRepository:
     def __init__(self, db: Session):
@@ -12,6 +13,7 @@ class CompanyTranslationRepository:
         self.db.add(company)
         self.db.commit()
         self.db.refresh(company)
+        public_profile_cache.invalidate_all()
         return company
 
     def get_company_translation_by_company_id_and_language_id(self, company_id: str, language_id: str) -> CompanyTranslation:
@@ -19,10 +21,12 @@ class CompanyTranslationRepository:
 
     def update_company_translation(self, company: CompanyTranslation):
         self.db.commit()
+        public_profile_cache.invalidate_all()
         return company
 
     def delete_company_translation(self, company_translation: CompanyTranslation) -> str:
         company_translation_id = company_translation.id
         self.db.delete(company_translation)
         self.db.commit()
+        public_profile_cache.invalidate_all()
         return company_translation_id
@@ -2,6 +2,8 @@ import uuid
 from sqlalchemy import asc, desc, or_
 from sqlalchemy.orm import Session
 from app.models.education.education import Education
+from app.utils.response_cache import public_profile_cache
+from app.utils.pagination import apply_cursor, fetch_page, resolve_sort_column
 
 class EducationRepository:
     def __init__(self, db: Session):
@@ -13,6 +15,7 @@ class EducationRepository:
         self.db.add(education)
         self.db.commit()
         self.db.refresh(education)
+        public_profile_cache.invalidate_user(education.user_id)
         return education
     
     def read_educations(
@@ -22,6 +25,8 @@ class EducationRepository:
         custom_filters: dict = None,
         offset: int = None, 
         size: int = None,
+        cursor: str = None,
+        with_total: bool = False,
         is_active: bool = None,
         user_id: str = None,
     ) -> list[Education]:
@@ -42,6 +47,11 @@ class EducationRepository:
                 else:
                     query = query.filter(getattr(Education, column) == value)
 
+        # Sorting and pagination by cursor
+        if cursor is not None:
+            sort_column = resolve_sort_column(sort_by, Education)
+            return fetch_page(apply_cursor(query, sort_column, Education.id, sort_order, cursor, size), with_total, total_query=query)
+
         # Sorting
         if sort_by is not None:
             if sort_order == 'asc' and hasattr(Education, sort_by):
@@ -53,35 +63,12 @@ class EducationRepository:
         if offset is not None and size is not None:
             query = query.offset((offset - 1) * size).limit(size)
 
-        return query.all()
+        return fetch_page(query, with_total)
     
-    def count_educations(
-        self, 
-        custom_filters: dict = None,
-        is_active: bool = None,
-        user_id: str = None,
-    ) -> int:
-        query = self.db.query(Education)
-
-        # Filtering
-        if is_active is not None:
-            query = query.filter(Education.is_active == is_active)
-
-        if user_id is not None:
-            query = query.filter(Education.user_id == user_id)
-
-        # Apply custom filters
-        if custom_filters is not None:
-            for column, value in custom_filters.items():
-                if isinstance(value, str):
-                    query = query.filter(getattr(Education, column).like(f'%{value}%'))
-                else:
-                    query = query.filter(getattr(Education, column) == value)
-
-        return query.count()
-
     def update_education(self, education: Education):
+        user_id = education.user_id
         self.db.commit()
+        public_profile_cache.invalidate_user(user_id)
         return education
 
     def read_education(self, id: str) -> Education:
@@ -90,6 +77,8 @@ class EducationRepository:
 
     def delete_education(self, education: Education) -> str:
         education_id = education.id
+        user_id = education.user_id
         self.db.delete(education)
         self.db.commit()
+        public_profile_cache.invalidate_user(user_id)
         return education_id
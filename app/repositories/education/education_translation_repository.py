@@ -1,10 +1,13 @@
 import uuid
 from sqlalchemy import asc, desc, or_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models.education.education import Education
 from app.models.education.education_translation import EducationTranslation
 from app.models.school.school import School
 from app.models.school.school_translation import SchoolTranslation
+from app.utils.response_cache import public_profile_cache
+from app.utils.pagination import apply_cursor, fetch_page, resolve_sort_column
 
 class EducationTranslationRepository:
     def __init__(self, db: Session):
@@ -12,12 +15,14 @@ class EducationTranslationRepository:
 
     def create_education_translation(self, education: EducationTranslation):
         education.id = str(uuid.uuid4())
+        user_id = self.db.get(Education, education.education_id).user_id
         self.db.add(education)
         self.db.commit()
         self.db.refresh(education)
+        public_profile_cache.invalidate_user(user_id)
         return education
     
-    def get_education_translation_by_user_id_and_language_id(
+    def get_education_translation_rows_by_user_id_and_language_id(
         self, 
         user_id: str, 
         language_id: str,
@@ -26,11 +31,16 @@ class EducationTranslationRepository:
         custom_filters: dict = None,
         offset: int = None, 
         size: int = None, 
-    ) -> list[EducationTranslation]:
-        query = self.db.query(EducationTranslation) \
+        cursor: str = None,
+        with_total: bool = False,
+    ) -> list[tuple[EducationTranslation, Education, School, SchoolTranslation]]:
+        """
+            Translation of user with education, school and school translation in one query
+        """
+        query = self.db.query(EducationTranslation, Education, School, SchoolTranslation) \
             .join(Education, EducationTranslation.education_id == Education.id) \
             .join(School, Education.school_id == School.id) \
-            .join(SchoolTranslation, School.id == SchoolTranslation.school_id) \
+            .join(SchoolTranslation, School.id == SchoolTranslation.school_id)
         
         query = query.filter(Education.user_id == user_id)
         query = query.filter(EducationTranslation.language_id == language_id)
@@ -46,6 +56,11 @@ class EducationTranslationRepository:
                 else:
                     query = query.filter(getattr(EducationTranslation, column) == value)
 
+        # Sorting and pagination by cursor
+        if cursor is not None:
+            sort_column = resolve_sort_column(sort_by, EducationTranslation, Education)
+            return fetch_page(apply_cursor(query, sort_column, EducationTranslation.id, sort_order, cursor, size), with_total, total_query=query)
+
         # Sorting
         if sort_by is not None:
             if sort_order == 'asc' and hasattr(EducationTranslation, sort_by):
@@ -60,44 +75,31 @@ class EducationTranslationRepository:
         if offset is not None and size is not None:
             query = query.offset((offset - 1) * size).limit(size)
 
-        return query.all()
-    
-    def count_education_translation_by_user_id_and_language_id(
-        self, 
-        user_id: str, 
-        language_id: str,
-        custom_filters: dict = None,
-    ) -> list[EducationTranslation]:
-        query = self.db.query(EducationTranslation) \
-            .join(Education, EducationTranslation.education_id == Education.id) \
-            .join(School, Education.school_id == School.id) \
-            .join(SchoolTranslation, School.id == SchoolTranslation.school_id) \
-        
-        query = query.filter(Education.user_id == user_id)
-        query = query.filter(EducationTranslation.language_id == language_id)
-        query = query.filter(SchoolTranslation.language_id == language_id)
-
-        query = query.filter(Education.is_active == True)
-
-         # Apply custom filters
-        if custom_filters is not None:
-            for column, value in custom_filters.items():
-                if isinstance(value, str):
-                    query = query.filter(getattr(EducationTranslation, column).like(f'%{value}%'))
-                else:
-                    query = query.filter(getattr(EducationTranslation, column) == value)
-
-        return query.count()
+        return fetch_page(query, with_total)
 
     def get_education_translation_by_education_id_and_language_id(self, education_id: str, language_id: str) -> EducationTranslation:
         return self.db.query(EducationTranslation).filter(EducationTranslation.education_id == education_id, EducationTranslation.language_id == language_id).first()
 
     def update_education_translation(self, education: EducationTranslation):
+        user_id = education.education.user_id
         self.db.commit()
+        public_profile_cache.invalidate_user(user_id)
         return education
 
     def delete_education_translation(self, education_translation: EducationTranslation) -> str:
         education_translation_id = education_translation.id
+        user_id = education_translation.education.user_id
         self.db.delete(education_translation)
         self.db.commit()
+        public_profile_cache.invalidate_user(user_id)
         return education_translation_id
+
+class AsyncEducationTranslationRepository:
+    """
+        EducationTranslationRepository on AsyncSession, query of sync repository is run through run_sync
+    """
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_education_translation_rows_by_user_id_and_language_id(self, user_id: str, language_id: str, **kwargs) -> list[tuple[EducationTranslation, Education, School, SchoolTranslation]]:
+        return await self.db.run_sync(lambda db: EducationTranslationRepository(db).get_education_translation_rows_by_user_id_and_language_id(user_id, language_id, **kwargs))
@@ -2,6 +2,8 @@ import uuid
 from sqlalchemy import asc, desc, or_
 from sqlalchemy.orm import Session
 from app.models.experience.experience import Experience
+from app.utils.response_cache import public_profile_cache
+from app.utils.pagination import apply_cursor, fetch_page, resolve_sort_column
 
 class ExperienceRepository:
     def __init__(self, db: Session):
@@ -13,6 +15,7 @@ class ExperienceRepository:
         self.db.add(experience)
         self.db.commit()
         self.db.refresh(experience)
+        public_profile_cache.invalidate_user(experience.user_id)
         return experience
     
     def read_experiences(
@@ -22,6 +25,8 @@ class ExperienceRepository:
         custom_filters: dict = None,
         offset: int = None, 
         size: int = None,
+        cursor: str = None,
+        with_total: bool = False,
         is_active: bool = None,
         user_id: str = None,
     ) -> list[Experience]:
@@ -42,6 +47,11 @@ class ExperienceRepository:
                 else:
                     query = query.filter(getattr(Experience, column) == value)
 
+        # Sorting and pagination by cursor
+        if cursor is not None:
+            sort_column = resolve_sort_column(sort_by, Experience)
+            return fetch_page(apply_cursor(query, sort_column, Experience.id, sort_order, cursor, size), with_total, total_query=query)
+
         # Sorting
         if sort_by is not None:
             if sort_order == 'asc' and hasattr(Experience, sort_by):
@@ -53,35 +63,12 @@ class ExperienceRepository:
         if offset is not None and size is not None:
             query = query.offset((offset - 1) * size).limit(size)
 
-        return query.all()
+        return fetch_page(query, with_total)
     
-    def count_experiences(
-        self, 
-        custom_filters: dict = None,
-        is_active: bool = None,
-        user_id: str = None,
-    ) -> int:
-        query = self.db.query(Experience)
-
-        # Filtering
-        if is_active is not None:
-            query = query.filter(Experience.is_active == is_active)
-        
-        if user_id is not None:
-            query = query.filter(Experience.user_id == user_id)
-
-        # Apply custom filters
-        if custom_filters is not None:
-            for column, value in custom_filters.items():
-                if isinstance(value, str):
-                    query = query.filter(getattr(Experience, column).like(f'%{value}%'))
-                else:
-                    query = query.filter(getattr(Experience, column) == value)
-
-        return query.count()
-
     def update_experience(self, experience: Experience):
+        user_id = experience.user_id
         self.db.commit()
+        public_profile_cache.invalidate_user(user_id)
         return experience
 
     def read_experience(self, id: str) -> Experience:
@@ -90,6 +77,8 @@ class ExperienceRepository:
 
     def delete_experience(self, experience: Experience) -> str:
         experience_id = experience.id
+        user_id = experience.user_id
         self.db.delete(experience)
         self.db.commit()
+        public_profile_cache.invalidate_user(user_id)
         return experience_id
@@ -1,10 +1,13 @@
 import uuid
 from sqlalchemy import asc, desc, or_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models.company.company import Company
 from app.models.company.company_translation import CompanyTranslation
 from app.models.experience.experience import Experience
 from app.models.experience.experience_translation import ExperienceTranslation
+from app.utils.response_cache import public_profile_cache
+from app.utils.pagination import apply_cursor, fetch_page, resolve_sort_column
 
 class ExperienceTranslationRepository:
     def __init__(self, db: Session):
@@ -12,12 +15,14 @@ class ExperienceTranslationRepository:
 
     def create_experience_translation(self, experience: ExperienceTranslation):
         experience.id = str(uuid.uuid4())
+        user_id = self.db.get(Experience, experience.experience_id).user_id
         self.db.add(experience)
         self.db.commit()
         self.db.refresh(experience)
+        public_profile_cache.invalidate_user(user_id)
         return experience
     
-    def get_experience_translation_by_user_id_and_language_id(
+    def get_experience_translation_rows_by_user_id_and_language_id(
         self, 
         user_id: str, 
         language_id: str,
@@ -26,11 +31,16 @@ class ExperienceTranslationRepository:
         custom_filters: dict = None,
         offset: int = None, 
         size: int = None, 
-    ) -> list[ExperienceTranslation]:
-        query = self.db.query(ExperienceTranslation) \
+        cursor: str = None,
+        with_total: bool = False,
+    ) -> list[tuple[ExperienceTranslation, Experience, Company, CompanyTranslation]]:
+        """
+            Translation of user with experience, company and company translation in one query
+        """
+        query = self.db.query(ExperienceTranslation, Experience, Company, CompanyTranslation) \
             .join(Experience, ExperienceTranslation.experience_id == Experience.id) \
             .join(Company, Experience.company_id == Company.id) \
-            .join(CompanyTranslation, Company.id == CompanyTranslation.company_id) \
+            .join(CompanyTranslation, Company.id == CompanyTranslation.company_id)
         
         query = query.filter(Experience.user_id == user_id)
         query = query.filter(ExperienceTranslation.language_id == language_id)
@@ -46,6 +56,11 @@ class ExperienceTranslationRepository:
                 else:
                     query = query.filter(getattr(ExperienceTranslation, column) == value)
 
+        # Sorting and pagination by cursor
+        if cursor is not None:
+            sort_column = resolve_sort_column(sort_by, ExperienceTranslation, Experience)
+            return fetch_page(apply_cursor(query, sort_column, ExperienceTranslation.id, sort_order, cursor, size), with_total, total_query=query)
+
         # Sorting
         if sort_by is not None:
             if sort_order == 'asc' and hasattr(ExperienceTranslation, sort_by):
@@ -60,44 +75,31 @@ class ExperienceTranslationRepository:
         if offset is not None and size is not None:
             query = query.offset((offset - 1) * size).limit(size)
 
-        return query.all()
-    
-    def count_experience_translation_by_user_id_and_language_id(
-        self, 
-        user_id: str, 
-        language_id: str,
-        custom_filters: dict = None,
-    ) -> list[ExperienceTranslation]:
-        query = self.db.query(ExperienceTranslation) \
-            .join(Experience, ExperienceTranslation.experience_id == Experience.id) \
-            .join(Company, Experience.company_id == Company.id) \
-            .join(CompanyTranslation, Company.id == CompanyTranslation.company_id) \
-        
-        query = query.filter(Experience.user_id == user_id)
-        query = query.filter(ExperienceTranslation.language_id == language_id)
-        query = query.filter(CompanyTranslation.language_id == language_id)
-
-        query = query.filter(Experience.is_active == True)
-
-         # Apply custom filters
-        if custom_filters is not None:
-            for column, value in custom_filters.items():
-                if isinstance(value, str):
-                    query = query.filter(getattr(ExperienceTranslation, column).like(f'%{value}%'))
-                else:
-                    query = query.filter(getattr(ExperienceTranslation, column) == value)
-
-        return query.count()
+        return fetch_page(query, with_total)
 
     def get_experience_translation_by_experience_id_and_language_id(self, experience_id: str, language_id: str) -> ExperienceTranslation:
         return self.db.query(ExperienceTranslation).filter(ExperienceTranslation.experience_id == experience_id, ExperienceTranslation.language_id == language_id).first()
 
     def update_experience_translation(self, experience: ExperienceTranslation):
+        user_id = experience.experience.user_id
         self.db.commit()
+        public_profile_cache.invalidate_user(user_id)
         return experience
 
     def delete_experience_translation(self, experience_translation: ExperienceTranslation) -> str:
         experience_translation_id = experience_translation.id
+        user_id = experience_translation.experience.user_id
         self.db.delete(experience_translation)
         self.db.commit()
+        public_profile_cache.invalidate_user(user_id)
         return experience_translation_id
+
+class AsyncExperienceTranslationRepository:
+    """
+        ExperienceTranslationRepository on AsyncSession, query of sync repository is run through run_sync
+    """
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_experience_translation_rows_by_user_id_and_language_id(self, user_id: str, language_id: str, **kwargs) -> list[tuple[ExperienceTranslation, Experience, Company, CompanyTranslation]]:
+        return await self.db.run_sync(lambda db: ExperienceTranslationRepository(db).get_experience_translation_rows_by_user_id_and_language_id(user_id, language_id, **kwargs))
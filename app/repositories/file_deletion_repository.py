@@ -0,0 +1,34 @@
+from datetime import datetime
+
+from sqlalchemy.orm import Session
+from app.models.file_deletion import FileDeletion
+
+class FileDeletionRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def create_file_deletion(self, file_deletion: FileDeletion):
+        # not committed, journal saved with the row that released the file
+        self.db.add(file_deletion)
+        return file_deletion
+
+    def claim_due_file_deletions(self, now: datetime, limit: int) -> list[FileDeletion]:
+        """
+            Due journal locked until commit, row locked by other worker is skipped
+        """
+        return self.db.query(FileDeletion) \
+            .filter(FileDeletion.next_attempt_at <= now) \
+            .order_by(FileDeletion.next_attempt_at) \
+            .limit(limit) \
+            .with_for_update(skip_locked=True) \
+            .all()
+
+    def delete_file_deletions(self, ids: list[str]) -> int:
+        # not committed, removed with the claim of the batch
+        return self.db.query(FileDeletion).filter(FileDeletion.id.in_(ids)).delete(synchronize_session=False)
+
+    def retry_file_deletion(self, file_deletion: FileDeletion, error: str, next_attempt_at: datetime):
+        file_deletion.attempts += 1
+        file_deletion.last_error = error
+        file_deletion.next_attempt_at = next_attempt_at
+        return file_deletion
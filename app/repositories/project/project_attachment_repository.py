@@ -1,7 +1,11 @@
 import uuid
 from sqlalchemy import asc, desc, or_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from app.models.project.project import Project
 from app.models.project.project_attachment import ProjectAttachment
+from app.utils.response_cache import public_profile_cache
+from app.utils.pagination import apply_cursor, fetch_page, resolve_sort_column
 
 class ProjectAttachmentRepository:
     def __init__(self, db: Session):
@@ -10,9 +14,11 @@ class ProjectAttachmentRepository:
     def create_project_attachment(self, project_attachment: ProjectAttachment):
         project_attachment.is_active = 1
         project_attachment.id = str(uuid.uuid4())
+        user_id = self.db.get(Project, project_attachment.project_id).user_id
         self.db.add(project_attachment)
         self.db.commit()
         self.db.refresh(project_attachment)
+        public_profile_cache.invalidate_user(user_id)
         return project_attachment
     
     def read_project_attachments(
@@ -22,6 +28,8 @@ class ProjectAttachmentRepository:
         custom_filters: dict = None,
         offset: int = None, 
         size: int = None,
+        cursor: str = None,
+        with_total: bool = False,
         is_active: bool = None,
         project_id: str = None,
     ) -> list[ProjectAttachment]:
@@ -42,6 +50,11 @@ class ProjectAttachmentRepository:
                 else:
                     query = query.filter(getattr(ProjectAttachment, column) == value)
 
+        # Sorting and pagination by cursor
+        if cursor is not None:
+            sort_column = resolve_sort_column(sort_by, ProjectAttachment)
+            return fetch_page(apply_cursor(query, sort_column, ProjectAttachment.id, sort_order, cursor, size), with_total, total_query=query)
+
         # Sorting
         if sort_by is not None:
             if sort_order == 'asc' and hasattr(ProjectAttachment, sort_by):
@@ -53,35 +66,12 @@ class ProjectAttachmentRepository:
         if offset is not None and size is not None:
             query = query.offset((offset - 1) * size).limit(size)
 
-        return query.all()
+        return fetch_page(query, with_total)
     
-    def count_project_attachments(
-        self, 
-        custom_filters: dict = None,
-        is_active: bool = None,
-        project_id: str = None,
-    ) -> int:
-        query = self.db.query(ProjectAttachment)
-
-        # Filtering
-        if is_active is not None:
-            query = query.filter(ProjectAttachment.is_active == is_active)
-        
-        if project_id is not None:
-            query = query.filter(ProjectAttachment.project_id == project_id)
-
-        # Apply custom filters
-        if custom_filters is not None:
-            for column, value in custom_filters.items():
-                if isinstance(value, str):
-                    query = query.filter(getattr(ProjectAttachment, column).like(f'%{value}%'))
-                else:
-                    query = query.filter(getattr(ProjectAttachment, column) == value)
-
-        return query.count()
-
     def update_project_attachment(self, project_attachment: ProjectAttachment):
+        user_id = project_attachment.project.user_id
         self.db.commit()
+        public_profile_cache.invalidate_user(user_id)
         return project_attachment
 
     def read_project_attachment(self, id: str) -> ProjectAttachment:
@@ -90,6 +80,18 @@ class ProjectAttachmentRepository:
 
     def delete_project_attachment(self, project_attachment: ProjectAttachment) -> str:
         project_attachment_id = project_attachment.id
+        user_id = project_attachment.project.user_id
         self.db.delete(project_attachment)
         self.db.commit()
+        public_profile_cache.invalidate_user(user_id)
         return project_attachment_id
+
+class AsyncProjectAttachmentRepository:
+    """
+        ProjectAttachmentRepository on AsyncSession, query of sync repository is run through run_sync
+    """
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def read_project_attachments(self, **kwargs) -> list[ProjectAttachment]:
+        return await self.db.run_sync(lambda db: ProjectAttachmentRepository(db).read_project_attachments(**kwargs))
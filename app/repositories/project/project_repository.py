@@ -1,7 +1,15 @@
 import uuid
-from sqlalchemy import asc, desc, or_
+from sqlalchemy import asc, desc, func, or_, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models.project.project import Project
+from app.models.project.project_attachment import ProjectAttachment
+from app.models.project.project_skill import ProjectSkill
+from app.models.skill.skill import Skill
+from app.models.skill.skill_translation import SkillTranslation
+from app.models.stored_file import StoredFile
+from app.utils.response_cache import public_profile_cache
+from app.utils.pagination import apply_cursor, fetch_page, resolve_sort_column
 
 class ProjectRepository:
     def __init__(self, db: Session):
@@ -13,6 +21,7 @@ class ProjectRepository:
         self.db.add(project)
         self.db.commit()
         self.db.refresh(project)
+        public_profile_cache.invalidate_user(project.user_id)
         return project
     
     def get_project_by_slug(self, slug: str) -> Project:
@@ -30,6 +39,8 @@ class ProjectRepository:
         custom_filters: dict = None,
         offset: int = None, 
         size: int = None,
+        cursor: str = None,
+        with_total: bool = False,
         is_active: bool = None,
         user_id: str = None,
     ) -> list[Project]:
@@ -50,6 +61,11 @@ class ProjectRepository:
                 else:
                     query = query.filter(getattr(Project, column) == value)
 
+        # Sorting and pagination by cursor
+        if cursor is not None:
+            sort_column = resolve_sort_column(sort_by, Project)
+            return fetch_page(apply_cursor(query, sort_column, Project.id, sort_order, cursor, size), with_total, total_query=query)
+
         # Sorting
         if sort_by is not None:
             if sort_order == 'asc' and hasattr(Project, sort_by):
@@ -61,35 +77,41 @@ class ProjectRepository:
         if offset is not None and size is not None:
             query = query.offset((offset - 1) * size).limit(size)
 
-        return query.all()
+        return fetch_page(query, with_total)
     
-    def count_projects(
-        self, 
-        custom_filters: dict = None,
-        is_active: bool = None,
-        user_id: str = None,
-    ) -> int:
-        query = self.db.query(Project)
+    def get_project_detail_version(self, project_id: str, language_id: str) -> tuple:
+        """
+            Count and latest updated_at of active attachment and skill of project, in one query
 
-        # Filtering
-        if is_active is not None:
-            query = query.filter(Project.is_active == is_active)
-        
-        if user_id is not None:
-            query = query.filter(Project.user_id == user_id)
+            - last is latest updated_at of stored file of every image, it change when derivative is ready
+        """
+        attachment_filter = (ProjectAttachment.project_id == project_id, ProjectAttachment.is_active == True)
+        skill_query = select(ProjectSkill.id) \
+            .join(SkillTranslation, SkillTranslation.skill_id == ProjectSkill.skill_id) \
+            .join(Skill, Skill.id == ProjectSkill.skill_id) \
+            .where(ProjectSkill.project_id == project_id, ProjectSkill.is_active == True, SkillTranslation.language_id == language_id)
+        image_query = union_all(
+            select(Project.image_url).where(Project.id == project_id),
+            select(Project.logo_url).where(Project.id == project_id),
+            select(ProjectAttachment.image_url).where(*attachment_filter),
+            skill_query.with_only_columns(Skill.image_url),
+            skill_query.with_only_columns(Skill.logo_url),
+        )
 
-        # Apply custom filters
-        if custom_filters is not None:
-            for column, value in custom_filters.items():
-                if isinstance(value, str):
-                    query = query.filter(getattr(Project, column).like(f'%{value}%'))
-                else:
-                    query = query.filter(getattr(Project, column) == value)
-
-        return query.count()
+        return self.db.query(
+            select(func.count(ProjectAttachment.id)).where(*attachment_filter).scalar_subquery(),
+            select(func.max(ProjectAttachment.updated_at)).where(*attachment_filter).scalar_subquery(),
+            skill_query.with_only_columns(func.count(ProjectSkill.id)).scalar_subquery(),
+            skill_query.with_only_columns(func.max(ProjectSkill.updated_at)).scalar_subquery(),
+            skill_query.with_only_columns(func.max(SkillTranslation.updated_at)).scalar_subquery(),
+            skill_query.with_only_columns(func.max(Skill.updated_at)).scalar_subquery(),
+            select(func.max(StoredFile.updated_at)).where(StoredFile.id.in_(image_query)).scalar_subquery(),
+        ).one()
 
     def update_project(self, project: Project):
+        user_id = project.user_id
         self.db.commit()
+        public_profile_cache.invalidate_user(user_id)
         return project
 
     def read_project(self, id: str) -> Project:
@@ -98,6 +120,21 @@ class ProjectRepository:
 
     def delete_project(self, project: Project) -> str:
         project_id = project.id
+        user_id = project.user_id
         self.db.delete(project)
         self.db.commit()
+        public_profile_cache.invalidate_user(user_id)
         return project_id
+
+class AsyncProjectRepository:
+    """
+        ProjectRepository on AsyncSession, query of sync repository is run through run_sync
+    """
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_project_by_user_id_and_slug(self, user_id: str, slug: str) -> Project:
+        return await self.db.run_sync(lambda db: ProjectRepository(db).get_project_by_user_id_and_slug(user_id, slug))
+
+    async def get_project_detail_version(self, project_id: str, language_id: str) -> tuple:
+        return await self.db.run_sync(lambda db: ProjectRepository(db).get_project_detail_version(project_id, language_id))
@@ -1,8 +1,12 @@
 import uuid
 from sqlalchemy import asc, desc, or_
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
+from app.models.project.project import Project
 from app.models.project.project_skill import ProjectSkill
 from app.models.skill.skill_translation import SkillTranslation
+from app.utils.response_cache import public_profile_cache
+from app.utils.pagination import apply_cursor, fetch_page, resolve_sort_column
 
 class ProjectSkillRepository:
     def __init__(self, db: Session):
@@ -10,9 +14,11 @@ class ProjectSkillRepository:
 
     def create_project_skill(self, project: ProjectSkill):
         project.id = str(uuid.uuid4())
+        user_id = self.db.get(Project, project.project_id).user_id
         self.db.add(project)
         self.db.commit()
         self.db.refresh(project)
+        public_profile_cache.invalidate_user(user_id)
         return project
 
     def get_project_skill_by_project_id_and_skill_id(self, project_id: str, skill_id: str) -> ProjectSkill:
@@ -24,7 +30,8 @@ class ProjectSkillRepository:
         language_id: str,
     ) -> list[SkillTranslation]:
         query = self.db.query(SkillTranslation) \
-            .join(ProjectSkill, SkillTranslation.skill_id == ProjectSkill.skill_id)
+            .join(ProjectSkill, SkillTranslation.skill_id == ProjectSkill.skill_id) \
+            .options(joinedload(SkillTranslation.skill))
         
         query = query.filter(ProjectSkill.project_id == project_id)
         query = query.filter(SkillTranslation.language_id == language_id)
@@ -40,6 +47,8 @@ class ProjectSkillRepository:
         custom_filters: dict = None,
         offset: int = None, 
         size: int = None,
+        cursor: str = None,
+        with_total: bool = False,
         is_active: bool = None,
         project_id: str = None,
     ) -> list[ProjectSkill]:
@@ -60,6 +69,11 @@ class ProjectSkillRepository:
                 else:
                     query = query.filter(getattr(ProjectSkill, column) == value)
 
+        # Sorting and pagination by cursor
+        if cursor is not None:
+            sort_column = resolve_sort_column(sort_by, ProjectSkill)
+            return fetch_page(apply_cursor(query, sort_column, ProjectSkill.id, sort_order, cursor, size), with_total, total_query=query)
+
         # Sorting
         if sort_by is not None:
             if sort_order == 'asc' and hasattr(ProjectSkill, sort_by):
@@ -71,39 +85,28 @@ class ProjectSkillRepository:
         if offset is not None and size is not None:
             query = query.offset((offset - 1) * size).limit(size)
 
-        return query.all()
+        return fetch_page(query, with_total)
     
-    def count_project_skills(
-        self, 
-        custom_filters: dict = None,
-        is_active: bool = None,
-        project_id: str = None,
-    ) -> int:
-        query = self.db.query(ProjectSkill)
-
-        # Filtering
-        if is_active is not None:
-            query = query.filter(ProjectSkill.is_active == is_active)
-        
-        if project_id is not None:
-            query = query.filter(ProjectSkill.project_id == project_id)
-
-        # Apply custom filters
-        if custom_filters is not None:
-            for column, value in custom_filters.items():
-                if isinstance(value, str):
-                    query = query.filter(getattr(ProjectSkill, column).like(f'%{value}%'))
-                else:
-                    query = query.filter(getattr(ProjectSkill, column) == value)
-
-        return query.count()
-
     def update_project_skill(self, project: ProjectSkill):
+        user_id = project.project.user_id
         self.db.commit()
+        public_profile_cache.invalidate_user(user_id)
         return project
 
     def delete_project_skill(self, project_skill: ProjectSkill) -> str:
         project_skill_id = project_skill.id
+        user_id = project_skill.project.user_id
         self.db.delete(project_skill)
         self.db.commit()
+        public_profile_cache.invalidate_user(user_id)
         return project_skill_id
+
+class AsyncProjectSkillRepository:
+    """
+        ProjectSkillRepository on AsyncSession, query of sync repository is run through run_sync
+    """
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_project_skill_by_project_id_and_language_id(self, project_id: str, language_id: str) -> list[SkillTranslation]:
+        return await self.db.run_sync(lambda db: ProjectSkillRepository(db).get_project_skill_by_project_id_and_language_id(project_id, language_id))
@@ -1,8 +1,11 @@
 import uuid
 from sqlalchemy import asc, desc, or_
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query, Session, contains_eager
 from app.models.project.project import Project
 from app.models.project.project_translation import ProjectTranslation
+from app.utils.response_cache import public_profile_cache
+from app.utils.pagination import apply_cursor, fetch_page, resolve_sort_column
 
 class ProjectTranslationRepository:
     def __init__(self, db: Session):
@@ -10,13 +13,16 @@ class ProjectTranslationRepository:
 
     def create_project_translation(self, project: ProjectTranslation):
         project.id = str(uuid.uuid4())
+        user_id = self.db.get(Project, project.project_id).user_id
         self.db.add(project)
         self.db.commit()
         self.db.refresh(project)
+        public_profile_cache.invalidate_user(user_id)
         return project
     
-    def get_project_translation_by_user_id_and_language_id(
-        self, 
+    def _read_by_user_id_and_language_id(
+        self,
+        query: Query,
         user_id: str, 
         language_id: str,
         sort_by: str = None, 
@@ -24,10 +30,13 @@ class ProjectTranslationRepository:
         custom_filters: dict = None,
         offset: int = None, 
         size: int = None, 
-    ) -> list[ProjectTranslation]:
-        query = self.db.query(ProjectTranslation) \
-            .join(Project, ProjectTranslation.project_id == Project.id)
-        
+        cursor: str = None,
+        with_total: bool = False,
+    ):
+        """
+            Filter, sort and paginate translation of user, shared by list and rows query
+        """
+        query = query.join(Project, ProjectTranslation.project_id == Project.id)
         query = query.filter(Project.user_id == user_id)
         query = query.filter(ProjectTranslation.language_id == language_id)
 
@@ -41,6 +50,11 @@ class ProjectTranslationRepository:
                 else:
                     query = query.filter(getattr(ProjectTranslation, column) == value)
 
+        # Sorting and pagination by cursor
+        if cursor is not None:
+            sort_column = resolve_sort_column(sort_by, ProjectTranslation)
+            return fetch_page(apply_cursor(query, sort_column, ProjectTranslation.id, sort_order, cursor, size), with_total, total_query=query)
+
         # Sorting
         if sort_by is not None:
             if sort_order == 'asc' and hasattr(ProjectTranslation, sort_by):
@@ -51,42 +65,71 @@ class ProjectTranslationRepository:
         if offset is not None and size is not None:
             query = query.offset((offset - 1) * size).limit(size)
 
-        return query.all()
-    
-    def count_project_translation_by_user_id_and_language_id(
+        return fetch_page(query, with_total)
+
+    def get_project_translation_by_user_id_and_language_id(
         self, 
         user_id: str, 
         language_id: str,
+        sort_by: str = None, 
+        sort_order: str = 'asc', 
         custom_filters: dict = None,
+        offset: int = None, 
+        size: int = None, 
+        cursor: str = None,
+        with_total: bool = False,
     ) -> list[ProjectTranslation]:
         query = self.db.query(ProjectTranslation) \
-            .join(Project, ProjectTranslation.project_id == Project.id)
-        
-        query = query.filter(Project.user_id == user_id)
-        query = query.filter(ProjectTranslation.language_id == language_id)
-
-        query = query.filter(Project.is_active == True)
-
-         # Apply custom filters
-        if custom_filters is not None:
-            for column, value in custom_filters.items():
-                if isinstance(value, str):
-                    query = query.filter(getattr(ProjectTranslation, column).like(f'%{value}%'))
-                else:
-                    query = query.filter(getattr(ProjectTranslation, column) == value)
-
-        return query.count()
-
+            .options(contains_eager(ProjectTranslation.project))
+        return self._read_by_user_id_and_language_id(query, user_id, language_id, sort_by, sort_order, custom_filters, offset, size, cursor, with_total)
+    
+    def get_project_translation_rows_by_user_id_and_language_id(
+        self, 
+        user_id: str, 
+        language_id: str,
+        sort_by: str = None, 
+        sort_order: str = 'asc', 
+        custom_filters: dict = None,
+        offset: int = None, 
+        size: int = None, 
+        cursor: str = None,
+        with_total: bool = False,
+    ) -> list[tuple[ProjectTranslation, Project]]:
+        """
+            Same as get_project_translation_by_user_id_and_language_id, with related row in one query
+        """
+        query = self.db.query(ProjectTranslation, Project)
+        return self._read_by_user_id_and_language_id(query, user_id, language_id, sort_by, sort_order, custom_filters, offset, size, cursor, with_total)
 
     def get_project_translation_by_project_id_and_language_id(self, project_id: str, language_id: str) -> ProjectTranslation:
         return self.db.query(ProjectTranslation).filter(ProjectTranslation.project_id == project_id, ProjectTranslation.language_id == language_id).first()
 
     def update_project_translation(self, project: ProjectTranslation):
+        user_id = project.project.user_id
         self.db.commit()
+        public_profile_cache.invalidate_user(user_id)
         return project
 
     def delete_project_translation(self, project_translation: ProjectTranslation) -> str:
         project_translation_id = project_translation.id
+        user_id = project_translation.project.user_id
         self.db.delete(project_translation)
         self.db.commit()
+        public_profile_cache.invalidate_user(user_id)
         return project_translation_id
+
+class AsyncProjectTranslationRepository:
+    """
+        ProjectTranslationRepository on AsyncSession, query of sync repository is run through run_sync
+    """
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_project_translation_by_user_id_and_language_id(self, user_id: str, language_id: str, **kwargs) -> list[ProjectTranslation]:
+        return await self.db.run_sync(lambda db: ProjectTranslationRepository(db).get_project_translation_by_user_id_and_language_id(user_id, language_id, **kwargs))
+
+    async def get_project_translation_rows_by_user_id_and_language_id(self, user_id: str, language_id: str, **kwargs) -> list[tuple[ProjectTranslation, Project]]:
+        return await self.db.run_sync(lambda db: ProjectTranslationRepository(db).get_project_translation_rows_by_user_id_and_language_id(user_id, language_id, **kwargs))
+
+    async def get_project_translation_by_project_id_and_language_id(self, project_id: str, language_id: str) -> ProjectTranslation:
+        return await self.db.run_sync(lambda db: ProjectTranslationRepository(db).get_project_translation_by_project_id_and_language_id(project_id, language_id))
@@ -0,0 +1,64 @@
+from datetime import datetime
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+from app.models.refresh_token import RefreshToken
+from app.models.role.role import Role
+from app.models.user import User
+
+class RefreshTokenRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def create_refresh_token(self, refresh_token: RefreshToken, is_commit: bool = True):
+        self.db.add(refresh_token)
+        if is_commit:
+            self.db.commit()
+        return refresh_token
+
+    def get_refresh_token_by_hash(self, token_hash: str) -> tuple[RefreshToken, User, Role] | None:
+        """
+            Refresh token with its user and role in one query
+        """
+        return self.db.query(RefreshToken, User, Role) \
+            .join(User, RefreshToken.user_id == User.id) \
+            .outerjoin(Role, User.role_id == Role.id) \
+            .filter(RefreshToken.token_hash == token_hash) \
+            .first()
+
+    def rotate_refresh_token(self, exist_refresh_token: RefreshToken, refresh_token: RefreshToken) -> bool:
+        """
+            Revoke old token and save its replacement
+
+            - false when old token already revoked by other request, nothing saved
+        """
+        count = self.db.query(RefreshToken) \
+            .filter(RefreshToken.id == exist_refresh_token.id, RefreshToken.revoked_at.is_(None)) \
+            .update({RefreshToken.revoked_at: sa.func.now(), RefreshToken.replaced_by: refresh_token.id}, synchronize_session=False)
+        if count != 1:
+            self.db.rollback()
+            return False
+
+        self.db.add(refresh_token)
+        self.db.commit()
+        return True
+
+    def revoke_refresh_token_family(self, family_id: str) -> int:
+        count = self.db.query(RefreshToken) \
+            .filter(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None)) \
+            .update({RefreshToken.revoked_at: sa.func.now()}, synchronize_session=False)
+        self.db.commit()
+        return count
+
+    def revoke_user_refresh_tokens(self, user_id: str, is_commit: bool = True) -> int:
+        count = self.db.query(RefreshToken) \
+            .filter(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None)) \
+            .update({RefreshToken.revoked_at: sa.func.now()}, synchronize_session=False)
+        if is_commit:
+            self.db.commit()
+        return count
+
+    def delete_expired_refresh_tokens(self, expired_before: datetime) -> int:
+        count = self.db.query(RefreshToken).filter(RefreshToken.expired_at <= expired_before).delete(synchronize_session=False)
+        self.db.commit()
+        return count
@@ -0,0 +1,28 @@
+from datetime import datetime
+
+from sqlalchemy.orm import Session
+from app.models.revoked_token import RevokedToken
+
+class RevokedTokenRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def create_revoked_token(self, revoked_token: RevokedToken):
+        if self.db.get(RevokedToken, revoked_token.id) is None:
+            self.db.add(revoked_token)
+            self.db.commit()
+        return revoked_token
+
+    def read_revoked_tokens(self, expired_after: datetime, created_since: datetime = None) -> list[tuple[str, datetime]]:
+        """
+            (jti, created_at) of token not expired yet, created_since for incremental load
+        """
+        query = self.db.query(RevokedToken.id, RevokedToken.created_at).filter(RevokedToken.expired_at > expired_after)
+        if created_since is not None:
+            query = query.filter(RevokedToken.created_at >= created_since)
+        return query.all()
+
+    def delete_expired_revoked_tokens(self, expired_before: datetime) -> int:
+        count = self.db.query(RevokedToken).filter(RevokedToken.expired_at <= expired_before).delete(synchronize_session=False)
+        self.db.commit()
+        return count
@@ -2,6 +2,7 @@ import uuid
 from sqlalchemy import asc, desc
 from sqlalchemy.orm import Session
 from app.models.role.role_authority import RoleAuthority
+from app.utils.permission import permission_cache
 
 class RoleAuthorityRepository:
     def __init__(self, db: Session):
@@ -12,11 +13,15 @@ class RoleAuthorityRepository:
         self.db.add(role_authority)
         self.db.commit()
         self.db.refresh(role_authority)
+        permission_cache.invalidate()
         return role_authority
     
     def get_role_authority_by_specific(self, role_id: int, name: str, feature: str) -> RoleAuthority:
         return self.db.query(RoleAuthority).filter(RoleAuthority.role_id == role_id,  RoleAuthority.name == name, RoleAuthority.feature == feature).first()
 
+    def has_role_authority(self, role_id: int, name: str, feature: str) -> bool:
+        return permission_cache.has_permission(self.db, role_id, feature, name)
+
     def read_role_authorities(
         self, 
         offset: int = None, 
@@ -56,25 +61,6 @@ class RoleAuthorityRepository:
 
         return query.all()
     
-    def count_role_authorities(
-        self,
-        role_id: int = None,
-        feature: str = None,
-        name: str = None,
-    ) -> int:
-        query = self.db.query(RoleAuthority)
-
-        if role_id is not None:
-            query = query.filter(RoleAuthority.role_id == role_id)
-
-        if feature is not None:
-            query = query.filter(RoleAuthority.feature == feature)
-        
-        if name is not None:
-            query = query.filter(RoleAuthority.name == name)
-
-        return query.count()
-
     def read_role_authority(self, id: str) -> RoleAuthority:
         role_authority = self.db.query(RoleAuthority).filter(RoleAuthority.id == id).first()
         return role_authority
@@ -83,4 +69,5 @@ class RoleAuthorityRepository:
         role_authority_id = role_authority.id
         self.db.delete(role_authority)
         self.db.commit()
+        permission_cache.invalidate()
         return role_authority_id
@@ -1,6 +1,8 @@
 from sqlalchemy import asc, desc
 from sqlalchemy.orm import Session
 from app.models.role.role import Role
+from app.utils.permission import permission_cache
+from app.utils.pagination import apply_cursor, fetch_page, resolve_sort_column
 
 class RoleRepository:
     def __init__(self, db: Session):
@@ -11,6 +13,7 @@ class RoleRepository:
         self.db.add(role)
         self.db.commit()
         self.db.refresh(role)
+        permission_cache.invalidate()
         return role
 
     def get_role_by_code(self, code: str) -> Role:
@@ -23,6 +26,8 @@ class RoleRepository:
         self, 
         offset: int = None, 
         size: int = None,
+        cursor: str = None,
+        with_total: bool = False,
         is_active: bool = None,
         level: int = None,
         sort_by: str = None, 
@@ -36,6 +41,11 @@ class RoleRepository:
         if level is not None:
             query = query.filter(Role.level >= level)
 
+        # Sorting and pagination by cursor
+        if cursor is not None:
+            sort_column = resolve_sort_column(sort_by, Role)
+            return fetch_page(apply_cursor(query, sort_column, Role.id, sort_order, cursor, size), with_total, total_query=query)
+
         # Sorting
         if sort_by is not None:
             if sort_order == 'asc' and hasattr(Role, sort_by):
@@ -47,25 +57,11 @@ class RoleRepository:
         if offset is not None and size is not None:
             query = query.offset((offset - 1) * size).limit(size)
 
-        return query.all()
+        return fetch_page(query, with_total)
     
-    def count_roles(
-        self, 
-        is_active: bool = None,
-        level: int = None,
-    ) -> int:
-        query = self.db.query(Role)
-
-        if is_active is not None:
-            query = query.filter(Role.is_active == is_active)
-
-        if level is not None:
-            query = query.filter(Role.level >= level)
-
-        return query.count()
-
     def update_role(self, role: Role):
         self.db.commit()
+        permission_cache.invalidate()
         return role
 
     def read_role(self, id: str) -> Role:
@@ -76,4 +72,5 @@ class RoleRepository:
         role_id = role.id
         self.db.delete(role)
         self.db.commit()
+        permission_cache.invalidate()
         return role_id
\ No newline at end of file
@@ -2,6 +2,8 @@ import uuid
 from sqlalchemy import asc, desc, or_
 from sqlalchemy.orm import Session
 from app.models.school.school import School
+from app.utils.response_cache import public_profile_cache
+from app.utils.pagination import apply_cursor, fetch_page, resolve_sort_column
 
 class SchoolRepository:
     def __init__(self, db: Session):
@@ -13,6 +15,7 @@ class SchoolRepository:
         self.db.add(school)
         self.db.commit()
         self.db.refresh(school)
+        public_profile_cache.invalidate_all()
         return school
 
     def get_school_by_name(self, name: str) -> School:
@@ -28,6 +31,8 @@ class SchoolRepository:
         custom_filters: dict = None,
         offset: int = None, 
         size: int = None,
+        cursor: str = None,
+        with_total: bool = False,
         is_active: bool = None,
     ) -> list[School]:
         query = self.db.query(School)
@@ -44,6 +49,11 @@ class SchoolRepository:
                 else:
                     query = query.filter(getattr(School, column) == value)
 
+        # Sorting and pagination by cursor
+        if cursor is not None:
+            sort_column = resolve_sort_column(sort_by, School)
+            return fetch_page(apply_cursor(query, sort_column, School.id, sort_order, cursor, size), with_total, total_query=query)
+
         # Sorting
         if sort_by is not None:
             if sort_order == 'asc' and hasattr(School, sort_by):
@@ -55,31 +65,11 @@ class SchoolRepository:
         if offset is not None and size is not None:
             query = query.offset((offset - 1) * size).limit(size)
 
-        return query.all()
+        return fetch_page(query, with_total)
     
-    def count_schools(
-        self, 
-        custom_filters: dict = None,
-        is_active: bool = None,
-    ) -> int:
-        query = self.db.query(School)
-
-        # Filtering
-        if is_active is not None:
-            query = query.filter(School.is_active == is_active)
-
-        # Apply custom filters
-        if custom_filters is not None:
-            for column, value in custom_filters.items():
-                if isinstance(value, str):
-                    query = query.filter(getattr(School, column).like(f'%{value}%'))
-                else:
-                    query = query.filter(getattr(School, column) == value)
-
-        return query.count()
-
     def update_school(self, school: School):
         self.db.commit()
+        public_profile_cache.invalidate_all()
         return school
 
     def read_school(self, id: str) -> School:
@@ -90,4 +80,5 @@ class SchoolRepository:
         school_id = school.id
         self.db.delete(school)
         self.db.commit()
+        public_profile_cache.invalidate_all()
         return school_id
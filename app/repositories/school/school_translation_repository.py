@@ -2,6 +2,7 @@ import uuid
 from sqlalchemy import asc, desc, or_
 from sqlalchemy.orm import Session
 from app.models.school.school_translation import SchoolTranslation
+from app.utils.response_cache import public_profile_cache
 
 class SchoolTranslationRepository:
     def __init__(self, db: Session):
@@ -12,6 +13,7 @@ class SchoolTranslationRepository:
         self.db.add(school)
         self.db.commit()
         self.db.refresh(school)
+        public_profile_cache.invalidate_all()
         return school
 
     def get_school_translation_by_school_id_and_language_id(self, school_id: str, language_id: str) -> SchoolTranslation:
@@ -19,10 +21,12 @@ class SchoolTranslationRepository:
 
     def update_school_translation(self, school: SchoolTranslation):
         self.db.commit()
+        public_profile_cache.invalidate_all()
         return school
 
     def delete_school_translation(self, school_translation: SchoolTranslation) -> str:
         school_translation_id = school_translation.id
         self.db.delete(school_translation)
         self.db.commit()
+        public_profile_cache.invalidate_all()
         return school_translation_id
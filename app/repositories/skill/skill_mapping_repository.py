@@ -2,6 +2,8 @@ import uuid
 from sqlalchemy import asc, desc, or_
 from sqlalchemy.orm import Session
 from app.models.skill.skill_mapping import SkillMapping
+from app.utils.response_cache import public_profile_cache
+from app.utils.pagination import apply_cursor, fetch_page, resolve_sort_column
 
 class SkillMappingRepository:
     def __init__(self, db: Session):
@@ -13,6 +15,7 @@ class SkillMappingRepository:
         self.db.add(skill_mapping)
         self.db.commit()
         self.db.refresh(skill_mapping)
+        public_profile_cache.invalidate_user(skill_mapping.user_id)
         return skill_mapping
     
     def read_skill_mappings(
@@ -22,6 +25,8 @@ class SkillMappingRepository:
         custom_filters: dict = None,
         offset: int = None, 
         size: int = None,
+        cursor: str = None,
+        with_total: bool = False,
         is_active: bool = None,
         user_id: str = None,
     ) -> list[SkillMapping]:
@@ -42,6 +47,11 @@ class SkillMappingRepository:
                 else:
                     query = query.filter(getattr(SkillMapping, column) == value)
 
+        # Sorting and pagination by cursor
+        if cursor is not None:
+            sort_column = resolve_sort_column(sort_by, SkillMapping)
+            return fetch_page(apply_cursor(query, sort_column, SkillMapping.id, sort_order, cursor, size), with_total, total_query=query)
+
         # Sorting
         if sort_by is not None:
             if sort_order == 'asc' and hasattr(SkillMapping, sort_by):
@@ -53,35 +63,12 @@ class SkillMappingRepository:
         if offset is not None and size is not None:
             query = query.offset((offset - 1) * size).limit(size)
 
-        return query.all()
+        return fetch_page(query, with_total)
     
-    def count_skill_mappings(
-        self, 
-        custom_filters: dict = None,
-        is_active: bool = None,
-        user_id: str = None,
-    ) -> int:
-        query = self.db.query(SkillMapping)
-
-        # Filtering
-        if is_active is not None:
-            query = query.filter(SkillMapping.is_active == is_active)
-        
-        if user_id is not None:
-            query = query.filter(SkillMapping.user_id == user_id)
-
-        # Apply custom filters
-        if custom_filters is not None:
-            for column, value in custom_filters.items():
-                if isinstance(value, str):
-                    query = query.filter(getattr(SkillMapping, column).like(f'%{value}%'))
-                else:
-                    query = query.filter(getattr(SkillMapping, column) == value)
-
-        return query.count()
-
     def update_skill_mapping(self, skill_mapping: SkillMapping):
+        user_id = skill_mapping.user_id
         self.db.commit()
+        public_profile_cache.invalidate_user(user_id)
         return skill_mapping
 
     def read_skill_mapping(self, id: str) -> SkillMapping:
@@ -94,6 +81,8 @@ class SkillMappingRepository:
 
     def delete_skill_mapping(self, skill_mapping: SkillMapping) -> str:
         skill_mapping_id = skill_mapping.id
+        user_id = skill_mapping.user_id
         self.db.delete(skill_mapping)
         self.db.commit()
+        public_profile_cache.invalidate_user(user_id)
         return skill_mapping_id
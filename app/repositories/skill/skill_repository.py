@@ -2,6 +2,8 @@ import uuid
 from sqlalchemy import asc, desc
 from sqlalchemy.orm import Session
 from app.models.skill.skill import Skill
+from app.utils.response_cache import public_profile_cache
+from app.utils.pagination import apply_cursor, fetch_page, resolve_sort_column
 
 class SkillRepository:
     def __init__(self, db: Session):
@@ -13,6 +15,7 @@ class SkillRepository:
         self.db.add(skill)
         self.db.commit()
         self.db.refresh(skill)
+        public_profile_cache.invalidate_all()
         return skill
 
     def get_skill_by_name(self, name: str) -> Skill:
@@ -28,6 +31,8 @@ class SkillRepository:
         custom_filters: dict = None,
         offset: int = None, 
         size: int = None,
+        cursor: str = None,
+        with_total: bool = False,
         is_active: bool = None,
     ) -> list[Skill]:
         query = self.db.query(Skill)
@@ -44,6 +49,11 @@ class SkillRepository:
                 else:
                     query = query.filter(getattr(Skill, column) == value)
 
+        # Sorting and pagination by cursor
+        if cursor is not None:
+            sort_column = resolve_sort_column(sort_by, Skill)
+            return fetch_page(apply_cursor(query, sort_column, Skill.id, sort_order, cursor, size), with_total, total_query=query)
+
         # Sorting
         if sort_by is not None:
             if sort_order == 'asc' and hasattr(Skill, sort_by):
@@ -55,31 +65,11 @@ class SkillRepository:
         if offset is not None and size is not None:
             query = query.offset((offset - 1) * size).limit(size)
 
-        return query.all()
+        return fetch_page(query, with_total)
     
-    def count_skills(
-        self, 
-        custom_filters: dict = None,
-        is_active: bool = None,
-    ) -> int:
-        query = self.db.query(Skill)
-
-        # Filtering
-        if is_active is not None:
-            query = query.filter(Skill.is_active == is_active)
-
-        # Apply custom filters
-        if custom_filters is not None:
-            for column, value in custom_filters.items():
-                if isinstance(value, str):
-                    query = query.filter(getattr(Skill, column).like(f'%{value}%'))
-                else:
-                    query = query.filter(getattr(Skill, column) == value)
-
-        return query.count()
-
     def update_skill(self, skill: Skill):
         self.db.commit()
+        public_profile_cache.invalidate_all()
         return skill
 
     def read_skill(self, id: str) -> Skill:
@@ -90,4 +80,5 @@ class SkillRepository:
         skill_id = skill.id
         self.db.delete(skill)
         self.db.commit()
+        public_profile_cache.invalidate_all()
         return skill_id
@@ -1,8 +1,12 @@
 import uuid
 from sqlalchemy import asc, desc, or_
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query, Session, joinedload
+from app.models.skill.skill import Skill
 from app.models.skill.skill_mapping import SkillMapping
 from app.models.skill.skill_translation import SkillTranslation
+from app.utils.response_cache import public_profile_cache
+from app.utils.pagination import apply_cursor, fetch_page, resolve_sort_column
 
 class SkillTranslationRepository:
     def __init__(self, db: Session):
@@ -13,10 +17,12 @@ class SkillTranslationRepository:
         self.db.add(skill)
         self.db.commit()
         self.db.refresh(skill)
+        public_profile_cache.invalidate_all()
         return skill
 
-    def get_skill_translation_by_user_id_and_language_id(
-        self, 
+    def _read_by_user_id_and_language_id(
+        self,
+        query: Query,
         user_id: str, 
         language_id: str,
         sort_by: str = None, 
@@ -24,9 +30,13 @@ class SkillTranslationRepository:
         custom_filters: dict = None,
         offset: int = None, 
         size: int = None, 
-    ) -> list[SkillTranslation]:
-        query = self.db.query(SkillTranslation).join(SkillMapping, SkillTranslation.skill_id == SkillMapping.skill_id)
-        
+        cursor: str = None,
+        with_total: bool = False,
+    ):
+        """
+            Filter, sort and paginate translation of user, shared by list and rows query
+        """
+        query = query.join(SkillMapping, SkillTranslation.skill_id == SkillMapping.skill_id)
         query = query.filter(SkillMapping.user_id == user_id)
         query = query.filter(SkillTranslation.language_id == language_id)
 
@@ -40,6 +50,11 @@ class SkillTranslationRepository:
                 else:
                     query = query.filter(getattr(SkillTranslation, column) == value)
 
+        # Sorting and pagination by cursor
+        if cursor is not None:
+            sort_column = resolve_sort_column(sort_by, SkillTranslation)
+            return fetch_page(apply_cursor(query, sort_column, SkillTranslation.id, sort_order, cursor, size), with_total, total_query=query)
+
         # Sorting
         if sort_by is not None:
             if sort_order == 'asc' and hasattr(SkillTranslation, sort_by):
@@ -50,40 +65,67 @@ class SkillTranslationRepository:
         if offset is not None and size is not None:
             query = query.offset((offset - 1) * size).limit(size)
 
-        return query.all()
-    
-    def count_skill_translation_by_user_id_and_language_id(
+        return fetch_page(query, with_total)
+
+    def get_skill_translation_by_user_id_and_language_id(
         self, 
         user_id: str, 
         language_id: str,
+        sort_by: str = None, 
+        sort_order: str = 'asc', 
         custom_filters: dict = None,
+        offset: int = None, 
+        size: int = None, 
+        cursor: str = None,
+        with_total: bool = False,
     ) -> list[SkillTranslation]:
-        query = self.db.query(SkillTranslation).join(SkillMapping, SkillTranslation.skill_id == SkillMapping.skill_id)
-        
-        query = query.filter(SkillMapping.user_id == user_id)
-        query = query.filter(SkillTranslation.language_id == language_id)
-
-        query = query.filter(SkillMapping.is_active == True)
-
-         # Apply custom filters
-        if custom_filters is not None:
-            for column, value in custom_filters.items():
-                if isinstance(value, str):
-                    query = query.filter(getattr(SkillTranslation, column).like(f'%{value}%'))
-                else:
-                    query = query.filter(getattr(SkillTranslation, column) == value)
-
-        return query.count()
+        query = self.db.query(SkillTranslation) \
+            .options(joinedload(SkillTranslation.skill))
+        return self._read_by_user_id_and_language_id(query, user_id, language_id, sort_by, sort_order, custom_filters, offset, size, cursor, with_total)
     
+    def get_skill_translation_rows_by_user_id_and_language_id(
+        self, 
+        user_id: str, 
+        language_id: str,
+        sort_by: str = None, 
+        sort_order: str = 'asc', 
+        custom_filters: dict = None,
+        offset: int = None, 
+        size: int = None, 
+        cursor: str = None,
+        with_total: bool = False,
+    ) -> list[tuple[SkillTranslation, Skill]]:
+        """
+            Same as get_skill_translation_by_user_id_and_language_id, with related row in one query
+        """
+        query = self.db.query(SkillTranslation, Skill) \
+            .join(Skill, SkillTranslation.skill_id == Skill.id)
+        return self._read_by_user_id_and_language_id(query, user_id, language_id, sort_by, sort_order, custom_filters, offset, size, cursor, with_total)
+
     def get_skill_translation_by_skill_id_and_language_id(self, skill_id: str, language_id: str) -> SkillTranslation:
         return self.db.query(SkillTranslation).filter(SkillTranslation.skill_id == skill_id, SkillTranslation.language_id == language_id).first()
 
     def update_skill_translation(self, skill: SkillTranslation):
         self.db.commit()
+        public_profile_cache.invalidate_all()
         return skill
 
     def delete_skill_translation(self, skill_translation: SkillTranslation) -> str:
         skill_translation_id = skill_translation.id
         self.db.delete(skill_translation)
         self.db.commit()
+        public_profile_cache.invalidate_all()
         return skill_translation_id
+
+class AsyncSkillTranslationRepository:
+    """
+        SkillTranslationRepository on AsyncSession, query of sync repository is run through run_sync
+    """
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_skill_translation_by_user_id_and_language_id(self, user_id: str, language_id: str, **kwargs) -> list[SkillTranslation]:
+        return await self.db.run_sync(lambda db: SkillTranslationRepository(db).get_skill_translation_by_user_id_and_language_id(user_id, language_id, **kwargs))
+
+    async def get_skill_translation_rows_by_user_id_and_language_id(self, user_id: str, language_id: str, **kwargs) -> list[tuple[SkillTranslation, Skill]]:
+        return await self.db.run_sync(lambda db: SkillTranslationRepository(db).get_skill_translation_rows_by_user_id_and_language_id(user_id, language_id, **kwargs))
@@ -2,6 +2,8 @@ import uuid
 from sqlalchemy import asc, desc, or_
 from sqlalchemy.orm import Session
 from app.models.solution.solution import Solution
+from app.utils.response_cache import public_profile_cache
+from app.utils.pagination import apply_cursor, fetch_page, resolve_sort_column
 
 class SolutionRepository:
     def __init__(self, db: Session):
@@ -13,6 +15,7 @@ class SolutionRepository:
         self.db.add(solution)
         self.db.commit()
         self.db.refresh(solution)
+        public_profile_cache.invalidate_user(solution.user_id)
         return solution
     
     def read_solutions(
@@ -22,6 +25,8 @@ class SolutionRepository:
         custom_filters: dict = None,
         offset: int = None, 
         size: int = None,
+        cursor: str = None,
+        with_total: bool = False,
         is_active: bool = None,
         user_id: str = None,
     ) -> list[Solution]:
@@ -42,6 +47,11 @@ class SolutionRepository:
                 else:
                     query = query.filter(getattr(Solution, column) == value)
 
+        # Sorting and pagination by cursor
+        if cursor is not None:
+            sort_column = resolve_sort_column(sort_by, Solution)
+            return fetch_page(apply_cursor(query, sort_column, Solution.id, sort_order, cursor, size), with_total, total_query=query)
+
         # Sorting
         if sort_by is not None:
             if sort_order == 'asc' and hasattr(Solution, sort_by):
@@ -53,35 +63,12 @@ class SolutionRepository:
         if offset is not None and size is not None:
             query = query.offset((offset - 1) * size).limit(size)
 
-        return query.all()
+        return fetch_page(query, with_total)
     
-    def count_solutions(
-        self, 
-        custom_filters: dict = None,
-        is_active: bool = None,
-        user_id: str = None,
-    ) -> int:
-        query = self.db.query(Solution)
-
-        # Filtering
-        if is_active is not None:
-            query = query.filter(Solution.is_active == is_active)
-        
-        if user_id is not None:
-            query = query.filter(Solution.user_id == user_id)
-
-        # Apply custom filters
-        if custom_filters is not None:
-            for column, value in custom_filters.items():
-                if isinstance(value, str):
-                    query = query.filter(getattr(Solution, column).like(f'%{value}%'))
-                else:
-                    query = query.filter(getattr(Solution, column) == value)
-
-        return query.count()
-
     def update_solution(self, solution: Solution):
+        user_id = solution.user_id
         self.db.commit()
+        public_profile_cache.invalidate_user(user_id)
         return solution
 
     def read_solution(self, id: str) -> Solution:
@@ -90,6 +77,8 @@ class SolutionRepository:
 
     def delete_solution(self, solution: Solution) -> str:
         solution_id = solution.id
+        user_id = solution.user_id
         self.db.delete(solution)
         self.db.commit()
+        public_profile_cache.invalidate_user(user_id)
         return solution_id
@@ -1,8 +1,11 @@
 import uuid
 from sqlalchemy import asc, desc, or_
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query, Session, contains_eager
 from app.models.solution.solution import Solution
 from app.models.solution.solution_translation import SolutionTranslation
+from app.utils.response_cache import public_profile_cache
+from app.utils.pagination import apply_cursor, fetch_page, resolve_sort_column
 
 class SolutionTranslationRepository:
     def __init__(self, db: Session):
@@ -10,13 +13,16 @@ class SolutionTranslationRepository:
 
     def create_solution_translation(self, solution: SolutionTranslation):
         solution.id = str(uuid.uuid4())
+        user_id = self.db.get(Solution, solution.solution_id).user_id
         self.db.add(solution)
         self.db.commit()
         self.db.refresh(solution)
+        public_profile_cache.invalidate_user(user_id)
         return solution
 
-    def get_solution_translation_by_user_id_and_language_id(
-        self, 
+    def _read_by_user_id_and_language_id(
+        self,
+        query: Query,
         user_id: str, 
         language_id: str,
         sort_by: str = None, 
@@ -24,10 +30,13 @@ class SolutionTranslationRepository:
         custom_filters: dict = None,
         offset: int = None, 
         size: int = None, 
-    ) -> list[SolutionTranslation]:
-        query = self.db.query(SolutionTranslation) \
-            .join(Solution, SolutionTranslation.solution_id == Solution.id)
-        
+        cursor: str = None,
+        with_total: bool = False,
+    ):
+        """
+            Filter, sort and paginate translation of user, shared by list and rows query
+        """
+        query = query.join(Solution, SolutionTranslation.solution_id == Solution.id)
         query = query.filter(Solution.user_id == user_id)
         query = query.filter(SolutionTranslation.language_id == language_id)
 
@@ -41,6 +50,11 @@ class SolutionTranslationRepository:
                 else:
                     query = query.filter(getattr(SolutionTranslation, column) == value)
 
+        # Sorting and pagination by cursor
+        if cursor is not None:
+            sort_column = resolve_sort_column(sort_by, SolutionTranslation)
+            return fetch_page(apply_cursor(query, sort_column, SolutionTranslation.id, sort_order, cursor, size), with_total, total_query=query)
+
         # Sorting
         if sort_by is not None:
             if sort_order == 'asc' and hasattr(SolutionTranslation, sort_by):
@@ -51,41 +65,68 @@ class SolutionTranslationRepository:
         if offset is not None and size is not None:
             query = query.offset((offset - 1) * size).limit(size)
 
-        return query.all()
-    
-    def count_solution_translation_by_user_id_and_language_id(
+        return fetch_page(query, with_total)
+
+    def get_solution_translation_by_user_id_and_language_id(
         self, 
         user_id: str, 
         language_id: str,
+        sort_by: str = None, 
+        sort_order: str = 'asc', 
         custom_filters: dict = None,
+        offset: int = None, 
+        size: int = None, 
+        cursor: str = None,
+        with_total: bool = False,
     ) -> list[SolutionTranslation]:
         query = self.db.query(SolutionTranslation) \
-            .join(Solution, SolutionTranslation.solution_id == Solution.id)
-        
-        query = query.filter(Solution.user_id == user_id)
-        query = query.filter(SolutionTranslation.language_id == language_id)
-
-        query = query.filter(Solution.is_active == True)
-
-         # Apply custom filters
-        if custom_filters is not None:
-            for column, value in custom_filters.items():
-                if isinstance(value, str):
-                    query = query.filter(getattr(SolutionTranslation, column).like(f'%{value}%'))
-                else:
-                    query = query.filter(getattr(SolutionTranslation, column) == value)
-
-        return query.count()
+            .options(contains_eager(SolutionTranslation.solution))
+        return self._read_by_user_id_and_language_id(query, user_id, language_id, sort_by, sort_order, custom_filters, offset, size, cursor, with_total)
+    
+    def get_solution_translation_rows_by_user_id_and_language_id(
+        self, 
+        user_id: str, 
+        language_id: str,
+        sort_by: str = None, 
+        sort_order: str = 'asc', 
+        custom_filters: dict = None,
+        offset: int = None, 
+        size: int = None, 
+        cursor: str = None,
+        with_total: bool = False,
+    ) -> list[tuple[SolutionTranslation, Solution]]:
+        """
+            Same as get_solution_translation_by_user_id_and_language_id, with related row in one query
+        """
+        query = self.db.query(SolutionTranslation, Solution)
+        return self._read_by_user_id_and_language_id(query, user_id, language_id, sort_by, sort_order, custom_filters, offset, size, cursor, with_total)
 
     def get_solution_translation_by_solution_id_and_language_id(self, solution_id: str, language_id: str) -> SolutionTranslation:
         return self.db.query(SolutionTranslation).filter(SolutionTranslation.solution_id == solution_id, SolutionTranslation.language_id == language_id).first()
 
     def update_solution_translation(self, solution: SolutionTranslation):
+        user_id = solution.solution.user_id
         self.db.commit()
+        public_profile_cache.invalidate_user(user_id)
         return solution
 
     def delete_solution_translation(self, solution_translation: SolutionTranslation) -> str:
         solution_translation_id = solution_translation.id
+        user_id = solution_translation.solution.user_id
         self.db.delete(solution_translation)
         self.db.commit()
+        public_profile_cache.invalidate_user(user_id)
         return solution_translation_id
+
+class AsyncSolutionTranslationRepository:
+    """
+        SolutionTranslationRepository on AsyncSession, query of sync repository is run through run_sync
+    """
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_solution_translation_by_user_id_and_language_id(self, user_id: str, language_id: str, **kwargs) -> list[SolutionTranslation]:
+        return await self.db.run_sync(lambda db: SolutionTranslationRepository(db).get_solution_translation_by_user_id_and_language_id(user_id, language_id, **kwargs))
+
+    async def get_solution_translation_rows_by_user_id_and_language_id(self, user_id: str, language_id: str, **kwargs) -> list[tuple[SolutionTranslation, Solution]]:
+        return await self.db.run_sync(lambda db: SolutionTranslationRepository(db).get_solution_translation_rows_by_user_id_and_language_id(user_id, language_id, **kwargs))
@@ -0,0 +1,91 @@
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.models.stored_file import StoredFile
+
+class StoredFileRepository:
+    """
+        Reference count of stored file
+
+        - not committed here, count change is saved with the row that use the file
+    """
+    def __init__(self, db: Session):
+        self.db = db
+
+    def read_stored_file(self, id: str):
+        return self.db.get(StoredFile, id)
+
+    def _increment(self, id: str) -> int:
+        return self.db.query(StoredFile) \
+            .filter(StoredFile.id == id) \
+            .update({StoredFile.ref_count: StoredFile.ref_count + 1}, synchronize_session=False)
+
+    def add_reference(self, id: str, size: int, content_type: str = None):
+        """
+            Count one more reference, row stay locked by the update or insert until commit
+
+            - deletion of the same file wait for the lock, see lock_stored_files
+        """
+        if self._increment(id):
+            return
+
+        try:
+            # other request can insert the same content first
+            with self.db.begin_nested():
+                self.db.add(StoredFile(id=id, size=size, content_type=content_type, ref_count=1))
+        except IntegrityError:
+            self._increment(id)
+
+    def remove_reference(self, id: str) -> int | None:
+        """
+            Reference left, None when file is not tracked
+        """
+        count = self.db.query(StoredFile) \
+            .filter(StoredFile.id == id, StoredFile.ref_count > 0) \
+            .update({StoredFile.ref_count: StoredFile.ref_count - 1}, synchronize_session=False)
+        if not count:
+            return None
+        return self.db.query(StoredFile.ref_count).filter(StoredFile.id == id).scalar()
+
+    def lock_stored_files(self, ids: list[str]) -> dict[str, int]:
+        """
+            Reference count of each file, row locked (FOR UPDATE) until commit
+
+            - locked in order of id, two deletion batch can not deadlock
+            - upload of the same content wait until the lock is released
+        """
+        query = self.db.query(StoredFile.id, StoredFile.ref_count) \
+            .filter(StoredFile.id.in_(ids)) \
+            .order_by(StoredFile.id) \
+            .with_for_update()
+        return {id: ref_count for id, ref_count in query}
+
+    def delete_stored_files(self, ids: list[str]) -> int:
+        return self.db.query(StoredFile) \
+            .filter(StoredFile.id.in_(ids), StoredFile.ref_count <= 0) \
+            .delete(synchronize_session=False)
+
+    def set_derivative_widths(self, id: str, widths: list[int]) -> int:
+        return self.db.query(StoredFile) \
+            .filter(StoredFile.id == id) \
+            .update({StoredFile.derivative_widths: widths}, synchronize_session=False)
+
+    def read_derivative_widths(self, ids: list[str]) -> dict[str, list[int]]:
+        """
+            Width of derivative ready for each file, file without derivative is left out
+        """
+        ids = {id for id in ids if id}
+        if not ids:
+            return {}
+        rows = self.db.query(StoredFile.id, StoredFile.derivative_widths).filter(StoredFile.id.in_(ids)).all()
+        return {id: widths for id, widths in rows if widths}
+
+class AsyncStoredFileRepository:
+    """
+        StoredFileRepository on AsyncSession, query of sync repository is run through run_sync
+    """
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def read_derivative_widths(self, ids: list[str]) -> dict[str, list[int]]:
+        return await self.db.run_sync(lambda db: StoredFileRepository(db).read_derivative_widths(ids))
@@ -1,8 +1,11 @@
 import uuid
 from sqlalchemy import asc, desc, or_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models.role.role import Role
 from app.models.user import User
+from app.utils.response_cache import public_profile_cache
+from app.utils.pagination import apply_cursor, fetch_page, resolve_sort_column
 
 class UserRepository:
     def __init__(self, db: Session):
@@ -33,6 +36,8 @@ class UserRepository:
         custom_filters: dict = None,
         offset: int = None, 
         size: int = None,
+        cursor: str = None,
+        with_total: bool = False,
         is_role_level: bool = False,
         role_level: int = None,
         user_id: str = None,
@@ -61,6 +66,11 @@ class UserRepository:
                 else:
                     query = query.filter(getattr(User, column) == value)
 
+        # Sorting and pagination by cursor
+        if cursor is not None:
+            sort_column = resolve_sort_column(sort_by, User)
+            return fetch_page(apply_cursor(query, sort_column, User.id, sort_order, cursor, size), with_total, total_query=query)
+
         # Sorting
         if sort_by is not None:
             if sort_order == 'asc' and hasattr(User, sort_by):
@@ -72,7 +82,7 @@ class UserRepository:
         if offset is not None and size is not None:
             query = query.offset((offset - 1) * size).limit(size)
 
-        return query.all()
+        return fetch_page(query, with_total)
     
     def count_users(
         self, 
@@ -109,7 +119,9 @@ class UserRepository:
         return query.count()
 
     def update_user(self, user: User):
+        user_id = user.id
         self.db.commit()
+        public_profile_cache.invalidate_user(user_id)
         return user
 
     def read_user(self, id: str) -> User:
@@ -120,4 +132,15 @@ class UserRepository:
         user_id = user.id
         self.db.delete(user)
         self.db.commit()
+        public_profile_cache.invalidate_user(user_id)
         return user_id
+
+class AsyncUserRepository:
+    """
+        UserRepository on AsyncSession, query of sync repository is run through run_sync
+    """
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_user_by_username(self, username: str) -> User:
+        return await self.db.run_sync(lambda db: UserRepository(db).get_user_by_username(username))
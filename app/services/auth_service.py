@@ -1,17 +1,27 @@
+import jwt
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from app.dtos.auth import AuthLogin
 from app.repositories.auth_repository import AuthRepository
+from app.repositories.refresh_token_repository import RefreshTokenRepository
 from app.repositories.user_repository import UserRepository
 from app.services.user_service import UserService
+from app.utils.generate_refresh_token import hash_refresh_token
+from app.utils.get_payload import get_payload, get_refresh_payload
+from app.utils.revocation import revocation_list
 
 class AuthService:
     def __init__(self, db: Session):
         self.db = db
         self.user_repository = UserRepository(db)
         self.auth_repository = AuthRepository(db)
+        self.refresh_token_repository = RefreshTokenRepository(db)
 
-    def auth_login(self, auth_login: AuthLogin):
-        user = self.user_repository.get_user_by_credential(auth_login.username_or_email)
+    async def auth_login(self, auth_login: AuthLogin):
+        """
+            Query run on request thread pool, bcrypt awaited on password pool
+        """
+        user = await run_in_threadpool(self.user_repository.get_user_by_credential, auth_login.username_or_email)
         if not user:
             raise ValueError('Credential failed')
         
@@ -19,5 +29,51 @@ class AuthService:
             raise ValueError('User is not active')
         
         user_service = UserService(self.db)
-        is_password_valid = user_service.verify_password(auth_login.password, user.password)
-        return self.auth_repository.auth_login(user, is_password_valid)
\ No newline at end of file
+        is_password_valid = await user_service.verify_password_async(auth_login.password, user.password)
+        return await run_in_threadpool(self.auth_repository.auth_login, user, is_password_valid)
+
+    def get_refresh_token(self, refresh_token: str):
+        try:
+            get_refresh_payload(refresh_token)
+        except jwt.ExpiredSignatureError:
+            raise ValueError('Refresh token expired')
+        except jwt.PyJWTError:
+            raise ValueError('Refresh token invalid')
+
+        exist = self.refresh_token_repository.get_refresh_token_by_hash(hash_refresh_token(refresh_token))
+        if not exist:
+            raise ValueError('Refresh token invalid')
+
+        return exist
+
+    def auth_refresh_token(self, refresh_token: str):
+        exist_refresh_token, user, role = self.get_refresh_token(refresh_token)
+
+        if exist_refresh_token.revoked_at is not None:
+            # rotated token is sent again, it may be stolen so whole login is ended
+            self.refresh_token_repository.revoke_refresh_token_family(exist_refresh_token.family_id)
+            raise ValueError('Refresh token reused')
+
+        if not user.is_active:
+            raise ValueError('User is not active')
+
+        try:
+            return self.auth_repository.auth_refresh_token(exist_refresh_token, user, role)
+        except ValueError:
+            self.refresh_token_repository.revoke_refresh_token_family(exist_refresh_token.family_id)
+            raise
+
+    def auth_logout(self, refresh_token: str, access_token: str = None):
+        exist_refresh_token, user, _ = self.get_refresh_token(refresh_token)
+        self.refresh_token_repository.revoke_refresh_token_family(exist_refresh_token.family_id)
+
+        # access token still valid until expired, so its jti is revoked too
+        if access_token:
+            try:
+                payload = get_payload(access_token, verify_exp=False)
+            except jwt.InvalidTokenError:
+                payload = None
+            if payload and payload.get('uid') == user.id:
+                revocation_list.revoke(self.db, payload.get('jti'), payload.get('exp'), user.id)
+
+        return user
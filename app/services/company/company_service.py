@@ -1,22 +1,22 @@
-import os
 import uuid
 from fastapi import HTTPException, UploadFile, status
 from sqlalchemy.orm import Session
 
 from app.models.company.company import Company
 from app.repositories.company.company_repository import CompanyRepository
-from app.utils.handling_file import delete_file, upload_file
+from app.utils.handling_file import delete_file, replace_file, upload_file
 
 class CompanyService:
+    static_folder_image = "static/images/company/image"
+    static_folder_logo = "static/images/company/logo"
+
     def __init__(self, db: Session):
         self.db = db
         self.company_repository = CompanyRepository(db)
-        self.static_folder_image = "static/images/company/image"
-        self.static_folder_logo = "static/images/company/logo"
     
     def create_company(self, company: Company, image: UploadFile = None, logo: UploadFile = None, file_extension_image = None, file_extension_logo = None):
-        company.image_url = upload_file(image, self.static_folder_image, file_extension_image, company.code) if image else ''
-        company.logo_url = upload_file(logo, self.static_folder_logo, file_extension_logo, company.code) if logo else ''
+        company.image_url = upload_file(self.db, image, file_extension_image) if image else ''
+        company.logo_url = upload_file(self.db, logo, file_extension_logo) if logo else ''
 
         return self.company_repository.create_company(company)
     
@@ -48,20 +48,16 @@ class CompanyService:
         exist_company.is_active = company.is_active
 
         if image and exist_company.image_url:
-            file_path = os.path.join(self.static_folder_image, exist_company.image_url)
-            delete_file(file_path)
-            exist_company.image_url = upload_file(image, self.static_folder_image, file_extension_image, company.code)
+            exist_company.image_url = replace_file(self.db, image, file_extension_image, self.static_folder_image, exist_company.image_url)
         
         if image and not exist_company.image_url:
-            exist_company.image_url = upload_file(image, self.static_folder_image, file_extension_image, company.code)
+            exist_company.image_url = upload_file(self.db, image, file_extension_image)
 
         if logo and exist_company.logo_url:
-            file_path = os.path.join(self.static_folder_logo, exist_company.logo_url)
-            delete_file(file_path)
-            exist_company.logo_url = upload_file(logo, self.static_folder_logo, file_extension_logo, company.code)
+            exist_company.logo_url = replace_file(self.db, logo, file_extension_logo, self.static_folder_logo, exist_company.logo_url)
 
         if logo and not exist_company.logo_url:
-            exist_company.logo_url = upload_file(logo, self.static_folder_logo, file_extension_logo, company.code)
+            exist_company.logo_url = upload_file(self.db, logo, file_extension_logo)
 
 
         return self.company_repository.update_company(exist_company)
@@ -72,11 +68,9 @@ class CompanyService:
             raise ValueError("Company not found")
 
         if company.image_url:
-            file_path = os.path.join(self.static_folder_image, company.image_url)
-            delete_file(file_path)
+            delete_file(self.db, self.static_folder_image, company.image_url)
 
         if company.logo_url:
-            file_path = os.path.join(self.static_folder_logo, company.logo_url)
-            delete_file(file_path)
+            delete_file(self.db, self.static_folder_logo, company.logo_url)
 
         return self.company_repository.delete_company(company)
@@ -1,21 +1,21 @@
-import os
 from fastapi import UploadFile
 from sqlalchemy.orm import Session
 
 from app.models.project.project import Project
 from app.repositories.project.project_repository import ProjectRepository
-from app.utils.handling_file import delete_file, upload_file
+from app.utils.handling_file import delete_file, replace_file, upload_file
 
 class ProjectService:
+    static_folder_image = "static/images/project/image"
+    static_folder_logo = "static/images/project/logo"
+
     def __init__(self, db: Session):
         self.db = db
         self.project_repository = ProjectRepository(db)
-        self.static_folder_image = "static/images/project/image"
-        self.static_folder_logo = "static/images/project/logo"
 
-    def create_project(self, file_name:str, project: Project, image: UploadFile = None, logo: UploadFile = None, file_extension_image = None, file_extension_logo = None):
-        project.image_url = upload_file(image, self.static_folder_image, file_extension_image,  file_name) if image else ''
-        project.logo_url = upload_file(logo, self.static_folder_logo, file_extension_logo, file_name) if logo else ''
+    def create_project(self, project: Project, image: UploadFile = None, logo: UploadFile = None, file_extension_image = None, file_extension_logo = None):
+        project.image_url = upload_file(self.db, image, file_extension_image) if image else ''
+        project.logo_url = upload_file(self.db, logo, file_extension_logo) if logo else ''
 
         return self.project_repository.create_project(project)
 
@@ -28,7 +28,6 @@ class ProjectService:
 
     def update_project(
         self,
-        file_name: str,
         exist_project: Project, 
         project: Project,
         image: UploadFile = None,
@@ -39,20 +38,16 @@ class ProjectService:
         self.validation_unique_based_other_project(exist_project, project)
 
         if image and exist_project.image_url:
-            file_path = os.path.join(self.static_folder_image, exist_project.image_url)
-            delete_file(file_path)
-            exist_project.image_url = upload_file(image, self.static_folder_image, file_extension_image, file_name)
+            exist_project.image_url = replace_file(self.db, image, file_extension_image, self.static_folder_image, exist_project.image_url)
 
         if image and not exist_project.image_url:
-            exist_project.image_url = upload_file(image, self.static_folder_image, file_extension_image, file_name)
+            exist_project.image_url = upload_file(self.db, image, file_extension_image)
 
         if logo and exist_project.logo_url:
-            file_path = os.path.join(self.static_folder_logo, exist_project.logo_url)
-            delete_file(file_path)
-            exist_project.logo_url = upload_file(logo, self.static_folder_logo, file_extension_logo, file_name)
+            exist_project.logo_url = replace_file(self.db, logo, file_extension_logo, self.static_folder_logo, exist_project.logo_url)
 
         if logo and not exist_project.logo_url:
-            exist_project.logo_url = upload_file(logo, self.static_folder_logo, file_extension_logo, file_name)
+            exist_project.logo_url = upload_file(self.db, logo, file_extension_logo)
         
         exist_project.title = project.title
         exist_project.is_active = project.is_active
@@ -65,11 +60,9 @@ class ProjectService:
             raise ValueError("Project not found")
 
         if project.image_url:
-            file_path = os.path.join(self.static_folder_image, project.image_url)
-            delete_file(file_path)
+            delete_file(self.db, self.static_folder_image, project.image_url)
         
         if project.logo_url:
-            file_path = os.path.join(self.static_folder_logo, project.logo_url)
-            delete_file(file_path)
+            delete_file(self.db, self.static_folder_logo, project.logo_url)
 
         return self.project_repository.delete_project(project)
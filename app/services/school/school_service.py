@@ -1,22 +1,22 @@
-import os
 import uuid
 from fastapi import HTTPException, UploadFile, status
 from sqlalchemy.orm import Session
 
 from app.models.school.school import School
 from app.repositories.school.school_repository import SchoolRepository
-from app.utils.handling_file import delete_file, upload_file
+from app.utils.handling_file import delete_file, replace_file, upload_file
 
 class SchoolService:
+    static_folder_image = "static/images/school/image"
+    static_folder_logo = "static/images/school/logo"
+
     def __init__(self, db: Session):
         self.db = db
         self.school_repository = SchoolRepository(db)
-        self.static_folder_image = "static/images/school/image"
-        self.static_folder_logo = "static/images/school/logo"
     
     def create_school(self, school: School, image: UploadFile = None, logo: UploadFile = None, file_extension_image = None, file_extension_logo = None):
-        school.image_url = upload_file(image, self.static_folder_image, file_extension_image, school.code) if image else ''
-        school.logo_url = upload_file(logo, self.static_folder_logo, file_extension_logo, school.code) if logo else ''
+        school.image_url = upload_file(self.db, image, file_extension_image) if image else ''
+        school.logo_url = upload_file(self.db, logo, file_extension_logo) if logo else ''
 
         return self.school_repository.create_school(school)
     
@@ -48,20 +48,16 @@ class SchoolService:
         exist_school.is_active = school.is_active
 
         if image and exist_school.image_url:
-            file_path = os.path.join(self.static_folder_image, exist_school.image_url)
-            delete_file(file_path)
-            exist_school.image_url = upload_file(image, self.static_folder_image, file_extension_image, school.code)
+            exist_school.image_url = replace_file(self.db, image, file_extension_image, self.static_folder_image, exist_school.image_url)
 
         if image and not exist_school.image_url:
-            exist_school.image_url = upload_file(image, self.static_folder_image, file_extension_image, school.code)
+            exist_school.image_url = upload_file(self.db, image, file_extension_image)
 
         if logo and exist_school.logo_url:
-            file_path = os.path.join(self.static_folder_logo, exist_school.logo_url)
-            delete_file(file_path)
-            exist_school.logo_url = upload_file(logo, self.static_folder_logo, file_extension_logo, school.code)
+            exist_school.logo_url = replace_file(self.db, logo, file_extension_logo, self.static_folder_logo, exist_school.logo_url)
 
         if logo and not exist_school.logo_url:
-            exist_school.logo_url = upload_file(logo, self.static_folder_logo, file_extension_logo, school.code)
+            exist_school.logo_url = upload_file(self.db, logo, file_extension_logo)
 
         return self.school_repository.update_school(exist_school)
     
@@ -71,11 +67,9 @@ class SchoolService:
             raise ValueError("School not found")
 
         if school.image_url:
-            file_path = os.path.join(self.static_folder_image, school.image_url)
-            delete_file(file_path)
+            delete_file(self.db, self.static_folder_image, school.image_url)
 
         if school.logo_url:
-            file_path = os.path.join(self.static_folder_logo, school.logo_url)
-            delete_file(file_path)
+            delete_file(self.db, self.static_folder_logo, school.logo_url)
 
         return self.school_repository.delete_school(school)
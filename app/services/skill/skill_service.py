@@ -1,22 +1,22 @@
-import os
 import uuid
 from fastapi import HTTPException, UploadFile, status
 from sqlalchemy.orm import Session
 
 from app.models.skill.skill import Skill
 from app.repositories.skill.skill_repository import SkillRepository
-from app.utils.handling_file import delete_file, upload_file
+from app.utils.handling_file import delete_file, replace_file, upload_file
 
 class SkillService:
+    static_folder_image = "static/images/skill/image"
+    static_folder_logo = "static/images/skill/logo"
+
     def __init__(self, db: Session):
         self.db = db
         self.skill_repository = SkillRepository(db)
-        self.static_folder_image = "static/images/skill/image"
-        self.static_folder_logo = "static/images/skill/logo"
     
     def create_skill(self, skill: Skill, image: UploadFile = None, logo: UploadFile = None, file_extension_image = None, file_extension_logo = None):
-        skill.image_url = upload_file(image, self.static_folder_image, file_extension_image, skill.code) if image else ''
-        skill.logo_url = upload_file(logo, self.static_folder_logo, file_extension_logo, skill.code) if logo else ''
+        skill.image_url = upload_file(self.db, image, file_extension_image) if image else ''
+        skill.logo_url = upload_file(self.db, logo, file_extension_logo) if logo else ''
 
         return self.skill_repository.create_skill(skill)
     
@@ -49,20 +49,16 @@ class SkillService:
         exist_skill.is_active = skill.is_active
 
         if image and exist_skill.image_url:
-            file_path = os.path.join(self.static_folder_image, exist_skill.image_url)
-            delete_file(file_path)
-            exist_skill.image_url = upload_file(image, self.static_folder_image, file_extension_image, skill.code)
+            exist_skill.image_url = replace_file(self.db, image, file_extension_image, self.static_folder_image, exist_skill.image_url)
         
         if image and not exist_skill.image_url:
-            exist_skill.image_url = upload_file(image, self.static_folder_image, file_extension_image, skill.code)
+            exist_skill.image_url = upload_file(self.db, image, file_extension_image)
         
         if logo and exist_skill.logo_url:
-            file_path = os.path.join(self.static_folder_logo, exist_skill.logo_url)
-            delete_file(file_path)
-            exist_skill.logo_url = upload_file(logo, self.static_folder_logo, file_extension_logo, skill.code)
+            exist_skill.logo_url = replace_file(self.db, logo, file_extension_logo, self.static_folder_logo, exist_skill.logo_url)
         
         if logo and not exist_skill.logo_url:
-            exist_skill.logo_url = upload_file(logo, self.static_folder_logo, file_extension_logo, skill.code)
+            exist_skill.logo_url = upload_file(self.db, logo, file_extension_logo)
 
         return self.skill_repository.update_skill(exist_skill)
     
@@ -72,11 +68,9 @@ class SkillService:
             raise ValueError("Skill not found")
 
         if skill.image_url:
-            file_path = os.path.join(self.static_folder_image, skill.image_url)
-            delete_file(file_path)
+            delete_file(self.db, self.static_folder_image, skill.image_url)
 
         if skill.logo_url:
-            file_path = os.path.join(self.static_folder_logo, skill.logo_url)
-            delete_file(file_path)
+            delete_file(self.db, self.static_folder_logo, skill.logo_url)
 
         return self.skill_repository.delete_skill(skill)
@@ -1,27 +1,26 @@
-import os
 from fastapi import UploadFile
 from sqlalchemy.orm import Session
 
 from app.models.solution.solution import Solution
 from app.repositories.solution.solution_repository import SolutionRepository
-from app.utils.handling_file import delete_file, upload_file
+from app.utils.handling_file import delete_file, replace_file, upload_file
 
 class SolutionService:
+    static_folder_image = "static/images/solution/image"
+    static_folder_logo = "static/images/solution/logo"
+
     def __init__(self, db: Session):
         self.db = db
         self.solution_repository = SolutionRepository(db)
-        self.static_folder_image = "static/images/solution/image"
-        self.static_folder_logo = "static/images/solution/logo"
 
-    def create_solution(self, file_name: str, solution: Solution, image: UploadFile = None, logo: UploadFile = None, file_extension_image = None, file_extension_logo = None):
-        solution.image_url = upload_file(image, self.static_folder_image, file_extension_image,  file_name) if image else ''
-        solution.logo_url = upload_file(logo, self.static_folder_logo, file_extension_logo, file_name) if logo else ''
+    def create_solution(self, solution: Solution, image: UploadFile = None, logo: UploadFile = None, file_extension_image = None, file_extension_logo = None):
+        solution.image_url = upload_file(self.db, image, file_extension_image) if image else ''
+        solution.logo_url = upload_file(self.db, logo, file_extension_logo) if logo else ''
 
         return self.solution_repository.create_solution(solution)
 
     def update_solution(
         self,
-        file_name: str,
         exist_solution: Solution, 
         solution: Solution,
         image: UploadFile = None,
@@ -30,20 +29,16 @@ class SolutionService:
         file_extension_logo = None,
     ):
         if image and exist_solution.image_url:
-            file_path = os.path.join(self.static_folder_image, exist_solution.image_url)
-            delete_file(file_path)
-            exist_solution.image_url = upload_file(image, self.static_folder_image, file_extension_image, file_name)
+            exist_solution.image_url = replace_file(self.db, image, file_extension_image, self.static_folder_image, exist_solution.image_url)
         
         if image and not exist_solution.image_url:
-            exist_solution.image_url = upload_file(image, self.static_folder_image, file_extension_image, file_name)
+            exist_solution.image_url = upload_file(self.db, image, file_extension_image)
 
         if logo and exist_solution.logo_url:
-            file_path = os.path.join(self.static_folder_logo, exist_solution.logo_url)
-            delete_file(file_path)
-            exist_solution.logo_url = upload_file(logo, self.static_folder_logo, file_extension_logo, file_name)
+            exist_solution.logo_url = replace_file(self.db, logo, file_extension_logo, self.static_folder_logo, exist_solution.logo_url)
 
         if logo and not exist_solution.logo_url:
-            exist_solution.logo_url = upload_file(logo, self.static_folder_logo, file_extension_logo, file_name)
+            exist_solution.logo_url = upload_file(self.db, logo, file_extension_logo)
 
         exist_solution.title = solution.title
         exist_solution.is_active = solution.is_active
@@ -56,11 +51,9 @@ class SolutionService:
             raise ValueError("Solution not found")
 
         if solution.image_url:
-            file_path = os.path.join(self.static_folder_image, solution.image_url)
-            delete_file(file_path)
+            delete_file(self.db, self.static_folder_image, solution.image_url)
         
         if solution.logo_url:
-            file_path = os.path.join(self.static_folder_logo, solution.logo_url)
-            delete_file(file_path)
+            delete_file(self.db, self.static_folder_logo, solution.logo_url)
 
         return self.solution_repository.delete_solution(solution)
@@ -1,29 +1,35 @@
-import os
 import uuid
 from fastapi import HTTPException, UploadFile, status
 from sqlalchemy.orm import Session
-from passlib.context import CryptContext
 
 from app.models.user import User
+from app.repositories.refresh_token_repository import RefreshTokenRepository
 from app.repositories.user_repository import UserRepository
-from app.utils.handling_file import delete_file, upload_file
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.utils.handling_file import delete_file, replace_file, upload_file
+from app.utils.password import password_hasher
 
 class UserService:
+    static_folder_image = "static/images/user"
+
     def __init__(self, db: Session):
         self.db = db
         self.user_repository = UserRepository(db)
-        self.static_folder_image = "static/images/user"
+        self.refresh_token_repository = RefreshTokenRepository(db)
     
     def verify_password(self, plain_password, hashed_password):
-        return pwd_context.verify(plain_password, hashed_password)
+        return password_hasher.verify(plain_password, hashed_password)
 
     def get_password_hash(self, password):
-        return pwd_context.hash(password)
+        return password_hasher.hash(password)
+
+    async def verify_password_async(self, plain_password, hashed_password):
+        return await password_hasher.verify_async(plain_password, hashed_password)
+
+    async def get_password_hash_async(self, password):
+        return await password_hasher.hash_async(password)
     
     def create_user(self, user: User, image: UploadFile = None, file_extension = None):
-        user.image_url = upload_file(image, self.static_folder_image, file_extension, user.username) if image else ''
+        user.image_url = upload_file(self.db, image, file_extension) if image else ''
 
         return self.user_repository.create_user(user)
     
@@ -52,18 +58,18 @@ class UserService:
         exist_user.gender = user.gender
 
         if image and exist_user.image_url:
-            file_path = os.path.join(self.static_folder_image, exist_user.image_url)
-            delete_file(file_path)
-            exist_user.image_url = upload_file(image, self.static_folder_image, file_extension, user.username)
+            exist_user.image_url = replace_file(self.db, image, file_extension, self.static_folder_image, exist_user.image_url)
 
         if image and not exist_user.image_url:
-            exist_user.image_url = upload_file(image, self.static_folder_image, file_extension, user.username)
+            exist_user.image_url = upload_file(self.db, image, file_extension)
 
         return self.user_repository.update_user(exist_user)
     
     def update_user_password(self, exist_user: User, user: User):
         if user.password:
             exist_user.password = user.password
+            # login from other device must login again with new password, saved with the password
+            self.refresh_token_repository.revoke_user_refresh_tokens(exist_user.id, is_commit=False)
 
         return self.user_repository.update_user(exist_user)
     
@@ -73,7 +79,6 @@ class UserService:
             raise ValueError("User not found")
 
         if user.image_url:
-            file_path = os.path.join(self.static_folder_image, user.image_url)
-            delete_file(file_path)
+            delete_file(self.db, self.static_folder_image, user.image_url)
 
         return self.user_repository.delete_user(user)
@@ -1,18 +1,21 @@
 from typing import Optional
 import jwt
 from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPAuthorizationCredentials
 from fastapi.security import HTTPBearer
 from fastapi.exceptions import HTTPException
 
-from app.utils.get_payload import get_payload
+from app.utils.revocation import refresh_revocation_list, revocation_list
+from app.utils.token_cache import token_cache
 
 class Authentication(HTTPBearer):
     async def __call__(self, request: Request) -> Optional[HTTPAuthorizationCredentials]:
         authorization = await super().__call__(request)
 
+        # signature only verified on first request of the token
         try:
-            payload = get_payload(authorization.credentials)
+            payload = token_cache.get_payload(authorization.credentials)
         except jwt.ExpiredSignatureError:
             raise HTTPException(
                 401,
@@ -30,4 +33,16 @@ class Authentication(HTTPBearer):
                 }
             )
 
+        # revoked token (logout), database only read when refresh is due
+        if revocation_list.is_refresh_due():
+            await run_in_threadpool(refresh_revocation_list)
+        if revocation_list.is_revoked(payload.get('jti')):
+            raise HTTPException(
+                401,
+                detail={
+                    'message': 'Token revoked',
+                    'code': 40102
+                }
+            )
+
         return payload
@@ -0,0 +1,208 @@
+import gzip
+import hashlib
+import threading
+import zlib
+from collections import OrderedDict
+
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import config
+from app.utils.static_files import accepts_encoding
+
+class CompressedBodyCache:
+    """
+        LRU of compressed body, limited by total bytes
+
+        - key is (encoding, digest of uncompressed body), only response with ETag is kept
+    """
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple) -> bytes | None:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def set(self, key: tuple, body: bytes):
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+            self._entries[key] = body
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def get_status(self) -> dict:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'size_bytes': self.size,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+compressed_body_cache = CompressedBodyCache(config.COMPRESSION_CACHE_MAX_SIZE_MB * 1024 * 1024)
+
+class _StreamCompressor:
+    """
+        Compress body sent in many message
+    """
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        if encoding == 'br':
+            self._compressor = brotli.Compressor(quality=brotli_quality)
+            self._compress, self._finish = self._compressor.process, self._compressor.finish
+        else:
+            self._compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+            self._compress, self._finish = self._compressor.compress, self._compressor.flush
+
+    def compress(self, data: bytes, more_body: bool) -> bytes:
+        body = self._compress(data) if data else b''
+        return body if more_body else body + self._finish()
+
+class CompressionMiddleware:
+    """
+        Compress response with Brotli or gzip, chosen by Accept-Encoding
+
+        - only content type in allow list and body not smaller than minimum_size
+        - response already encoded, partial, HEAD or sent as file path is left as it is
+        - compressed response get Vary: Accept-Encoding and weak ETag
+        - compressed body of response with ETag kept in cache, cached public profile is not compressed again
+    """
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 500,
+        content_types: list[str] = None,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        cache: CompressedBodyCache = None,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.content_types = [content_type.lower() for content_type in (content_types or ['application/json', 'text/'])]
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.cache = cache
+
+    def select_encoding(self, accept_encoding: str) -> str | None:
+        if accepts_encoding(accept_encoding, 'br'):
+            return 'br'
+        if accepts_encoding(accept_encoding, 'gzip'):
+            return 'gzip'
+        return None
+
+    def is_compressible(self, status_code: int, headers: Headers) -> bool:
+        if status_code < 200 or status_code in (204, 206, 304):
+            return False
+        if 'content-encoding' in headers or 'content-range' in headers:
+            return False
+        content_type = headers.get('content-type', '').split(';')[0].strip().lower()
+        return any(content_type.startswith(allowed) for allowed in self.content_types)
+
+    def compress(self, encoding: str, body: bytes) -> bytes:
+        if encoding == 'br':
+            return brotli.compress(body, quality=self.brotli_quality)
+        # mtime 0, same body always give same bytes
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    def compress_cached(self, encoding: str, body: bytes, etag: str = None) -> bytes:
+        if self.cache is None or not etag:
+            return self.compress(encoding, body)
+        # etag is not unique across url, same etag and size would share the bytes
+        key = (encoding, hashlib.blake2b(body, digest_size=16).digest())
+        compressed = self.cache.get(key)
+        if compressed is None:
+            compressed = self.compress(encoding, body)
+            self.cache.set(key, compressed)
+        return compressed
+
+    def _set_encoding_headers(self, headers: MutableHeaders, encoding: str):
+        headers['content-encoding'] = encoding
+        headers.add_vary_header('Accept-Encoding')
+        if 'accept-ranges' in headers:
+            del headers['accept-ranges']
+        etag = headers.get('etag')
+        if etag and not etag.startswith('W/'):
+            # compressed bytes are not the bytes the strong etag was made for
+            headers['etag'] = f"W/{etag}"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] != 'http' or scope['method'] == 'HEAD':
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self.select_encoding(Headers(scope=scope).get('accept-encoding', ''))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        compressor = None
+        passthrough = False
+
+        async def compress_send(message: Message):
+            nonlocal start_message, compressor, passthrough
+            if message['type'] == 'http.response.start':
+                start_message = message
+                return
+
+            if passthrough:
+                await send(message)
+                return
+
+            if compressor is not None:
+                more_body = message.get('more_body', False)
+                await send({
+                    'type': 'http.response.body',
+                    'body': compressor.compress(message.get('body', b''), more_body),
+                    'more_body': more_body,
+                })
+                return
+
+            headers = MutableHeaders(raw=list(start_message['headers']))
+            body = message.get('body', b'')
+            more_body = message.get('more_body', False)
+            content_length = headers.get('content-length')
+            size = int(content_length) if content_length and content_length.isdigit() else None
+            if (
+                message['type'] != 'http.response.body'
+                or not self.is_compressible(start_message['status'], headers)
+                or (not more_body and len(body) < self.minimum_size)
+                or (more_body and size is not None and size < self.minimum_size)
+            ):
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            self._set_encoding_headers(headers, encoding)
+            if more_body:
+                # streamed body, length not known until the end
+                compressor = _StreamCompressor(encoding, self.gzip_level, self.brotli_quality)
+                del headers['content-length']
+                body = compressor.compress(body, more_body)
+            else:
+                body = self.compress_cached(encoding, body, headers.get('etag'))
+                headers['content-length'] = str(len(body))
+
+            await send({**start_message, 'headers': headers.raw})
+            await send({'type': 'http.response.body', 'body': body, 'more_body': more_body})
+
+        await self.app(scope, receive, compress_send)
@@ -0,0 +1,79 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request
+from fastapi.responses import Response
+
+VALIDATOR_HEADERS = ['etag', 'last-modified', 'cache-control']
+
+def make_etag(value: bytes | str) -> str:
+    if isinstance(value, str):
+        value = value.encode()
+    return f'"{hashlib.blake2b(value, digest_size=16).hexdigest()}"'
+
+def get_last_modified(*values) -> datetime | None:
+    values = [value for value in values if value is not None]
+    return max(values) if values else None
+
+def format_http_date(value: datetime) -> str:
+    # database store datetime without timezone, treat it as utc
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc).replace(microsecond=0), usegmt=True)
+
+def set_validators(response: Response, etag: str = None, last_modified: datetime = None) -> Response:
+    """
+        Set ETag (hash of body when not given) and Last-Modified header
+    """
+    response.headers['etag'] = etag or make_etag(response.body)
+    if last_modified is not None:
+        response.headers['last-modified'] = format_http_date(last_modified)
+    response.headers['cache-control'] = 'no-cache'
+    return response
+
+def is_not_modified(request: Request, etag: str = None, last_modified: str = None) -> bool:
+    """
+        If-None-Match has priority, If-Modified-Since only used when it not sent
+    """
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match is not None:
+        if etag is None:
+            return False
+        if if_none_match.strip() == '*':
+            return True
+        # weak comparison
+        candidates = [candidate.strip().removeprefix('W/') for candidate in if_none_match.split(',')]
+        return etag.removeprefix('W/') in candidates
+
+    if_modified_since = request.headers.get('if-modified-since')
+    if if_modified_since is not None and last_modified is not None:
+        try:
+            return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+
+    return False
+
+def not_modified_response(headers) -> Response:
+    return Response(
+        status_code=304,
+        headers={key: value for key, value in headers.items() if key.lower() in VALIDATOR_HEADERS},
+    )
+
+def check_not_modified(request: Request, etag: str, last_modified: datetime = None) -> Response | None:
+    """
+        Check validator before response body is built
+    """
+    response = set_validators(Response(status_code=304), etag=etag, last_modified=last_modified)
+    if is_not_modified(request, response.headers.get('etag'), response.headers.get('last-modified')):
+        return response
+    return None
+
+def conditional_response(request: Request, response: Response) -> Response:
+    """
+        Return 304 without body when client copy still valid
+    """
+    if is_not_modified(request, response.headers.get('etag'), response.headers.get('last-modified')):
+        return not_modified_response(response.headers)
+    return response
@@ -0,0 +1,207 @@
+import logging
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session
+
+from app.config import config
+from app.database import SessionLocal
+from app.models.file_deletion import FileDeletion
+from app.repositories.file_deletion_repository import FileDeletionRepository
+from app.repositories.stored_file_repository import StoredFileRepository
+from app.utils.image_derivative import get_derivative_keys
+from app.utils.storage import get_storage, is_content_key
+
+logger = logging.getLogger(__name__)
+
+# flag in session info, session has journaled deletion not committed yet
+PENDING_DELETION_KEY = 'file_deletion_pending'
+
+def _utc_now() -> datetime:
+    # every time of journal from app clock, not mixed with NOW() of database server
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+class FileDeletionQueue:
+    """
+        Delete released file after the transaction that released it is committed
+
+        - journal row saved in the same transaction, rollback keep the file and restart keep the journal
+        - worker thread woken on commit, also poll every interval for retry and journal left by other process
+        - due journal handled in batch, file of one storage removed by one call
+        - failed file retried later, delay doubled on each attempt
+        - content key uploaded again before its turn is kept
+        - batch claimed with FOR UPDATE SKIP LOCKED, worker of other process take other row
+        - stored file row of content key locked while its file is removed, upload of same content wait for it
+    """
+    def __init__(self, poll_interval: int, batch_size: int, retry_delay: int, retry_max_delay: int):
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.retry_delay = retry_delay
+        self.retry_max_delay = retry_max_delay
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.deleted = 0
+        self.kept = 0
+        self.failed = 0
+        self.last_error = None
+
+    def enqueue(self, db: Session, folder: str, filename: str):
+        """
+            Journal file in session of db, deleted once it committed
+        """
+        now = _utc_now()
+        FileDeletionRepository(db).create_file_deletion(FileDeletion(
+            id=str(uuid.uuid4()),
+            folder=None if is_content_key(filename) else folder,
+            filename=filename,
+            attempts=0,
+            next_attempt_at=now,
+            created_at=now,
+        ))
+        db.info[PENDING_DELETION_KEY] = True
+
+    def notify(self):
+        self._wake.set()
+
+    def _get_retry_at(self, attempts: int) -> datetime:
+        delay = min(self.retry_max_delay, self.retry_delay * 2 ** attempts)
+        return _utc_now() + timedelta(seconds=delay)
+
+    def process(self, db: Session) -> int:
+        """
+            Handle one batch of due journal, return count of journal read
+        """
+        file_deletion_repository = FileDeletionRepository(db)
+        file_deletions = file_deletion_repository.claim_due_file_deletions(_utc_now(), self.batch_size)
+        if not file_deletions:
+            return 0
+
+        # content key referenced again, new upload of same content reuse the file
+        stored_file_repository = StoredFileRepository(db)
+        content_keys = sorted({x.filename for x in file_deletions if is_content_key(x.filename)})
+        ref_counts = stored_file_repository.lock_stored_files(content_keys) if content_keys else {}
+        reused = {id for id, ref_count in ref_counts.items() if ref_count > 0}
+
+        done_ids = []
+        groups = {}
+        for file_deletion in file_deletions:
+            if file_deletion.filename in reused:
+                done_ids.append(file_deletion.id)
+                continue
+            keys = [file_deletion.filename, *get_derivative_keys(file_deletion.filename)]
+            file_storage, items = groups.setdefault(file_deletion.folder, (get_storage(file_deletion.folder, file_deletion.filename), []))
+            items.append((file_deletion, keys))
+
+        deleted = 0
+        deleted_content_keys = []
+        failures = []
+        for file_storage, items in groups.values():
+            try:
+                errors = file_storage.delete_many([key for _, keys in items for key in keys])
+            except Exception as e:
+                errors = {key: str(e) for _, keys in items for key in keys}
+            for file_deletion, keys in items:
+                error = next((errors[key] for key in keys if key in errors), None)
+                if error is None:
+                    done_ids.append(file_deletion.id)
+                    deleted += 1
+                    if file_deletion.filename in ref_counts:
+                        deleted_content_keys.append(file_deletion.filename)
+                else:
+                    failures.append((file_deletion, error))
+
+        for file_deletion, error in failures:
+            file_deletion_repository.retry_file_deletion(file_deletion, error, self._get_retry_at(file_deletion.attempts))
+        if deleted_content_keys:
+            stored_file_repository.delete_stored_files(deleted_content_keys)
+        if done_ids:
+            file_deletion_repository.delete_file_deletions(done_ids)
+        # claim released by the commit
+        db.commit()
+
+        with self._lock:
+            self.batches += 1
+            self.deleted += deleted
+            self.kept += len(file_deletions) - deleted - len(failures)
+            self.failed += len(failures)
+            if failures:
+                self.last_error = failures[-1][1]
+        return len(file_deletions)
+
+    def process_due(self):
+        """
+            Handle every due journal with own session
+        """
+        db = SessionLocal()
+        try:
+            while not self._stop.is_set() and self.process(db) >= self.batch_size:
+                continue
+        finally:
+            db.close()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.process_due()
+            except Exception:
+                logger.exception('file deletion failed')
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    def start(self):
+        """
+            Start worker, journal left from last run handled first
+        """
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='file-deletion', daemon=True)
+            self._thread.start()
+
+    def shutdown(self, timeout: float = 10):
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            self._wake.set()
+            thread.join(timeout)
+
+    def get_status(self, db: Session) -> dict:
+        pending, oldest = db.query(func.count(FileDeletion.id), func.min(FileDeletion.created_at)).one()
+        with self._lock:
+            status = {
+                'running': self._thread is not None,
+                'batches': self.batches,
+                'deleted': self.deleted,
+                'kept': self.kept,
+                'failed': self.failed,
+                'last_error': self.last_error,
+            }
+        status.update({
+            'pending': pending,
+            'oldest_pending_age_s': round((_utc_now() - oldest).total_seconds(), 3) if oldest else 0,
+        })
+        return status
+
+file_deletion_queue = FileDeletionQueue(
+    config.FILE_DELETION_POLL_INTERVAL,
+    config.FILE_DELETION_BATCH_SIZE,
+    config.FILE_DELETION_RETRY_DELAY,
+    config.FILE_DELETION_RETRY_MAX_DELAY,
+)
+
+@event.listens_for(Session, 'after_commit')
+def _notify_after_commit(session: Session):
+    if session.info.pop(PENDING_DELETION_KEY, False):
+        file_deletion_queue.notify()
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_after_rollback(session: Session):
+    # journal rolled back with the row, nothing to delete
+    session.info.pop(PENDING_DELETION_KEY, None)
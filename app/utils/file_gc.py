@@ -0,0 +1,287 @@
+import asyncio
+import logging
+import os
+import re
+import shutil
+import time
+from collections import Counter
+from datetime import datetime
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from app.config import config
+from app.database import SessionLocal
+from app.models.company.company import Company
+from app.models.project.project import Project
+from app.models.project.project_attachment import ProjectAttachment
+from app.models.school.school import School
+from app.models.skill.skill import Skill
+from app.models.solution.solution import Solution
+from app.models.stored_file import StoredFile
+from app.models.user import User
+from app.repositories.stored_file_repository import StoredFileRepository
+from app.services.company.company_service import CompanyService
+from app.services.project.project_attachment_service import ProjectAttachmentService
+from app.services.project.project_service import ProjectService
+from app.services.school.school_service import SchoolService
+from app.services.skill.skill_service import SkillService
+from app.services.solution.solution_service import SolutionService
+from app.services.user_service import UserService
+from app.utils.storage import is_content_key
+
+logger = logging.getLogger(__name__)
+
+# every column holding a file, with folder of file saved before content addressed storage
+FILE_COLUMNS = [
+    (User.image_url, UserService.static_folder_image),
+    (Project.image_url, ProjectService.static_folder_image),
+    (Project.logo_url, ProjectService.static_folder_logo),
+    (ProjectAttachment.image_url, ProjectAttachmentService.static_folder_image),
+    (Solution.image_url, SolutionService.static_folder_image),
+    (Solution.logo_url, SolutionService.static_folder_logo),
+    (Skill.image_url, SkillService.static_folder_image),
+    (Skill.logo_url, SkillService.static_folder_logo),
+    (School.image_url, SchoolService.static_folder_image),
+    (School.logo_url, SchoolService.static_folder_logo),
+    (Company.image_url, CompanyService.static_folder_image),
+    (Company.logo_url, CompanyService.static_folder_logo),
+]
+
+# file in folder that is not uploaded
+KEEP_FILES = {'README.md', '.gitkeep'}
+
+_DERIVATIVE_SUFFIX = re.compile(r'@\d+w$')
+
+def get_base_stem(name: str) -> str:
+    """
+        Stem of original file, derivative (name@64w.webp) and precompressed (name.png.gz) included
+    """
+    for suffix in ('.br', '.gz'):
+        name = name.removesuffix(suffix)
+    return _DERIVATIVE_SUFFIX.sub('', os.path.splitext(name)[0])
+
+def read_references(db: Session, batch_size: int = 1000) -> tuple[Counter, dict[str, set]]:
+    """
+        Stream every file column, (reference count of content key, stem of old file per folder)
+    """
+    content_keys = Counter()
+    legacy_stems = {folder: set() for _, folder in FILE_COLUMNS}
+    for column, folder in FILE_COLUMNS:
+        query = db.query(column).filter(column.isnot(None), column != '').execution_options(yield_per=batch_size)
+        for (filename,) in query:
+            if is_content_key(filename):
+                content_keys[filename] += 1
+            else:
+                legacy_stems[folder].add(get_base_stem(filename))
+    return content_keys, legacy_stems
+
+def count_references(db: Session, content_key: str) -> int:
+    """
+        Row using the content key now, in every file column
+    """
+    return sum(db.query(func.count()).filter(column == content_key).scalar() for column, _ in FILE_COLUMNS)
+
+def _is_still_referenced(db: Session, stems: list[str]) -> set[str]:
+    """
+        Stem that got referenced after the scan, checked right before deleting
+    """
+    referenced = set()
+    for column, _ in FILE_COLUMNS:
+        filters = [column.like(f"{stem}.%") for stem in stems]
+        for (filename,) in db.query(column).filter(or_(*filters)):
+            referenced.add(get_base_stem(filename))
+    return referenced
+
+def _walk_files(root: str):
+    """
+        (path, stat) of every file under root by os.scandir
+    """
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False) and entry.name not in KEEP_FILES:
+                        yield entry.path, entry.stat(follow_symlinks=False)
+        except FileNotFoundError:
+            continue
+
+class FileGarbageCollector:
+    """
+        Remove uploaded file not used by any row
+
+        - database columns are the truth, row deleted by sql cascade leave file behind
+        - file newer than min_age is skipped, its row may not be committed yet
+        - orphan handled in batch, each batch checked again with database before removed
+        - stored file row of content file locked while the file is removed, same as file_deletion_queue
+        - quarantine_folder set: file moved there instead of deleted
+    """
+    def __init__(
+        self,
+        db: Session,
+        min_age: int = 3600,
+        batch_size: int = 500,
+        max_files: int = None,
+        quarantine_folder: str = None,
+        dry_run: bool = False,
+    ):
+        self.db = db
+        self.min_age = min_age
+        self.batch_size = batch_size
+        self.max_files = max_files
+        self.quarantine_folder = quarantine_folder
+        self.dry_run = dry_run
+        self.report = {
+            'scanned': 0,
+            'skipped_recent': 0,
+            'orphaned': 0,
+            'removed': 0,
+            'reclaimed_bytes': 0,
+            'repaired_ref_counts': 0,
+        }
+
+    def _candidates(self, content_keys: Counter, legacy_stems: dict[str, set]):
+        """
+            (path, size, stem, content key or None) of file not referenced
+        """
+        now = time.time()
+        content_stems = {get_base_stem(key) for key in content_keys}
+
+        roots = [(folder, False) for folder in dict.fromkeys(legacy_stems)]
+        if config.STORAGE_BACKEND == 'local':
+            roots.append((config.STORAGE_LOCAL_ROOT, True))
+
+        for root, is_content_root in roots:
+            for path, stat_result in _walk_files(root):
+                self.report['scanned'] += 1
+                relative_path = os.path.relpath(path, root).replace(os.sep, '/')
+                stem = get_base_stem(relative_path)
+                if (stem in content_stems) if is_content_root else (stem in legacy_stems[root]):
+                    continue
+                if now - stat_result.st_mtime < self.min_age:
+                    self.report['skipped_recent'] += 1
+                    continue
+                yield path, stat_result.st_size, stem, relative_path if is_content_root else None
+
+    def _remove(self, path: str):
+        if self.quarantine_folder:
+            target = os.path.join(self.quarantine_folder, datetime.now().strftime('%Y%m%d'), os.path.relpath(path))
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.move(path, target)
+        else:
+            os.remove(path)
+
+    def _lock_content_files(self, stems: set[str]) -> dict[str, int]:
+        """
+            Reference count of stored file of each stem, row locked until commit like file_deletion_queue
+        """
+        if not stems:
+            return {}
+        filters = [StoredFile.id.like(f"{stem}.%") for stem in stems]
+        ids = [id for (id,) in self.db.query(StoredFile.id).filter(or_(*filters))]
+        return StoredFileRepository(self.db).lock_stored_files(sorted(ids)) if ids else {}
+
+    def _flush(self, batch: list):
+        referenced = _is_still_referenced(self.db, [stem for _, _, stem, _ in batch])
+        ref_counts = self._lock_content_files({stem for _, _, stem, content_key in batch if content_key and stem not in referenced})
+        # upload of same content counted the file again after the scan
+        in_use = {get_base_stem(id) for id, ref_count in ref_counts.items() if ref_count > 0}
+        removed_stems = set()
+        now = time.time()
+        for path, size, stem, content_key in batch:
+            if stem in referenced or (content_key and stem in in_use):
+                continue
+            self.report['orphaned'] += 1
+            if self.dry_run:
+                continue
+            try:
+                # upload not committed yet touch the file it reuse, checked again under the lock
+                if content_key and now - os.stat(path).st_mtime < self.min_age:
+                    self.report['skipped_recent'] += 1
+                    continue
+                self._remove(path)
+            except FileNotFoundError:
+                continue
+            self.report['removed'] += 1
+            self.report['reclaimed_bytes'] += size
+            if content_key:
+                removed_stems.add(stem)
+
+        removed_ids = [id for id in ref_counts if get_base_stem(id) in removed_stems]
+        if removed_ids:
+            StoredFileRepository(self.db).delete_stored_files(removed_ids)
+        # lock released
+        self.db.commit()
+
+    def repair_ref_counts(self, content_keys: Counter):
+        """
+            Set reference count to number of row really using the file
+
+            - scan only pick the suspect, each one is counted again with its row locked
+            - upload or release of the file in the meantime is waited for, not overwritten
+        """
+        query = self.db.query(StoredFile.id, StoredFile.ref_count).execution_options(yield_per=self.batch_size)
+        suspects = [id for id, ref_count in query if ref_count != content_keys.get(id, 0)]
+        if self.dry_run:
+            self.report['repaired_ref_counts'] = len(suspects)
+            return
+
+        for id in suspects:
+            ref_count = self.db.query(StoredFile.ref_count).filter(StoredFile.id == id).with_for_update().scalar()
+            if ref_count is not None:
+                actual = count_references(self.db, id)
+                if ref_count != actual:
+                    self.db.query(StoredFile).filter(StoredFile.id == id).update({StoredFile.ref_count: actual}, synchronize_session=False)
+                    self.report['repaired_ref_counts'] += 1
+            # lock released per file, upload is not held for the whole repair
+            self.db.commit()
+
+    def collect(self) -> dict:
+        content_keys, legacy_stems = read_references(self.db, self.batch_size)
+        self.repair_ref_counts(content_keys)
+
+        batch = []
+        handled = 0
+        for candidate in self._candidates(content_keys, legacy_stems):
+            if self.max_files is not None and handled >= self.max_files:
+                break
+            batch.append(candidate)
+            handled += 1
+            if len(batch) >= self.batch_size:
+                self._flush(batch)
+                batch = []
+        if batch:
+            self._flush(batch)
+
+        return self.report
+
+def collect_orphan_files(**kwargs) -> dict:
+    """
+        Run collector with own session
+    """
+    db = SessionLocal()
+    try:
+        return FileGarbageCollector(db, **kwargs).collect()
+    finally:
+        db.close()
+
+async def run_file_gc_periodically(interval: int):
+    """
+        Scheduled task of app, run collector on worker thread every interval second
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            report = await run_in_threadpool(
+                collect_orphan_files,
+                min_age=config.FILE_GC_MIN_AGE,
+                batch_size=config.FILE_GC_BATCH_SIZE,
+                quarantine_folder=config.FILE_GC_QUARANTINE_FOLDER,
+            )
+            logger.info('file gc: %s', report)
+        except Exception:
+            logger.exception('file gc failed')
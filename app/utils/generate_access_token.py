@@ -1,10 +1,12 @@
 import time
+import uuid
 
 from typing import Tuple
 
 import jwt
 
 from app.config import config
+from app.utils.key_material import get_signing_key
 
 def generate_access_token(payload: dict) -> Tuple[str, int]:
     current_time = int(time.time())
@@ -13,13 +15,11 @@ def generate_access_token(payload: dict) -> Tuple[str, int]:
     payload.update({
         'exp' : expired_at,
         'iat' : current_time,
+        'jti' : str(uuid.uuid4()),
     })
 
-    # Remove newline and split characters within the key
-    key_without_newline_and_split = config.PRIVATE_KEY.replace('\n', '').split('-----')
+    kid, private_key = get_signing_key()
 
-    PRIVATE_KEY = f'-----{key_without_newline_and_split[1]}-----\n{key_without_newline_and_split[2]}\n-----{key_without_newline_and_split[3]}-----'
-
-    access_token = jwt.encode(payload, PRIVATE_KEY, 'RS256')
+    access_token = jwt.encode(payload, private_key, 'RS256', headers={'kid': kid})
 
     return access_token, expired_at
@@ -1,21 +1,30 @@
+import hashlib
 import time
 
+from typing import Tuple
+
 import jwt
 
 from app.config import config
+from app.utils.key_material import get_refresh_signing_key
 
-def generate_refresh_token(payload: dict) -> str:
+def generate_refresh_token(payload: dict) -> Tuple[str, int]:
     current_time = int(time.time())
+    expired_at = current_time + config.REFRESH_TOKEN_EXPIRATION
 
     payload.update({
+        'exp' : expired_at,
         'iat' : current_time,
     })
 
-    # Remove newline and split characters within the key
-    key_without_newline_and_split = config.REFRESH_PRIVATE_KEY.replace('\n', '').split('-----')
+    kid, refresh_private_key = get_refresh_signing_key()
 
-    REFRESH_PRIVATE_KEY = f'-----{key_without_newline_and_split[1]}-----\n{key_without_newline_and_split[2]}\n-----{key_without_newline_and_split[3]}-----'
+    refresh_token = jwt.encode(payload, refresh_private_key, 'RS256', headers={'kid': kid})
 
-    refresh_token = jwt.encode(payload, REFRESH_PRIVATE_KEY, 'RS256')
+    return refresh_token, expired_at
 
-    return refresh_token
+def hash_refresh_token(refresh_token: str) -> str:
+    """
+        Refresh token is saved as hash, leaked table can not be used to refresh
+    """
+    return hashlib.sha256(refresh_token.encode()).hexdigest()
@@ -1,19 +1,18 @@
 import jwt
 
-from app.config import config
+from app.utils.key_material import get_refresh_verifying_key, get_verifying_key
 
 def get_payload(access_token: str, verify_exp: bool = True) -> dict:
-
-    # Remove newline and split characters within the key
-    key_without_newline_and_split = config.PUBLIC_KEY.replace('\n', '').split('-----')
-
-    PUBLIC_KEY = f'-----{key_without_newline_and_split[1]}-----\n{key_without_newline_and_split[2]}\n-----{key_without_newline_and_split[3]}-----'
+    header = jwt.get_unverified_header(access_token)
 
     payload = jwt.decode(
         access_token,
-        PUBLIC_KEY,
+        get_verifying_key(header.get('kid')),
         ['RS256'],
         options={'verify_exp': verify_exp}
     )
 
     return payload
+
+def get_refresh_payload(refresh_token: str) -> dict:
+    return jwt.decode(refresh_token, get_refresh_verifying_key(), ['RS256'])
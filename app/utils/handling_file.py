@@ -1,52 +1,140 @@
 from fastapi import File
-import uuid
+import hashlib
 import os
-from datetime import datetime
-from pathlib import Path
-import shutil
 
+from sqlalchemy.orm import Session
+
+from app.config import config
+from app.repositories.stored_file_repository import StoredFileRepository
+from app.utils.file_deletion import file_deletion_queue
+from app.utils.image_derivative import IMAGE_CONTENT_TYPES, image_derivative_pool
+from app.utils.storage import is_content_key, make_content_key, storage
+
+# bytes read per step when copying upload to disk
+CHUNK_SIZE = 1024 * 1024
+
+# first bytes needed to know the file type
+SNIFF_SIZE = 16
+
+def sniff_content_type(header: bytes) -> str | None:
+    """
+        MIME type from magic bytes of the file, not from header sent by client
+    """
+    if header.startswith(b'\xff\xd8\xff'):
+        return 'image/jpeg'
+    if header.startswith(b'\x89PNG\r\n\x1a\n'):
+        return 'image/png'
+    if header.startswith((b'GIF87a', b'GIF89a')):
+        return 'image/gif'
+    if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+        return 'image/webp'
+    return None
+
+def get_file_size(file: File) -> int:
+    # size is counted by multipart parser, seek only when it not known
+    if getattr(file, 'size', None) is not None:
+        return file.size
 
-async def validation_file(file: File, limit_file_size_mb: int = 5, allowed_extension: list = ["image/jpeg", "image/png"]):
     file.file.seek(0, 2)
     file_size = file.file.tell()
 
     # move the cursor back to the beginning
-    await file.seek(0)
-    if file_size > limit_file_size_mb * 1024 * 1024:
-        # more than 5 MB
+    file.file.seek(0)
+    return file_size
+
+def validation_file(file: File, limit_file_size_mb: int = config.UPLOAD_MAX_FILE_SIZE_MB, allowed_extension: list = ["image/jpeg", "image/png"]):
+    # upload over the limit already aborted while received, exact size checked here
+    if get_file_size(file) > limit_file_size_mb * 1024 * 1024:
         raise ValueError(f"Image too large. only allow file lower than {limit_file_size_mb} mb")
 
-    # check the content type (MIME type)
-    content_type = file.content_type
+    # check the content type (MIME type) by content of file
+    file.file.seek(0)
+    content_type = sniff_content_type(file.file.read(SNIFF_SIZE))
+    file.file.seek(0)
     if content_type not in allowed_extension:
         file_formats = ', '.join([mime.split('/')[-1] for mime in allowed_extension])
         raise ValueError(f"Invalid file file type. only allow file with type {file_formats}")
 
-def upload_file(data, folder, file_extension, name = None):
+def upload_file(db: Session, data, file_extension = None, limit_file_size_mb: int = config.UPLOAD_MAX_FILE_SIZE_MB):
+    """
+        Save upload to storage by chunk, return its key
+
+        - key is sha256 of content, same content uploaded twice share one file
+        - reference counted in session of db, saved with the row that use it
+        - extension follow magic bytes when type is known
+        - size limit checked while copying, bigger file is aborted
+        - resized derivative of image made in background after committed
+    """
     if data:
-        # Generate a new filename based on date now with random uuid and provided extension
-        current_date = datetime.now().date()
-        new_filename = f"{name}.{file_extension}" if name else f"{current_date}-{str(uuid.uuid4())}.{file_extension}"
+        data.file.seek(0)
+        header = data.file.read(SNIFF_SIZE)
+        content_type = sniff_content_type(header)
+        if content_type:
+            file_extension = content_type.split('/')[1]
 
-        # Save the uploaded file to a directory
-        file_path = Path(folder) / new_filename
-        with open(file_path, "wb") as f_dest:
-            shutil.copyfileobj(data.file, f_dest)
+        digest = hashlib.sha256()
+        temp_path = storage.create_temp()
+        limit_file_size = limit_file_size_mb * 1024 * 1024
+        file_size = 0
+        try:
+            with open(temp_path, "wb") as f_dest:
+                chunk = header
+                while chunk:
+                    file_size += len(chunk)
+                    if file_size > limit_file_size:
+                        raise ValueError(f"Image too large. only allow file lower than {limit_file_size_mb} mb")
+                    digest.update(chunk)
+                    f_dest.write(chunk)
+                    chunk = data.file.read(CHUNK_SIZE)
 
-        # Return the filename
-        return str(Path(new_filename))
+            key = make_content_key(digest.hexdigest(), file_extension)
+            # reference first, its row lock keep deletion of the same content away until commit
+            StoredFileRepository(db).add_reference(key, file_size, content_type)
+            storage.save_temp(temp_path, key)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        if content_type in IMAGE_CONTENT_TYPES:
+            image_derivative_pool.enqueue(db, key)
+
+        return key
     else:
         print('error to upload file')
         return None
 
-def delete_file(file_path: str):
+def replace_file(db: Session, data, file_extension, folder, old_filename = None):
+    """
+        Upload new file then release the old one
+
+        - old file stay when upload fail
+        - same content keep its file, reference count go up then down
+    """
+    new_filename = upload_file(db, data, file_extension)
+    if old_filename and new_filename:
+        delete_file(db, folder, old_filename)
+    return new_filename
+
+def delete_file(db: Session, folder: str, filename: str):
+    """
+        Release file of a row, removed from storage after commit when no other row use it
+
+        - only journaled in session of db, request does not wait for storage
+        - rollback keep the file, deletion run by file_deletion_queue
+        - stored file row kept with count 0, removed by the queue together with the file
+        - file saved before content addressed storage is in folder
+    """
+    if not filename:
+        return False
     try:
-        # Check if the file exists before attempting to delete
-        if os.path.exists(file_path):
-            os.remove(file_path)
-            return True
-        else:
-            return False  # File not found
+        if is_content_key(filename):
+            ref_count = StoredFileRepository(db).remove_reference(filename)
+            if ref_count is None or ref_count > 0:
+                return False
+
+        file_deletion_queue.enqueue(db, folder, filename)
+        return True
     except Exception as e:
         print(e)
-        return False  # Error occurred while deleting
+        return False  # Error occurred while journaling
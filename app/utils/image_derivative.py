@@ -0,0 +1,202 @@
+import io
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+
+from PIL import Image
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config import config
+from app.database import SessionLocal
+from app.repositories.stored_file_repository import StoredFileRepository
+from app.utils.response_cache import public_profile_cache
+from app.utils.storage import get_storage, storage
+
+logger = logging.getLogger(__name__)
+
+# key in session info, image saved in session waiting for commit before resize
+PENDING_DERIVATIVE_KEY = 'image_derivative_pending'
+
+# derivative can be made from these type, gif only keep first frame
+IMAGE_CONTENT_TYPES = ['image/jpeg', 'image/png', 'image/gif', 'image/webp']
+
+def get_derivative_name(filename: str, width: int, extension: str) -> str:
+    stem = os.path.splitext(filename)[0]
+    return f"{stem}@{width}w.{extension}"
+
+def get_derivative_extensions(filename: str) -> list[str]:
+    # webp written last, its existence mean all format of that width is ready
+    extension = os.path.splitext(filename)[1][1:].lower()
+    return [extension, 'webp'] if extension != 'webp' else ['webp']
+
+def _save_image(image, file_storage, key: str, extension: str, quality: int):
+    image_format = {'jpg': 'JPEG', 'jpeg': 'JPEG'}.get(extension, extension.upper())
+    if image_format == 'JPEG' and image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+
+    buffer = io.BytesIO()
+    image.save(buffer, format=image_format, quality=quality)
+    buffer.seek(0)
+    file_storage.save(key, buffer, f"image/{extension}")
+
+def generate_derivatives(key: str, file_storage = None, widths: list[int] = None, quality: int = None) -> list[int]:
+    """
+        Resize image to each width, saved as webp and original format next to the image, return width ready
+
+        - width not smaller than image is skipped
+        - content addressed image never change, derivative already saved is kept
+    """
+    file_storage = file_storage if file_storage is not None else storage
+    widths = widths if widths is not None else config.IMAGE_DERIVATIVE_WIDTHS
+    quality = quality if quality is not None else config.IMAGE_DERIVATIVE_QUALITY
+    extensions = get_derivative_extensions(key)
+    ready = []
+
+    with file_storage.open(key) as stream, Image.open(stream) as image:
+        image.load()
+        if image.mode == 'P':
+            image = image.convert('RGBA')
+
+        for width in sorted(widths):
+            if width >= image.width:
+                continue
+
+            if not file_storage.exists(get_derivative_name(key, width, 'webp')):
+                height = max(1, round(image.height * width / image.width))
+                resized = image.resize((width, height), Image.LANCZOS)
+                for extension in extensions:
+                    _save_image(resized, file_storage, get_derivative_name(key, width, extension), extension, quality)
+            ready.append(width)
+
+    return ready
+
+def get_derivative_keys(filename: str, widths: list[int] = None) -> list[str]:
+    """
+        Key of every derivative the image can have, generated or not
+    """
+    widths = widths if widths is not None else config.IMAGE_DERIVATIVE_WIDTHS
+    return [
+        get_derivative_name(filename, width, extension)
+        for width in widths
+        for extension in get_derivative_extensions(filename)
+    ]
+
+def get_srcset(folder: str, filename: str, derivative_widths: dict[str, list[int]]) -> dict | None:
+    """
+        srcset of each format, e.g. {"webp": "<url> 64w, <url> 256w"}
+
+        - derivative_widths is read from stored file before, storage is not checked
+        - None when image has no derivative
+    """
+    widths = derivative_widths.get(filename) if filename else None
+    if not widths:
+        return None
+
+    file_storage = get_storage(folder, filename)
+
+    return {
+        extension: ', '.join(f"{file_storage.url(get_derivative_name(filename, width, extension))} {width}w" for width in widths)
+        for extension in reversed(get_derivative_extensions(filename))
+    }
+
+class ImageDerivativePool:
+    """
+        Make image derivative in background, upload request does not wait for resize
+
+        - job of new upload submitted after its transaction is committed
+        - width ready saved on stored file, srcset built from it without checking storage
+        - public profile cache dropped when new derivative ready, so srcset show up
+    """
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._executor = None
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.duration_total = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='image-derivative')
+        return self._executor
+
+    def _save_widths(self, key: str, widths: list[int]) -> bool:
+        db = SessionLocal()
+        try:
+            stored_file_repository = StoredFileRepository(db)
+            stored_file = stored_file_repository.read_stored_file(key)
+            # released before its turn, or nothing new
+            if stored_file is None or stored_file.derivative_widths == widths:
+                return False
+            stored_file_repository.set_derivative_widths(key, widths)
+            db.commit()
+            return True
+        finally:
+            db.close()
+
+    def _run(self, key: str):
+        started_at = time.perf_counter()
+        try:
+            widths = generate_derivatives(key)
+            if widths and self._save_widths(key, widths):
+                public_profile_cache.invalidate_all()
+            return widths
+        except Exception:
+            # file deleted before its turn or not a readable image
+            logger.exception("image derivative of %s failed", key)
+            with self._lock:
+                self.failed += 1
+            return []
+        finally:
+            elapsed = time.perf_counter() - started_at
+            with self._lock:
+                self.in_flight -= 1
+                self.completed += 1
+                self.duration_total += elapsed
+
+    def submit(self, key: str) -> Future:
+        with self._lock:
+            self.in_flight += 1
+        return self._get_executor().submit(self._run, key)
+
+    def enqueue(self, db: Session, key: str):
+        """
+            Submit image once session of db is committed, its stored file row exist by then
+        """
+        db.info.setdefault(PENDING_DERIVATIVE_KEY, []).append(key)
+
+    def get_status(self) -> dict:
+        with self._lock:
+            in_flight, completed, failed, duration_total = self.in_flight, self.completed, self.failed, self.duration_total
+        return {
+            'workers': self.workers,
+            'widths': config.IMAGE_DERIVATIVE_WIDTHS,
+            'in_flight': in_flight,
+            'completed': completed,
+            'failed': failed,
+            'duration_avg_ms': round(duration_total * 1000 / completed, 3) if completed else 0,
+        }
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+image_derivative_pool = ImageDerivativePool(config.IMAGE_DERIVATIVE_WORKERS)
+
+@event.listens_for(Session, 'after_commit')
+def _submit_after_commit(session: Session):
+    for key in session.info.pop(PENDING_DERIVATIVE_KEY, []):
+        image_derivative_pool.submit(key)
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_after_rollback(session: Session):
+    # upload rolled back with the row, nothing to resize
+    session.info.pop(PENDING_DERIVATIVE_KEY, None)
@@ -0,0 +1,52 @@
+from functools import lru_cache
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+
+from app.config import config
+
+def format_pem(key: str) -> str:
+    # Remove newline and split characters within the key
+    key_without_newline_and_split = key.replace('\n', '').split('-----')
+
+    return f'-----{key_without_newline_and_split[1]}-----\n{key_without_newline_and_split[2]}\n-----{key_without_newline_and_split[3]}-----'
+
+@lru_cache(maxsize=None)
+def load_private_key(key: str):
+    """
+        Parse private key once per process
+    """
+    return serialization.load_pem_private_key(format_pem(key).encode(), password=None)
+
+@lru_cache(maxsize=None)
+def load_public_key(key: str):
+    """
+        Parse public key once per process
+    """
+    return serialization.load_pem_public_key(format_pem(key).encode())
+
+def get_signing_key():
+    return config.KEY_ID, load_private_key(config.PRIVATE_KEY)
+
+def get_refresh_signing_key():
+    return config.KEY_ID, load_private_key(config.REFRESH_PRIVATE_KEY)
+
+def get_refresh_verifying_key():
+    # refresh token is only verified by this api, public key is taken from private key
+    return load_private_key(config.REFRESH_PRIVATE_KEY).public_key()
+
+def get_verifying_key(kid: str = None):
+    """
+        Get public key based kid header
+
+        - token without kid signed before rotation support, use current key
+        - retired key still valid while listed in PREVIOUS_PUBLIC_KEYS
+    """
+    if kid is None or kid == config.KEY_ID:
+        return load_public_key(config.PUBLIC_KEY)
+
+    previous_key = config.PREVIOUS_PUBLIC_KEYS.get(kid)
+    if not previous_key:
+        raise jwt.DecodeError('Unknown key id')
+
+    return load_public_key(previous_key)
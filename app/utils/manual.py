@@ -1,4 +1,6 @@
 def get_total_pages(size, count):
+    if count is None:
+        return None
     extra_page = 1 if size is not None and count % size > 0 else 0
     total_pages = (count // size) + extra_page if size is not None else None
     return total_pages
\ No newline at end of file
@@ -0,0 +1,147 @@
+import base64
+import json
+from datetime import date, datetime
+
+from sqlalchemy import and_, asc, desc, func, inspect, literal, or_, select
+from sqlalchemy.orm import ColumnProperty, InstrumentedAttribute
+
+class Page(list):
+    """
+        Rows of one page
+
+        - total is count of all row matching the filter, None when not counted
+    """
+    def __init__(self, rows = (), total: int = None):
+        super().__init__(rows)
+        self.total = total
+
+def fetch_page(query, with_total: bool = False, total_query = None) -> Page:
+    """
+        Run page query, total is selected in the same statement
+
+        - total by COUNT(*) OVER(), window is counted before LIMIT and OFFSET
+        - keyset filter also shrink the window, so cursor page give unfiltered query as total_query
+    """
+    if not with_total:
+        return Page(query.all())
+
+    if total_query is None:
+        total = func.count().over()
+    else:
+        total = select(func.count()).select_from(total_query.order_by(None).subquery()).scalar_subquery()
+
+    is_single_entity = len(query.column_descriptions) == 1
+    rows = query.add_columns(total.label('total_count')).all()
+    if not rows:
+        return Page(total=0)
+
+    return Page(
+        [row[0] if is_single_entity else tuple(row[:-1]) for row in rows],
+        total=rows[0][-1],
+    )
+
+def resolve_sort_column(sort_by: str, *models):
+    """
+        Column of the first model that has column sort_by
+    """
+    if sort_by is None:
+        return None
+    for model in models:
+        column = getattr(model, sort_by, None)
+        if isinstance(column, InstrumentedAttribute) and isinstance(column.property, ColumnProperty):
+            return column
+    return None
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {'t': 'datetime', 'v': value.isoformat()}
+    if isinstance(value, date):
+        return {'t': 'date', 'v': value.isoformat()}
+    return {'t': None, 'v': value}
+
+def _decode_value(value: dict):
+    if value['t'] == 'datetime':
+        return datetime.fromisoformat(value['v'])
+    if value['t'] == 'date':
+        return date.fromisoformat(value['v'])
+    return value['v']
+
+def encode_cursor(sort_value, id) -> str:
+    data = json.dumps({'s': _encode_value(sort_value), 'id': id}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip('=')
+
+def decode_cursor(cursor: str) -> tuple:
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        return _decode_value(data['s']), data['id']
+    except (ValueError, KeyError, TypeError):
+        raise ValueError('Invalid cursor')
+
+def apply_cursor(query, sort_column, id_column, sort_order: str, cursor: str, size: int = None):
+    """
+        Keyset pagination, order by sort column then id
+
+        - empty cursor is the first page
+        - null sort value come first on asc and last on desc, same as mysql
+    """
+    is_desc = sort_order == 'desc'
+    direction = desc if is_desc else asc
+
+    if cursor:
+        sort_value, last_id = decode_cursor(cursor)
+        after_id = id_column < last_id if is_desc else id_column > last_id
+
+        if sort_column is None:
+            query = query.filter(after_id)
+        elif sort_value is None:
+            query = query.filter(
+                and_(sort_column.is_(None), after_id) if is_desc
+                else or_(sort_column.isnot(None), and_(sort_column.is_(None), after_id))
+            )
+        else:
+            # bound with column type, boolean column can not be compared to python True/False
+            sort_value = literal(sort_value, sort_column.type)
+            if is_desc:
+                query = query.filter(or_(sort_column < sort_value, and_(sort_column == sort_value, after_id), sort_column.is_(None)))
+            else:
+                query = query.filter(or_(sort_column > sort_value, and_(sort_column == sort_value, after_id)))
+
+    if sort_column is not None:
+        query = query.order_by(direction(sort_column))
+    query = query.order_by(direction(id_column))
+
+    if size is not None:
+        query = query.limit(size)
+
+    return query
+
+def _get_row_value(row, column):
+    """
+        Value of column from model row, tuple row or model related to row
+    """
+    model = column.class_
+    if isinstance(row, model):
+        return getattr(row, column.key)
+    if isinstance(row, tuple):
+        for item in row:
+            if isinstance(item, model):
+                return getattr(item, column.key)
+    for relationship in inspect(type(row)).relationships:
+        if relationship.mapper.class_ is model:
+            return getattr(getattr(row, relationship.key), column.key)
+    return None
+
+def get_next_cursor(rows: list, size: int, sort_by: str, *models) -> str | None:
+    """
+        Cursor after last row, None when no more page
+
+        - models in same order as given to resolve_sort_column, first one has the id
+    """
+    if not rows or size is None or len(rows) < size:
+        return None
+    row = rows[-1]
+    sort_column = resolve_sort_column(sort_by, *models)
+    return encode_cursor(
+        _get_row_value(row, sort_column) if sort_column is not None else None,
+        _get_row_value(row, models[0].id),
+    )
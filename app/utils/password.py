@@ -0,0 +1,102 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+from passlib.context import CryptContext
+
+from app.config import config
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+class PasswordHasher:
+    """
+        Run bcrypt on a dedicated pool with fixed worker
+
+        - bcrypt is slow by design, login burst wait in queue instead of eat every request thread
+        - async handler await the result, event loop and request thread are free while waiting
+        - 'process' executor use all cpu core, 'thread' executor is lighter
+    """
+    def __init__(self, workers: int, executor: str = 'thread'):
+        self.workers = workers
+        self.executor_type = executor
+        self._executor = None
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def _get_executor(self) -> Executor:
+        # created on first use, so process pool is not forked while app still importing
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.executor_type == 'process':
+                        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                    else:
+                        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='password')
+        return self._executor
+
+    def _submit(self, function, *args) -> Future:
+        started_at = time.perf_counter()
+        with self._lock:
+            self.in_flight += 1
+
+        def done(_):
+            elapsed = time.perf_counter() - started_at
+            with self._lock:
+                self.in_flight -= 1
+                self.completed += 1
+                self.wait_total += elapsed
+                self.wait_max = max(self.wait_max, elapsed)
+
+        try:
+            future = self._get_executor().submit(function, *args)
+        except BaseException:
+            done(None)
+            raise
+        future.add_done_callback(done)
+        return future
+
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return self._submit(_verify, plain_password, hashed_password).result()
+
+    def hash(self, password: str) -> str:
+        return self._submit(_hash, password).result()
+
+    async def verify_async(self, plain_password: str, hashed_password: str) -> bool:
+        return await asyncio.wrap_future(self._submit(_verify, plain_password, hashed_password))
+
+    async def hash_async(self, password: str) -> str:
+        return await asyncio.wrap_future(self._submit(_hash, password))
+
+    def get_status(self) -> dict:
+        with self._lock:
+            in_flight = self.in_flight
+            completed = self.completed
+            wait_total = self.wait_total
+            wait_max = self.wait_max
+        return {
+            'executor': self.executor_type,
+            'workers': self.workers,
+            'in_flight': in_flight,
+            'queue_depth': max(0, in_flight - self.workers),
+            'completed': completed,
+            'duration_avg_ms': round(wait_total * 1000 / completed, 3) if completed else 0,
+            'duration_max_ms': round(wait_max * 1000, 3),
+        }
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+password_hasher = PasswordHasher(config.PASSWORD_HASH_WORKERS, config.PASSWORD_HASH_EXECUTOR)
@@ -0,0 +1,94 @@
+import threading
+import time
+from enum import Enum
+
+from fastapi import Depends, status
+from fastapi.exceptions import HTTPException
+from sqlalchemy.orm import Session
+
+from app.config import config
+from app.database import get_db
+from app.models.role.role import Role
+from app.models.role.role_authority import RoleAuthority
+from app.utils.authentication import Authentication
+
+class PermissionCache:
+    """
+        In process cache of role_authorities table
+
+        - role id -> set of (feature, name)
+        - role code -> role id, so token role_code can be checked without query
+        - reload when invalidated by write or when older than PERMISSION_CACHE_TTL
+    """
+    def __init__(self, ttl: int = config.PERMISSION_CACHE_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # (permissions, role_codes, loaded_at), swapped as a whole
+        self._snapshot = None
+
+    def load(self, db: Session):
+        permissions = {}
+        for role_id, feature, name in db.query(RoleAuthority.role_id, RoleAuthority.feature, RoleAuthority.name).all():
+            permissions.setdefault(role_id, set()).add((feature, name))
+
+        role_codes = {code: role_id for role_id, code in db.query(Role.id, Role.code).all()}
+
+        snapshot = (permissions, role_codes, time.monotonic())
+        with self._lock:
+            self._snapshot = snapshot
+        return snapshot
+
+    def invalidate(self):
+        with self._lock:
+            self._snapshot = None
+
+    def _get_snapshot(self, db: Session):
+        snapshot = self._snapshot
+        if snapshot is None or (time.monotonic() - snapshot[2]) >= self.ttl:
+            snapshot = self.load(db)
+        return snapshot
+
+    def get_permissions(self, db: Session, role_id: int) -> set:
+        permissions, _, _ = self._get_snapshot(db)
+        return permissions.get(role_id, set())
+
+    def has_permission(self, db: Session, role_id: int, feature: str, name: str) -> bool:
+        return (feature, name) in self.get_permissions(db, role_id)
+
+    def has_permission_by_role_code(self, db: Session, role_code: str, feature: str, name: str) -> bool:
+        permissions, role_codes, _ = self._get_snapshot(db)
+        role_id = role_codes.get(role_code)
+        if role_id is None:
+            return False
+        return (feature, name) in permissions.get(role_id, set())
+
+permission_cache = PermissionCache()
+
+def has_permission(db: Session, payload: dict, feature: str | Enum, name: str | Enum) -> bool:
+    """
+        Check role authority of user login without query
+
+        - role is taken from role_code of access token and checked with cache
+    """
+    feature = feature.value if isinstance(feature, Enum) else feature
+    name = name.value if isinstance(name, Enum) else name
+    role_code = payload.get("role_code", None)
+    if not role_code:
+        return False
+    return permission_cache.has_permission_by_role_code(db, role_code, feature, name)
+
+def require(feature: str | Enum, name: str | Enum):
+    """
+        Dependency to check role authority of user login
+
+        - forbidden when user login has no authority
+        - return payload token when allowed
+    """
+    name_value = name.value if isinstance(name, Enum) else name
+
+    def dependency(db: Session = Depends(get_db), payload = Depends(Authentication())):
+        if not has_permission(db, payload, feature, name):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=f"Not allow to {name_value}")
+        return payload
+
+    return dependency
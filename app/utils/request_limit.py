@@ -0,0 +1,106 @@
+from fastapi import HTTPException, status
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# part header (content disposition, content type) counted with the file it describe
+PART_HEADER_ALLOWANCE = 16 * 1024
+
+def get_boundary(content_type: bytes) -> bytes | None:
+    for param in content_type.split(b';')[1:]:
+        name, _, value = param.strip().partition(b'=')
+        if name.lower() == b'boundary' and value:
+            return value.strip(b'"')
+    return None
+
+class MultipartPartCounter:
+    """
+        Size of current part of multipart body, counted by chunk without parsing it
+
+        - part start after each boundary delimiter, delimiter across two chunk is found by kept tail
+    """
+    def __init__(self, boundary: bytes):
+        self.delimiter = b'\r\n--' + boundary
+        # first delimiter has no line break before it
+        self._tail = b'\r\n'
+        self._offset = -len(self._tail)
+        self._part_start = 0
+
+    def feed(self, chunk: bytes) -> int:
+        """
+            Size of biggest part touched by chunk, part ended inside it included
+        """
+        data = self._tail + chunk
+        size = 0
+        index = data.find(self.delimiter)
+        while index != -1:
+            size = max(size, self._offset + index - self._part_start)
+            self._part_start = self._offset + index + len(self.delimiter)
+            index = data.find(self.delimiter, index + len(self.delimiter))
+
+        end = self._offset + len(data)
+        # shorter than delimiter, can not hold a delimiter already found
+        self._tail = data[-(len(self.delimiter) - 1):]
+        self._offset = end - len(self._tail)
+        return max(size, end - self._part_start)
+
+class UploadSizeLimitMiddleware:
+    """
+        Abort multipart request bigger than max_size while it still being received
+
+        - Content-Length over limit rejected before body is read
+        - chunked body counted on every receive, the form parser stop at the limit
+        - max_file_size set: each part counted too, file over it stopped before spooled whole
+    """
+    def __init__(self, app: ASGIApp, max_size: int, max_file_size: int = None):
+        self.app = app
+        self.max_size = max_size
+        self.max_file_size = max_file_size
+
+    def _too_large(self):
+        return HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Request too large. only allow request lower than {self.max_size // (1024 * 1024)} mb",
+        )
+
+    def _file_too_large(self):
+        return HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Image too large. only allow file lower than {self.max_file_size // (1024 * 1024)} mb",
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope['headers'])
+        content_type = headers.get(b'content-type', b'')
+        if not content_type.startswith(b'multipart/form-data'):
+            await self.app(scope, receive, send)
+            return
+
+        content_length = headers.get(b'content-length')
+        if content_length is not None and content_length.isdigit() and int(content_length) > self.max_size:
+            error = self._too_large()
+            response = JSONResponse({'detail': error.detail}, status_code=error.status_code)
+            await response(scope, receive, send)
+            return
+
+        boundary = get_boundary(content_type)
+        part_counter = MultipartPartCounter(boundary) if self.max_file_size and boundary else None
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message['type'] == 'http.request':
+                body = message.get('body', b'')
+                received += len(body)
+                # raised inside the handler, turned into 413 by exception handler
+                if received > self.max_size:
+                    raise self._too_large()
+                if part_counter is not None and part_counter.feed(body) > self.max_file_size + PART_HEADER_ALLOWANCE:
+                    raise self._file_too_large()
+            return message
+
+        await self.app(scope, limited_receive, send)
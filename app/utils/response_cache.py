@@ -0,0 +1,144 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response
+
+from app.config import config
+from app.utils.conditional_request import VALIDATOR_HEADERS
+
+class MemoryCacheBackend:
+    """
+        LRU cache in process with ttl
+
+        - each entry has tag (user id) so writes of the owner can drop it
+    """
+    def __init__(self, max_size: int, ttl: int):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, tag, expired_at = entry
+            if expired_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, tag: str):
+        with self._lock:
+            self._entries[key] = (value, tag, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete_tag(self, tag: str):
+        with self._lock:
+            for key in [key for key, entry in self._entries.items() if entry[1] == tag]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+class RedisCacheBackend:
+    """
+        Cache shared between worker, need package redis
+
+        - tag is a set of key, clear is done by change namespace
+        - entry keep namespace it written in, lookup is one MGET of namespace and entry
+        - client is blocking, ResponseCache call it from thread pool
+    """
+    blocking = True
+
+    def __init__(self, url: str, ttl: int, prefix: str = 'public-profile'):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key: str):
+        namespace, entry = self.client.mget(f"{self.prefix}:ns", f"{self.prefix}:{key}")
+        if entry is None:
+            return None
+        entry_namespace, value = entry.split(b'\n', 1)
+        # written before last clear
+        if int(entry_namespace) != int(namespace or 0):
+            return None
+        return value
+
+    def set(self, key: str, value: bytes, tag: str):
+        namespace = int(self.client.get(f"{self.prefix}:ns") or 0)
+        pipeline = self.client.pipeline()
+        pipeline.set(f"{self.prefix}:{key}", f"{namespace}\n".encode() + value, ex=self.ttl)
+        pipeline.sadd(f"{self.prefix}:tag:{tag}", f"{self.prefix}:{key}")
+        pipeline.expire(f"{self.prefix}:tag:{tag}", self.ttl)
+        pipeline.execute()
+
+    def delete_tag(self, tag: str):
+        keys = self.client.smembers(f"{self.prefix}:tag:{tag}")
+        pipeline = self.client.pipeline()
+        if keys:
+            pipeline.delete(*keys)
+        pipeline.delete(f"{self.prefix}:tag:{tag}")
+        pipeline.execute()
+
+    def clear(self):
+        self.client.incr(f"{self.prefix}:ns")
+
+class ResponseCache:
+    def __init__(self, backend = None):
+        self.backend = backend
+
+    def make_key(self, request: Request, section: str, username: str, language_id: str = None) -> str:
+        query = '&'.join(f"{key}={value}" for key, value in sorted(request.query_params.multi_items()))
+        return f"{username}:{language_id or ''}:{section}:{query}"
+
+    async def _call(self, function, *args):
+        # network backend must not block the event loop
+        if getattr(self.backend, 'blocking', False):
+            return await run_in_threadpool(function, *args)
+        return function(*args)
+
+    async def get(self, key: str) -> Response | None:
+        if self.backend is None:
+            return None
+        value = await self._call(self.backend.get, key)
+        if value is None:
+            return None
+        # first line is validator headers, rest is body
+        headers, body = value.split(b'\n', 1)
+        return Response(content=body, headers=json.loads(headers), media_type='application/json')
+
+    async def set(self, key: str, user_id: str, response: Response) -> Response:
+        if self.backend is not None and response.status_code == 200:
+            headers = {name: value for name, value in response.headers.items() if name in VALIDATOR_HEADERS}
+            await self._call(self.backend.set, key, json.dumps(headers).encode() + b'\n' + bytes(response.body), user_id)
+        return response
+
+    def invalidate_user(self, user_id: str):
+        if self.backend is not None and user_id:
+            self.backend.delete_tag(user_id)
+
+    def invalidate_all(self):
+        if self.backend is not None:
+            self.backend.clear()
+
+def create_response_cache() -> ResponseCache:
+    if config.RESPONSE_CACHE_BACKEND == 'memory':
+        return ResponseCache(MemoryCacheBackend(config.RESPONSE_CACHE_MAX_SIZE, config.RESPONSE_CACHE_TTL))
+    if config.RESPONSE_CACHE_BACKEND == 'redis':
+        return ResponseCache(RedisCacheBackend(config.RESPONSE_CACHE_REDIS_URL, config.RESPONSE_CACHE_TTL))
+    return ResponseCache()
+
+public_profile_cache = create_response_cache()
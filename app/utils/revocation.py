@@ -0,0 +1,160 @@
+import hashlib
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.orm import Session
+
+from app.config import config
+from app.database import SessionLocal
+from app.models.revoked_token import RevokedToken
+from app.repositories.refresh_token_repository import RefreshTokenRepository
+from app.repositories.revoked_token_repository import RevokedTokenRepository
+
+class BloomFilter:
+    """
+        Set of string without false negative, false positive checked by exact set
+    """
+    def __init__(self, size: int, hashes: int):
+        self.size = size
+        self.hashes = hashes
+        self._bits = bytearray((size + 7) // 8)
+
+    def _positions(self, value: str):
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + index * second) % self.size for index in range(self.hashes)]
+
+    def add(self, value: str):
+        for position in self._positions(value):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+class RevocationList:
+    """
+        Per process copy of revoked_tokens table
+
+        - bloom filter answer most lookup (not revoked) without touching the exact set
+        - load only row created since watermark every REVOCATION_REFRESH_INTERVAL
+        - watermark read with overlap, row inserted before but committed after last load is not missed
+        - full rebuild every REVOCATION_REBUILD_INTERVAL drop expired jti, expired revoked and refresh token deleted from table
+    """
+    def __init__(
+        self,
+        bloom_size: int = config.REVOCATION_BLOOM_SIZE,
+        bloom_hashes: int = config.REVOCATION_BLOOM_HASHES,
+        refresh_interval: int = config.REVOCATION_REFRESH_INTERVAL,
+        rebuild_interval: int = config.REVOCATION_REBUILD_INTERVAL,
+        refresh_overlap: int = config.REVOCATION_REFRESH_OVERLAP,
+    ):
+        self.bloom_size = bloom_size
+        self.bloom_hashes = bloom_hashes
+        self.refresh_interval = refresh_interval
+        self.rebuild_interval = rebuild_interval
+        self.refresh_overlap = refresh_overlap
+        self._lock = threading.Lock()
+        self._bloom = BloomFilter(bloom_size, bloom_hashes)
+        self._revoked = set()
+        # jti revoked by this process, kept over rebuild that may started before its commit
+        self._recent = {}
+        self._watermark = None
+        self._refreshed_at = None
+        self._rebuilt_at = None
+        self.bloom_hits = 0
+
+    def is_refresh_due(self) -> bool:
+        return self._refreshed_at is None or (time.monotonic() - self._refreshed_at) >= self.refresh_interval
+
+    def refresh(self, db: Session):
+        repository = RevokedTokenRepository(db)
+        now = time.monotonic()
+
+        if self._rebuilt_at is None or (now - self._rebuilt_at) >= self.rebuild_interval:
+            repository.delete_expired_revoked_tokens(_utc_now())
+            RefreshTokenRepository(db).delete_expired_refresh_tokens(_utc_now())
+            rows = repository.read_revoked_tokens(_utc_now())
+            bloom = BloomFilter(self.bloom_size, self.bloom_hashes)
+            revoked = set()
+            for jti, _ in rows:
+                bloom.add(jti)
+                revoked.add(jti)
+            with self._lock:
+                self._recent = {jti: revoked_at for jti, revoked_at in self._recent.items() if revoked_at >= now}
+                for jti in self._recent:
+                    bloom.add(jti)
+                    revoked.add(jti)
+                self._bloom, self._revoked = bloom, revoked
+                self._watermark = max((created_at for _, created_at in rows), default=self._watermark)
+                self._refreshed_at = self._rebuilt_at = now
+            return
+
+        # created_at is set on insert, transaction committed later can have row older than watermark
+        created_since = self._watermark - timedelta(seconds=self.refresh_overlap) if self._watermark else None
+        rows = repository.read_revoked_tokens(_utc_now(), created_since=created_since)
+        with self._lock:
+            for jti, created_at in rows:
+                if jti not in self._revoked:
+                    self._bloom.add(jti)
+                    self._revoked.add(jti)
+                if self._watermark is None or created_at > self._watermark:
+                    self._watermark = created_at
+            self._refreshed_at = now
+
+    def is_revoked(self, jti: str) -> bool:
+        if not jti or not self._revoked:
+            return False
+        if jti not in self._bloom:
+            return False
+        self.bloom_hits += 1
+        return jti in self._revoked
+
+    def revoke(self, db: Session, jti: str, expired_at: int, user_id: str = None):
+        """
+            Save revoked jti, other process get it on next refresh
+        """
+        if not jti:
+            return
+        RevokedTokenRepository(db).create_revoked_token(RevokedToken(
+            id=jti,
+            user_id=user_id,
+            expired_at=datetime.fromtimestamp(expired_at, timezone.utc).replace(tzinfo=None),
+        ))
+        with self._lock:
+            self._bloom.add(jti)
+            self._revoked.add(jti)
+            self._recent[jti] = time.monotonic()
+
+    def get_status(self) -> dict:
+        with self._lock:
+            return {
+                'revoked': len(self._revoked),
+                'bloom_size': self.bloom_size,
+                'bloom_hashes': self.bloom_hashes,
+                'bloom_hits': self.bloom_hits,
+                'watermark': str(self._watermark) if self._watermark else None,
+            }
+
+revocation_list = RevocationList()
+
+_refresh_lock = threading.Lock()
+
+def refresh_revocation_list():
+    """
+        Refresh with own session, skipped when other thread already refreshing
+    """
+    if not _refresh_lock.acquire(blocking=False):
+        return
+    try:
+        db = SessionLocal()
+        try:
+            revocation_list.refresh(db)
+        finally:
+            db.close()
+    finally:
+        _refresh_lock.release()
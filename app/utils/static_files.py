@@ -0,0 +1,242 @@
+import hashlib
+import os
+import stat
+from email.utils import formatdate
+from mimetypes import guess_type
+from urllib.parse import quote
+
+import anyio
+from fastapi import Request
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+from app.utils.conditional_request import is_not_modified, not_modified_response
+
+# precompressed sibling file, first accepted one is served
+PRECOMPRESSED_VARIANTS = [('br', '.br'), ('gzip', '.gz')]
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+def parse_range(range_header: str, size: int) -> tuple[int, int] | None:
+    """
+        (start, end) of single byte range, None when header is not usable
+
+        - multiple range is served as whole file
+        - RangeNotSatisfiable when range start after end of file
+    """
+    unit, _, ranges = range_header.partition('=')
+    if unit.strip().lower() != 'bytes' or ',' in ranges:
+        return None
+
+    start_text, separator, end_text = ranges.strip().partition('-')
+    if not separator:
+        return None
+
+    try:
+        if start_text == '':
+            # suffix range, last n bytes
+            suffix = int(end_text)
+            if suffix <= 0 or size == 0:
+                raise RangeNotSatisfiable()
+            return max(0, size - suffix), size - 1
+        start = int(start_text)
+        end = int(end_text) if end_text else None
+    except ValueError:
+        return None
+
+    if end is not None and start > end:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable()
+    return start, size - 1 if end is None else min(end, size - 1)
+
+def accepts_encoding(accept_encoding: str, encoding: str) -> bool:
+    for value in accept_encoding.split(','):
+        name, _, parameters = value.strip().partition(';')
+        if name.strip().lower() != encoding:
+            continue
+        quality = parameters.strip().removeprefix('q=')
+        try:
+            return not parameters or float(quality) > 0
+        except ValueError:
+            return False
+    return False
+
+def make_static_etag(stat_result: os.stat_result, encoding: str = None) -> str:
+    # file is replaced by rename, new inode or mtime mean new content; each encoding has own etag
+    value = f"{stat_result.st_ino}-{stat_result.st_mtime_ns}-{stat_result.st_size}-{encoding or 'identity'}"
+    return f'"{hashlib.blake2b(value.encode(), digest_size=16).hexdigest()}"'
+
+class StaticFileResponse(Response):
+    """
+        File or byte range of file
+
+        - zero copy when server support asgi pathsend or zerocopysend extension
+    """
+    chunk_size = 64 * 1024
+
+    def __init__(
+        self,
+        path: str,
+        start: int,
+        end: int,
+        status_code: int = 200,
+        headers: dict = None,
+        media_type: str = None,
+        method: str = None,
+    ):
+        self.path = path
+        self.start = start
+        self.count = max(0, end - start + 1)
+        self.status_code = status_code
+        self.media_type = media_type
+        self.background = None
+        self.send_header_only = method is not None and method.upper() == 'HEAD'
+        self.init_headers(headers)
+        self.headers['content-length'] = str(self.count)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        await send({
+            'type': 'http.response.start',
+            'status': self.status_code,
+            'headers': self.raw_headers,
+        })
+        if self.send_header_only or self.count == 0:
+            await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+            return
+
+        extensions = scope.get('extensions') or {}
+        if 'http.response.pathsend' in extensions and self.status_code == 200:
+            await send({'type': 'http.response.pathsend', 'path': os.path.abspath(self.path)})
+            return
+
+        if 'http.response.zerocopysend' in extensions:
+            with open(self.path, 'rb') as file:
+                await send({
+                    'type': 'http.response.zerocopysend',
+                    'file': file,
+                    'offset': self.start,
+                    'count': self.count,
+                    'more_body': False,
+                })
+            return
+
+        async with await anyio.open_file(self.path, mode='rb') as file:
+            await file.seek(self.start)
+            remaining = self.count
+            while remaining > 0:
+                chunk = await file.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({
+                    'type': 'http.response.body',
+                    'body': chunk,
+                    'more_body': remaining > 0,
+                })
+            if remaining > 0:
+                await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+
+class StaticFileServer(StaticFiles):
+    """
+        Static file with cache policy, Range and precompressed variant
+
+        - cache_control by path prefix inside the mount, longest prefix win
+        - strong ETag and Last-Modified, 304 when client copy still valid
+        - .br or .gz sibling served when client accept it and it not older than the file
+        - accel_redirect_prefix set: only header is sent with X-Accel-Redirect, front proxy
+          send the bytes (and its own gzip_static / brotli_static)
+    """
+    def __init__(
+        self,
+        *args,
+        cache_control: dict[str, str] = None,
+        default_cache_control: str = 'no-cache',
+        accel_redirect_prefix: str = None,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.cache_control = sorted((cache_control or {}).items(), key=lambda item: len(item[0]), reverse=True)
+        self.default_cache_control = default_cache_control
+        self.accel_redirect_prefix = accel_redirect_prefix.rstrip('/') if accel_redirect_prefix else None
+
+    def get_cache_control(self, path: str) -> str:
+        for prefix, cache_control in self.cache_control:
+            if path.startswith(prefix):
+                return cache_control
+        return self.default_cache_control
+
+    def select_variant(self, full_path: str, stat_result: os.stat_result, accept_encoding: str):
+        """
+            (path, stat, encoding, has_variant) of file to send
+
+            - has_variant tell response depend on Accept-Encoding
+        """
+        has_variant = False
+        for encoding, suffix in PRECOMPRESSED_VARIANTS:
+            try:
+                variant_stat = os.stat(f"{full_path}{suffix}")
+            except OSError:
+                continue
+            if not stat.S_ISREG(variant_stat.st_mode) or variant_stat.st_mtime < stat_result.st_mtime:
+                continue
+            has_variant = True
+            if accepts_encoding(accept_encoding, encoding):
+                return f"{full_path}{suffix}", variant_stat, encoding, True
+        return full_path, stat_result, None, has_variant
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope: Scope, status_code: int = 200) -> Response:
+        full_path = str(full_path)
+        request = Request(scope)
+        request_headers = Headers(scope=scope)
+        relative_path = os.path.relpath(full_path, os.path.realpath(self.directory)).replace(os.sep, '/')
+        media_type = guess_type(full_path)[0] or 'text/plain'
+
+        headers = {'cache-control': self.get_cache_control(relative_path)}
+        encoding = None
+        if self.accel_redirect_prefix is None:
+            full_path, stat_result, encoding, has_variant = self.select_variant(
+                full_path, stat_result, request_headers.get('accept-encoding', '')
+            )
+            if has_variant:
+                headers['vary'] = 'Accept-Encoding'
+            if encoding:
+                headers['content-encoding'] = encoding
+
+        headers['etag'] = make_static_etag(stat_result, encoding)
+        headers['last-modified'] = formatdate(stat_result.st_mtime, usegmt=True)
+        if status_code == 200 and is_not_modified(request, headers['etag'], headers['last-modified']):
+            return not_modified_response(headers)
+
+        if self.accel_redirect_prefix is not None:
+            # inside the mounted folder, not the working directory that can change or be a parent
+            headers['x-accel-redirect'] = quote(f"{self.accel_redirect_prefix}/{relative_path}")
+            return Response(status_code=status_code, headers=headers, media_type=media_type)
+
+        headers['accept-ranges'] = 'bytes'
+        size = stat_result.st_size
+        start, end = 0, size - 1
+        range_header = request_headers.get('range')
+        if_range = request_headers.get('if-range')
+        if range_header and status_code == 200 and (if_range is None or if_range.strip() == headers['etag']):
+            try:
+                byte_range = parse_range(range_header, size)
+            except RangeNotSatisfiable:
+                return Response(status_code=416, headers={**headers, 'content-range': f"bytes */{size}"})
+            if byte_range is not None:
+                start, end = byte_range
+                status_code = 206
+                headers['content-range'] = f"bytes {start}-{end}/{size}"
+
+        return StaticFileResponse(
+            full_path,
+            start,
+            end,
+            status_code=status_code,
+            headers=headers,
+            media_type=media_type,
+            method=scope['method'],
+        )
@@ -0,0 +1,202 @@
+import io
+import os
+import shutil
+import tempfile
+import uuid
+from pathlib import Path
+
+from app.config import config
+
+# content addressed file never change, client can keep it forever
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+def make_content_key(digest: str, extension: str) -> str:
+    """
+        Sharded key of content hash, e.g. 'ab/cd/abcd...ef.png'
+    """
+    return f"{digest[:2]}/{digest[2:4]}/{digest}.{extension}"
+
+def is_content_key(filename: str) -> bool:
+    # file saved before content addressed storage only has name, key has shard folder
+    return bool(filename) and '/' in filename
+
+class LocalStorageBackend:
+    """
+        Files in folder of this server, served by static mount
+    """
+    def __init__(self, root: str, url_prefix: str = None):
+        self.root = root
+        self.url_prefix = url_prefix if url_prefix is not None else root
+
+    def _path(self, key: str) -> Path:
+        return Path(self.root) / key
+
+    def create_temp(self) -> str:
+        # same file system as root, so rename is atomic
+        os.makedirs(self.root, exist_ok=True)
+        return os.path.join(self.root, f".{uuid.uuid4().hex}.tmp")
+
+    def save_temp(self, temp_path: str, key: str):
+        path = self._path(key)
+        if path.exists():
+            os.remove(temp_path)
+            # reused file counted as new for min_age of file gc
+            os.utime(path)
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(temp_path, path)
+
+    def save(self, key: str, stream, content_type: str = None):
+        temp_path = self.create_temp()
+        try:
+            with open(temp_path, 'wb') as f_dest:
+                shutil.copyfileobj(stream, f_dest)
+            path = self._path(key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def open(self, key: str):
+        return open(self._path(key), 'rb')
+
+    def exists(self, key: str) -> bool:
+        return self._path(key).exists()
+
+    def delete(self, key: str) -> bool:
+        path = self._path(key)
+        if not path.exists():
+            return False
+        os.remove(path)
+        return True
+
+    def delete_many(self, keys: list[str]) -> dict[str, str]:
+        """
+            Remove each key, {key: error} of key that failed
+
+            - key already gone is counted as removed
+        """
+        errors = {}
+        for key in keys:
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                continue
+            except OSError as error:
+                errors[key] = str(error)
+        return errors
+
+    def url(self, key: str) -> str:
+        return f"{self.url_prefix}/{key}"
+
+class S3StorageBackend:
+    """
+        S3 compatible bucket (aws, minio, ...), need package boto3
+
+        - endpoint_url point to other S3 compatible server, e.g. local minio
+    """
+    def __init__(
+        self,
+        bucket: str,
+        endpoint_url: str = None,
+        region: str = None,
+        access_key: str = None,
+        secret_key: str = None,
+        public_url: str = None,
+    ):
+        import boto3
+
+        self.client = boto3.client(
+            's3',
+            endpoint_url=endpoint_url or None,
+            region_name=region or None,
+            aws_access_key_id=access_key or None,
+            aws_secret_access_key=secret_key or None,
+        )
+        self.bucket = bucket
+        self.public_url = (public_url or f"{endpoint_url or 'https://s3.amazonaws.com'}/{bucket}").rstrip('/')
+
+    def create_temp(self) -> str:
+        file_descriptor, temp_path = tempfile.mkstemp(suffix='.tmp')
+        os.close(file_descriptor)
+        return temp_path
+
+    def save_temp(self, temp_path: str, key: str):
+        try:
+            if not self.exists(key):
+                with open(temp_path, 'rb') as stream:
+                    self.save(key, stream)
+        finally:
+            os.remove(temp_path)
+
+    def save(self, key: str, stream, content_type: str = None):
+        extra_args = {'CacheControl': IMMUTABLE_CACHE_CONTROL}
+        if content_type:
+            extra_args['ContentType'] = content_type
+        self.client.upload_fileobj(stream, self.bucket, key, ExtraArgs=extra_args)
+
+    def open(self, key: str):
+        # body of s3 is not seekable, image library need to seek
+        body = self.client.get_object(Bucket=self.bucket, Key=key)['Body']
+        return io.BytesIO(body.read())
+
+    def exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+            return True
+        except ClientError as error:
+            if error.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+                return False
+            raise
+
+    def delete(self, key: str) -> bool:
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+        return True
+
+    def delete_many(self, keys: list[str]) -> dict[str, str]:
+        """
+            Remove keys by one request per 1000 key, {key: error} of key that failed
+        """
+        errors = {}
+        for index in range(0, len(keys), 1000):
+            response = self.client.delete_objects(
+                Bucket=self.bucket,
+                Delete={'Objects': [{'Key': key} for key in keys[index:index + 1000]], 'Quiet': True},
+            )
+            for error in response.get('Errors', []):
+                errors[error['Key']] = error.get('Message') or error.get('Code')
+        return errors
+
+    def url(self, key: str) -> str:
+        return f"{self.public_url}/{key}"
+
+def create_storage():
+    if config.STORAGE_BACKEND == 's3':
+        return S3StorageBackend(
+            config.STORAGE_S3_BUCKET,
+            endpoint_url=config.STORAGE_S3_ENDPOINT_URL,
+            region=config.STORAGE_S3_REGION,
+            access_key=config.STORAGE_S3_ACCESS_KEY,
+            secret_key=config.STORAGE_S3_SECRET_KEY,
+            public_url=config.STORAGE_S3_PUBLIC_URL,
+        )
+    return LocalStorageBackend(config.STORAGE_LOCAL_ROOT, config.STORAGE_LOCAL_URL_PREFIX.strip('/'))
+
+storage = create_storage()
+
+def get_storage(folder: str, filename: str):
+    """
+        Storage of the file, old file still read from its own folder
+    """
+    if is_content_key(filename):
+        return storage
+    return LocalStorageBackend(folder)
+
+def get_file_url(folder: str, filename: str) -> str | None:
+    if not filename:
+        return None
+    return get_storage(folder, filename).url(filename)
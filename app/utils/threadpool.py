@@ -0,0 +1,23 @@
+from anyio import to_thread
+
+from app.config import config
+
+def configure_threadpool(size: int = config.THREADPOOL_SIZE):
+    """
+        Bound worker thread used to run sync handler and dependency
+
+        - must be called inside event loop
+    """
+    to_thread.current_default_thread_limiter().total_tokens = size
+
+def get_threadpool_status() -> dict:
+    """
+        Must be called inside event loop, so from async handler
+    """
+    limiter = to_thread.current_default_thread_limiter()
+    statistics = limiter.statistics()
+    return {
+        'size': limiter.total_tokens,
+        'busy': statistics.borrowed_tokens,
+        'waiting': statistics.tasks_waiting,
+    }
@@ -0,0 +1,77 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+import jwt
+
+from app.config import config
+from app.utils.get_payload import get_payload
+
+class TokenCache:
+    """
+        LRU of verified access token, key is hash of the token
+
+        - repeat request of same token skip RS256 verification
+        - exp of payload still checked on every hit
+        - max_size 0 disable the cache
+    """
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.verify_total = 0.0
+
+    def get_payload(self, access_token: str) -> dict:
+        """
+            Same error as get_payload, expired token raise ExpiredSignatureError
+        """
+        key = hashlib.blake2b(access_token.encode(), digest_size=16).digest()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                payload, expired_at = entry
+                if expired_at is not None and expired_at <= time.time():
+                    del self._entries[key]
+                    raise jwt.ExpiredSignatureError('Signature has expired')
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return dict(payload)
+
+        started_at = time.perf_counter()
+        payload = get_payload(access_token)
+        elapsed = time.perf_counter() - started_at
+
+        with self._lock:
+            self.misses += 1
+            self.verify_total += elapsed
+            if self.max_size > 0:
+                self._entries[key] = (payload, payload.get('exp'))
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+
+        return dict(payload)
+
+    def get_status(self) -> dict:
+        with self._lock:
+            hits, misses, verify_total, size = self.hits, self.misses, self.verify_total, len(self._entries)
+        verify_avg = verify_total / misses if misses else 0
+        return {
+            'size': size,
+            'max_size': self.max_size,
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': round(hits / (hits + misses), 4) if hits + misses else 0,
+            'verify_avg_ms': round(verify_avg * 1000, 3),
+            # cost of verification skipped by hit, estimated from average of miss
+            'verify_saved_ms': round(hits * verify_avg * 1000, 3),
+        }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+token_cache = TokenCache(config.TOKEN_CACHE_MAX_SIZE)
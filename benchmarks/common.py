@@ -0,0 +1,24 @@
+import os
+import tempfile
+
+def _generate_key_pair() -> tuple[str, str]:
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_key = key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption())
+    public_key = key.public_key().public_bytes(serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo)
+    return private_key.decode(), public_key.decode()
+
+def setup_environment():
+    """
+        Config need key and database before app is imported
+
+        - value already in environment is kept, otherwise fresh key and sqlite file in temp folder
+    """
+    if 'PRIVATE_KEY' not in os.environ or 'PUBLIC_KEY' not in os.environ:
+        os.environ['PRIVATE_KEY'], os.environ['PUBLIC_KEY'] = _generate_key_pair()
+    if 'REFRESH_PRIVATE_KEY' not in os.environ:
+        os.environ['REFRESH_PRIVATE_KEY'], _ = _generate_key_pair()
+    os.environ.setdefault('DB', f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'benchmark.db')}")
+    os.environ.setdefault('PORT', '5000')
@@ -0,0 +1,155 @@
+"""
+    Latency of read while upload and write run at the same time, at different thread pool size
+
+    - handlers threadpool: sync handler run on thread pool, as the app does
+    - handlers blocking: sync handler body run on event loop, like async def handler doing sync work before
+
+    python -m benchmarks.concurrency --handlers blocking threadpool --sizes 4 30 --writers 8 --readers 8 --duration 5
+"""
+import argparse
+import asyncio
+import importlib
+import io
+import os
+import pkgutil
+import statistics
+import tempfile
+import time
+import uuid
+
+from benchmarks.common import setup_environment
+
+setup_environment()
+# uploaded logo kept out of static folder of the repo
+os.environ.setdefault('STORAGE_LOCAL_ROOT', tempfile.mkdtemp())
+
+import fastapi.routing
+import httpx
+from PIL import Image
+
+from app import models
+from app.database import Base, SessionLocal, engine
+from app.main import app
+from app.models.role.role import Role
+from app.models.role.role_authority import RoleAuthority, RoleAuthorityFeature, RoleAuthorityName
+from app.models.user import User
+from app.utils.password import password_hasher
+from app.utils.threadpool import configure_threadpool
+
+READ_URLS = {
+    # async handler, run on event loop
+    'public_profile': '/api/v1/public-profile/admin',
+    # sync handler, run on thread pool
+    'role_list': '/api/v1/role',
+}
+
+_run_in_threadpool = fastapi.routing.run_in_threadpool
+
+async def _run_on_loop(function, *args, **kwargs):
+    return function(*args, **kwargs)
+
+def use_handlers(handlers: str):
+    """
+        Endpoint body on thread pool, or on event loop for the blocking baseline
+
+        - dependency (session, authentication) stay on thread pool in both, as before the change
+    """
+    fastapi.routing.run_in_threadpool = _run_on_loop if handlers == 'blocking' else _run_in_threadpool
+
+def _seed():
+    for module in pkgutil.walk_packages(models.__path__, 'app.models.'):
+        importlib.import_module(module.name)
+    Base.metadata.create_all(engine)
+    db = SessionLocal()
+    try:
+        if db.get(User, 'u-admin') is None:
+            db.add(Role(id=1, code='ADMIN', name='ADMIN', level=0, is_active=True))
+            for feature in RoleAuthorityFeature:
+                for name in RoleAuthorityName:
+                    db.add(RoleAuthority(id=str(uuid.uuid4()), role_id=1, feature=feature.value, name=name.value))
+            db.add(User(id='u-admin', role_id=1, username='admin', email='admin@mail.com', password=password_hasher.hash('secret'), is_active=True, gender='male', name='Admin'))
+            db.commit()
+    finally:
+        db.close()
+
+def _make_logo() -> bytes:
+    buffer = io.BytesIO()
+    Image.new('RGB', (256, 256), (40, 80, 120)).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+def _percentile(latencies: list[float], percent: int) -> float:
+    if len(latencies) < 2:
+        return round(latencies[0] * 1000, 1) if latencies else 0.0
+    return round(statistics.quantiles(latencies, n=100)[percent - 1] * 1000, 1)
+
+async def _write(client: httpx.AsyncClient, headers: dict, logo: bytes) -> bool:
+    code = uuid.uuid4().hex[:12]
+    response = await client.post(
+        '/api/v1/skill',
+        headers=headers,
+        data={'code': code, 'name': code, 'is_active': 'true'},
+        files={'logo': ('logo.png', logo, 'image/png')},
+    )
+    if response.status_code == 201:
+        response = await client.delete(f"/api/v1/skill/{response.json()['data']['id']}", headers=headers)
+    return response.status_code < 400
+
+async def _read(client: httpx.AsyncClient, headers: dict, url: str) -> bool:
+    response = await client.get(url, headers=headers)
+    return response.status_code < 400
+
+async def _repeat(request, deadline: float, result: dict):
+    while time.perf_counter() < deadline:
+        started_at = time.perf_counter()
+        try:
+            is_ok = await request()
+        except Exception:
+            # error raised by app, e.g. database locked while event loop is blocked
+            is_ok = False
+        result['latencies'].append(time.perf_counter() - started_at)
+        result['errors'] += not is_ok
+
+async def run(handlers: str, size: int, writers: int, readers: int, duration: float) -> dict:
+    use_handlers(handlers)
+    configure_threadpool(size)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://benchmark') as client:
+        response = await client.post('/api/v1/auth/login', json={'username_or_email': 'admin', 'password': 'secret'})
+        headers = {'Authorization': f"Bearer {response.json()['data']['access_token']}"}
+        logo = _make_logo()
+
+        results = {name: {'latencies': [], 'errors': 0} for name in ['write', *READ_URLS]}
+        deadline = time.perf_counter() + duration
+        tasks = [_repeat(lambda: _write(client, headers, logo), deadline, results['write']) for _ in range(writers)]
+        for name, url in READ_URLS.items():
+            tasks += [_repeat(lambda url=url: _read(client, headers, url), deadline, results[name]) for _ in range(readers)]
+        await asyncio.gather(*tasks)
+
+    report = {'handlers': handlers, 'threadpool': size}
+    for name, result in results.items():
+        report[name] = {
+            'requests': len(result['latencies']),
+            'errors': result['errors'],
+            'p50_ms': _percentile(result['latencies'], 50),
+            'p99_ms': _percentile(result['latencies'], 99),
+        }
+    return report
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--handlers', choices=['blocking', 'threadpool'], nargs='+', default=['blocking', 'threadpool'])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[4, 30])
+    parser.add_argument('--writers', type=int, default=8)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=5)
+    args = parser.parse_args()
+
+    _seed()
+    print(f"writers={args.writers} readers={args.readers} per read url, duration={args.duration}s")
+    for handlers in args.handlers:
+        for size in args.sizes:
+            print(asyncio.run(run(handlers, size, args.writers, args.readers, args.duration)))
+    password_hasher.shutdown()
+
+if __name__ == '__main__':
+    main()
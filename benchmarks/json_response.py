@@ -0,0 +1,67 @@
+"""
+    Time to build response of biggest public profile, model_dump + JSONResponse versus orjson json_response
+
+    python -m benchmarks.json_response --items 99 --number 200
+"""
+import argparse
+import timeit
+from datetime import date, datetime
+
+from benchmarks.common import setup_environment
+
+setup_environment()
+
+from fastapi.responses import JSONResponse
+
+from app.models.response import GeneralDataResponse, json_response
+
+SECTIONS = ['educations', 'experiences', 'skills', 'solutions', 'projects']
+
+def _item(i: int, now: datetime, today: date, to_value) -> dict:
+    return {
+        'id': f'id-{i}',
+        'title': 'x' * 64,
+        'description': 'd' * 512,
+        'started_at': to_value(today),
+        'finished_at': to_value(today),
+        'created_at': to_value(now),
+        'updated_at': to_value(now),
+        'image_url': 'static/files/ab/cd/' + 'e' * 64 + '.png',
+        'image_srcset': {'webp': ', '.join(f'url@{width}w.webp {width}w' for width in (64, 256, 1024))},
+        'school': {'name': 'n' * 40, 'description': 'd' * 512, 'image_url': 'u' * 80},
+    }
+
+def make_profile(items: int, to_value) -> dict:
+    """
+        Profile with every section full, to_value convert date and datetime
+    """
+    now, today = datetime.now(), date.today()
+    profile = {'username': 'admin', 'name': 'Admin'}
+    for section in SECTIONS:
+        profile[section] = [_item(i, now, today, to_value) for i in range(items)]
+    return profile
+
+def _per_call_ms(function, number: int) -> float:
+    return round(min(timeit.repeat(function, number=number, repeat=5)) / number * 1000, 3)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--items', type=int, default=99)
+    parser.add_argument('--number', type=int, default=200)
+    args = parser.parse_args()
+
+    # before: endpoint converted date with str and response was dumped to dict then encoded by json
+    str_profile = make_profile(args.items, str)
+    native_profile = make_profile(args.items, lambda value: value)
+    model_dump = lambda: JSONResponse(content=GeneralDataResponse(code=200, status='OK', data=str_profile).model_dump(), status_code=200)
+    orjson_response = lambda: json_response(GeneralDataResponse(code=200, status='OK', data=native_profile), 200)
+
+    print({
+        'items_per_section': args.items,
+        'body_bytes': len(orjson_response().body),
+        'model_dump_json_ms': _per_call_ms(model_dump, args.number),
+        'orjson_ms': _per_call_ms(orjson_response, args.number),
+    })
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""
+    Sign and verify per second, PEM parsed on every call versus key parsed once per process
+
+    python -m benchmarks.jwt_keys --number 2000
+"""
+import argparse
+import time
+
+from benchmarks.common import setup_environment
+
+setup_environment()
+
+import jwt
+
+from app.config import config
+from app.utils.generate_access_token import generate_access_token
+from app.utils.get_payload import get_payload
+from app.utils.key_material import format_pem
+
+def _per_second(function, number: int) -> float:
+    started_at = time.perf_counter()
+    for _ in range(number):
+        function()
+    return round(number / (time.perf_counter() - started_at), 1)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--number', type=int, default=2000)
+    args = parser.parse_args()
+
+    private_pem, public_pem = format_pem(config.PRIVATE_KEY), format_pem(config.PUBLIC_KEY)
+    token, _ = generate_access_token({'id': 'user-id'})
+    # first call parse the key, not counted
+    get_payload(token)
+
+    # pem given to pyjwt parse the key again on every call
+    print({
+        'operation': 'verify',
+        'pem_per_call_per_s': _per_second(lambda: jwt.decode(token, public_pem, ['RS256']), args.number),
+        'parsed_key_per_s': _per_second(lambda: get_payload(token), args.number),
+    })
+    sign_number = max(1, args.number // 10)
+    print({
+        'operation': 'sign',
+        'pem_per_call_per_s': _per_second(lambda: jwt.encode({'id': 'user-id'}, private_pem, 'RS256'), sign_number),
+        'parsed_key_per_s': _per_second(lambda: generate_access_token({'id': 'user-id'}), sign_number),
+    })
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+    Login throughput of bcrypt pool at different size, and event loop delay while it run
+
+    python -m benchmarks.password_hasher --sizes 1 2 4 8 --logins 64
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import setup_environment
+
+setup_environment()
+
+from app.utils.password import PasswordHasher, pwd_context
+
+async def _measure_loop_delay(stop: asyncio.Event, interval: float = 0.01) -> float:
+    # how late a 10 ms sleep wake up, blocked loop show up here
+    delay_max = 0.0
+    while not stop.is_set():
+        started_at = time.perf_counter()
+        await asyncio.sleep(interval)
+        delay_max = max(delay_max, time.perf_counter() - started_at - interval)
+    return delay_max
+
+async def run(workers: int, executor: str, logins: int, hashed_password: str) -> dict:
+    password_hasher = PasswordHasher(workers, executor)
+    # pool started before timing, first process fork is not counted
+    await password_hasher.verify_async('secret', hashed_password)
+
+    stop = asyncio.Event()
+    delay_task = asyncio.create_task(_measure_loop_delay(stop))
+    started_at = time.perf_counter()
+    results = await asyncio.gather(*[password_hasher.verify_async('secret', hashed_password) for _ in range(logins)])
+    elapsed = time.perf_counter() - started_at
+    stop.set()
+    loop_delay_max = await delay_task
+    password_hasher.shutdown()
+
+    assert all(results)
+    return {
+        'workers': workers,
+        'logins_per_s': round(logins / elapsed, 1),
+        'loop_delay_max_ms': round(loop_delay_max * 1000, 1),
+        'elapsed_s': round(elapsed, 2),
+    }
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--logins', type=int, default=64)
+    parser.add_argument('--executor', choices=['thread', 'process'], default='thread')
+    args = parser.parse_args()
+
+    hashed_password = pwd_context.hash('secret')
+    print(f"executor={args.executor} logins={args.logins}")
+    for workers in args.sizes:
+        print(asyncio.run(run(workers, args.executor, args.logins, hashed_password)))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+import argparse
+import json
+
+from app.config import config
+from app.utils.file_gc import collect_orphan_files
+
+# remove this will break orm rule
+from app.models.role.role import Role
+from app.models.role.role_authority import RoleAuthority
+from app.models.education.education import Education
+from app.models.education.education_translation import EducationTranslation
+from app.models.experience.experience import Experience
+from app.models.experience.experience_translation import ExperienceTranslation
+from app.models.solution.solution_translation import SolutionTranslation
+from app.models.project.project_translation import ProjectTranslation
+from app.models.project.project_skill import ProjectSkill
+from app.models.skill.skill_translation import SkillTranslation
+from app.models.skill.skill_mapping import SkillMapping
+from app.models.school.school_translation import SchoolTranslation
+from app.models.company.company_translation import CompanyTranslation
+
+# remove uploaded file (static/images, content addressed storage) not used by any row
+parser = argparse.ArgumentParser(description="Remove uploaded file not used by any row")
+parser.add_argument("--dry-run", action="store_true", help="only report orphan file")
+parser.add_argument("--quarantine", default=config.FILE_GC_QUARANTINE_FOLDER, help="move orphan file to this folder instead of delete")
+parser.add_argument("--min-age", type=int, default=config.FILE_GC_MIN_AGE, help="skip file modified in the last n second")
+parser.add_argument("--batch-size", type=int, default=config.FILE_GC_BATCH_SIZE, help="orphan checked and removed per batch")
+parser.add_argument("--max-files", type=int, default=None, help="stop after n orphan file")
+args = parser.parse_args()
+
+report = collect_orphan_files(
+    min_age=args.min_age,
+    batch_size=args.batch_size,
+    max_files=args.max_files,
+    quarantine_folder=args.quarantine,
+    dry_run=args.dry_run,
+)
+print(json.dumps(report, indent=2))
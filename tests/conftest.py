@@ -0,0 +1,149 @@
+import datetime
+import importlib
+import os
+import pkgutil
+import tempfile
+import uuid
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+def _generate_key_pair() -> tuple[str, str]:
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_key = key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption())
+    public_key = key.public_key().public_bytes(serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo)
+    return private_key.decode(), public_key.decode()
+
+# config is read on import of app, environment set before it
+_private_key, _public_key = _generate_key_pair()
+_refresh_private_key, _ = _generate_key_pair()
+os.environ['PRIVATE_KEY'] = _private_key
+os.environ['PUBLIC_KEY'] = _public_key
+os.environ['REFRESH_PRIVATE_KEY'] = _refresh_private_key
+os.environ['DB'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}"
+os.environ['PORT'] = '5000'
+os.environ['RESPONSE_CACHE_BACKEND'] = 'memory'
+# uploaded and deleted file kept out of static folder of the repo
+os.environ['STORAGE_LOCAL_ROOT'] = tempfile.mkdtemp()
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app import models
+from app.database import Base, SessionLocal, async_engine, engine
+from app.main import app
+from app.models.company.company import Company
+from app.models.company.company_translation import CompanyTranslation
+from app.models.education.education import Education
+from app.models.education.education_translation import EducationTranslation
+from app.models.experience.experience import Experience
+from app.models.experience.experience_translation import ExperienceTranslation
+from app.models.project.project import Project
+from app.models.project.project_attachment import ProjectAttachment
+from app.models.project.project_skill import ProjectSkill
+from app.models.project.project_translation import ProjectTranslation
+from app.models.role.role import Role
+from app.models.role.role_authority import RoleAuthority, RoleAuthorityFeature, RoleAuthorityName
+from app.models.school.school import School
+from app.models.school.school_translation import SchoolTranslation
+from app.models.skill.skill import Skill
+from app.models.skill.skill_mapping import SkillMapping
+from app.models.skill.skill_translation import SkillTranslation
+from app.models.solution.solution import Solution
+from app.models.solution.solution_translation import SolutionTranslation
+from app.models.user import User
+from app.utils.password import password_hasher
+from app.utils.response_cache import public_profile_cache
+
+PASSWORD = 'secret'
+
+class QueryCounter:
+    """
+        Count statement sent to database by sync and async engine
+    """
+    def __init__(self):
+        self.statements = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def _before_cursor_execute(self, conn, cursor, statement, *args):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        for target in (engine, async_engine.sync_engine):
+            event.listen(target, 'before_cursor_execute', self._before_cursor_execute)
+        return self
+
+    def __exit__(self, *args):
+        for target in (engine, async_engine.sync_engine):
+            event.remove(target, 'before_cursor_execute', self._before_cursor_execute)
+
+def _seed_users(db):
+    db.add(Role(id=1, code='ADMIN', name='ADMIN', level=0, is_active=True))
+    db.add(Role(id=2, code='USER', name='USER', level=1, is_active=True))
+    for feature in RoleAuthorityFeature:
+        for name in RoleAuthorityName:
+            db.add(RoleAuthority(id=str(uuid.uuid4()), role_id=1, feature=feature.value, name=name.value))
+    password = password_hasher.hash(PASSWORD)
+    db.add(User(id='u-admin', role_id=1, username='admin', email='admin@mail.com', password=password, is_active=True, gender='male', name='Admin'))
+    db.add(User(id='u-user', role_id=2, username='user', email='user@mail.com', password=password, is_active=True, gender='male', name='User'))
+
+def _seed_content(db, size: int):
+    for i in range(size):
+        db.add(School(id=f's{i}', code=f's{i}', name=f'School {i}', image_url=f's{i}.png', is_active=True))
+        db.add(SchoolTranslation(id=f'st{i}', school_id=f's{i}', name=f'School {i}', language_id='en'))
+        db.add(Education(id=f'e{i}', school_id=f's{i}', user_id='u-admin', title=f'education {i}', started_at=datetime.date(2020, 1, i + 1), is_active=True))
+        db.add(EducationTranslation(id=f'et{i}', education_id=f'e{i}', title=f'education {i}', degree='degree', field_of_study='field', language_id='en'))
+        db.add(Company(id=f'c{i}', code=f'c{i}', name=f'Company {i}', logo_url=f'c{i}.png', is_active=True))
+        db.add(CompanyTranslation(id=f'ct{i}', company_id=f'c{i}', name=f'Company {i}', language_id='en'))
+        db.add(Experience(id=f'x{i}', company_id=f'c{i}', user_id='u-admin', title=f'experience {i}', started_at=datetime.date(2021, 1, i + 1), is_active=True))
+        db.add(ExperienceTranslation(id=f'xt{i}', experience_id=f'x{i}', title=f'experience {i}', employee_type='full time', location='remote', location_type='remote', language_id='en'))
+        db.add(Skill(id=f'k{i}', code=f'k{i}', name=f'Skill {i}', logo_url=f'k{i}.png', is_active=True))
+        db.add(SkillMapping(id=f'km{i}', skill_id=f'k{i}', user_id='u-admin', is_active=True))
+        db.add(SkillTranslation(id=f'kt{i}', skill_id=f'k{i}', name=f'skill {i}', language_id='en'))
+        db.add(Solution(id=f'o{i}', user_id='u-admin', title=f'solution {i}', image_url=f'o{i}.png', is_active=True))
+        db.add(SolutionTranslation(id=f'ot{i}', solution_id=f'o{i}', title=f'solution {i}', language_id='en'))
+        db.add(Project(id=f'p{i}', user_id='u-admin', title=f'project {i}', slug=f'project-{i}', image_url=f'p{i}.png', is_active=True))
+        db.add(ProjectTranslation(id=f'pt{i}', project_id=f'p{i}', title=f'project {i}', language_id='en'))
+        db.add(ProjectSkill(id=f'ps{i}', project_id='p0', skill_id=f'k{i}', is_active=True))
+        db.add(ProjectAttachment(id=f'pa{i}', project_id='p0', title=f'attachment {i}', category='image', is_active=True))
+
+@pytest.fixture(scope='session')
+def client():
+    """
+        Client on fresh database with role ADMIN, USER and 8 row of every public profile section
+    """
+    for module in pkgutil.walk_packages(models.__path__, 'app.models.'):
+        importlib.import_module(module.name)
+    Base.metadata.create_all(engine)
+    db = SessionLocal()
+    try:
+        _seed_users(db)
+        _seed_content(db, 8)
+        db.commit()
+    finally:
+        db.close()
+    return TestClient(app)
+
+@pytest.fixture
+def login(client):
+    """
+        Login as seeded user, return access and refresh token
+    """
+    def _login(username: str) -> dict:
+        response = client.post('/api/v1/auth/login', json={'username_or_email': username, 'password': PASSWORD})
+        assert response.status_code == 200
+        return response.json()['data']
+    return _login
+
+@pytest.fixture
+def count_queries():
+    return QueryCounter
+
+@pytest.fixture(autouse=True)
+def clear_public_profile_cache():
+    public_profile_cache.invalidate_all()
+    yield
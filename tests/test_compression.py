@@ -0,0 +1,101 @@
+import gzip
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Mount, Route
+
+from app.utils.compression import CompressedBodyCache, CompressionMiddleware, compressed_body_cache
+from app.utils.static_files import StaticFileServer
+
+FULL_PROFILE_URL = '/api/v1/public-profile/admin/en/full'
+GZIP = {'accept-encoding': 'gzip'}
+
+@pytest.fixture
+def static_client(tmp_path):
+    """
+        Client on small app of static file and text route, behind compression middleware
+    """
+    (tmp_path / 'big.txt').write_text('hello world ' * 2000)
+    app = Starlette(routes=[
+        Route('/small', lambda request: PlainTextResponse('small')),
+        # same etag and same size, body differ
+        Route('/same/{name}', lambda request: PlainTextResponse(request.path_params['name'] * 1000, headers={'etag': '"same"'})),
+        Mount('/static', StaticFileServer(directory=tmp_path)),
+    ])
+    app.add_middleware(CompressionMiddleware, minimum_size=500, cache=CompressedBodyCache(1024 * 1024))
+    return TestClient(app)
+
+def test_json_compressed_with_vary_and_weak_etag(client):
+    response = client.get(FULL_PROFILE_URL, headers=GZIP)
+    assert response.status_code == 200
+    assert response.headers['content-encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['vary']
+    assert response.headers['etag'].startswith('W/')
+    assert response.json()['data']
+
+def test_brotli_preferred(client):
+    response = client.get(FULL_PROFILE_URL, headers={'accept-encoding': 'gzip, br'})
+    assert response.status_code == 200
+    assert response.headers['content-encoding'] == 'br'
+    assert response.headers['etag'].startswith('W/')
+
+def test_brotli_streamed_static_file(static_client):
+    response = static_client.get('/static/big.txt', headers={'accept-encoding': 'br'})
+    assert response.headers['content-encoding'] == 'br'
+    assert response.text == 'hello world ' * 2000
+
+def test_identity_not_compressed(client):
+    response = client.get(FULL_PROFILE_URL, headers={'accept-encoding': 'identity'})
+    assert response.status_code == 200
+    assert 'content-encoding' not in response.headers
+    assert int(response.headers['content-length']) == len(response.content)
+
+def test_compressed_body_reused(client):
+    client.get(FULL_PROFILE_URL, headers=GZIP)
+    hits = compressed_body_cache.get_status()['hits']
+    response = client.get(FULL_PROFILE_URL, headers=GZIP)
+    assert response.headers['content-encoding'] == 'gzip'
+    assert compressed_body_cache.get_status()['hits'] == hits + 1
+
+def test_weak_etag_not_modified(client):
+    etag = client.get(FULL_PROFILE_URL, headers=GZIP).headers['etag']
+    response = client.get(FULL_PROFILE_URL, headers={**GZIP, 'if-none-match': etag})
+    assert response.status_code == 304
+    assert response.content == b''
+
+def test_small_body_not_compressed(static_client):
+    response = static_client.get('/small', headers=GZIP)
+    assert response.text == 'small'
+    assert 'content-encoding' not in response.headers
+
+def test_static_file_compressed(static_client):
+    response = static_client.get('/static/big.txt', headers=GZIP)
+    assert response.headers['content-encoding'] == 'gzip'
+    assert 'accept-ranges' not in response.headers
+    assert response.text == 'hello world ' * 2000
+
+def test_cache_not_shared_by_same_etag_and_size(static_client):
+    assert static_client.get('/same/a', headers=GZIP).text == 'a' * 1000
+    response = static_client.get('/same/b', headers=GZIP)
+    assert response.headers['content-encoding'] == 'gzip'
+    assert response.text == 'b' * 1000
+
+def test_range_passthrough(static_client):
+    response = static_client.get('/static/big.txt', headers={**GZIP, 'range': 'bytes=0-9'})
+    assert response.status_code == 206
+    assert 'content-encoding' not in response.headers
+    assert response.content == b'hello worl'
+
+def test_head_passthrough(static_client):
+    response = static_client.head('/static/big.txt', headers=GZIP)
+    assert response.status_code == 200
+    assert 'content-encoding' not in response.headers
+    assert int(response.headers['content-length']) == len('hello world ' * 2000)
+
+def test_gzip_deterministic():
+    middleware = CompressionMiddleware(None)
+    body = b'{"data": "' + b'x' * 1000 + b'"}'
+    assert middleware.compress('gzip', body) == middleware.compress('gzip', body)
+    assert gzip.decompress(middleware.compress('gzip', body)) == body
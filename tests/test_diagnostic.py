@@ -0,0 +1,32 @@
+import pytest
+
+from app.config import config
+
+DIAGNOSTIC_URLS = [
+    '/api/v1/diagnostic/pool',
+    '/api/v1/diagnostic/threadpool',
+    '/api/v1/diagnostic/password-hasher',
+    '/api/v1/diagnostic/revocation',
+    '/api/v1/diagnostic/token-cache',
+    '/api/v1/diagnostic/image-derivative',
+    '/api/v1/diagnostic/file-deletion',
+    '/api/v1/diagnostic/compression',
+]
+
+def _bearer(token: str) -> dict:
+    return {'authorization': f"Bearer {token}"}
+
+@pytest.mark.parametrize('url', DIAGNOSTIC_URLS)
+def test_diagnostic_forbidden_without_authority(client, login, url):
+    response = client.get(url, headers=_bearer(login('user')['access_token']))
+    assert response.status_code == 403
+
+@pytest.mark.parametrize('url', DIAGNOSTIC_URLS)
+def test_diagnostic_allowed_for_admin(client, login, url):
+    response = client.get(url, headers=_bearer(login('admin')['access_token']))
+    assert response.status_code == 200
+
+def test_pool_status_from_config(client, login):
+    response = client.get('/api/v1/diagnostic/pool', headers=_bearer(login('admin')['access_token']))
+    data = response.json()['data']
+    assert data['sync']['max_overflow'] == config.DB_POOL_MAX_OVERFLOW
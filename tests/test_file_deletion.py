@@ -0,0 +1,73 @@
+import io
+
+import pytest
+
+from app.database import SessionLocal
+from app.models.file_deletion import FileDeletion
+from app.models.stored_file import StoredFile
+from app.utils.file_deletion import FileDeletionQueue
+from app.utils.storage import make_content_key, storage
+
+@pytest.fixture
+def db(client):
+    db = SessionLocal()
+    yield db
+    db.query(FileDeletion).delete()
+    db.commit()
+    db.close()
+
+@pytest.fixture
+def queue():
+    return FileDeletionQueue(poll_interval=60, batch_size=10, retry_delay=60, retry_max_delay=600)
+
+def _stored_file(db, digest: str, ref_count: int) -> str:
+    key = make_content_key(digest * 64, 'png')
+    storage.save(key, io.BytesIO(b'image'))
+    db.add(StoredFile(id=key, size=5, ref_count=ref_count))
+    db.commit()
+    return key
+
+def test_process_delete_only_unreferenced_file(db, queue):
+    kept = _stored_file(db, 'a', 1)
+    removed = _stored_file(db, 'b', 0)
+    queue.enqueue(db, None, kept)
+    queue.enqueue(db, None, removed)
+    db.commit()
+
+    assert queue.process(db) == 2
+    db.expire_all()
+    assert storage.exists(kept)
+    assert db.get(StoredFile, kept).ref_count == 1
+    assert not storage.exists(removed)
+    assert db.get(StoredFile, removed) is None
+    assert db.query(FileDeletion).count() == 0
+    assert (queue.deleted, queue.kept) == (1, 1)
+
+def test_process_delete_file_of_old_folder(db, queue, tmp_path):
+    (tmp_path / 'old.png').write_bytes(b'image')
+    queue.enqueue(db, str(tmp_path), 'old.png')
+    db.commit()
+
+    assert queue.process(db) == 1
+    assert not (tmp_path / 'old.png').exists()
+
+def test_rollback_drop_journal(db, queue):
+    key = _stored_file(db, 'c', 0)
+    queue.enqueue(db, None, key)
+    db.rollback()
+
+    assert queue.process(db) == 0
+    assert storage.exists(key)
+
+def test_failed_delete_retried_later(db, queue, tmp_path):
+    # folder can not be removed as file
+    (tmp_path / 'busy.png').mkdir()
+    queue.enqueue(db, str(tmp_path), 'busy.png')
+    db.commit()
+
+    assert queue.process(db) == 1
+    file_deletion = db.query(FileDeletion).one()
+    assert file_deletion.attempts == 1
+    assert file_deletion.last_error
+    # not due before retry delay
+    assert queue.process(db) == 0
@@ -0,0 +1,45 @@
+import datetime
+
+import pytest
+
+from app.utils.pagination import decode_cursor, encode_cursor
+
+SCHOOL_URL = '/api/v1/school'
+
+def _walk(client, url: str, headers: dict, params: dict) -> list[str]:
+    ids = []
+    cursor = ''
+    while cursor is not None:
+        response = client.get(url, headers=headers, params={**params, 'size': 3, 'cursor': cursor, 'with_total': False})
+        assert response.status_code == 200
+        body = response.json()
+        assert body['meta']['total'] is None
+        ids += [row['id'] for row in body['data']]
+        cursor = body['meta']['next_cursor']
+    return ids
+
+@pytest.mark.parametrize('params, expected', [
+    ({}, [f's{i}' for i in range(8)]),
+    ({'sort_by': 'name', 'sort_order': 'desc'}, [f's{i}' for i in reversed(range(8))]),
+    # same value on every row, order kept by id
+    ({'sort_by': 'is_active', 'sort_order': 'asc'}, [f's{i}' for i in range(8)]),
+    # null on every row
+    ({'sort_by': 'website_url', 'sort_order': 'desc'}, [f's{i}' for i in reversed(range(8))]),
+])
+def test_cursor_walk_every_row_once(client, login, params, expected):
+    headers = {'authorization': f"Bearer {login('admin')['access_token']}"}
+    assert _walk(client, SCHOOL_URL, headers, params) == expected
+
+def test_cursor_walk_public_profile(client):
+    url = '/api/v1/public-profile/admin/en/project'
+    ids = _walk(client, url, {}, {})
+    assert len(ids) == len(set(ids)) == 8
+
+def test_invalid_cursor_rejected(client, login):
+    headers = {'authorization': f"Bearer {login('admin')['access_token']}"}
+    response = client.get(SCHOOL_URL, headers=headers, params={'size': 3, 'cursor': 'not-a-cursor'})
+    assert response.status_code == 400
+
+@pytest.mark.parametrize('value', [None, 'name', 3, datetime.date(2020, 1, 2), datetime.datetime(2020, 1, 2, 3, 4, 5)])
+def test_cursor_round_trip(value):
+    assert decode_cursor(encode_cursor(value, 's1')) == (value, 's1')
@@ -0,0 +1,9 @@
+def test_project_detail_etag_unique_per_project(client):
+    etags = {client.get(f"/api/v1/public-profile/admin/en/project/project-{i}").headers['etag'] for i in (1, 2)}
+    assert len(etags) == 2
+
+def test_project_detail_not_modified(client):
+    url = '/api/v1/public-profile/admin/en/project/project-1'
+    etag = client.get(url).headers['etag']
+    response = client.get(url, headers={'if-none-match': etag})
+    assert response.status_code == 304
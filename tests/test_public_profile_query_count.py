@@ -0,0 +1,35 @@
+import pytest
+
+from app.utils.response_cache import public_profile_cache
+
+# user, page with count, stored file of srcset
+LIST_QUERY_COUNT = 3
+
+@pytest.mark.parametrize('section', ['skill', 'project', 'solution', 'education', 'experience'])
+def test_list_query_count_not_depend_on_page_size(client, count_queries, section):
+    counts = []
+    for size in (2, 8):
+        public_profile_cache.invalidate_all()
+        with count_queries() as counter:
+            response = client.get(f"/api/v1/public-profile/admin/en/{section}?size={size}")
+        assert response.status_code == 200
+        assert len(response.json()['data']) == size
+        counts.append(counter.count)
+
+    assert counts == [LIST_QUERY_COUNT, LIST_QUERY_COUNT]
+
+def test_list_query_count_with_cursor(client, count_queries):
+    with count_queries() as counter:
+        response = client.get('/api/v1/public-profile/admin/en/project?size=3&cursor=&with_total=false')
+    assert response.status_code == 200
+    assert response.json()['meta']['next_cursor']
+    assert counter.count == LIST_QUERY_COUNT
+
+def test_project_detail_query_count(client, count_queries):
+    with count_queries() as counter:
+        response = client.get('/api/v1/public-profile/admin/en/project/project-0')
+    assert response.status_code == 200
+    assert len(response.json()['data']['skills']) == 8
+    assert len(response.json()['data']['attachments']) == 8
+    # user, project, translation, validator, skill, attachment, stored file of srcset
+    assert counter.count == 7
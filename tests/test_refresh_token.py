@@ -0,0 +1,61 @@
+from conftest import PASSWORD
+
+REFRESH_URL = '/api/v1/auth/refresh-token'
+
+def _bearer(token: str) -> dict:
+    return {'authorization': f"Bearer {token}"}
+
+def _refresh(client, refresh_token: str):
+    return client.post(REFRESH_URL, json={'refresh_token': refresh_token})
+
+def test_refresh_rotate_token(client, login):
+    tokens = login('user')
+    response = _refresh(client, tokens['refresh_token'])
+    assert response.status_code == 200
+    rotated = response.json()['data']
+    assert rotated['refresh_token'] != tokens['refresh_token']
+    assert client.get('/api/v1/auth/profile', headers=_bearer(rotated['access_token'])).status_code == 200
+
+def test_refresh_reuse_revoke_token_family(client, login):
+    tokens = login('user')
+    rotated = _refresh(client, tokens['refresh_token']).json()['data']
+
+    response = _refresh(client, tokens['refresh_token'])
+    assert response.status_code == 401
+    assert response.json()['detail'] == 'Refresh token reused'
+    # token rotated from the reused one belong to same login, revoked with it
+    assert _refresh(client, rotated['refresh_token']).status_code == 401
+
+def test_refresh_reuse_keep_other_login(client, login):
+    tokens = login('user')
+    other = login('user')
+    _refresh(client, tokens['refresh_token'])
+    _refresh(client, tokens['refresh_token'])
+    assert _refresh(client, other['refresh_token']).status_code == 200
+
+def test_refresh_after_logout_rejected(client, login):
+    tokens = login('user')
+    response = client.post('/api/v1/auth/logout', json={'refresh_token': tokens['refresh_token']})
+    assert response.status_code == 200
+    assert _refresh(client, tokens['refresh_token']).status_code == 401
+
+def test_password_change_revoke_refresh_token(client, login):
+    tokens = login('user')
+    other = login('user')
+
+    def change_password(access_token: str, old_password: str, new_password: str):
+        response = client.put(
+            '/api/v1/auth/profile/password',
+            headers=_bearer(access_token),
+            json={'old_password': old_password, 'new_password': new_password, 'confirm_new_password': new_password},
+        )
+        assert response.status_code == 200
+
+    change_password(tokens['access_token'], PASSWORD, 'changed')
+    try:
+        assert _refresh(client, other['refresh_token']).status_code == 401
+    finally:
+        change_password(tokens['access_token'], 'changed', PASSWORD)
+
+def test_invalid_refresh_token_rejected(client):
+    assert _refresh(client, 'not-a-token').status_code == 401
@@ -0,0 +1,38 @@
+from app.database import SessionLocal
+from app.repositories.user_repository import UserRepository
+
+PROFILE_URL = '/api/v1/public-profile/admin'
+
+def _rename(user_id: str, name: str):
+    db = SessionLocal()
+    try:
+        repository = UserRepository(db)
+        user = repository.read_user(user_id)
+        user.name = name
+        repository.update_user(user)
+    finally:
+        db.close()
+
+def test_cached_response_served_without_query(client, count_queries):
+    first = client.get(PROFILE_URL)
+    with count_queries() as counter:
+        second = client.get(PROFILE_URL)
+    assert second.status_code == 200
+    assert second.content == first.content
+    assert counter.count == 0
+
+def test_owner_write_invalidate_cached_response(client):
+    assert client.get(PROFILE_URL).json()['data']['name'] == 'Admin'
+    _rename('u-admin', 'Admin Renamed')
+    try:
+        assert client.get(PROFILE_URL).json()['data']['name'] == 'Admin Renamed'
+    finally:
+        _rename('u-admin', 'Admin')
+
+def test_other_user_write_keep_cached_response(client, count_queries):
+    client.get(PROFILE_URL)
+    _rename('u-user', 'User')
+    with count_queries() as counter:
+        response = client.get(PROFILE_URL)
+    assert response.status_code == 200
+    assert counter.count == 0
@@ -0,0 +1,56 @@
+import jwt
+
+from app.database import SessionLocal
+from app.utils.revocation import BloomFilter, RevocationList
+
+PROFILE_URL = '/api/v1/auth/profile'
+
+def _bearer(token: str) -> dict:
+    return {'authorization': f"Bearer {token}"}
+
+def _logout(client, tokens: dict, access_token: str = None):
+    return client.post(
+        '/api/v1/auth/logout',
+        headers=_bearer(access_token or tokens['access_token']),
+        json={'refresh_token': tokens['refresh_token']},
+    )
+
+def test_logout_revoke_access_token(client, login):
+    tokens = login('user')
+    other = login('user')
+    assert client.get(PROFILE_URL, headers=_bearer(tokens['access_token'])).status_code == 200
+
+    assert _logout(client, tokens).status_code == 200
+    response = client.get(PROFILE_URL, headers=_bearer(tokens['access_token']))
+    assert response.status_code == 401
+    assert response.json()['detail']['code'] == 40102
+    # other login of same user not revoked
+    assert client.get(PROFILE_URL, headers=_bearer(other['access_token'])).status_code == 200
+
+def test_logout_keep_access_token_of_other_user(client, login):
+    tokens = login('user')
+    admin = login('admin')
+    assert _logout(client, tokens, access_token=admin['access_token']).status_code == 200
+    assert client.get(PROFILE_URL, headers=_bearer(admin['access_token'])).status_code == 200
+
+def test_revoked_token_loaded_by_other_process(client, login):
+    tokens = login('user')
+    _logout(client, tokens)
+    jti = jwt.decode(tokens['access_token'], options={'verify_signature': False})['jti']
+
+    # fresh list, as in other worker process
+    revocation_list = RevocationList()
+    db = SessionLocal()
+    try:
+        revocation_list.refresh(db)
+    finally:
+        db.close()
+    assert revocation_list.is_revoked(jti)
+    assert not revocation_list.is_revoked('not-revoked')
+
+def test_bloom_filter_no_false_negative():
+    bloom = BloomFilter(1024, 3)
+    values = [f'jti-{i}' for i in range(500)]
+    for value in values:
+        bloom.add(value)
+    assert all(value in bloom for value in values)
@@ -0,0 +1,20 @@
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.routing import Mount
+
+from app.utils.static_files import StaticFileServer
+
+def test_accel_redirect_relative_to_mounted_folder(tmp_path, monkeypatch):
+    root = tmp_path / 'storage'
+    (root / 'ab').mkdir(parents=True)
+    (root / 'ab' / 'file.txt').write_text('content')
+    # working directory not a parent of the folder
+    working_directory = tmp_path / 'app'
+    working_directory.mkdir()
+    monkeypatch.chdir(working_directory)
+
+    app = Starlette(routes=[Mount('/files', StaticFileServer(directory=root, accel_redirect_prefix='/_protected/files'))])
+    response = TestClient(app).get('/files/ab/file.txt')
+    assert response.status_code == 200
+    assert response.headers['x-accel-redirect'] == '/_protected/files/ab/file.txt'
+    assert response.content == b''
@@ -0,0 +1,36 @@
+import pytest
+
+from app.config import config
+from app.utils.request_limit import MultipartPartCounter
+
+ORIGIN = {'origin': 'http://localhost:3000'}
+
+def _multipart(boundary: bytes, parts: list[bytes]) -> bytes:
+    body = b''.join(b'--' + boundary + b'\r\nContent-Disposition: form-data; name="f"\r\n\r\n' + part + b'\r\n' for part in parts)
+    return body + b'--' + boundary + b'--\r\n'
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 1024])
+def test_part_counter_reset_on_every_boundary(chunk_size):
+    boundary = b'xyz'
+    body = _multipart(boundary, [b'a' * 100, b'b' * 100, b'c' * 100])
+    counter = MultipartPartCounter(boundary)
+    sizes = [counter.feed(body[i:i + chunk_size]) for i in range(0, len(body), chunk_size)]
+    # biggest part is one file with its header, not the whole body
+    assert len(body) > 400
+    assert 100 < max(sizes) < 200
+
+def test_file_over_limit_rejected_while_received(client):
+    image = b'\x89PNG\r\n\x1a\n' + b'0' * (config.UPLOAD_MAX_FILE_SIZE_MB * 1024 * 1024 + 64 * 1024)
+    response = client.post('/api/v1/skill', headers=ORIGIN, data={'code': 'big'}, files={'logo': ('logo.png', image, 'image/png')})
+    assert response.status_code == 413
+    assert response.headers['access-control-allow-origin'] == ORIGIN['origin']
+
+def test_request_over_limit_has_cors_header(client):
+    headers = {
+        **ORIGIN,
+        'content-type': 'multipart/form-data; boundary=xyz',
+        'content-length': str(config.UPLOAD_MAX_REQUEST_SIZE_MB * 1024 * 1024 + 1),
+    }
+    response = client.post('/api/v1/skill', headers=headers, content=b'')
+    assert response.status_code == 413
+    assert response.headers['access-control-allow-origin'] == ORIGIN['origin']